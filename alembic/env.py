@@ -10,12 +10,16 @@ sys.path.append(os.path.join(sys.path[0], 'src'))
 
 from src.settings.config import DB_ENV
 from src.database import Base
-from src.auth.models import UsersORM, SecretInfoORM
+from src.auth.models import UsersORM, SecretInfoORM, RefreshTokenORM, RevokedAccessTokenORM
 from src.channels.models import ChannelsORM
 from src.courses.models import CoursesORM, CoursesStructureORM
 from src.permissions.models import PermissionsORM
 from src.videos.models import VideoORM, VideoMetadatasORM, CategoryORM, TagORM
 from src.rating_description.models import VideoCommentsORM, CoursesCommentsORM
+from src.media.models import MediaJobORM, MediaBlobORM
+from src.deletions.models import DeletionJobORM
+from src.storage_usage.models import StorageObjectORM, StorageUsageORM
+from src.webhooks.models import WebhookEventORM, WebhookRetryORM
 
 
 # this is the Alembic Config object, which provides
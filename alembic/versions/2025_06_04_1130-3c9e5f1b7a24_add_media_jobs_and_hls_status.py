@@ -0,0 +1,52 @@
+"""add media_jobs and hls_status
+
+Revision ID: 3c9e5f1b7a24
+Revises: 8d3f0a6c2e71
+Create Date: 2025-06-04 11:30:42.518604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e5f1b7a24'
+down_revision = '8d3f0a6c2e71'
+branch_labels = None
+depends_on = None
+
+
+hls_status_enum = postgresql.ENUM('none', 'pending', 'processing', 'ready', 'failed', name='hls_status_enum')
+
+
+def upgrade() -> None:
+    hls_status_enum.create(op.get_bind(), checkfirst=True)
+    op.add_column('videos', sa.Column(
+        'hls_status',
+        postgresql.ENUM(name='hls_status_enum', create_type=False),
+        server_default='none',
+        nullable=False
+    ))
+    op.create_table('media_jobs',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('video_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['video_id'], ['videos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('video_id', 'kind', name='uq_media_jobs_video_kind')
+    )
+    op.create_index(op.f('ix_media_jobs_status'), 'media_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_media_jobs_status'), table_name='media_jobs')
+    op.drop_table('media_jobs')
+    op.drop_column('videos', 'hls_status')
+    hls_status_enum.drop(op.get_bind(), checkfirst=True)
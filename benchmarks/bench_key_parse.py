@@ -0,0 +1,95 @@
+"""
+Разбор ключей объектов из уведомлений MinIO:
+
+* ``split + pydantic`` — прежний ``UploadKey.from_s3``: ветки по ``split('/')``
+  и построение модели pydantic;
+* ``KeyTemplateRegistry`` — одно скомпилированное выражение по всем шаблонам
+  и slotted ``UploadKey``.
+
+Смесь ключей как в реальном потоке: оригиналы и превью видео, аватары,
+плюс производные файлы, которые вебхуки пропускают.
+
+Запуск (нужны переменные окружения приложения):
+    python -m benchmarks.bench_key_parse
+"""
+import timeit
+from pathlib import Path
+from typing import Optional
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel
+
+from src.aws.strategies import ObjectKind
+from src.aws.upload_key import UploadKey
+
+
+ITERATIONS = 200_000
+REPEAT = 5
+
+
+class _LegacyUploadKey(BaseModel):
+    user_id: UUID
+    channel_id: Optional[str] = None
+    video_id: Optional[UUID] = None
+    course_id: Optional[UUID] = None
+    kind: ObjectKind
+    key: str
+    ext: str
+
+
+def _legacy_from_s3(user_id: UUID, key: str) -> Optional[_LegacyUploadKey]:
+    parts = key.split("/")
+    ext = Path(key).suffix.lstrip(".").lower()
+    if parts == ["other", f"user_avatar.{ext}"]:
+        return _LegacyUploadKey(user_id=user_id, kind=ObjectKind.PROFILE_AVATAR, key=key, ext=ext)
+    if len(parts) == 3 and parts[0] == "channels" and parts[2].startswith("channel_avatar"):
+        return _LegacyUploadKey(user_id=user_id, channel_id=parts[1], kind=ObjectKind.CHANNEL_AVATAR, key=key, ext=ext)
+    if len(parts) == 3 and parts[0] == "channels" and parts[2].startswith("channel_preview"):
+        return _LegacyUploadKey(user_id=user_id, channel_id=parts[1], kind=ObjectKind.CHANNEL_PREVIEW, key=key, ext=ext)
+    if len(parts) == 5 and parts[0] == "channels" and parts[2] == "videos":
+        video_id = UUID(parts[3])
+        if parts[4].startswith("video."):
+            return _LegacyUploadKey(user_id=user_id, channel_id=parts[1], video_id=video_id,
+                                    kind=ObjectKind.VIDEO, key=key, ext=ext)
+        if parts[4].startswith("video_preview"):
+            return _LegacyUploadKey(user_id=user_id, channel_id=parts[1], video_id=video_id,
+                                    kind=ObjectKind.VIDEO_PREVIEW, key=key, ext=ext)
+    if (len(parts) == 5 and parts[0] == "channels" and parts[2] == "courses"
+            and parts[4].startswith("course_preview")):
+        return _LegacyUploadKey(user_id=user_id, channel_id=parts[1], course_id=UUID(parts[3]),
+                                kind=ObjectKind.COURSE_PREVIEW, key=key, ext=ext)
+    return None
+
+
+def _keys() -> list[str]:
+    video, course = uuid4(), uuid4()
+    return [
+        f"channels/bench/videos/{video}/video.mp4",
+        f"channels/bench/videos/{video}/video_preview.png",
+        f"channels/bench/courses/{course}/course_preview.webp",
+        "channels/bench/channel_avatar.png",
+        "other/user_avatar.jpg",
+        f"channels/bench/videos/{video}/hls/720p/segment_00042.ts",
+    ]
+
+
+def main() -> None:
+    user_id, keys = uuid4(), _keys()
+    for key in keys:
+        legacy, parsed = _legacy_from_s3(user_id, key), UploadKey.from_s3(user_id=user_id, key=key)
+        assert (legacy and legacy.kind) == (parsed and parsed.kind), key
+
+    candidates = {
+        "split + pydantic": lambda: [_legacy_from_s3(user_id, key) for key in keys],
+        "KeyTemplateRegistry": lambda: [UploadKey.from_s3(user_id=user_id, key=key) for key in keys],
+    }
+    rounds = ITERATIONS // len(keys)
+    print(f"{rounds * len(keys)} ключей, лучший из {REPEAT} прогонов")
+    for name, run in candidates.items():
+        seconds = min(timeit.repeat(run, number=rounds, repeat=REPEAT))
+        total = rounds * len(keys)
+        print(f"  {name:<20} {total / seconds:>12,.0f} ключей/с   {seconds / total * 1e6:7.3f} мкс/ключ")
+
+
+if __name__ == "__main__":
+    main()
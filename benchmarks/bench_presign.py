@@ -0,0 +1,59 @@
+"""
+Пропускная способность presign на одно ядро:
+
+* ``botocore`` — ``generate_presigned_url`` внутреннего клиента + переписывание URL
+  на публичный хост (прежняя реализация);
+* ``SigV4Presigner`` — локальная подпись для публичного хоста с кэшированным ключом.
+
+Запуск (нужны переменные окружения приложения, сеть не требуется):
+    python -m benchmarks.bench_presign
+"""
+import asyncio
+import time
+
+from aiobotocore.session import get_session
+from botocore.config import Config
+
+from src.aws.presigner import SigV4Presigner
+
+
+ITERATIONS = 20_000
+PARAMS = {"Bucket": "3fa85f64-5717-4562-b3fc-2c963f66afa6", "Key": "channels/demo/videos/0001/video.mp4",
+          "ContentType": "video/mp4", "ACL": "public-read"}
+
+
+def _report(name: str, seconds: float, iterations: int) -> None:
+    print(f"  {name:<18} {iterations / seconds:>10,.0f} URL/с   {seconds / iterations * 1e6:7.2f} мкс/URL")
+
+
+async def _botocore(iterations: int) -> float:
+    async with get_session().create_client(
+        "s3", endpoint_url="http://minio:9000", region_name="us-east-1",
+        aws_access_key_id="AK", aws_secret_access_key="SK", config=Config(signature_version="s3v4"),
+    ) as client:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            url = await client.generate_presigned_url("put_object", Params=PARAMS, ExpiresIn=3600)
+            f"http://localhost/s3proxy/{url.split('/', 3)[3]}"
+        return time.perf_counter() - started
+
+
+def _local(iterations: int) -> float:
+    presigner = SigV4Presigner(
+        access_key="AK", secret_key="SK", region="us-east-1", public_base_url="http://localhost/s3proxy",
+    )
+    headers = {"Content-Type": PARAMS["ContentType"], "x-amz-acl": PARAMS["ACL"]}
+    started = time.perf_counter()
+    for _ in range(iterations):
+        presigner.presign("PUT", PARAMS["Bucket"], PARAMS["Key"], expires_in=3600, headers=headers)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    print(f"{ITERATIONS} подписей, один поток")
+    _report("botocore", asyncio.run(_botocore(ITERATIONS // 10)), ITERATIONS // 10)
+    _report("SigV4Presigner", _local(ITERATIONS), ITERATIONS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Сравнение сериализации списков ``VideoDataReadSchema``:
+
+* ``response_model`` + ``JSONResponse`` — путь FastAPI по умолчанию;
+* ``response_model`` + ``ORJSONResponse`` — только быстрый класс ответа;
+* ``models_response`` — обход ``response_model`` через ``TypeAdapter.dump_json``.
+
+Запуск (нужны переменные окружения приложения):
+    python -m benchmarks.bench_response_serialization
+"""
+import asyncio
+import timeit
+from datetime import datetime, timezone
+from typing import List
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.core.responses import ORJSONResponse, models_response
+from src.core.Enums.ExtensionsEnums import ImageExtensionsEnum, VideoExtensionsEnum
+from src.videos.schemas import VideoDataReadSchema
+
+
+SIZES = (100, 1000)
+REPEAT = 5
+
+
+def _videos(count: int) -> List[VideoDataReadSchema]:
+    user_id = uuid4()
+    now = datetime.now(timezone.utc)
+    return [
+        VideoDataReadSchema(
+            id=uuid4(),
+            user_id=user_id,
+            course_id=None,
+            channel_id="bench",
+            video_url="",
+            preview_url=None,
+            video_ext=VideoExtensionsEnum.MP4,
+            preview_ext=ImageExtensionsEnum.JPEG if index % 2 else None,
+            name=f"Видео {index}",
+            description="Описание " * 10,
+            is_free=True,
+            is_public=True,
+            timeline=index,
+            upload_date=now,
+        )
+        for index in range(count)
+    ]
+
+
+def main() -> None:
+    field = create_model_field("Response", List[VideoDataReadSchema], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def through_response_model(response_class):
+        def run(items):
+            content = loop.run_until_complete(serialize_response(field=field, response_content=items))
+            return response_class(content).body
+        return run
+
+    cases = {
+        "response_model + JSONResponse": through_response_model(JSONResponse),
+        "response_model + ORJSONResponse": through_response_model(ORJSONResponse),
+        "models_response": lambda items: models_response(VideoDataReadSchema, items).body,
+    }
+
+    for size in SIZES:
+        items = _videos(size)
+        number = max(1, 10_000 // size)
+        print(f"\n{size} элементов, {number} итераций x {REPEAT}")
+        baseline = None
+        for name, case in cases.items():
+            best = min(timeit.repeat(lambda: case(items), number=number, repeat=REPEAT)) / number
+            baseline = baseline or best
+            print(f"  {name:<34} {best * 1e3:8.3f} мс  x{baseline / best:5.2f}")
+
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,64 @@
+import importlib.util
 import logging
 import uvicorn
-from .settings.config import API_ENV
+from .settings.config import API_ENV, MODE_ENV
 from .core.log import configure_logging
 
 logger = logging.getLogger("src.main")
 configure_logging()
 
-if __name__ == '__main__':
-    configure_logging()
-    
-    logger.debug("Запуск приложения")
 
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def serve_development() -> None:
+    """Один процесс с перезагрузкой при изменении кода"""
     uvicorn.run(
         'src.app:app',
         host=API_ENV.SERVER_HOST,
         port=API_ENV.SERVER_PORT,
+        proxy_headers=True,
+        forwarded_allow_ips=API_ENV.FORWARDED_ALLOW_IPS,
         reload=True,
     )
+
+
+def serve_production() -> None:
+    """
+    Несколько воркеров под супервизором uvicorn.
+    SIGHUP — поочерёдный перезапуск воркеров, SIGTTIN/SIGTTOU — ±1 воркер.
+    """
+    loop = "uvloop" if _available("uvloop") else "asyncio"
+    http = "httptools" if _available("httptools") else "h11"
+    workers = API_ENV.workers_count
+
+    logger.info(f"Запуск {workers} воркеров (loop={loop}, http={http})")
+
+    uvicorn.run(
+        'src.app:app',
+        host=API_ENV.SERVER_HOST,
+        port=API_ENV.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=API_ENV.BACKLOG,
+        timeout_keep_alive=API_ENV.KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=API_ENV.GRACEFUL_SHUTDOWN_TIMEOUT,
+        limit_concurrency=API_ENV.LIMIT_CONCURRENCY,
+        # Адрес клиента за nginx — из X-Forwarded-For доверенного прокси
+        proxy_headers=True,
+        forwarded_allow_ips=API_ENV.FORWARDED_ALLOW_IPS,
+        reload=False,
+    )
+
+
+if __name__ == '__main__':
+    configure_logging()
+    
+    logger.debug("Запуск приложения")
+
+    if MODE_ENV.MODE == "DEV":
+        serve_development()
+    else:
+        serve_production()
@@ -9,20 +9,26 @@ from .channels.router import router as channel_router
 from .courses.router import router as courses_router
 from .permissions.router import router as permissions_router
 from .courses_structure.router import router as courses_structure_router
-from .aws.router import router as storage_router
+from .aws.router import router as storage_router, files_router as storage_files_router
+from .storage_usage.router import router as storage_usage_router
 
 from .webhooks.router import router as minio_webhook_router
 from .videos.router import router as video_router
+from .media.router import router as media_router
 
+from .core.health import router as health_router
+from .core.metrics import router as metrics_router
+from .core.responses import ORJSONResponse
+from .lifecycle import startup, shutdown
 from .settings.config import API_ENV, MODE_ENV
 
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
+    await startup()
     yield
-    # Shutdown
+    await shutdown()
 
 root_path = "/api"
 server_url = API_ENV.public_url
@@ -33,6 +39,7 @@ app = FastAPI(
     description="Video hosting service built with FastAPI",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
@@ -61,9 +68,14 @@ app.include_router(courses_router)
 app.include_router(permissions_router)
 app.include_router(courses_structure_router)
 app.include_router(storage_router)
+app.include_router(storage_files_router)
+app.include_router(storage_usage_router)
 
 app.include_router(minio_webhook_router)
 app.include_router(video_router)
+app.include_router(media_router)
+app.include_router(metrics_router)
+app.include_router(health_router)
 
 @app.get('/')
 async def root():
@@ -3,6 +3,8 @@ from fastapi import Depends, HTTPException, status, Request, Cookie
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
+from jose import JWTError
+
 import logging
 
 from ..core.Enums.ExtensionsEnums import ImageExtensionsEnum
@@ -14,7 +16,8 @@ from ..core.Enums.MIMETypeEnums import ImageMimeEnum
 
 from .exceptions import AuthHTTPExceptions
 from .service import AuthService
-from .schemas import UserReadSchema
+from .schemas import CurrentUserSchema
+from .tokens import decode_access_token
 
 
 logger = logging.getLogger(__name__)
@@ -70,35 +73,56 @@ async def get_token_from_cookie(
     logger.debug("No token found in cookies or headers")
     return None
 
+async def get_access_payload(
+    token: Optional[str] = Depends(get_token_from_cookie),
+) -> Optional[dict]:
+    """Claims текущего access-токена или None, если токена нет или он недействителен"""
+    if not token:
+        return None
+    try:
+        return decode_access_token(token)[1]
+    except (JWTError, ValueError):
+        return None
+
+
+async def get_optional_user(
+    token: Optional[str] = Depends(get_token_from_cookie),
+) -> Optional[CurrentUserSchema]:
+    """Пользователь для открытых маршрутов: None, если токена нет или он недействителен"""
+    if not token:
+        return None
+    try:
+        return decode_access_token(token)[0]
+    except (JWTError, ValueError):
+        return None
+
+
 async def get_current_user(
-    request: Request,
     token: Optional[str] = Depends(get_token_from_cookie),
-    auth_service: AuthService = Depends(get_auth_service)
-) -> UserReadSchema:
+) -> CurrentUserSchema:
     """
-    Зависимость для получения текущего пользователя
+    Зависимость для получения текущего пользователя.
+    Пользователь восстанавливается из claims короткоживущего access-токена
+    (только id, email, created_at), БД не используется; отзыв проверяется
+    по индексу в памяти.
     
     Args:
-        request: Запрос FastAPI
         token: Токен доступа
-        auth_service: Сервис аутентификации
         
     Returns:
-        UserReadSchema: Данные текущего пользователя
+        CurrentUserSchema: Идентификатор и email текущего пользователя
         
     Raises:
-        HTTPException: 401 Unauthorized, если токен недействителен или отсутствует
+        HTTPException: 401 Unauthorized, если токен недействителен, отозван или отсутствует
     """
-    logger.debug(f"Getting current user from token: {token is not None}")
-    
+    http_exceptions = AuthHTTPExceptions()
     if not token:
         logger.warning("No token provided for authentication")
-        raise auth_service.http_exceptions.unauthorized_401()
+        raise http_exceptions.unauthorized_401()
     
     try:
-        user = await auth_service.get_current_user(token)
-        logger.debug(f"User authenticated: {user.username}")
+        user, _ = decode_access_token(token)
         return user
-    except Exception as e:
+    except (JWTError, ValueError) as e:
         logger.warning(f"Authentication failed: {str(e)}")
-        raise auth_service.http_exceptions.unauthorized_401("Invalid authentication credentials")
+        raise http_exceptions.unauthorized_401("Invalid authentication credentials")
@@ -25,6 +25,13 @@ class AuthHTTPExceptions(AbstractHTTPExceptions):
             detail=detail
         )
     
+    def service_unavailable_503(self, detail: str = "Authentication is temporarily overloaded, try again later") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": "1"}
+        )
+
     def unauthorized_401(self, detail: str = "Not authenticated") -> HTTPException:
         """default - hasn't token"""
         return HTTPException(
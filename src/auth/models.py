@@ -87,4 +87,75 @@ class SecretInfoORM(Base):
     organization_name: Mapped[str | None] = mapped_column(
         String(255), 
         nullable=True
-    )
\ No newline at end of file
+    )
+
+class RefreshTokenORM(Base):
+    """
+    Refresh-токен. Хранится только хеш секрета; токены одной цепочки ротации
+    объединены ``family_id`` — повторное использование отозванного токена
+    отзывает всю цепочку.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id:          Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        default=uuid.uuid4,
+        primary_key=True
+    )
+    user_id:     Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey(UsersORM.id, ondelete='CASCADE'),
+        nullable=False,
+        index=True
+    )
+    family_id:   Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False,
+        index=True
+    )
+    secret_hash: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False
+    )
+    access_jti:  Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False
+    )
+    created_at:  Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+    expires_at:  Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False
+    )
+    revoked_at:  Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        index=True
+    )
+
+
+class RevokedAccessTokenORM(Base):
+    """
+    Отозванный до истечения access-токен. Не ссылается на пользователя:
+    отзыв должен пережить удаление аккаунта, строки удаляются после ``expires_at``.
+    """
+    __tablename__ = "revoked_access_tokens"
+
+    jti:        Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True
+    )
+    revoked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False,
+        index=True
+    )
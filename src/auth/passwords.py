@@ -0,0 +1,127 @@
+"""
+Хеширование паролей вне event loop.
+
+bcrypt занимает 100–300 мс CPU, поэтому ``hash``/``verify`` выполняются
+в отдельном ограниченном пуле потоков (bcrypt отпускает GIL).
+Если очередь ожидающих задач переполнена, запрос отклоняется сразу,
+а не копится в памяти.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from ..core.metrics import register_metrics
+from ..settings.config import AUTH_ENV
+
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=AUTH_ENV.BCRYPT_ROUNDS,
+)
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Очередь хеширования переполнена"""
+    pass
+
+
+@dataclass(slots=True)
+class _Job:
+    submitted_at: float
+    started: bool = False
+    abandoned: bool = False
+
+
+class PasswordHasher:
+    def __init__(self, context: CryptContext, max_workers: int, queue_limit: int):
+        self.context = context
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._work_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(self.context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Проверка пароля; второй элемент — новый хеш, если у сохранённого
+        устарели параметры (например, изменился BCRYPT_ROUNDS)
+        """
+        return await self._submit(self.context.verify_and_update, password, hashed)
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._queued >= self.queue_limit:
+                self._rejected += 1
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self._queued += 1
+
+        job = _Job(time.perf_counter())
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, self._run, job, func, args)
+        finally:
+            with self._lock:
+                if not job.started:
+                    # Запрос отменён, пока задача ждала в очереди: _run её пропустит
+                    job.abandoned = True
+                    self._queued -= 1
+
+    def _run(self, job: _Job, func: Callable[..., Any], args: tuple) -> Any:
+        started_at = time.perf_counter()
+        with self._lock:
+            if job.abandoned:
+                return None
+            job.started = True
+            self._queued -= 1
+            self._running += 1
+            self._wait_seconds += started_at - job.submitted_at
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._work_seconds += time.perf_counter() - started_at
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "workers": self.max_workers,
+                "queue_limit": self.queue_limit,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_seconds / completed * 1000, 3),
+                "avg_work_ms": round(self._work_seconds / completed * 1000, 3),
+            }
+
+    def shutdown(self) -> None:
+        """Дожидается текущих задач; новый пул создаёт потоки только по требованию"""
+        executor, self._executor = self._executor, ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="bcrypt"
+        )
+        executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=AUTH_ENV.PASSWORD_HASH_WORKERS,
+    queue_limit=AUTH_ENV.PASSWORD_HASH_QUEUE_LIMIT,
+)
+register_metrics("password_hasher", password_hasher.metrics)
@@ -1,12 +1,14 @@
 from uuid import UUID
+from datetime import datetime, timedelta, UTC
 from typing import Optional, List, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import DateTime, delete, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
 from sqlalchemy.dialects.postgresql import UUID
 
-from .models import UsersORM, SecretInfoORM
+from .models import UsersORM, SecretInfoORM, RefreshTokenORM, RevokedAccessTokenORM
 from .schemas import UserCreateSchema
 
 from ..core.AbstractRepository import AbstractRepository
@@ -107,14 +109,127 @@ class SecretInfoRepository(AbstractRepository[SecretInfoORM]):
             .values(INN = INN)
         )
         await self.session.commit()
+
+    async def update_hashed_password(self, user_id: UUID, hashed_password: str) -> None:
+        await self.session.execute(
+            update(SecretInfoORM)
+            .where(SecretInfoORM.id == user_id)
+            .values(hashed_password = hashed_password)
+        )
+        await self.session.commit()
         
 
 
+class RefreshTokenRepository(AbstractRepository[RefreshTokenORM]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, RefreshTokenORM)
+
+    async def get_for_update(self, token_id: UUID) -> Optional[RefreshTokenORM]:
+        """Блокирует строку, чтобы два параллельных refresh не ротировали один токен"""
+        query = select(self.model).where(self.model.id == token_id).with_for_update()
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def rotate(self, current: RefreshTokenORM, replacement: RefreshTokenORM) -> None:
+        current.revoked_at = datetime.now(UTC)
+        self.session.add(replacement)
+        await self.session.commit()
+
+    async def revoke(self, token_id: UUID) -> Optional[Tuple[UUID, datetime]]:
+        """Отзывает токен; возвращает (access_jti, created_at) или None"""
+        query = (
+            update(self.model)
+            .where(self.model.id == token_id, self.model.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(UTC))
+            .returning(self.model.access_jti, self.model.created_at)
+        )
+        result = await self.session.execute(query)
+        await self.session.commit()
+        row = result.first()
+        return tuple(row) if row else None
+
+    async def revoke_family(self, family_id: UUID) -> List[Tuple[UUID, datetime]]:
+        query = (
+            update(self.model)
+            .where(self.model.family_id == family_id, self.model.revoked_at.is_(None))
+            .values(revoked_at=datetime.now(UTC))
+            .returning(self.model.access_jti, self.model.created_at)
+        )
+        result = await self.session.execute(query)
+        await self.session.commit()
+        return [tuple(row) for row in result.all()]
+
+    async def get_revoked_since(self, since: datetime) -> List[Tuple[UUID, datetime]]:
+        """access_jti токенов, выданных и отозванных после ``since``"""
+        query = (
+            select(self.model.access_jti, self.model.created_at)
+            .where(self.model.created_at >= since, self.model.revoked_at >= since)
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+
+class RevokedAccessTokenRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def revoke(self, jti: UUID, expires_at: datetime, *, commit: bool = True) -> None:
+        query = (
+            insert(RevokedAccessTokenORM)
+            .values(jti=jti, expires_at=expires_at, revoked_at=datetime.now(UTC))
+            .on_conflict_do_nothing(index_elements=[RevokedAccessTokenORM.jti])
+        )
+        await self.session.execute(query)
+        if commit:
+            await self.session.commit()
+
+    async def revoke_user_sessions(self, user_id: UUID, ttl: timedelta) -> List[Tuple[UUID, datetime]]:
+        """
+        Отзывает access-токены всех сессий пользователя, выданные за последние ``ttl``;
+        возвращает (jti, expires_at) добавленных строк. Без commit — фиксируется
+        вместе с удалением пользователя.
+        """
+        now = datetime.now(UTC)
+        sessions = (
+            select(
+                RefreshTokenORM.access_jti,
+                RefreshTokenORM.created_at + ttl,
+                literal(now, DateTime(timezone=True)),
+            )
+            .where(RefreshTokenORM.user_id == user_id, RefreshTokenORM.created_at > now - ttl)
+        )
+        query = (
+            insert(RevokedAccessTokenORM)
+            .from_select(["jti", "expires_at", "revoked_at"], sessions)
+            .on_conflict_do_nothing(index_elements=[RevokedAccessTokenORM.jti])
+            .returning(RevokedAccessTokenORM.jti, RevokedAccessTokenORM.expires_at)
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def get_active(self) -> List[Tuple[UUID, datetime]]:
+        """(jti, expires_at) отозванных токенов, срок которых ещё не истёк"""
+        query = (
+            select(RevokedAccessTokenORM.jti, RevokedAccessTokenORM.expires_at)
+            .where(RevokedAccessTokenORM.expires_at > datetime.now(UTC))
+        )
+        result = await self.session.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def purge_expired(self) -> None:
+        await self.session.execute(
+            delete(RevokedAccessTokenORM).where(RevokedAccessTokenORM.expires_at <= datetime.now(UTC))
+        )
+        await self.session.commit()
+
+
 class AuthRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
         self.user_repo = UserRepository(session)
         self.secret_repo = SecretInfoRepository(session)
+        self.refresh_repo = RefreshTokenRepository(session)
+        self.revoked_repo = RevokedAccessTokenRepository(session)
 
     async def create_user(
         self, user_data: UserCreateSchema, hashed_password: str, username: str
@@ -145,6 +260,13 @@ class AuthRepository:
 
         return user, secret_info
 
+    async def get_user_and_secret_by_id(self, user_id: UUID) -> Optional[Tuple[UsersORM, SecretInfoORM]]:
+        user = await self.user_repo.get_by_id(user_id)
+        secret_info = await self.secret_repo.get_by_id(user_id)
+        if not user or not secret_info:
+            return None
+        return user, secret_info
+
     async def get_user_with_secret_info(self, user_id: UUID) -> Optional[UsersORM]:
         query = (
             select(UsersORM)
@@ -213,6 +335,9 @@ class AuthRepository:
     async def update_organization_name(self, user_id: UUID, organization_name: str) -> None:
         await self.secret_repo.update_organization_name(user_id, organization_name)
 
+    async def update_hashed_password(self, user_id: UUID, hashed_password: str) -> None:
+        await self.secret_repo.update_hashed_password(user_id, hashed_password)
+
     async def update_INN(self, user_id: UUID, INN: str) -> None:
         await self.secret_repo.update_INN(user_id, INN)
 
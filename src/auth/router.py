@@ -1,19 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from typing import Optional
+
+from fastapi import APIRouter, Body, Cookie, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 from datetime import timedelta
 
-from .schemas import UserCreateSchema, UserReadSchema, TokenSchema, UserUpdateSchema, UserReadPublicSchema
+from .schemas import CurrentUserSchema, UserCreateSchema, UserReadSchema, TokenSchema, UserUpdateSchema, UserReadPublicSchema, RefreshTokenRequestSchema
 from .service import AuthService
 from ..database import get_async_session
-from .dependencies import get_current_user, get_auth_service
+from .dependencies import get_current_user, get_auth_service, get_access_payload
+from .tokens import access_token_ttl, refresh_token_ttl
+from ..core.responses import models_response
+from ..deletions.dependencies import get_deletion_service
+from ..deletions.service import DeletionService
 
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+
+def _set_token_cookies(response: Response, tokens: TokenSchema) -> None:
+    access_max_age = int(access_token_ttl().total_seconds())
+    refresh_max_age = int(refresh_token_ttl().total_seconds())
+    response.set_cookie(
+        key="access_token",
+        value=f"Bearer {tokens.access_token}",
+        httponly=True,
+        max_age=access_max_age,
+        expires=access_max_age,
+        samesite="lax",
+        secure=False  # В продакшн установить True
+    )
+    response.set_cookie(
+        key="refresh_token",
+        value=tokens.refresh_token,
+        httponly=True,
+        max_age=refresh_max_age,
+        expires=refresh_max_age,
+        samesite="strict",
+        secure=False  # В продакшн установить True
+    )
+
 @router.post(
     "/register", 
     response_model=UserReadSchema, 
@@ -51,32 +80,47 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token_expires = timedelta(minutes=auth_service.access_token_expire_minutes)
-    access_token = auth_service.create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
+    tokens, _ = await auth_service.issue_tokens(user)
     logger.info(f"Generated token for user: {user.username}")
     
     # Устанавливаем cookie
-    response.set_cookie(
-        key="access_token",
-        value=f"Bearer {access_token}",
-        httponly=True,
-        max_age=auth_service.access_token_expire_minutes * 60,
-        expires=auth_service.access_token_expire_minutes * 60,
-        samesite="lax",
-        secure=False  # В продакшн установить True
-    )
+    _set_token_cookies(response, tokens)
     logger.info("Cookie set successfully")
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    return tokens
+
+@router.post(
+    "/refresh",
+    response_model=TokenSchema,
+    summary="Обновление токенов",
+    description="Обменивает refresh-токен (из тела или cookie) на новую пару токенов; старый refresh-токен отзывается."
+)
+async def refresh(
+    response: Response,
+    body: Optional[RefreshTokenRequestSchema] = Body(None),
+    refresh_token: Optional[str] = Cookie(None),
+    auth_service: AuthService = Depends(get_auth_service)
+):
+    raw_token = (body.refresh_token if body else None) or refresh_token
+    if not raw_token:
+        raise auth_service.http_exceptions.unauthorized_401("Refresh token is missing")
+
+    tokens, _ = await auth_service.refresh_tokens(raw_token)
+    _set_token_cookies(response, tokens)
+    return tokens
 
 @router.post(
     "/logout",
     summary="Выход пользователя",
-    description="Удаляет cookie с токеном доступа."
+    description="Отзывает refresh-токен и текущий access-токен, удаляет cookie."
 )
-async def logout(response: Response):
+async def logout(
+    response: Response,
+    body: Optional[RefreshTokenRequestSchema] = Body(None),
+    refresh_token: Optional[str] = Cookie(None),
+    access_payload: Optional[dict] = Depends(get_access_payload),
+    auth_service: AuthService = Depends(get_auth_service)
+):
     """
     Выход пользователя
     
@@ -87,7 +131,10 @@ async def logout(response: Response):
         dict: Сообщение об успешном выходе
     """
     logger.info("User logout")
+    raw_token = (body.refresh_token if body else None) or refresh_token
+    await auth_service.logout(raw_token, access_payload)
     response.delete_cookie(key="access_token")
+    response.delete_cookie(key="refresh_token")
     return {"message": "Successfully logged out"}
 
 @router.get(
@@ -97,19 +144,22 @@ async def logout(response: Response):
     description="Возвращает информацию о текущем аутентифицированном пользователе."
 )
 async def read_users_me(
-    current_user: UserReadSchema = Depends(get_current_user)
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    auth_service: AuthService = Depends(get_auth_service)
 ):
     """
-    Получение информации о текущем пользователе
+    Получение информации о текущем пользователе.
+    Профиль читается из БД: access-токен несёт только неизменяемые поля
     
     Args:
         current_user: Текущий пользователь (получен из зависимости)
+        auth_service: Сервис аутентификации
         
     Returns:
         UserReadSchema: Данные текущего пользователя
     """
-    logger.info(f"Get user info for: {current_user.username}")
-    return current_user
+    logger.info(f"Get user info for: {current_user.id}")
+    return await auth_service.get_user(current_user.id)
 
 @router.put(
     "/me", 
@@ -118,12 +168,15 @@ async def read_users_me(
     description="Обновляет данные текущего пользователя."
 )
 async def update_user_me(
+    response: Response,
     user_data: UserUpdateSchema,
-    current_user: UserReadSchema = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    access_payload: Optional[dict] = Depends(get_access_payload),
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """
-    Обновление данных текущего пользователя
+    Обновление данных текущего пользователя.
+    При деактивации сессии пользователя отзываются, cookie удаляются
     
     Args:
         user_data: Новые данные пользователя
@@ -133,8 +186,14 @@ async def update_user_me(
     Returns:
         UserReadSchema: Обновленные данные пользователя
     """
-    logger.info(f"Update user data for: {current_user.username}")
-    return await auth_service.update_user(current_user.id, user_data.model_dump(exclude_unset=True))
+    logger.info(f"Update user data for: {current_user.id}")
+    user = await auth_service.update_user(
+        current_user.id, user_data.model_dump(exclude_unset=True), access_payload
+    )
+    if not user.is_active:
+        response.delete_cookie(key="access_token")
+        response.delete_cookie(key="refresh_token")
+    return user
 
 
 @router.delete(
@@ -144,18 +203,23 @@ async def update_user_me(
     description="Удаляет текущего пользователя."
 )
 async def delete_user_me(
-    current_user: UserReadSchema = Depends(get_current_user),
-    auth_service: AuthService = Depends(get_auth_service)
+    current_user: CurrentUserSchema = Depends(get_current_user),
+    access_payload: Optional[dict] = Depends(get_access_payload),
+    auth_service: AuthService = Depends(get_auth_service),
+    deletions: DeletionService = Depends(get_deletion_service),
 ):
     """
-    Удаление текущего пользователя
+    Удаление текущего пользователя; его бакет очищается в фоне
     
     Args:
         current_user: Текущий пользователь (получен из зависимости)
         auth_service: Сервис аутентификации
+        deletions: Очистка хранилища
     """
-    logger.info(f"Delete user: {current_user.username}")
-    await auth_service.delete_user(current_user.id)
+    logger.info(f"Delete user: {current_user.id}")
+    await deletions.purge_user(current_user.id)
+    await auth_service.delete_user(current_user.id, access_payload)
+    deletions.wake()
     return None 
 
 
@@ -164,12 +228,12 @@ async def get_users(
     auth_service: AuthService = Depends(get_auth_service), 
     limit:int = 20) :
     """Получение списка всех пользователей"""
-    return await auth_service.get_all_users(limit)
+    return models_response(UserReadPublicSchema, await auth_service.get_all_users(limit))
 
 @router.patch("/me/username", status_code=status.HTTP_204_NO_CONTENT)
 async def update_username(
     username: str,
-    current_user: UserReadSchema = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
     auth_service: AuthService = Depends(get_auth_service)
 ):
     return await auth_service.update_username(current_user.id, username)
@@ -177,7 +241,7 @@ async def update_username(
 @router.patch("/me/phone_number", status_code=status.HTTP_204_NO_CONTENT)
 async def update_phone_number(
     phone_number: str,
-    current_user: UserReadSchema = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
     auth_service: AuthService = Depends(get_auth_service)
 ):
     return await auth_service.update_phone_number(current_user.id, phone_number)    
@@ -185,7 +249,7 @@ async def update_phone_number(
 @router.patch("/me/organization_name", status_code=status.HTTP_204_NO_CONTENT)
 async def update_organization_name(
     organization_name: str,
-    current_user: UserReadSchema = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
     auth_service: AuthService = Depends(get_auth_service)
 ):  
     return await auth_service.update_organization_name(current_user.id, organization_name)
@@ -193,7 +257,7 @@ async def update_organization_name(
 @router.patch("/me/INN", status_code=status.HTTP_204_NO_CONTENT)
 async def update_INN(
     INN: str,
-    current_user: UserReadSchema = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
     auth_service: AuthService = Depends(get_auth_service)
 ):
     return await auth_service.update_INN(current_user.id, INN)
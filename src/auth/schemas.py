@@ -6,7 +6,7 @@ from typing import Optional, Union, Annotated
 from ..core.Enums.ExtensionsEnums import ImageExtensionsEnum
 from .models import UsersORM, SecretInfoORM
 
-from ..settings.config import S3_ENV
+from ..aws.layout import public_object_url
 
 import logging
 from ..core.log import configure_logging
@@ -78,12 +78,21 @@ class UserReadPublicSchema(BaseModel):
             else:
                 ext_value = self.avatar_ext
             
-            base_url = S3_ENV.BASE_SERVER_URL
-            return f"{base_url}/minio/{self.id}/other/user_avatar.{ext_value}"
+            return public_object_url(self.id, f"other/user_avatar.{ext_value}")
         
         return None
 
 
+class CurrentUserSchema(BaseModel):
+    """
+    Пользователь из claims access-токена: только поля, которые не меняются
+    за время жизни аккаунта. Профиль — через ``GET /auth/me`` из БД.
+    """
+    id: UUID = Field(..., description="Уникальный идентификатор пользователя")
+    email: str = Field(..., description="Email пользователя")
+    created_at: datetime = Field(..., description="Дата и время создания аккаунта")
+
+
 class UserReadSchema(BaseModel):
     """Схема для чтения данных пользователя"""
     id: UUID = Field(..., description="Уникальный идентификатор пользователя")
@@ -137,8 +146,7 @@ class UserReadSchema(BaseModel):
             else:
                 ext_value = self.avatar_ext
             
-            base_url = S3_ENV.BASE_SERVER_URL
-            return f"{base_url}/minio/{self.id}/other/user_avatar.{ext_value}"
+            return public_object_url(self.id, f"other/user_avatar.{ext_value}")
         
         return None
 
@@ -185,6 +193,8 @@ class TokenSchema(BaseModel):
     """Схема токена доступа"""
     access_token: str = Field(..., description="JWT токен доступа")
     token_type: str = Field(default="bearer", description="Тип токена")
+    expires_in: Optional[int] = Field(default=None, description="Время жизни access-токена в секундах")
+    refresh_token: Optional[str] = Field(default=None, description="Токен для получения новой пары токенов")
 
     model_config = ConfigDict(
         title="Токен доступа",
@@ -196,6 +206,11 @@ class TokenSchema(BaseModel):
         }
     )
 
+class RefreshTokenRequestSchema(BaseModel):
+    """Refresh-токен в теле запроса (если клиент не использует cookie)"""
+    refresh_token: Optional[str] = Field(None, description="Refresh-токен, выданный при входе")
+
+
 class TokenDataSchema(BaseModel):
     """Схема данных токена"""
     email: Optional[EmailStr] = Field(None, description="Email пользователя")
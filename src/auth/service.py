@@ -1,11 +1,11 @@
 import logging
+import asyncio
 import sys
 import random
 from uuid import UUID
 from datetime import datetime, timedelta, UTC
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
-from jose import JWTError, jwt
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -16,13 +16,25 @@ from ..core.Enums.ExtensionsEnums import ImageExtensionsEnum
 from ..core.Enums.TypeReferencesEnums import ImageTypeReference
 
 from .schemas import (
+    TokenSchema,
     UserCreateSchema,
     UserReadSchema,
     UserReadPublicSchema
 )
+from .models import RefreshTokenORM
 from .repository import AuthRepository
+from .tokens import (
+    IssuedAccessToken,
+    access_token_ttl,
+    create_access_token,
+    new_refresh_token,
+    refresh_secret_matches,
+    refresh_token_ttl,
+    revoked_tokens,
+    split_refresh_token,
+)
 from .exceptions import AuthHTTPExceptions
-from passlib.context import CryptContext
+from .passwords import PasswordHasherBusy, password_hasher
 
 import logging
 from ..core.log import configure_logging
@@ -30,25 +42,120 @@ from ..core.log import configure_logging
 logger = logging.getLogger(__name__)
 configure_logging()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class AuthService:
     def __init__(self, session: AsyncSession, http_exceptions :AuthHTTPExceptions):
         self.repository = AuthRepository(session)
         self.http_exceptions = http_exceptions
-        self.secret_key = AUTH_ENV.SECRET_AUTH
-        self.algorithm = "HS256"
-        self.access_token_expire_minutes = AUTH_ENV.ACCESS_TOKEN_EXPIRE_MINUTES
+        self.password_hasher = password_hasher
 
         logger.warning("AuthService успешно инициализирован")
 
 
-    def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
-        to_encode = data.copy()
-        expire = datetime.now(UTC) + (expires_delta or timedelta(minutes=self.access_token_expire_minutes))
-        to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+    async def issue_tokens(
+        self,
+        user: UserReadSchema,
+        family_id: Optional[UUID] = None,
+        replaces: Optional[RefreshTokenORM] = None,
+    ) -> Tuple[TokenSchema, IssuedAccessToken]:
+        """
+        Новая пара токенов. При ротации (``replaces``) старый refresh-токен
+        отзывается в той же транзакции, что и создаётся новый.
+        """
+        access = create_access_token(user)
+        token_id, secret_hash, refresh_token = new_refresh_token()
+        entity = RefreshTokenORM(
+            id=token_id,
+            user_id=user.id,
+            family_id=family_id or token_id,
+            secret_hash=secret_hash,
+            access_jti=access.jti,
+            created_at=datetime.now(UTC),
+            expires_at=datetime.now(UTC) + refresh_token_ttl(),
+        )
+        if replaces is None:
+            await self.repository.refresh_repo.create(entity)
+        else:
+            await self.repository.refresh_repo.rotate(replaces, entity)
+
+        tokens = TokenSchema(
+            access_token=access.token,
+            expires_in=int(access_token_ttl().total_seconds()),
+            refresh_token=refresh_token,
+        )
+        return tokens, access
+
+    async def refresh_tokens(self, raw_refresh_token: str) -> Tuple[TokenSchema, IssuedAccessToken]:
+        """
+        Ротация refresh-токена. Предъявление уже отозванного токена означает
+        утечку — отзывается вся цепочка вместе с выданными по ней access-токенами.
+        """
+        invalid = self.http_exceptions.unauthorized_401("Invalid refresh token")
+        parsed = split_refresh_token(raw_refresh_token)
+        if parsed is None:
+            raise invalid
+        token_id, secret = parsed
+
+        stored = await self.repository.refresh_repo.get_for_update(token_id)
+        if stored is None or not refresh_secret_matches(secret, stored.secret_hash):
+            raise invalid
+
+        if stored.revoked_at is not None:
+            logger.warning(f"Повторное использование refresh-токена {token_id}, цепочка {stored.family_id} отозвана")
+            self._revoke_access(await self.repository.refresh_repo.revoke_family(stored.family_id))
+            raise invalid
+        if stored.expires_at <= datetime.now(UTC):
+            raise invalid
+
+        result = await self.repository.get_user_and_secret_by_id(stored.user_id)
+        if result is None or not result[0].is_active:
+            raise invalid
+
+        user = UserReadSchema.from_orm(*result)
+        return await self.issue_tokens(user, family_id=stored.family_id, replaces=stored)
+
+    async def logout(self, raw_refresh_token: Optional[str], access_payload: Optional[dict]) -> None:
+        """Отзывает refresh-токен и текущий access-токен"""
+        if access_payload is not None:
+            await self.revoke_access_token(access_payload)
+
+        parsed = split_refresh_token(raw_refresh_token) if raw_refresh_token else None
+        if parsed is None:
+            return
+        token_id, secret = parsed
+        stored = await self.repository.refresh_repo.get_by_id(token_id)
+        if stored is None or not refresh_secret_matches(secret, stored.secret_hash):
+            return
+        revoked = await self.repository.refresh_repo.revoke(token_id)
+        if revoked is not None:
+            self._revoke_access([revoked])
+
+    async def revoke_access_token(self, access_payload: dict, *, commit: bool = True) -> None:
+        """
+        Отзыв access-токена без refresh-токена (logout без cookie, удаление
+        аккаунта): строка в ``revoked_access_tokens`` видна всем воркерам
+        и переживает каскадное удаление refresh-токенов пользователя.
+        """
+        revoked_tokens.revoke(access_payload["jti"], access_payload["exp"])
+        await self.repository.revoked_repo.revoke(
+            UUID(access_payload["jti"]), datetime.fromtimestamp(access_payload["exp"], UTC), commit=commit
+        )
+
+    async def sync_revoked_tokens(self) -> int:
+        """Подтягивает в индекс access-токены, отозванные другими воркерами"""
+        revoked = await self.repository.refresh_repo.get_revoked_since(datetime.now(UTC) - access_token_ttl())
+        self._revoke_access(revoked)
+        direct = await self.repository.revoked_repo.get_active()
+        revoked_tokens.revoke_many((str(jti), expires_at.timestamp()) for jti, expires_at in direct)
+        await self.repository.revoked_repo.purge_expired()
+        return len(revoked) + len(direct)
+
+    @staticmethod
+    def _revoke_access(revoked: List[Tuple[UUID, datetime]]) -> None:
+        ttl = access_token_ttl()
+        revoked_tokens.revoke_many(
+            (str(access_jti), (created_at + ttl).timestamp()) for access_jti, created_at in revoked
+        )
 
     def _generate_username_from_email(self, email: str) -> str:
         username_base = email.split('@')[0]
@@ -59,8 +166,17 @@ class AuthService:
         result = await self.repository.get_user_by_email(email)
         if result:
             user, secret_info = result
-            if pwd_context.verify(password, secret_info.hashed_password):
+            try:
+                verified, new_hash = await self.password_hasher.verify_and_update(
+                    password, secret_info.hashed_password
+                )
+            except PasswordHasherBusy:
+                raise self.http_exceptions.service_unavailable_503()
+            if verified:
                 logger.info(f"User found: {user.username}")
+                if new_hash is not None:
+                    logger.info(f"Пароль пользователя {user.id} перехеширован с новыми параметрами bcrypt")
+                    await self.repository.update_hashed_password(secret_info.id, new_hash)
                 return UserReadSchema.from_orm(user, secret_info)
         return None
 
@@ -70,7 +186,10 @@ class AuthService:
         
         username = self._generate_username_from_email(user_data.email)
         
-        hashed_password = pwd_context.hash(user_data.password)
+        try:
+            hashed_password = await self.password_hasher.hash(user_data.password)
+        except PasswordHasherBusy:
+            raise self.http_exceptions.service_unavailable_503()
         
         user = await self.repository.create_user(user_data, hashed_password, username)
         
@@ -84,43 +203,47 @@ class AuthService:
         user, secret_info = result
         return UserReadSchema.from_orm(user, secret_info)
 
-    async def get_current_user(self, token: str) -> UserReadSchema:
-        """Получение текущего пользователя по токену"""
-        credentials_exception = self.http_exceptions.unauthorized_401("Could not validate credentials")
-        
-        try: 
-            try:
-                payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            except JWTError as e:
-                logger.error(f"JWT decode error: {str(e)}")
-                raise credentials_exception
-                
-            email: str = payload.get("sub")
-            if email is None:
-                raise credentials_exception
-                
-            result = await self.repository.get_user_by_email(email)
-            if not result:
-                raise credentials_exception
-                
-            user, secret_info = result
-            
-            return UserReadSchema.from_orm(user, secret_info)
-            
-        except JWTError as e:
-            logger.error(f"JWT validation error: {str(e)}")
-            raise credentials_exception
-        except Exception as e:
-            logger.error(f"Unexpected error in get_current_user: {str(e)}")
-            raise credentials_exception
-
-
-    async def delete_user(self, user_id: str) -> bool:
+    async def delete_user(self, user_id: str, access_payload: Optional[dict] = None) -> bool:
+        """
+        Удаляет пользователя. Access-токены всех его сессий сначала отзываются
+        в ``revoked_access_tokens``: refresh-токены удалятся каскадом, а по ним
+        другие воркеры узнавали бы об отзыве. Отзыв, удаление и всё, что уже
+        добавлено в сессию (задания очистки хранилища), фиксируются одним commit.
+        """
+        await self._revoke_user_sessions(user_id, access_payload)
         success = await self.repository.delete_user(user_id)
         if not success:
             raise self.http_exceptions.not_found_404()
         return True
     
+    async def get_user(self, user_id: UUID) -> UserReadSchema:
+        """Актуальный профиль из БД: в access-токене только неизменяемые поля"""
+        result = await self.repository.get_user_and_secret_by_id(user_id)
+        if result is None:
+            raise self.http_exceptions.not_found_404()
+        return UserReadSchema.from_orm(*result)
+
+    async def update_user(
+        self, user_id: UUID, update_data: Dict[str, Any], access_payload: Optional[dict] = None
+    ) -> UserReadSchema:
+        """
+        Обновляет профиль. При деактивации access-токены всех сессий
+        отзываются в той же транзакции, а refresh-токены перестают
+        приниматься по ``is_active``.
+        """
+        if update_data.get("is_active") is False:
+            await self._revoke_user_sessions(user_id, access_payload)
+        if await self.repository.update_user(user_id, update_data) is None:
+            raise self.http_exceptions.not_found_404()
+        return await self.get_user(user_id)
+
+    async def _revoke_user_sessions(self, user_id: UUID, access_payload: Optional[dict]) -> None:
+        """Отзыв access-токенов пользователя без commit"""
+        if access_payload is not None:
+            await self.revoke_access_token(access_payload, commit=False)
+        revoked = await self.repository.revoked_repo.revoke_user_sessions(user_id, access_token_ttl())
+        revoked_tokens.revoke_many((str(jti), expires_at.timestamp()) for jti, expires_at in revoked)
+
     async def get_all_users(self, limit: int = 20) -> List[UserReadPublicSchema]:
         entities = await self.repository.get_all_user_public_data(limit)
         return [UserReadPublicSchema.model_validate(user) for user in entities]
@@ -155,3 +278,16 @@ class AuthService:
     
     
 
+
+
+async def sync_revoked_tokens_forever(interval_seconds: float) -> None:
+    """Фоновая синхронизация индекса отозванных access-токенов между воркерами"""
+    from ..database import async_session_maker
+
+    while True:
+        try:
+            async with async_session_maker() as session:
+                await AuthService(session, AuthHTTPExceptions()).sync_revoked_tokens()
+        except Exception as e:
+            logger.error(f"Не удалось синхронизировать отозванные токены: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,140 @@
+"""
+Access- и refresh-токены.
+
+Access JWT живёт несколько минут и несёт только неизменяемые поля
+пользователя (``CurrentUserSchema``), поэтому ``get_current_user`` не ходит
+в БД, а смена имени, аватара или активности не оставляет в токене
+устаревших данных.
+Отзыв access-токенов до истечения срока — через ``revoked_tokens``:
+индекс в памяти процесса, который пополняется при logout/ротации и
+периодически синхронизируется с таблицами ``refresh_tokens`` и
+``revoked_access_tokens``.
+Refresh-токен — непрозрачная строка ``<id>.<secret>``, в БД лежит только
+sha256 секрета.
+"""
+import hashlib
+import hmac
+import secrets
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from threading import Lock
+from typing import Dict, Iterable, Optional, Tuple
+
+from jose import JWTError, jwt
+
+from ..core.metrics import register_metrics
+from ..settings.config import AUTH_ENV
+from .schemas import CurrentUserSchema, UserReadSchema
+
+
+ALGORITHM = "HS256"
+ACCESS_TOKEN_TYPE = "access"
+
+
+@dataclass(frozen=True, slots=True)
+class IssuedAccessToken:
+    token: str
+    jti: uuid.UUID
+    expires_at: datetime
+
+
+class RevokedTokenIndex:
+    """jti отозванных access-токенов со сроком хранения до их истечения"""
+
+    def __init__(self):
+        self._entries: Dict[str, float] = {}
+        self._lock = Lock()
+        self._next_purge = 0.0
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[jti] = expires_at
+
+    def revoke_many(self, entries: Iterable[Tuple[str, float]]) -> None:
+        for jti, expires_at in entries:
+            self.revoke(jti, expires_at)
+
+    def is_revoked(self, jti: str) -> bool:
+        now = time.time()
+        if now >= self._next_purge:
+            self._purge(now)
+        return jti in self._entries
+
+    def _purge(self, now: float) -> None:
+        with self._lock:
+            self._entries = {jti: exp for jti, exp in self._entries.items() if exp > now}
+            self._next_purge = now + 60
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+revoked_tokens = RevokedTokenIndex()
+register_metrics("revoked_access_tokens", lambda: {"size": len(revoked_tokens)})
+
+
+def access_token_ttl() -> timedelta:
+    return timedelta(minutes=AUTH_ENV.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
+def refresh_token_ttl() -> timedelta:
+    return timedelta(days=AUTH_ENV.REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+def create_access_token(user: UserReadSchema, jti: Optional[uuid.UUID] = None) -> IssuedAccessToken:
+    jti = jti or uuid.uuid4()
+    issued_at = datetime.now(UTC)
+    expires_at = issued_at + access_token_ttl()
+    claims = {
+        "sub": user.email,
+        "uid": str(user.id),
+        "jti": str(jti),
+        "typ": ACCESS_TOKEN_TYPE,
+        "iat": issued_at,
+        "exp": expires_at,
+        "usr": user.model_dump(mode="json", include={"created_at"}),
+    }
+    token = jwt.encode(claims, AUTH_ENV.SECRET_AUTH, algorithm=ALGORITHM)
+    return IssuedAccessToken(token=token, jti=jti, expires_at=expires_at)
+
+
+def decode_access_token(token: str) -> Tuple[CurrentUserSchema, dict]:
+    """
+    Пользователь из claims access-токена.
+    JWTError — подпись/срок, ValueError — не access-токен или он отозван.
+    """
+    payload = jwt.decode(token, AUTH_ENV.SECRET_AUTH, algorithms=[ALGORITHM])
+    if payload.get("typ") != ACCESS_TOKEN_TYPE or "usr" not in payload:
+        raise ValueError("Not an access token")
+    if revoked_tokens.is_revoked(payload["jti"]):
+        raise ValueError("Token has been revoked")
+
+    user = CurrentUserSchema(id=payload["uid"], email=payload["sub"], **payload["usr"])
+    return user, payload
+
+
+def new_refresh_token() -> Tuple[uuid.UUID, str, str]:
+    """(id, хеш секрета, строка для клиента)"""
+    token_id = uuid.uuid4()
+    secret = secrets.token_urlsafe(32)
+    return token_id, hash_refresh_secret(secret), f"{token_id}.{secret}"
+
+
+def split_refresh_token(raw: str) -> Optional[Tuple[uuid.UUID, str]]:
+    token_id, _, secret = raw.partition(".")
+    try:
+        return uuid.UUID(token_id), secret
+    except ValueError:
+        return None
+
+
+def hash_refresh_secret(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+def refresh_secret_matches(secret: str, secret_hash: str) -> bool:
+    return hmac.compare_digest(hash_refresh_secret(secret), secret_hash)
@@ -1,7 +1,8 @@
 import json
 
 from enum import StrEnum, unique
-from typing import Dict, Final
+from fnmatch import fnmatchcase
+from typing import Dict, Final, Tuple
 
 
 @unique
@@ -49,4 +50,43 @@ def get_public_policy(bucket_name: str):
         ]
     }
 
-    return policy
\ No newline at end of file
+    return policy
+
+
+# Объекты, которые в режиме ``signed`` остаются публичными: обложки,
+# аватары, постер и раскадровка. Оригиналы и HLS отдаются только по подписи.
+# ``*`` совпадает и с ``/``, как в ресурсах политики S3.
+PUBLIC_OBJECT_PATTERNS: Final[Tuple[str, ...]] = (
+    "*user_avatar*",
+    "*channel_avatar*",
+    "*channel_preview*",
+    "*course_preview*",
+    "*video_preview*",
+    "*/poster.jpg",
+    "*/storyboard/*",
+)
+
+
+def is_public_object(key: str) -> bool:
+    """Объект читается без подписи и в режиме ``signed``"""
+    return any(fnmatchcase(key, pattern) for pattern in PUBLIC_OBJECT_PATTERNS)
+
+
+def get_delivery_policy(bucket_name: str, delivery: str):
+    """
+    Политика бакета для режима раздачи: ``public`` — чтение всего бакета,
+    ``signed`` — только объектов из ``PUBLIC_OBJECT_PATTERNS``.
+    """
+    if delivery != "signed":
+        return get_public_policy(bucket_name)
+    return {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Effect": "Allow",
+                "Principal": {"AWS": "*"},
+                "Action": ["s3:GetObject"],
+                "Resource": [f"arn:aws:s3:::{bucket_name}/{pattern}" for pattern in PUBLIC_OBJECT_PATTERNS]
+            }
+        ]
+    }
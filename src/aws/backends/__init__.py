@@ -0,0 +1,32 @@
+from functools import lru_cache
+
+from ...settings.config import AUTH_ENV, STORAGE_ENV
+from ..layout import public_base_url
+from .base import ObjectInfo, StorageBackend, StorageEvent, StorageEventListener
+from .local import InvalidObjectPath, LocalStorageBackend
+from .s3 import S3StorageBackend
+
+
+@lru_cache(maxsize=1)
+def get_storage_backend() -> StorageBackend:
+    """Бэкенд процесса, выбранный ``STORAGE_BACKEND``"""
+    if STORAGE_ENV.STORAGE_BACKEND == "local":
+        return LocalStorageBackend(
+            root=STORAGE_ENV.STORAGE_LOCAL_ROOT,
+            secret=STORAGE_ENV.STORAGE_LOCAL_SECRET or AUTH_ENV.SECRET_AUTH,
+            public_base_url=public_base_url(),
+            chunk_size=STORAGE_ENV.STORAGE_LOCAL_CHUNK_SIZE,
+        )
+    return S3StorageBackend()
+
+
+__all__ = [
+    "ObjectInfo",
+    "StorageBackend",
+    "StorageEvent",
+    "StorageEventListener",
+    "InvalidObjectPath",
+    "LocalStorageBackend",
+    "S3StorageBackend",
+    "get_storage_backend",
+]
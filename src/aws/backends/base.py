@@ -0,0 +1,170 @@
+"""
+Интерфейс бэкенда хранилища объектов.
+
+Бэкенд умеет выдавать presigned-ссылку на загрузку, читать метаданные,
+удалять и перечислять объекты по префиксу, а также сообщать подписчикам
+о загруженных объектах. S3-бэкенд получает такие события от MinIO через
+вебхуки, локальный — порождает их сам после приёма файла.
+"""
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+from urllib.parse import quote_plus
+
+from ..access_policies import AccessPolicy
+
+from ...core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+@dataclass(frozen=True, slots=True)
+class ObjectInfo:
+    bucket: str
+    key: str
+    size: int
+    etag: str
+    last_modified: datetime
+    content_type: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class StorageEvent:
+    """Объект создан в хранилище; формат совпадает с уведомлением MinIO"""
+    bucket: str
+    key: str
+    size: int
+    etag: str
+    content_type: Optional[str] = None
+    event_name: str = "s3:ObjectCreated:Put"
+    event_time: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    @property
+    def sequencer(self) -> str:
+        # Как у MinIO: время события в наносекундах, hex
+        return format(int(self.event_time.timestamp()) * 1_000_000_000 + self.event_time.microsecond * 1000, "X")
+
+    def to_minio_payload(self) -> Dict[str, Any]:
+        return {
+            "EventName": self.event_name,
+            "Key": f"{self.bucket}/{self.key}",
+            "Records": [{
+                "eventName": self.event_name,
+                "eventTime": self.event_time.isoformat(),
+                "s3": {
+                    "bucket": {"name": self.bucket},
+                    "object": {
+                        # MinIO кодирует ключ как application/x-www-form-urlencoded
+                        "key": quote_plus(self.key),
+                        "size": self.size,
+                        "eTag": self.etag,
+                        "contentType": self.content_type,
+                        "sequencer": self.sequencer,
+                    },
+                },
+            }],
+        }
+
+
+StorageEventListener = Callable[[StorageEvent], Awaitable[None]]
+
+
+class StorageBackend(ABC):
+    """Общий интерфейс S3 и локального хранилища"""
+
+    name: str
+
+    def __init__(self):
+        self._listeners: List[StorageEventListener] = []
+
+    # ---------- события ----------
+    def subscribe(self, listener: StorageEventListener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    async def emit(self, event: StorageEvent) -> None:
+        """Доставляет событие подписчикам; ошибка одного не мешает остальным"""
+        for listener in self._listeners:
+            try:
+                await listener(event)
+            except Exception:
+                logger.exception("Подписчик %r не обработал событие %s/%s", listener, event.bucket, event.key)
+
+    # ---------- жизненный цикл ----------
+    async def warm(self) -> None:
+        """Проверка доступности при старте процесса"""
+
+    async def close(self) -> None:
+        """Освобождение соединений при остановке процесса"""
+
+    # ---------- операции ----------
+    @abstractmethod
+    async def ensure_bucket(self, bucket: str) -> None: ...
+
+    @abstractmethod
+    def presign_upload(
+        self,
+        bucket: str,
+        key: str,
+        *,
+        content_type: str,
+        access: AccessPolicy,
+        expires_in: int,
+    ) -> str: ...
+
+    @abstractmethod
+    def presign_get(self, bucket: str, key: str, *, expires_in: int, now: Optional[float] = None) -> str:
+        """Подписанная ссылка на чтение объекта клиентом (режим ``STORAGE_DELIVERY=signed``)"""
+
+    @abstractmethod
+    async def source_url(self, bucket: str, key: str, *, expires_in: int = 3600) -> str:
+        """Адрес объекта для чтения внутренними процессами (ffmpeg и т.п.)"""
+
+    @abstractmethod
+    async def read_range(self, bucket: str, key: str, offset: int, length: int) -> bytes:
+        """Байты ``[offset, offset + length)`` объекта"""
+
+    @abstractmethod
+    async def put_file(
+        self,
+        bucket: str,
+        key: str,
+        path: str | Path,
+        *,
+        content_type: str,
+        cache_control: Optional[str] = None,
+    ) -> None:
+        """Кладёт производный файл (рендишены, превью); событие загрузки не порождается"""
+
+    @abstractmethod
+    async def head(self, bucket: str, key: str) -> Optional[ObjectInfo]: ...
+
+    @abstractmethod
+    async def delete(self, bucket: str, keys: Iterable[str]) -> int:
+        """Удаляет объекты (отсутствующие пропускаются), возвращает число обработанных ключей"""
+
+    @abstractmethod
+    def list_prefix(
+        self, bucket: str, prefix: str = "", *, start_after: Optional[str] = None
+    ) -> AsyncIterator[ObjectInfo]:
+        """Объекты под префиксом в порядке ключей; ``start_after`` — продолжить после ключа"""
+
+    @abstractmethod
+    async def delete_bucket(self, bucket: str) -> None:
+        """Удаляет опустевший бакет; отсутствующий бакет — не ошибка"""
+
+    @abstractmethod
+    async def list_buckets(self) -> List[str]: ...
+
+    @abstractmethod
+    async def copy_object(
+        self, source_bucket: str, source_key: str, bucket: str, key: str, *, storage_class: Optional[str] = None
+    ) -> None:
+        """
+        Копия внутри хранилища, без передачи данных через процесс; событие
+        загрузки не порождается. ``storage_class`` — класс хранения копии, если бэкенд их различает.
+        """
@@ -0,0 +1,265 @@
+"""
+Локальное хранилище: бакет — каталог внутри ``STORAGE_LOCAL_ROOT``, объект — файл.
+
+Загрузка идёт через API по ссылке того же вида, что и presigned PUT в S3:
+подпись HMAC-SHA256 покрывает метод, путь, срок действия, Content-Type и ACL.
+Файл пишется во временный файл рядом с целевым и атомарно переименовывается,
+после чего бэкенд сам порождает событие ``s3:ObjectCreated:Put``.
+"""
+import asyncio
+import hashlib
+import hmac
+import mimetypes
+import os
+import shutil
+import stat as stat_module
+import time
+import uuid
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Optional
+from urllib.parse import quote, urlencode
+
+import aiofiles
+import aiofiles.os
+
+from ..access_policies import AccessPolicy
+from .base import ObjectInfo, StorageBackend, StorageEvent
+
+
+_PART_SUFFIX = ".part"
+
+
+class InvalidObjectPath(ValueError):
+    """Имя бакета или ключ выходят за пределы корня хранилища"""
+    pass
+
+
+def _etag(stat: os.stat_result) -> str:
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+class LocalStorageBackend(StorageBackend):
+    name = "local"
+
+    def __init__(self, *, root: str | Path, secret: str, public_base_url: str, chunk_size: int = 1024 * 1024):
+        """``public_base_url`` — адрес раздачи файлов API (``.../api/storage``)"""
+        super().__init__()
+        self.root = Path(root).resolve()
+        self.chunk_size = chunk_size
+        self._secret = secret.encode()
+        self._base_url = public_base_url.rstrip("/")
+
+    # ---------- пути ----------
+    def path_for(self, bucket: str, key: str = "") -> Path:
+        if not bucket or "/" in bucket or bucket in (".", ".."):
+            raise InvalidObjectPath(f"Некорректное имя бакета: {bucket!r}")
+        parts = [part for part in key.split("/") if part]
+        if any(part in (".", "..") or part.endswith(_PART_SUFFIX) for part in parts):
+            raise InvalidObjectPath(f"Некорректный ключ: {key!r}")
+        return self.root.joinpath(bucket, *parts)
+
+    def _info(self, bucket: str, key: str, stat: os.stat_result) -> ObjectInfo:
+        return ObjectInfo(
+            bucket=bucket,
+            key=key,
+            size=stat.st_size,
+            etag=_etag(stat),
+            last_modified=datetime.fromtimestamp(stat.st_mtime, UTC),
+            content_type=mimetypes.guess_type(key)[0],
+        )
+
+    # ---------- жизненный цикл ----------
+    async def warm(self) -> None:
+        await aiofiles.os.makedirs(self.root, exist_ok=True)
+
+    async def ensure_bucket(self, bucket: str) -> None:
+        await aiofiles.os.makedirs(self.path_for(bucket), exist_ok=True)
+
+    # ---------- подпись ----------
+    def _signature(self, method: str, bucket: str, key: str, expires: int, content_type: str, acl: str) -> str:
+        message = "\n".join((method, bucket, key, str(expires), content_type, acl))
+        return hmac.new(self._secret, message.encode(), hashlib.sha256).hexdigest()
+
+    def presign_upload(
+        self,
+        bucket: str,
+        key: str,
+        *,
+        content_type: str,
+        access: AccessPolicy,
+        expires_in: int,
+        now: Optional[float] = None,
+    ) -> str:
+        expires = int(now if now is not None else time.time()) + expires_in
+        query = urlencode({
+            "X-Expires": expires,
+            "X-Acl": access.value,
+            "X-Signature": self._signature("PUT", bucket, key, expires, content_type, access.value),
+        })
+        return f"{self._base_url}/{bucket}/{quote(key)}?{query}"
+
+    def presign_get(self, bucket: str, key: str, *, expires_in: int, now: Optional[float] = None) -> str:
+        expires = int(now if now is not None else time.time()) + expires_in
+        query = urlencode({"X-Expires": expires, "X-Signature": self._signature("GET", bucket, key, expires, "", "")})
+        return f"{self._base_url}/{bucket}/{quote(key)}?{query}"
+
+    def verify_get(self, bucket: str, key: str, *, expires: int, signature: str, now: Optional[float] = None) -> bool:
+        if expires < (now if now is not None else time.time()):
+            return False
+        return hmac.compare_digest(self._signature("GET", bucket, key, expires, "", ""), signature)
+
+    def verify_upload(
+        self,
+        bucket: str,
+        key: str,
+        *,
+        content_type: str,
+        acl: str,
+        expires: int,
+        signature: str,
+        now: Optional[float] = None,
+    ) -> bool:
+        if expires < (now if now is not None else time.time()):
+            return False
+        expected = self._signature("PUT", bucket, key, expires, content_type, acl)
+        return hmac.compare_digest(expected, signature)
+
+    # ---------- объекты ----------
+    async def write(
+        self,
+        bucket: str,
+        key: str,
+        chunks: AsyncIterable[bytes],
+        *,
+        content_type: Optional[str] = None,
+    ) -> ObjectInfo:
+        """Пишет поток во временный файл и атомарно подменяет целевой, затем порождает событие"""
+        target = self.path_for(bucket, key)
+        await aiofiles.os.makedirs(target.parent, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.{uuid.uuid4().hex}{_PART_SUFFIX}")
+        try:
+            async with aiofiles.open(temporary, "wb") as file:
+                async for chunk in chunks:
+                    if chunk:
+                        await file.write(chunk)
+            await aiofiles.os.replace(temporary, target)
+        except BaseException:
+            try:
+                await aiofiles.os.remove(temporary)
+            except FileNotFoundError:
+                pass
+            raise
+
+        info = self._info(bucket, key, await aiofiles.os.stat(target))
+        await self.emit(StorageEvent(
+            bucket=bucket,
+            key=key,
+            size=info.size,
+            etag=info.etag,
+            content_type=content_type or info.content_type,
+        ))
+        return info
+
+    async def source_url(self, bucket: str, key: str, *, expires_in: int = 3600) -> str:
+        return str(self.path_for(bucket, key))
+
+    async def read_range(self, bucket: str, key: str, offset: int, length: int) -> bytes:
+        async with aiofiles.open(self.path_for(bucket, key), "rb") as file:
+            await file.seek(offset)
+            return await file.read(length)
+
+    def _put_file_sync(self, target: Path, path: str | Path) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.{uuid.uuid4().hex}{_PART_SUFFIX}")
+        try:
+            shutil.copyfile(path, temporary)
+            os.replace(temporary, target)
+        except BaseException:
+            temporary.unlink(missing_ok=True)
+            raise
+
+    async def put_file(
+        self,
+        bucket: str,
+        key: str,
+        path: str | Path,
+        *,
+        content_type: str,
+        cache_control: Optional[str] = None,
+    ) -> None:
+        await asyncio.to_thread(self._put_file_sync, self.path_for(bucket, key), path)
+
+    async def head(self, bucket: str, key: str) -> Optional[ObjectInfo]:
+        try:
+            stat = await aiofiles.os.stat(self.path_for(bucket, key))
+        except (FileNotFoundError, NotADirectoryError, InvalidObjectPath):
+            return None
+        if not stat_module.S_ISREG(stat.st_mode):
+            return None
+        return self._info(bucket, key, stat)
+
+    def _delete_sync(self, bucket: str, keys: List[str]) -> int:
+        deleted = 0
+        parents = set()
+        for key in keys:
+            try:
+                path = self.path_for(bucket, key)
+                path.unlink()
+            except (FileNotFoundError, InvalidObjectPath):
+                continue
+            parents.add(path.parent)
+            deleted += 1
+
+        # Как в S3, «каталоги» без объектов не остаются
+        bucket_path = self.path_for(bucket)
+        for directory in sorted(parents, key=lambda path: len(path.parts), reverse=True):
+            while directory != bucket_path and bucket_path in directory.parents:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    break
+                directory = directory.parent
+        return deleted
+
+    async def delete(self, bucket: str, keys: Iterable[str]) -> int:
+        return await asyncio.to_thread(self._delete_sync, bucket, list(keys))
+
+    def _scan_sync(self, bucket: str, prefix: str, start_after: Optional[str]) -> List[ObjectInfo]:
+        bucket_path = self.path_for(bucket)
+        # Обходим только каталог, в который попадает префикс
+        start = self.path_for(bucket, prefix.rpartition("/")[0])
+        found: List[ObjectInfo] = []
+        for directory, _, files in os.walk(start):
+            for name in files:
+                if name.endswith(_PART_SUFFIX):
+                    continue
+                path = Path(directory, name)
+                key = path.relative_to(bucket_path).as_posix()
+                if key.startswith(prefix) and (start_after is None or key > start_after):
+                    found.append(self._info(bucket, key, path.stat()))
+        found.sort(key=lambda info: info.key)
+        return found
+
+    async def list_prefix(
+        self, bucket: str, prefix: str = "", *, start_after: Optional[str] = None
+    ) -> AsyncIterator[ObjectInfo]:
+        for info in await asyncio.to_thread(self._scan_sync, bucket, prefix, start_after):
+            yield info
+
+    async def delete_bucket(self, bucket: str) -> None:
+        await asyncio.to_thread(shutil.rmtree, self.path_for(bucket), ignore_errors=True)
+
+    async def list_buckets(self) -> List[str]:
+        def scan() -> List[str]:
+            if not self.root.is_dir():
+                return []
+            return sorted(entry.name for entry in os.scandir(self.root) if entry.is_dir())
+        return await asyncio.to_thread(scan)
+
+    async def copy_object(
+        self, source_bucket: str, source_key: str, bucket: str, key: str, *, storage_class: Optional[str] = None
+    ) -> None:
+        await asyncio.to_thread(
+            self._put_file_sync, self.path_for(bucket, key), self.path_for(source_bucket, source_key)
+        )
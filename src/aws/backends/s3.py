@@ -0,0 +1,256 @@
+"""
+Бэкенд MinIO/S3 поверх общего aiobotocore-клиента.
+
+События о загрузках приходят от MinIO на ``/webhooks/minio/*``
+по правилам ``NOTIFY_RULES``, которые настраиваются при создании бакета.
+"""
+import json
+import logging
+from datetime import datetime, UTC
+from itertools import islice
+from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Optional
+
+from botocore.exceptions import ClientError
+from types_aiobotocore_s3.client import S3Client
+
+from ..access_policies import AccessPolicy, get_delivery_policy
+from ..client import close_s3_client, get_s3_client
+from ..notify_configs import NOTIFY_RULES
+from ..presigner import get_public_presigner
+from ...settings.config import STORAGE_ENV
+from .base import ObjectInfo, StorageBackend
+
+from ...core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+# Предел S3 DeleteObjects на один запрос
+DELETE_BATCH_SIZE = 1000
+# CopyObject копирует не больше 5 ГиБ; крупнее — по частям через UploadPartCopy
+COPY_MAX_SINGLE = 5 * 1024 ** 3
+COPY_PART_SIZE = 512 * 1024 ** 2
+
+
+class S3StorageBackend(StorageBackend):
+    name = "s3"
+
+    # ---------- жизненный цикл ----------
+    async def warm(self) -> None:
+        try:
+            client = await get_s3_client()
+            await client.list_buckets()
+        except Exception:
+            logger.exception("S3 недоступен при старте, клиент будет переподключён при первом запросе")
+            await close_s3_client()
+
+    async def close(self) -> None:
+        await close_s3_client()
+
+    # ---------- бакеты ----------
+    async def _create_bucket(self, client: S3Client, bucket_name: str) -> None:
+        try:
+            await client.create_bucket(Bucket=bucket_name)
+            logger.debug("Создан бакет %s", bucket_name)
+        except (
+            client.exceptions.BucketAlreadyOwnedByYou,
+            client.exceptions.BucketAlreadyExists,
+        ):
+            logger.debug("Бакет %s уже существует", bucket_name)
+        except ClientError:
+            logger.exception("Не удалось создать бакет")
+            raise
+
+    async def _set_bucket_policy(self, client: S3Client, bucket_name: str) -> None:
+        try:
+            await client.put_bucket_policy(
+                Bucket=bucket_name,
+                Policy=json.dumps(get_delivery_policy(bucket_name, STORAGE_ENV.STORAGE_DELIVERY))
+            )
+            logger.debug("Установлена политика доступа (%s) на бакет %s", STORAGE_ENV.STORAGE_DELIVERY, bucket_name)
+        except ClientError:
+            logger.warning("Не удалось установить политику на бакет %s", bucket_name, exc_info=True)
+
+    async def _sync_notifications(self, client: S3Client, bucket_name: str) -> None:
+        try:
+            current = await client.get_bucket_notification_configuration(Bucket=bucket_name)
+        except ClientError:
+            logger.warning("Ошибка получения конфигурации уведомлений для %s, продолжаем с пустой", bucket_name)
+            current = {}
+
+        existing_ids = {c["Id"] for c in current.get("QueueConfigurations", [])}
+        new_configs = [
+            rule.to_aws() for rule in NOTIFY_RULES
+            if rule.id not in existing_ids
+        ]
+
+        if not new_configs:
+            logger.debug("S3-уведомления уже актуальны для %s", bucket_name)
+            return
+
+        merged = {
+            "QueueConfigurations": current.get("QueueConfigurations", []) + new_configs
+        }
+        await client.put_bucket_notification_configuration(
+            Bucket=bucket_name,
+            NotificationConfiguration=merged,
+        )
+        logger.debug("Добавлены S3-уведомления: %s", [r["Id"] for r in new_configs])
+
+    async def ensure_bucket(self, bucket: str) -> None:
+        client: S3Client = await get_s3_client()
+        await self._create_bucket(client, bucket)
+        await self._set_bucket_policy(client, bucket)
+        await self._sync_notifications(client, bucket)
+
+    # ---------- объекты ----------
+    def presign_upload(
+        self,
+        bucket: str,
+        key: str,
+        *,
+        content_type: str,
+        access: AccessPolicy,
+        expires_in: int,
+    ) -> str:
+        # Подпись сразу для публичного хоста: nginx передаёт Host как есть
+        return get_public_presigner().presign(
+            "PUT",
+            bucket,
+            key,
+            expires_in=expires_in,
+            headers={
+                "Content-Type": content_type,
+                "x-amz-acl": access.value,
+            },
+        )
+
+    def presign_get(self, bucket: str, key: str, *, expires_in: int, now: Optional[float] = None) -> str:
+        # Ключ подписи закэширован в подписчике на сутки: подпись ссылки — одно HMAC
+        return get_public_presigner().presign(
+            "GET",
+            bucket,
+            key,
+            expires_in=expires_in,
+            now=datetime.fromtimestamp(now, UTC) if now is not None else None,
+        )
+
+    async def source_url(self, bucket: str, key: str, *, expires_in: int = 3600) -> str:
+        client: S3Client = await get_s3_client()
+        return await client.generate_presigned_url(
+            "get_object", Params={"Bucket": bucket, "Key": key}, ExpiresIn=expires_in
+        )
+
+    async def read_range(self, bucket: str, key: str, offset: int, length: int) -> bytes:
+        client: S3Client = await get_s3_client()
+        response = await client.get_object(Bucket=bucket, Key=key, Range=f"bytes={offset}-{offset + length - 1}")
+        async with response["Body"] as body:
+            return await body.read()
+
+    async def put_file(
+        self,
+        bucket: str,
+        key: str,
+        path: str | Path,
+        *,
+        content_type: str,
+        cache_control: Optional[str] = None,
+    ) -> None:
+        client: S3Client = await get_s3_client()
+        extra = {"CacheControl": cache_control} if cache_control else {}
+        with open(path, "rb") as body:
+            await client.put_object(Bucket=bucket, Key=key, Body=body, ContentType=content_type, **extra)
+
+    async def head(self, bucket: str, key: str) -> Optional[ObjectInfo]:
+        client: S3Client = await get_s3_client()
+        try:
+            response = await client.head_object(Bucket=bucket, Key=key)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NoSuchBucket"):
+                return None
+            raise
+        return ObjectInfo(
+            bucket=bucket,
+            key=key,
+            size=response["ContentLength"],
+            etag=response["ETag"].strip('"'),
+            last_modified=response["LastModified"],
+            content_type=response.get("ContentType"),
+        )
+
+    async def delete(self, bucket: str, keys: Iterable[str]) -> int:
+        client: S3Client = await get_s3_client()
+        keys = iter(keys)
+        deleted = 0
+        while batch := list(islice(keys, DELETE_BATCH_SIZE)):
+            response = await client.delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+            for error in response.get("Errors", []):
+                logger.warning("Не удалось удалить %s/%s: %s", bucket, error.get("Key"), error.get("Message"))
+            deleted += len(batch) - len(response.get("Errors", []))
+        return deleted
+
+    async def list_prefix(
+        self, bucket: str, prefix: str = "", *, start_after: Optional[str] = None
+    ) -> AsyncIterator[ObjectInfo]:
+        client: S3Client = await get_s3_client()
+        paginator = client.get_paginator("list_objects_v2")
+        extra = {"StartAfter": start_after} if start_after else {}
+        async for page in paginator.paginate(Bucket=bucket, Prefix=prefix, **extra):
+            for item in page.get("Contents", []):
+                yield ObjectInfo(
+                    bucket=bucket,
+                    key=item["Key"],
+                    size=item["Size"],
+                    etag=item["ETag"].strip('"'),
+                    last_modified=item["LastModified"],
+                )
+
+    async def delete_bucket(self, bucket: str) -> None:
+        client: S3Client = await get_s3_client()
+        try:
+            await client.delete_bucket(Bucket=bucket)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") != "NoSuchBucket":
+                raise
+
+    async def list_buckets(self) -> List[str]:
+        client: S3Client = await get_s3_client()
+        response = await client.list_buckets()
+        return [bucket["Name"] for bucket in response.get("Buckets", [])]
+
+    async def copy_object(
+        self, source_bucket: str, source_key: str, bucket: str, key: str, *, storage_class: Optional[str] = None
+    ) -> None:
+        client: S3Client = await get_s3_client()
+        source = {"Bucket": source_bucket, "Key": source_key}
+        extra = {"StorageClass": storage_class} if storage_class else {}
+        info = await self.head(source_bucket, source_key)
+        if info is None:
+            raise FileNotFoundError(f"{source_bucket}/{source_key}")
+        if info.size <= COPY_MAX_SINGLE:
+            await client.copy_object(CopySource=source, Bucket=bucket, Key=key, **extra)
+            return
+
+        upload = await client.create_multipart_upload(
+            Bucket=bucket, Key=key, ContentType=info.content_type or "application/octet-stream", **extra
+        )
+        try:
+            parts = []
+            for number, offset in enumerate(range(0, info.size, COPY_PART_SIZE), start=1):
+                end = min(offset + COPY_PART_SIZE, info.size) - 1
+                response = await client.upload_part_copy(
+                    Bucket=bucket, Key=key, UploadId=upload["UploadId"], PartNumber=number,
+                    CopySource=source, CopySourceRange=f"bytes={offset}-{end}",
+                )
+                parts.append({"PartNumber": number, "ETag": response["CopyPartResult"]["ETag"]})
+            await client.complete_multipart_upload(
+                Bucket=bucket, Key=key, UploadId=upload["UploadId"], MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            await client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload["UploadId"])
+            raise
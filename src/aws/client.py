@@ -1,11 +1,14 @@
 import asyncio
-from typing import Any, Optional
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
 
+from aiobotocore.config import AioConfig
 from aiobotocore.session import get_session
-from botocore.config import Config
 
 from types_aiobotocore_s3.client import S3Client
 
+from ..core.metrics import register_metrics
 from ..settings.config import S3_ENV
 
 import logging
@@ -21,6 +24,74 @@ configure_logging()
 _REGION = "us-east-1"  # для MinIO регион произвольный, но задаём по умолчанию
 
 
+def _client_config() -> AioConfig:
+    return AioConfig(
+        signature_version="s3v4",
+        max_pool_connections=S3_ENV.S3_MAX_POOL_CONNECTIONS,
+        connect_timeout=S3_ENV.S3_CONNECT_TIMEOUT,
+        read_timeout=S3_ENV.S3_READ_TIMEOUT,
+        retries={"mode": S3_ENV.S3_RETRY_MODE, "max_attempts": S3_ENV.S3_MAX_ATTEMPTS},
+        tcp_keepalive=S3_ENV.S3_TCP_KEEPALIVE,
+        connector_args={"keepalive_timeout": S3_ENV.S3_KEEPALIVE_TIMEOUT},
+    )
+
+
+class S3PoolMetrics:
+    """
+    Загрузка пула соединений по событиям botocore:
+    ``before-call`` занимает слот, ``after-call``/``after-call-error`` освобождает.
+    """
+
+    def __init__(self, max_pool_connections: int):
+        self.max_pool_connections = max_pool_connections
+        self._lock = Lock()
+        self._in_flight = 0
+        self._peak = 0
+        self._calls = 0
+        self._errors = 0
+        self._seconds = 0.0
+
+    def attach(self, client: S3Client) -> None:
+        events = client.meta.events
+        events.register("before-call.s3", self._before_call)
+        events.register("after-call.s3", self._after_call)
+        events.register("after-call-error.s3", self._after_call_error)
+
+    def _before_call(self, context: Dict[str, Any], **_: Any) -> None:
+        context["pool_metrics_started"] = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_flight)
+
+    def _after_call(self, context: Dict[str, Any], **_: Any) -> None:
+        self._release(context, failed=False)
+
+    def _after_call_error(self, context: Dict[str, Any], **_: Any) -> None:
+        self._release(context, failed=True)
+
+    def _release(self, context: Dict[str, Any], failed: bool) -> None:
+        started = context.pop("pool_metrics_started", None)
+        if started is None:
+            return
+        with self._lock:
+            self._in_flight -= 1
+            self._calls += 1
+            self._errors += failed
+            self._seconds += time.perf_counter() - started
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_pool_connections": self.max_pool_connections,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak,
+                "utilisation": round(self._in_flight / self.max_pool_connections, 3),
+                "calls": self._calls,
+                "errors": self._errors,
+                "avg_call_ms": round(self._seconds / (self._calls or 1) * 1000, 3),
+            }
+
+
 class _S3ClientFactory:
 
     _session = get_session()
@@ -28,33 +99,41 @@ class _S3ClientFactory:
     def __init__(self):
         self._client: Optional[Any] = None
         self._lock = asyncio.Lock()
+        self.metrics = S3PoolMetrics(S3_ENV.S3_MAX_POOL_CONNECTIONS)
 
 
     async def get_client(self) -> S3Client:
+        # Быстрый путь без блокировки: после создания клиент только читается
+        client = self._client
+        if client is not None:
+            return client
+
         async with self._lock:
             if self._client is None:
-                self._client = await self._session.create_client(
+                client = await self._session.create_client(
                     "s3",
                     endpoint_url = S3_ENV.S3_URL,
                     region_name = _REGION,
                     aws_access_key_id=S3_ENV.S3_ACCESS_KEY,
                     aws_secret_access_key=S3_ENV.S3_SECRET_KEY,
-                    config=Config(signature_version="s3v4"),
+                    config=_client_config(),
                 ).__aenter__()
+                self.metrics.attach(client)
+                self._client = client
             return self._client
         
     async def close(self) -> None:
         async with self._lock:
-            if self._client is not None:
-                await self._client.__aexit__(None, None, None)
-                self._client = None
+            client, self._client = self._client, None
+            if client is not None:
+                await client.__aexit__(None, None, None)
 
 
 _factory = _S3ClientFactory()
+register_metrics("s3_pool", _factory.metrics.snapshot)
 
 async def get_s3_client():
     return await _factory.get_client()
 
 async def close_s3_client() -> None:
     await _factory.close()
-
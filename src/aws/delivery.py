@@ -0,0 +1,96 @@
+"""
+Адреса объектов для клиента в зависимости от ``STORAGE_DELIVERY``.
+
+``public`` — бакеты открыты на чтение, адрес — просто путь к объекту.
+``signed`` — бакеты закрыты (кроме ``PUBLIC_OBJECT_PATTERNS``), оригиналы
+и HLS отдаются по подписанным GET-ссылкам. Ссылки подписываются пачкой на
+всю страницу (``sign_many``) и кэшируются по ``(пользователь, объект)``:
+пока до истечения остаётся больше ``STORAGE_SIGNED_URL_MIN_TTL_SECONDS``,
+повторный запрос получает ту же ссылку — без подписи и с попаданием в
+кэш браузера/CDN.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .access_policies import is_public_object
+from .backends import get_storage_backend
+from .layout import public_base_url
+from ..core.metrics import register_metrics
+from ..settings.config import STORAGE_ENV
+
+
+Viewer = Optional[Hashable]
+StorageObject = Tuple[str, str]
+
+
+class DeliverySigner:
+    def __init__(self, *, mode: str, ttl: int, min_ttl: int, max_entries: int):
+        self.mode = mode
+        self.ttl = ttl
+        # Ссылка, которой осталось жить меньше min_ttl, подписывается заново
+        self.min_ttl = min(min_ttl, ttl // 2)
+        self.max_entries = max(1, max_entries)
+        self._cache: "OrderedDict[Tuple[Viewer, str, str], Tuple[str, float]]" = OrderedDict()
+        self._hits = 0
+        self._signed = 0
+        self._evicted = 0
+
+    @property
+    def signed(self) -> bool:
+        return self.mode == "signed"
+
+    def needs_signature(self, key: str) -> bool:
+        return self.signed and not is_public_object(key)
+
+    def url(self, viewer: Viewer, bucket: str, key: str) -> str:
+        return self.sign_many(viewer, [(bucket, key)])[0]
+
+    def sign_many(self, viewer: Viewer, objects: Sequence[StorageObject], *, now: Optional[float] = None) -> List[str]:
+        """Адреса объектов в том же порядке; недостающие подписи считаются за один проход"""
+        now = time.time() if now is None else now
+        base_url = public_base_url()
+        backend = None
+        urls: List[str] = []
+        for bucket, key in objects:
+            if not self.needs_signature(key):
+                urls.append(f"{base_url}/{bucket}/{key}")
+                continue
+
+            cache_key = (viewer, bucket, key)
+            cached = self._cache.get(cache_key)
+            if cached is not None and cached[1] - now > self.min_ttl:
+                self._cache.move_to_end(cache_key)
+                self._hits += 1
+                urls.append(cached[0])
+                continue
+
+            backend = backend or get_storage_backend()
+            url = backend.presign_get(bucket, key, expires_in=self.ttl, now=now)
+            self._cache[cache_key] = (url, int(now) + self.ttl)
+            self._cache.move_to_end(cache_key)
+            self._signed += 1
+            urls.append(url)
+
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self._evicted += 1
+        return urls
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "cached": len(self._cache),
+            "hits": self._hits,
+            "signed": self._signed,
+            "evicted": self._evicted,
+        }
+
+
+delivery_signer = DeliverySigner(
+    mode=STORAGE_ENV.STORAGE_DELIVERY,
+    ttl=STORAGE_ENV.STORAGE_SIGNED_URL_TTL_SECONDS,
+    min_ttl=STORAGE_ENV.STORAGE_SIGNED_URL_MIN_TTL_SECONDS,
+    max_entries=STORAGE_ENV.STORAGE_SIGNED_URL_CACHE_SIZE,
+)
+register_metrics("signed_urls", delivery_signer.metrics)
@@ -1,4 +1,8 @@
+from fastapi import Depends
+
 from .service import StorageService
+from .backends import LocalStorageBackend, get_storage_backend
+from .exceptions import StorageHTTPExceptions
 
 
 
@@ -20,7 +24,19 @@ async def get_storage_service() -> StorageService:
     global _storage_singleton
     if _storage_singleton is None:
         logger.debug("storage service - none - инициация singleton объекта")
-        _storage_singleton = StorageService()
+        _storage_singleton = StorageService(get_storage_backend())
     return _storage_singleton
 
 
+async def get_storage_exceptions() -> StorageHTTPExceptions:
+    return StorageHTTPExceptions()
+
+
+async def get_local_storage_backend(
+    http_exceptions: StorageHTTPExceptions = Depends(get_storage_exceptions),
+) -> LocalStorageBackend:
+    """Раздача и приём файлов через API доступны только для локального бэкенда"""
+    backend = get_storage_backend()
+    if not isinstance(backend, LocalStorageBackend):
+        raise http_exceptions.not_found_404("Local storage is disabled")
+    return backend
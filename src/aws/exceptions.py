@@ -0,0 +1,33 @@
+from fastapi import HTTPException, status
+
+from ..core.AbsractHTTPExceptions import AbstractHTTPExceptions
+
+
+class StorageHTTPExceptions(AbstractHTTPExceptions):
+
+    def not_found_404(self, detail: str = "Object not found") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail
+        )
+
+
+    def conflict_409(self, detail: str = "Ошибка не описана") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail
+        )
+
+
+    def forbidden_403(self, detail: str = "Signature does not match or has expired") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
+
+
+    def bad_request_400(self, detail: str = "Invalid object path") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail
+        )
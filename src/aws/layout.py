@@ -0,0 +1,187 @@
+"""
+Раскладка объектов по бакетам и их публичные адреса.
+
+Два режима (``STORAGE_LAYOUT``):
+
+* ``per_user`` — бакет на владельца (``str(owner_id).lower()``), ключи
+  внутри бакета относительные;
+* ``shared`` — небольшой фиксированный набор общих бакетов, ключ начинается
+  с ``{owner_id}/``. При ``STORAGE_SHARED_SHARDS > 1`` владелец попадает
+  в бакет ``{STORAGE_SHARED_BUCKET}-NNN`` по хэшу id.
+
+Остальной код работает с относительными ключами (``channels/...``) и
+переводит их в адрес хранилища только через ``locate``/``resolve``.
+Публичный адрес зависит от выбранного бэкенда хранилища: MinIO отдаётся
+nginx-ом под ``/minio``, локальный диск — самим API под ``/storage``.
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import List, Literal, Optional, Sequence, Tuple
+from uuid import UUID
+
+from ..settings.config import API_ENV, S3_ENV, STORAGE_ENV
+
+
+LOCAL_FILES_PATH = "storage"
+
+
+@dataclass(frozen=True, slots=True)
+class StorageLayout:
+    mode: Literal["per_user", "shared"] = "per_user"
+    shared_bucket: str = "uploads"
+    shards: int = 1
+
+    @classmethod
+    def from_env(cls) -> "StorageLayout":
+        return cls(
+            mode=STORAGE_ENV.STORAGE_LAYOUT,
+            shared_bucket=STORAGE_ENV.STORAGE_SHARED_BUCKET,
+            shards=max(1, STORAGE_ENV.STORAGE_SHARED_SHARDS),
+        )
+
+    @property
+    def shared(self) -> bool:
+        return self.mode == "shared"
+
+    def _shard_bucket(self, shard: int) -> str:
+        return self.shared_bucket if self.shards == 1 else f"{self.shared_bucket}-{shard:03d}"
+
+    def bucket_for(self, owner_id: UUID | str) -> str:
+        owner = str(owner_id).lower()
+        if not self.shared:
+            return owner
+        digest = hashlib.blake2b(owner.encode(), digest_size=8).digest()
+        return self._shard_bucket(int.from_bytes(digest, "big") % self.shards)
+
+    def owner_root(self, owner_id: UUID | str) -> str:
+        """Префикс всех объектов владельца внутри его бакета"""
+        return f"{str(owner_id).lower()}/" if self.shared else ""
+
+    def locate(self, owner_id: UUID | str, key: str) -> Tuple[str, str]:
+        """(bucket, key) объекта владельца по относительному ключу"""
+        return self.bucket_for(owner_id), f"{self.owner_root(owner_id)}{key}"
+
+    def resolve(self, bucket: str, key: str) -> Optional[Tuple[UUID, str]]:
+        """Обратно к ``locate``: владелец и относительный ключ; ``None`` — объект не из раскладки"""
+        try:
+            if not self.shared:
+                return UUID(bucket), key
+            owner, _, relative = key.partition("/")
+            owner_id = UUID(owner)
+        except ValueError:
+            return None
+        if not relative or self.bucket_for(owner_id) != bucket:
+            return None
+        return owner_id, relative
+
+    def buckets(self) -> List[str]:
+        """Все общие бакеты; в режиме ``per_user`` их набор не фиксирован"""
+        return [self._shard_bucket(shard) for shard in range(self.shards)] if self.shared else []
+
+
+LAYOUT = StorageLayout.from_env()
+
+
+def bucket_for(owner_id: UUID | str) -> str:
+    return LAYOUT.bucket_for(owner_id)
+
+
+def locate(owner_id: UUID | str, key: str) -> Tuple[str, str]:
+    """(bucket, key) объекта владельца"""
+    return LAYOUT.locate(owner_id, key)
+
+
+def resolve(bucket: str, key: str) -> Optional[Tuple[UUID, str]]:
+    return LAYOUT.resolve(bucket, key)
+
+
+def channel_prefix(channel_id: str) -> str:
+    return f"channels/{channel_id}"
+
+
+def course_prefix(channel_id: str, course_id: UUID | str) -> str:
+    return f"{channel_prefix(channel_id)}/courses/{course_id}"
+
+
+def video_prefix(channel_id: str, video_id: UUID | str) -> str:
+    """Общий префикс оригинала видео и всех производных файлов"""
+    return f"{channel_prefix(channel_id)}/videos/{video_id}"
+
+
+# Производные файлы видео относительно его префикса (или префикса содержимого)
+HLS_DIR = "hls"
+HLS_MASTER = f"{HLS_DIR}/master.m3u8"
+POSTER = "poster.jpg"
+STORYBOARD_VTT = "storyboard/storyboard.vtt"
+
+
+def blob_prefix(sha256: str) -> str:
+    """Префикс содержимого в ``STORAGE_BLOB_BUCKET``: оригинал и производные файлы одинаковых загрузок"""
+    return f"sha256/{sha256[:2]}/{sha256}"
+
+
+# Группы файлов видео, которые переносятся в холодный бакет целиком
+ORIGINAL, RENDITIONS, PREVIEWS = "original", "renditions", "previews"
+
+
+def video_file_group(name: str) -> Optional[str]:
+    """Группа файла видео; ``None`` — файл всегда остаётся в основном бакете (превью автора)"""
+    if name.startswith("video."):
+        return ORIGINAL
+    if name.startswith(f"{HLS_DIR}/"):
+        return RENDITIONS
+    if name == POSTER or name.startswith("storyboard/"):
+        return PREVIEWS
+    return None
+
+
+def cold_object(owner_id: UUID | str, key: str) -> Tuple[str, str]:
+    """(bucket, key) в холодном бакете: один бакет на всех, ключ начинается с id владельца"""
+    return STORAGE_ENV.STORAGE_COLD_BUCKET, f"{str(owner_id).lower()}/{key}"
+
+
+def video_object(
+    owner_id: UUID | str,
+    channel_id: str,
+    video_id: UUID | str,
+    name: str,
+    *,
+    content_sha256: Optional[str] = None,
+    cold_groups: Sequence[str] = (),
+) -> Tuple[str, str]:
+    """
+    (bucket, key) файла видео: у видео, найденного по содержимому, — общий
+    объект ``sha256/…``; файлы групп из ``cold_groups`` — в холодном бакете.
+    """
+    if content_sha256:
+        return STORAGE_ENV.STORAGE_BLOB_BUCKET, f"{blob_prefix(content_sha256)}/{name}"
+    key = f"{video_prefix(channel_id, video_id)}/{name}"
+    if cold_groups and video_file_group(name) in cold_groups:
+        return cold_object(owner_id, key)
+    return locate(owner_id, key)
+
+
+def public_base_url() -> str:
+    if STORAGE_ENV.STORAGE_BACKEND == "local":
+        return f"{API_ENV.public_url}/{LOCAL_FILES_PATH}"
+    return S3_ENV.public_url
+
+
+def public_object_url(owner_id: UUID | str, key: str) -> str:
+    bucket, key = locate(owner_id, key)
+    return f"{public_base_url()}/{bucket}/{key}"
+
+
+def video_object_url(
+    owner_id: UUID | str,
+    channel_id: str,
+    video_id: UUID | str,
+    name: str,
+    *,
+    content_sha256: Optional[str] = None,
+    cold_groups: Sequence[str] = (),
+) -> str:
+    bucket, key = video_object(
+        owner_id, channel_id, video_id, name, content_sha256=content_sha256, cold_groups=cold_groups
+    )
+    return f"{public_base_url()}/{bucket}/{key}"
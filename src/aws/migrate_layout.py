@@ -0,0 +1,193 @@
+"""
+Онлайн-перенос объектов из раскладки ``per_user`` в ``shared``.
+
+Порядок, при котором API не останавливается:
+
+1. ``python -m src.aws.migrate_layout`` при ещё включённом ``per_user`` —
+   копирует объекты всех пользовательских бакетов в общие бакеты
+   (``{owner_id}/...``), старые копии продолжают отдаваться; учёт занятого
+   места не трогается, пока API пишет его по старым адресам;
+2. ``STORAGE_LAYOUT=shared`` и перезапуск API — новые загрузки и ссылки
+   идут в общие бакеты;
+3. повторный запуск — докопирует то, что успели загрузить между шагами 1 и 2
+   (уже скопированные объекты пропускаются), и переносит учёт занятого места;
+4. ``--delete-source`` — удаляет старые бакеты, в которых не было ошибок копирования.
+   Разрешено только после шага 2 и вместе с переносом учёта: при ``per_user``
+   API ещё отдаёт и пишет объекты по старым адресам.
+
+Между шагами 2 и 3 объекты, загруженные после шага 1, ещё не видны по
+новым адресам. Копирование идёт внутри хранилища (CopyObject) несколькими
+параллельными задачами и событий загрузки не порождает.
+"""
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+from uuid import UUID
+
+from .backends import ObjectInfo, StorageBackend, get_storage_backend
+from .layout import LAYOUT, StorageLayout
+from ..database import async_session_maker
+from ..settings.config import STORAGE_ENV
+from ..storage_usage.repository import StorageUsageRepository
+
+from ..core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+@dataclass(slots=True)
+class MigrationStats:
+    copied: int = 0
+    skipped: int = 0
+    bytes: int = 0
+    failed: int = 0
+
+
+def _owner_bucket(bucket: str) -> Optional[UUID]:
+    """Бакеты раскладки ``per_user`` называются id владельца; остальные не трогаем"""
+    try:
+        owner_id = UUID(bucket)
+    except ValueError:
+        return None
+    return owner_id if str(owner_id) == bucket else None
+
+
+class LayoutMigration:
+    def __init__(
+        self,
+        backend: StorageBackend,
+        *,
+        target: StorageLayout,
+        concurrency: int = 16,
+        delete_source: bool = False,
+    ):
+        if not target.shared:
+            raise ValueError("Целевая раскладка должна быть shared")
+        if delete_source and not LAYOUT.shared:
+            raise ValueError("Старые бакеты удаляются только после переключения API на STORAGE_LAYOUT=shared")
+        self.backend = backend
+        self.target = target
+        self.concurrency = max(1, concurrency)
+        self.delete_source = delete_source
+
+    async def run(self, buckets: Optional[List[str]] = None, *, rewrite_ledger: bool = True) -> MigrationStats:
+        if self.delete_source and not rewrite_ledger:
+            # Учёт места старого бакета иначе остался бы привязан к удалённым объектам
+            raise ValueError("Старые бакеты удаляются только вместе с переносом учёта места")
+        if buckets is None:
+            buckets = await self.backend.list_buckets()
+        owners = [(bucket, owner_id) for bucket in buckets if (owner_id := _owner_bucket(bucket)) is not None]
+
+        for bucket in self.target.buckets():
+            await self.backend.ensure_bucket(bucket)
+
+        total = MigrationStats()
+        for bucket, owner_id in owners:
+            stats = await self.migrate_bucket(bucket, owner_id)
+            logger.info(
+                f"{bucket}: скопировано {stats.copied} ({stats.bytes} байт), "
+                f"пропущено {stats.skipped}, ошибок {stats.failed}"
+            )
+            total.copied += stats.copied
+            total.skipped += stats.skipped
+            total.bytes += stats.bytes
+            total.failed += stats.failed
+            if stats.failed:
+                continue
+            if rewrite_ledger:
+                await self._move_ledger(bucket, owner_id)
+            if self.delete_source:
+                await self._drop_source(bucket)
+        return total
+
+    async def migrate_bucket(self, bucket: str, owner_id: UUID) -> MigrationStats:
+        """Копирует все объекты бакета владельца; ограниченная очередь держит листинг впереди копирования"""
+        stats = MigrationStats()
+        queue: asyncio.Queue[Optional[ObjectInfo]] = asyncio.Queue(maxsize=self.concurrency * 4)
+
+        async def worker() -> None:
+            while (info := await queue.get()) is not None:
+                try:
+                    if await self._copy(info, owner_id):
+                        stats.copied += 1
+                        stats.bytes += info.size
+                    else:
+                        stats.skipped += 1
+                except Exception:
+                    stats.failed += 1
+                    logger.exception(f"Не удалось скопировать {bucket}/{info.key}")
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            async for info in self.backend.list_prefix(bucket):
+                await queue.put(info)
+        finally:
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        return stats
+
+    async def _copy(self, info: ObjectInfo, owner_id: UUID) -> bool:
+        """False — по новому адресу уже лежит та же или более новая версия"""
+        bucket, key = self.target.locate(owner_id, info.key)
+        existing = await self.backend.head(bucket, key)
+        if existing is not None and existing.size == info.size and existing.last_modified >= info.last_modified:
+            return False
+        await self.backend.copy_object(info.bucket, info.key, bucket, key)
+        return True
+
+    async def _move_ledger(self, bucket: str, owner_id: UUID) -> None:
+        target_bucket, prefix = self.target.locate(owner_id, "")
+        async with async_session_maker() as session:
+            await StorageUsageRepository(session).move_bucket(bucket, target_bucket, prefix)
+            await session.commit()
+
+    async def _drop_source(self, bucket: str) -> None:
+        batch: List[str] = []
+        async for info in self.backend.list_prefix(bucket):
+            batch.append(info.key)
+            if len(batch) >= 1000:
+                await self.backend.delete(bucket, batch)
+                batch = []
+        if batch:
+            await self.backend.delete(bucket, batch)
+        await self.backend.delete_bucket(bucket)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Перенос объектов из per_user-бакетов в общие бакеты")
+    parser.add_argument("buckets", nargs="*", help="Бакеты владельцев; по умолчанию — все")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--delete-source", action="store_true", help="Удалить старые бакеты после копирования (только при STORAGE_LAYOUT=shared)")
+    parser.add_argument("--skip-ledger", action="store_true", help="Не переносить учёт занятого места")
+    return parser.parse_args()
+
+
+async def _main(args: argparse.Namespace) -> MigrationStats:
+    target = StorageLayout(
+        mode="shared",
+        shared_bucket=STORAGE_ENV.STORAGE_SHARED_BUCKET,
+        shards=max(1, STORAGE_ENV.STORAGE_SHARED_SHARDS),
+    )
+    backend = get_storage_backend()
+    await backend.warm()
+    try:
+        migration = LayoutMigration(
+            backend, target=target, concurrency=args.concurrency, delete_source=args.delete_source
+        )
+        stats = await migration.run(args.buckets or None, rewrite_ledger=LAYOUT.shared and not args.skip_ledger)
+    finally:
+        await backend.close()
+    return stats
+
+
+if __name__ == "__main__":
+    stats = asyncio.run(_main(_parse_args()))
+    logger.info(
+        f"Готово: скопировано {stats.copied} ({stats.bytes} байт), "
+        f"пропущено {stats.skipped}, ошибок {stats.failed}"
+    )
+    raise SystemExit(1 if stats.failed else 0)
@@ -0,0 +1,118 @@
+"""
+Локальный SigV4-подписчик presigned URL для публичного хоста.
+
+URL подписывается сразу для адреса, который видит клиент
+(``BASE_SERVER_URL/s3proxy/...``), с ``Host`` публичного сервера —
+nginx передаёт его в MinIO без изменений и отрезает префикс ``/s3proxy``.
+Ключ подписи зависит только от даты и региона, поэтому вычисляется
+один раз в сутки; сама подпись — одно HMAC и один sha256.
+"""
+import hashlib
+import hmac
+from datetime import datetime, UTC
+from functools import lru_cache
+from typing import Mapping, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from ..settings.config import S3_ENV
+
+
+_ALGORITHM = "AWS4-HMAC-SHA256"
+_UNSIGNED_PAYLOAD = "UNSIGNED-PAYLOAD"
+
+
+def _quote(value: str) -> str:
+    return quote(value, safe="-_.~")
+
+
+class SigV4Presigner:
+    __slots__ = ("_access_key", "_secret_key", "_region", "_service", "_base_url", "_host", "_scope_cache")
+
+    def __init__(
+        self,
+        *,
+        access_key: str,
+        secret_key: str,
+        region: str,
+        public_base_url: str,
+        service: str = "s3",
+    ):
+        """
+        ``public_base_url`` — адрес, по которому клиент обращается к хранилищу
+        (может содержать префикс пути, который прокси отрезает перед MinIO).
+        """
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._region = region
+        self._service = service
+        self._base_url = public_base_url.rstrip("/")
+        self._host = urlsplit(self._base_url).netloc
+        self._scope_cache: Tuple[str, str, bytes] = ("", "", b"")
+
+    def _scope(self, date_stamp: str) -> Tuple[str, bytes]:
+        """(scope, ключ подписи) на дату; пересчитывается раз в сутки"""
+        cached_date, scope, key = self._scope_cache
+        if cached_date == date_stamp:
+            return scope, key
+
+        key = hmac.new(f"AWS4{self._secret_key}".encode(), date_stamp.encode(), hashlib.sha256).digest()
+        for part in (self._region, self._service, "aws4_request"):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        scope = f"{date_stamp}/{self._region}/{self._service}/aws4_request"
+        self._scope_cache = (date_stamp, scope, key)
+        return scope, key
+
+    def presign(
+        self,
+        method: str,
+        bucket: str,
+        key: str,
+        *,
+        expires_in: int,
+        headers: Optional[Mapping[str, str]] = None,
+        now: Optional[datetime] = None,
+    ) -> str:
+        """
+        Presigned URL в path-style. ``headers`` — заголовки, которые клиент
+        обязан отправить с теми же значениями (Content-Type, x-amz-acl…).
+        """
+        now = now or datetime.now(UTC)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        scope, signing_key = self._scope(amz_date[:8])
+
+        signed = {"host": self._host}
+        if headers:
+            signed.update((name.lower(), value.strip()) for name, value in headers.items())
+        names = sorted(signed)
+        signed_headers = ";".join(names)
+        canonical_headers = "".join(f"{name}:{signed[name]}\n" for name in names)
+
+        path = f"/{bucket}/{quote(key, safe='/~')}"
+        query = (
+            f"X-Amz-Algorithm={_ALGORITHM}"
+            f"&X-Amz-Credential={_quote(f'{self._access_key}/{scope}')}"
+            f"&X-Amz-Date={amz_date}"
+            f"&X-Amz-Expires={expires_in}"
+            f"&X-Amz-SignedHeaders={_quote(signed_headers)}"
+        )
+        canonical_request = (
+            f"{method}\n{path}\n{query}\n{canonical_headers}\n{signed_headers}\n{_UNSIGNED_PAYLOAD}"
+        )
+        string_to_sign = (
+            f"{_ALGORITHM}\n{amz_date}\n{scope}\n"
+            f"{hashlib.sha256(canonical_request.encode()).hexdigest()}"
+        )
+        signature = hmac.new(signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+        return f"{self._base_url}{path}?{query}&X-Amz-Signature={signature}"
+
+
+@lru_cache(maxsize=1)
+def get_public_presigner() -> SigV4Presigner:
+    from .client import _REGION
+
+    return SigV4Presigner(
+        access_key=S3_ENV.S3_ACCESS_KEY,
+        secret_key=S3_ENV.S3_SECRET_KEY,
+        region=_REGION,
+        public_base_url=f"{S3_ENV.BASE_SERVER_URL}/s3proxy",
+    )
@@ -1,9 +1,12 @@
 from uuid import UUID
 from pathlib import Path
+from typing import Optional
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import FileResponse
 
-from ..auth.schemas import UserReadSchema
+from ..auth.schemas import CurrentUserSchema
 from ..auth.dependencies import get_current_user
 
 from ..channels.schemas import ChannelReadSchema
@@ -25,18 +28,27 @@ from .schemas import (
     VideoPreviewUploadRequestSchema, VideoPreviewUploadResponseSchema,
 )
 from .service import StorageService
-from .dependencies import get_storage_service
+from ..storage_usage.dependencies import get_storage_usage_service
+from ..storage_usage.service import StorageUsageService
+from .dependencies import get_storage_service, get_local_storage_backend, get_storage_exceptions
+from .exceptions import StorageHTTPExceptions
+from .backends import InvalidObjectPath, LocalStorageBackend
+from .delivery import delivery_signer
+from .layout import LOCAL_FILES_PATH
+from ..settings.config import STORAGE_ENV
 from .strategies import ObjectKind
 from .access_policies import AccessPolicy
 
 router = APIRouter(prefix="/upload", tags=["Storage"])
+files_router = APIRouter(prefix=f"/{LOCAL_FILES_PATH}", tags=["Storage"], include_in_schema=False)
 
 
 @router.post("/avatar", response_model=UserAvatarUploadResponseSchema, status_code=status.HTTP_201_CREATED)
 async def upload_user_avatar(
     payload: UserAvatarUploadRequestSchema,
-    user: UserReadSchema = Depends(get_current_user),
+    user: CurrentUserSchema = Depends(get_current_user),
     storage: StorageService = Depends(get_storage_service),
+    usage: StorageUsageService = Depends(get_storage_usage_service),
 ):
     presign = await storage.generate_upload_urls(
         owner_id=user.id,
@@ -44,6 +56,7 @@ async def upload_user_avatar(
         content_type=payload.content_type,
         source_filename=payload.file_name,
         access=AccessPolicy.PUBLIC_READ,
+        usage=usage,
     )
     return UserAvatarUploadResponseSchema(**presign)
 
@@ -53,6 +66,7 @@ async def upload_channel_avatar(
     payload: ChannelAvatarUploadRequestSchema,
     channel: ChannelReadSchema = Depends(get_current_channel),
     storage: StorageService = Depends(get_storage_service),
+    usage: StorageUsageService = Depends(get_storage_usage_service),
 ):
     presign = await storage.generate_upload_urls(
         owner_id=channel.owner_id,
@@ -60,6 +74,7 @@ async def upload_channel_avatar(
         content_type=payload.content_type,
         source_filename=payload.file_name,
         access=AccessPolicy.PUBLIC_READ,
+        usage=usage,
         channel_id=channel.id,
     )
     return ChannelAvatarUploadResponseSchema(**presign)
@@ -70,6 +85,7 @@ async def upload_channel_preview(
     payload: ChannelPreviewUploadRequestSchema,
     channel: ChannelReadSchema = Depends(get_current_channel),
     storage: StorageService = Depends(get_storage_service),
+    usage: StorageUsageService = Depends(get_storage_usage_service),
 ):
     presign = await storage.generate_upload_urls(
         owner_id=channel.owner_id,
@@ -77,6 +93,7 @@ async def upload_channel_preview(
         content_type=payload.content_type,
         source_filename=payload.file_name,
         access=AccessPolicy.PUBLIC_READ,
+        usage=usage,
         channel_id=channel.id,
     )
     return ChannelPreviewUploadResponseSchema(**presign)
@@ -87,6 +104,7 @@ async def upload_course_preview(
     payload: CoursePreviewUploadRequestSchema,
     course: CourseReadSchema = Depends(get_current_course_with_owner_validate),
     storage: StorageService = Depends(get_storage_service),
+    usage: StorageUsageService = Depends(get_storage_usage_service),
 ):
     presign = await storage.generate_upload_urls(
         owner_id=course.owner_id,
@@ -94,6 +112,7 @@ async def upload_course_preview(
         content_type=payload.content_type,
         source_filename=payload.file_name,
         access=AccessPolicy.PUBLIC_READ,
+        usage=usage,
         channel_id=course.channel_id,
         course_id=course.id
     )
@@ -106,6 +125,7 @@ async def upload_video(
     channel: ChannelReadSchema = Depends(get_current_channel),
     videos: VideoService = Depends(get_video_service),
     storage: StorageService = Depends(get_storage_service),
+    usage: StorageUsageService = Depends(get_storage_usage_service),
 ):
     video_obj = await videos.create_initial_video(user_id=channel.owner_id, channel_id=channel.id)
     presign = await storage.generate_upload_urls(
@@ -113,7 +133,8 @@ async def upload_video(
         object_kind=ObjectKind.VIDEO,
         content_type=payload.content_type,
         source_filename=payload.file_name,
-        access=AccessPolicy.PUBLIC_READ,
+        access=AccessPolicy.PRIVATE if delivery_signer.signed else AccessPolicy.PUBLIC_READ,
+        usage=usage,
         channel_id=channel.id,
         video_id=video_obj.id,
     )
@@ -125,6 +146,7 @@ async def upload_video_preview(
     payload: VideoPreviewUploadRequestSchema,
     video_data: VideoDataReadSchema = Depends(validate_video_access),
     storage: StorageService = Depends(get_storage_service),
+    usage: StorageUsageService = Depends(get_storage_usage_service),
 ):
     presign = await storage.generate_upload_urls(
         owner_id=video_data.user_id,
@@ -132,6 +154,7 @@ async def upload_video_preview(
         content_type=payload.content_type,
         source_filename=payload.file_name,
         access=AccessPolicy.PUBLIC_READ,
+        usage=usage,
         channel_id=video_data.channel_id,
         video_id=video_data.id,
     )
@@ -139,4 +162,71 @@ async def upload_video_preview(
 
 
 @router.post("/mardown")
-async def upload_markdown(): pass
\ No newline at end of file
+async def upload_markdown(): pass
+
+
+# ---------- локальное хранилище: приём и раздача файлов ----------
+@files_router.put("/{bucket}/{key:path}")
+async def put_local_object(
+    bucket: str,
+    key: str,
+    request: Request,
+    expires: int = Query(alias="X-Expires"),
+    acl: str = Query(alias="X-Acl"),
+    signature: str = Query(alias="X-Signature"),
+    backend: LocalStorageBackend = Depends(get_local_storage_backend),
+    http_exceptions: StorageHTTPExceptions = Depends(get_storage_exceptions),
+):
+    content_type = request.headers.get("content-type", "")
+    if not backend.verify_upload(
+        bucket, key, content_type=content_type, acl=acl, expires=expires, signature=signature
+    ):
+        raise http_exceptions.forbidden_403()
+    try:
+        info = await backend.write(bucket, key, request.stream(), content_type=content_type)
+    except InvalidObjectPath as exc:
+        raise http_exceptions.bad_request_400(str(exc))
+    return Response(status_code=status.HTTP_200_OK, headers={"ETag": f'"{info.etag}"'})
+
+
+@files_router.api_route("/{bucket}/{key:path}", methods=["GET", "HEAD"])
+async def get_local_object(
+    bucket: str,
+    key: str,
+    request: Request,
+    expires: Optional[int] = Query(default=None, alias="X-Expires"),
+    signature: Optional[str] = Query(default=None, alias="X-Signature"),
+    backend: LocalStorageBackend = Depends(get_local_storage_backend),
+    http_exceptions: StorageHTTPExceptions = Depends(get_storage_exceptions),
+):
+    # STORAGE_DELIVERY=signed: закрытые объекты отдаются только по подписанной ссылке
+    if delivery_signer.needs_signature(key) and (
+        expires is None or signature is None
+        or not backend.verify_get(bucket, key, expires=expires, signature=signature)
+    ):
+        raise http_exceptions.forbidden_403()
+    info = await backend.head(bucket, key)
+    if info is None:
+        raise http_exceptions.not_found_404()
+
+    etag = f'"{info.etag}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    if STORAGE_ENV.STORAGE_LOCAL_ACCEL_PREFIX:
+        # nginx отдаёт файл сам (sendfile + Range) из internal-локации
+        return Response(headers={
+            "X-Accel-Redirect": f"{STORAGE_ENV.STORAGE_LOCAL_ACCEL_PREFIX}/{bucket}/{quote(key)}",
+            "Content-Type": info.content_type or "application/octet-stream",
+            "ETag": etag,
+        })
+
+    # Range/If-Range обрабатывает FileResponse; полный ответ уходит через
+    # http.response.pathsend, если сервер поддерживает zero-copy отдачу
+    response = FileResponse(
+        backend.path_for(bucket, key),
+        media_type=info.content_type,
+        headers={"ETag": etag},
+    )
+    response.chunk_size = backend.chunk_size
+    return response
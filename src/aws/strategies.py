@@ -1,8 +1,18 @@
+"""
+Раскладка ключей объектов, загружаемых пользователями.
+
+Каждый вид объекта описан одним шаблоном вида
+``channels/{channel_id}/videos/{video_id}/video{ext}``; из него получаются
+и построитель ключа для presign, и разбор ключа из уведомления MinIO.
+Все шаблоны компилируются в одно регулярное выражение: разбор ключа —
+один ``match`` без ``split`` и перебора веток.
+"""
 import mimetypes
-from abc import abstractmethod
+import re
+from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
-from typing import Any, Protocol, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
 
@@ -16,98 +26,144 @@ class ObjectKind(Enum):
     LESSON_MARKDOWN = auto()
 
 
-class KeyBuildingStrategy(Protocol):
-    @abstractmethod
-    def build_key(self, **context: Any) -> str: ...
-
-
-_STRATEGY_REGISTRY: dict[ObjectKind, KeyBuildingStrategy] = {}
-
-
-def register_strategy(object_kind: ObjectKind):
-    def decorator(cls: type[KeyBuildingStrategy]):
-        _STRATEGY_REGISTRY[object_kind] = cls()
-        return cls
-    return decorator
-
-
 def _ext(fname: str) -> str:
     return Path(fname).suffix or mimetypes.guess_extension(
         mimetypes.guess_type(fname)[0] or ""
     ) or ".bin"
 
 
-@register_strategy(ObjectKind.PROFILE_AVATAR)
-class ProfileAvatarKeyStrategy(KeyBuildingStrategy):
-    def build_key(self, *, source_filename: str, **_: Any) -> str:
-        return f"other/user_avatar{_ext(source_filename)}"
-
-
-@register_strategy(ObjectKind.CHANNEL_AVATAR)
-class ChannelAvatarKeyStrategy(KeyBuildingStrategy):
-    def build_key(self, *, channel_id: str, source_filename: str, **_: Any) -> str:
-        return f"channels/{channel_id}/channel_avatar{_ext(source_filename)}"
-
-
-@register_strategy(ObjectKind.CHANNEL_PREVIEW)
-class ChannelPreviewKeyStrategy(KeyBuildingStrategy):
-    def build_key(self, *, channel_id: str, source_filename: str, **_: Any) -> str:
-        return f"channels/{channel_id}/channel_preview{_ext(source_filename)}"
-
-
-
-@register_strategy(ObjectKind.VIDEO)
-class VideoKeyStrategy(KeyBuildingStrategy):
-    def build_key(self, *, channel_id: str, video_id: UUID, source_filename: str, **_: Any) -> str:
-        return f"channels/{channel_id}/videos/{video_id}/video{_ext(source_filename)}"
-
-
-@register_strategy(ObjectKind.VIDEO_PREVIEW)
-class VideoPreviewKeyStrategy(KeyBuildingStrategy):
-    def build_key(self, *, channel_id: str, video_id: UUID, source_filename: str, **_: Any) -> str:
-        return f"channels/{channel_id}/videos/{video_id}/video_preview{_ext(source_filename)}"
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+# Что может стоять на месте поля при разборе ключа
+_FIELD_PATTERNS: Dict[str, str] = {
+    "channel_id": r"[^/]+",
+    "video_id": r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}",
+    "course_id": r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}",
+    "ext": r"\.[^./]+",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class KeyTemplate:
+    kind: ObjectKind
+    pattern: str
+    fields: Tuple[str, ...] = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "fields", tuple(_PLACEHOLDER.findall(self.pattern)))
+
+    def build(self, *, source_filename: str, **context: Any) -> str:
+        values = {"ext": _ext(source_filename)}
+        for name in self.fields:
+            if name == "ext":
+                continue
+            if context.get(name) is None:
+                raise ValueError(f"{self.kind.name}: не передан {name}")
+            values[name] = context[name]
+        return self.pattern.format(**values)
+
+    def regex(self, group_prefix: str) -> str:
+        """Регулярное выражение шаблона; имена групп уникальны в пределах общего выражения"""
+        parts, position = [], 0
+        for placeholder in _PLACEHOLDER.finditer(self.pattern):
+            parts.append(re.escape(self.pattern[position:placeholder.start()]))
+            name = placeholder.group(1)
+            parts.append(f"(?P<{group_prefix}{name}>{_FIELD_PATTERNS[name]})")
+            position = placeholder.end()
+        parts.append(re.escape(self.pattern[position:]))
+        return "".join(parts)
+
+
+class KeyTemplateRegistry:
+    def __init__(self):
+        self._templates: Dict[ObjectKind, KeyTemplate] = {}
+        self._builders: Dict[ObjectKind, Callable[..., str]] = {}
+        self._matcher: Optional[re.Pattern] = None
+        # Имя внешней группы → (шаблон, [(имя группы, имя поля)])
+        self._groups: Dict[str, Tuple[KeyTemplate, List[Tuple[str, str]]]] = {}
+
+    def register(self, kind: ObjectKind, pattern: str) -> KeyTemplate:
+        template = KeyTemplate(kind, pattern)
+        self._templates[kind] = template
+        self._matcher = None
+        return template
+
+    def register_builder(self, kind: ObjectKind):
+        """Ключ, который только строится и не разбирается из уведомлений"""
+        def decorator(builder: Callable[..., str]) -> Callable[..., str]:
+            self._builders[kind] = builder
+            return builder
+        return decorator
+
+    def compile(self) -> re.Pattern:
+        alternatives = []
+        self._groups = {}
+        for index, template in enumerate(self._templates.values()):
+            outer, prefix = f"t{index}", f"t{index}_"
+            alternatives.append(f"(?P<{outer}>{template.regex(prefix)})")
+            self._groups[outer] = (
+                template,
+                [(f"{prefix}{name}", name) for name in template.fields],
+            )
+        self._matcher = re.compile("|".join(alternatives))
+        return self._matcher
+
+    def build(self, kind: ObjectKind, **context: Any) -> str:
+        template = self._templates.get(kind)
+        if template is not None:
+            return template.build(**context)
+        try:
+            builder = self._builders[kind]
+        except KeyError as exc:
+            raise ValueError(f"No strategy registered for {kind!r}") from exc
+        return builder(**context)
+
+    def parse(self, key: str) -> Optional[Tuple[ObjectKind, Dict[str, str]]]:
+        """Вид объекта и значения полей шаблона; ``None`` — ключ не из раскладки загрузок"""
+        matcher = self._matcher or self.compile()
+        match = matcher.fullmatch(key)
+        if match is None:
+            return None
+        # Внешняя группа альтернативы закрывается последней
+        template, groups = self._groups[match.lastgroup]
+        return template.kind, {name: match.group(group) for group, name in groups}
+
+
+key_templates = KeyTemplateRegistry()
+
+key_templates.register(ObjectKind.PROFILE_AVATAR, "other/user_avatar{ext}")
+key_templates.register(ObjectKind.CHANNEL_AVATAR, "channels/{channel_id}/channel_avatar{ext}")
+key_templates.register(ObjectKind.CHANNEL_PREVIEW, "channels/{channel_id}/channel_preview{ext}")
+key_templates.register(ObjectKind.VIDEO, "channels/{channel_id}/videos/{video_id}/video{ext}")
+key_templates.register(ObjectKind.VIDEO_PREVIEW, "channels/{channel_id}/videos/{video_id}/video_preview{ext}")
+key_templates.register(ObjectKind.COURSE_PREVIEW, "channels/{channel_id}/courses/{course_id}/course_preview{ext}")
+
+
+@key_templates.register_builder(ObjectKind.LESSON_MARKDOWN)
+def _lesson_markdown_key(
+    *,
+    channel_id: str,
+    course_id: UUID,
+    module_name: Optional[str] = None,
+    submodule_name: Optional[str] = None,
+    lesson_name: str,
+    **_: Any
+) -> str:
+    def normalize_path(path: str) -> str:
+        return path.replace(" ", "_").lower()
+
+    parts: list[str] = [
+        "channels", str(channel_id),
+        "courses", str(course_id)
+    ]
+    if module_name:
+        parts.append(normalize_path(module_name))
+    if submodule_name:
+        parts.append(normalize_path(submodule_name))
+
+    parts.append(f"{normalize_path(lesson_name)}.md")
+    return "/".join(parts)
 
 
 def build_key(object_kind: ObjectKind, **context: Any) -> str:
-    try:
-        strategy = _STRATEGY_REGISTRY[object_kind]
-    except KeyError as exc:
-        raise ValueError(f"No strategy registered for {object_kind!r}") from exc
-    return strategy.build_key(**context)
-
-@register_strategy(ObjectKind.COURSE_PREVIEW)
-class CoursePreviewKeyStrategy(KeyBuildingStrategy):
-    def build_key(self, channel_id: str, course_id: str, source_filename: str, **_: Any) -> str:
-        return f"channels/{channel_id}/courses/{course_id}/course_preview{_ext(source_filename)}"
-    
-@register_strategy(ObjectKind.LESSON_MARKDOWN)
-class LessonMorkdowmKeyStrategy(KeyBuildingStrategy):
-
-    def build_key(
-            self,
-            *,
-            channel_id: str,
-            course_id: UUID,
-            module_name: Optional[str] = None,
-            submodule_name: Optional[str] = None,
-            lesson_name: str,
-            **_: Any
-            ) -> str:
-        
-        def normalize_path(path: str) -> str:
-            return path.replace(" ", "_").lower()
-        
-        lesson = normalize_path(lesson_name)
-
-        parts: list[str] = [
-            "channels", str(channel_id),
-            "courses", str(course_id)
-        ]
-
-        if module_name:
-            parts.append(normalize_path(module_name))
-        if submodule_name:
-            parts.append(normalize_path(submodule_name))
-
-        parts.append(f"{lesson}.md")
-        return "/".join(parts)
\ No newline at end of file
+    return key_templates.build(object_kind, **context)
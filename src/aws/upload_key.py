@@ -1,21 +1,26 @@
 from uuid import UUID
 from pathlib import Path
+from dataclasses import dataclass
 from typing import Optional, Any
 
-from pydantic import BaseModel, field_validator
+from .layout import resolve
+from .strategies import ObjectKind, build_key, key_templates
 
-from .strategies import ObjectKind, build_key
 
-
-class UploadKey(BaseModel):
+@dataclass(slots=True)
+class UploadKey:
+    """
+    Разобранный ключ загруженного объекта. Без валидации pydantic: поля
+    уже проверены регулярным выражением шаблона, а ключ разбирается на
+    каждую запись каждого вебхука.
+    """
     user_id: UUID
-    channel_id: Optional[str] = None
-    video_id: Optional[UUID] = None
-    course_id: Optional[UUID] = None
-
     kind: ObjectKind
     key: str
     ext: str
+    channel_id: Optional[str] = None
+    video_id: Optional[UUID] = None
+    course_id: Optional[UUID] = None
 
     @classmethod
     def from_context(
@@ -39,43 +44,28 @@ class UploadKey(BaseModel):
         )
 
     @classmethod
-    def from_s3(cls, *, user_id: UUID, key: str) -> Optional["UploadKey"]:
-        parts = key.split("/")
-        ext = Path(key).suffix.lstrip(".").lower()
-
-        # user_avatar
-        if parts == ["other", f"user_avatar.{ext}"]:
-            return cls(user_id=user_id, kind=ObjectKind.PROFILE_AVATAR, key=key, ext=ext)
+    def from_object(cls, bucket: str, key: str) -> Optional["UploadKey"]:
+        """Ключ из уведомления хранилища: владелец определяется раскладкой (бакет или префикс)"""
+        located = resolve(bucket, key)
+        if located is None:
+            return None
+        user_id, relative = located
+        return cls.from_s3(user_id=user_id, key=relative)
 
-        # channels/{channel_id}/channel_avatar.*
-        if len(parts) == 3 and parts[0] == "channels" and parts[2].startswith("channel_avatar"):
-            return cls(user_id=user_id, channel_id=parts[1],
-                       kind=ObjectKind.CHANNEL_AVATAR, key=key, ext=ext)
-
-        # channels/{channel_id}/channel_preview.*
-        if len(parts) == 3 and parts[0] == "channels" and parts[2].startswith("channel_preview"):
-            return cls(user_id=user_id, channel_id=parts[1],
-                       kind=ObjectKind.CHANNEL_PREVIEW, key=key, ext=ext)
-
-        # channels/{channel_id}/videos/{video_id}/video*.*
-        if len(parts) == 5 and parts[0] == "channels" and parts[2] == "videos":
-            video_id = UUID(parts[3])
-            if parts[4].startswith("video."):
-                return cls(user_id=user_id, channel_id=parts[1],
-                           video_id=video_id, kind=ObjectKind.VIDEO, key=key, ext=ext)
-            if parts[4].startswith("video_preview"):
-                return cls(user_id=user_id, channel_id=parts[1],
-                           video_id=video_id, kind=ObjectKind.VIDEO_PREVIEW, key=key, ext=ext)
-
-        # channels/{channel_id}/courses/{course_id}/course_preview.*
-        if (len(parts) == 5 and parts[0] == "channels" and parts[2] == "courses"
-                and parts[4].startswith("course_preview")):
-            return cls(user_id=user_id, channel_id=parts[1],
-                       course_id=UUID(parts[3]), kind=ObjectKind.COURSE_PREVIEW, key=key, ext=ext)
-
-        return None
-
-    @field_validator("ext")
     @classmethod
-    def _lower(cls, v: str) -> str:
-        return v.lower()
+    def from_s3(cls, *, user_id: UUID, key: str) -> Optional["UploadKey"]:
+        parsed = key_templates.parse(key)
+        if parsed is None:
+            return None
+        kind, fields = parsed
+        video_id = fields.get("video_id")
+        course_id = fields.get("course_id")
+        return cls(
+            user_id=user_id,
+            kind=kind,
+            key=key,
+            ext=fields["ext"][1:].lower(),
+            channel_id=fields.get("channel_id"),
+            video_id=UUID(video_id) if video_id else None,
+            course_id=UUID(course_id) if course_id else None,
+        )
@@ -4,7 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import get_async_session
 
 from ..auth.dependencies import get_current_user
-from ..auth.schemas import UserReadSchema
+from ..auth.schemas import CurrentUserSchema
 
 from .service import ChannelService
 from .schemas import ChannelReadSchema
@@ -24,7 +24,7 @@ async def get_channel_exceptions() -> ChannelsHTTPExceptions:
 
 async def get_current_channel(
     channel_id: str,
-    user: UserReadSchema = Depends(get_current_user),
+    user: CurrentUserSchema = Depends(get_current_user),
     service: ChannelService = Depends(get_channel_service),
 ) -> ChannelReadSchema:
     channel = await service.repository.get_by_id(channel_id)
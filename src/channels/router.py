@@ -3,7 +3,10 @@ from fastapi import APIRouter, Depends, status
 from uuid import UUID
 
 from ..auth.dependencies import get_current_user
-from ..auth.schemas import UserReadSchema
+from ..auth.schemas import CurrentUserSchema
+from ..core.responses import models_response
+from ..deletions.dependencies import get_deletion_service
+from ..deletions.service import DeletionService
 
 from .dependencies import get_channel_service, get_current_channel
 from .schemas import ChannelCreateSchema, ChannelReadSchema
@@ -18,7 +21,7 @@ router = APIRouter(
 @router.post("", response_model=ChannelReadSchema, status_code=status.HTTP_201_CREATED)
 async def create_channel(
     channel_data: ChannelCreateSchema,
-    current_user: UserReadSchema = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
     channel_service: ChannelService = Depends(get_channel_service)
 ):
     """Создает новый канал"""
@@ -32,16 +35,16 @@ async def get_channels(channel_service: ChannelService = Depends(get_channel_ser
     Returns:
         list[ChannelReadSchema]: Список всех каналов
     """
-    return await channel_service.get_channels()
+    return models_response(ChannelReadSchema, await channel_service.get_channels())
 
 
 @router.get("/my", response_model=list[ChannelReadSchema])
 async def get_my_channels(
-    current_user: UserReadSchema = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
     channel_service: ChannelService = Depends(get_channel_service)
 ):
     """Получает все каналы текущего пользователя"""
-    return await channel_service.get_my_channels(current_user)
+    return models_response(ChannelReadSchema, await channel_service.get_my_channels(current_user))
 
 
 @router.get("/user/{owner_id}", response_model=list[ChannelReadSchema])
@@ -50,7 +53,7 @@ async def get_user_channels(
     channel_service: ChannelService = Depends(get_channel_service)
 ):
     """Получает все каналы указанного пользователя"""
-    return await channel_service.get_user_channels(owner_id)
+    return models_response(ChannelReadSchema, await channel_service.get_user_channels(owner_id))
 
 @router.get("/{channel_id}", response_model=ChannelReadSchema)
 async def get_channel(
@@ -65,9 +68,14 @@ async def get_channel(
 async def delete_channel(
     channel_data: ChannelReadSchema = Depends(get_current_channel),
     channel_service: ChannelService = Depends(get_channel_service),
+    deletions: DeletionService = Depends(get_deletion_service),
 ):
     """
     Удаляет канал. Только владелец может удалить свой канал.
+    Файлы канала удаляются из хранилища в фоне.
     """
+    # Задания очистки фиксируются тем же commit, что и удаление канала
+    await deletions.purge_channel(channel_data.owner_id, channel_data.id)
     await channel_service.delete_channel(channel_data)
+    deletions.wake()
 
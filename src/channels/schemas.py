@@ -3,7 +3,7 @@ from uuid import UUID
 from typing import Optional
 
 from ..core.Enums.ExtensionsEnums import ImageExtensionsEnum
-from ..settings.config import S3_ENV
+from ..aws.layout import public_object_url
 
 import logging
 from ..core.log import configure_logging
@@ -41,8 +41,7 @@ class ChannelReadSchema(ChannelBaseSchema):
             else:
                 ext_value = self.avatar_ext
             
-            base_url = S3_ENV.BASE_SERVER_URL
-            return f"{base_url}/minio/{self.owner_id}/channels/{self.id}/channel_avatar.{ext_value}"
+            return public_object_url(self.owner_id, f"channels/{self.id}/channel_avatar.{ext_value}")
         
         return None
     
@@ -56,7 +55,6 @@ class ChannelReadSchema(ChannelBaseSchema):
             else:
                 ext_value = self.preview_ext
             
-            base_url = S3_ENV.BASE_SERVER_URL
-            return f"{base_url}/minio/{self.owner_id}/channels/{self.id}/channel_preview.{ext_value}"
+            return public_object_url(self.owner_id, f"channels/{self.id}/channel_preview.{ext_value}")
         
         return None
\ No newline at end of file
@@ -14,7 +14,7 @@ from .models import ChannelsORM
 from .schemas import ChannelCreateSchema, ChannelReadSchema
 from .exceptions import ChannelsHTTPExceptions
 
-from ..auth.schemas import UserReadSchema
+from ..auth.schemas import CurrentUserSchema
 
 
 logger = logging.getLogger(__name__)
@@ -27,7 +27,7 @@ class ChannelService:
         self.http_exceptions = http_exceptions
         
 
-    async def create_channel(self, channel_data: ChannelCreateSchema, user_data: UserReadSchema) -> ChannelReadSchema | HTTPException:
+    async def create_channel(self, channel_data: ChannelCreateSchema, user_data: CurrentUserSchema) -> ChannelReadSchema | HTTPException:
         """
             Создает новый канал
             Args:
@@ -87,7 +87,7 @@ class ChannelService:
         
         return [ChannelReadSchema.model_validate(channel) for channel in channels]
     
-    async def get_my_channels(self, user: UserReadSchema) -> list[ChannelReadSchema]:
+    async def get_my_channels(self, user: CurrentUserSchema) -> list[ChannelReadSchema]:
         """
         Получает все каналы текущего пользователя
         Args:
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class DeletionReasonEnum(Enum):
+    USER = "user"
+    CHANNEL = "channel"
+    COURSE = "course"
+    VIDEO = "video"
+
+
+class DeletionJobStatusEnum(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
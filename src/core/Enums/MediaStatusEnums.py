@@ -0,0 +1,24 @@
+from enum import Enum
+
+
+class HlsStatusEnum(Enum):
+    NONE = "none"
+    PENDING = "pending"
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class MediaJobKindEnum(Enum):
+    HLS = "hls"
+    PROBE = "probe"
+    STORYBOARD = "storyboard"
+    DIGEST = "digest"
+    REHYDRATE = "rehydrate"
+
+
+class MediaJobStatusEnum(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
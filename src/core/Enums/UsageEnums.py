@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class UsageScopeEnum(Enum):
+    USER = "user"
+    CHANNEL = "channel"
+    COURSE = "course"
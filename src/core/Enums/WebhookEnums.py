@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class WebhookRetryStatusEnum(Enum):
+    PENDING = "pending"
+    DEAD = "dead"
@@ -0,0 +1,91 @@
+"""
+Реестр фоновых задач процесса.
+
+Подсистемы регистрируют корутины-воркеры и функции «слива» — дописать
+начатую работу (задачи обработки медиа, пачки удаления) до отмены;
+lifespan приложения запускает воркеры после прогрева и при остановке
+сначала сливает их, затем отменяет задачи.
+"""
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+from .log import configure_logging
+from .metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+WorkerFactory = Callable[[], Awaitable[None]]
+DrainCallback = Callable[[], Awaitable[None]]
+
+
+@dataclass(slots=True)
+class _Worker:
+    name: str
+    factory: WorkerFactory
+    task: Optional[asyncio.Task] = None
+
+
+class BackgroundWorkers:
+    def __init__(self):
+        self._workers: Dict[str, _Worker] = {}
+        self._drains: Dict[str, DrainCallback] = {}
+
+    def register(self, name: str, factory: WorkerFactory) -> None:
+        """Регистрирует долгоживущую корутину; запускается в ``start``"""
+        self._workers[name] = _Worker(name=name, factory=factory)
+
+    def register_drain(self, name: str, drain: DrainCallback) -> None:
+        """Регистрирует функцию, дописывающую начатую работу при остановке"""
+        self._drains[name] = drain
+
+    def start(self) -> None:
+        for worker in self._workers.values():
+            if worker.task is None or worker.task.done():
+                worker.task = asyncio.create_task(worker.factory(), name=worker.name)
+                logger.info(f"Фоновая задача {worker.name} запущена")
+
+    async def drain(self, timeout: float) -> None:
+        """Все функции слива параллельно, каждая не дольше ``timeout``"""
+        await asyncio.gather(*(self._drain_one(name, drain, timeout) for name, drain in self._drains.items()))
+
+    async def _drain_one(self, name: str, drain: DrainCallback, timeout: float) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(drain(), timeout)
+            logger.info(f"{name}: начатая работа завершена за {time.perf_counter() - started:.3f} с")
+        except asyncio.TimeoutError:
+            logger.warning(f"{name}: не дождались завершения за {timeout} с, оставшееся будет прервано")
+        except Exception:
+            logger.exception(f"{name}: не удалось завершить начатую работу")
+
+    async def stop(self, timeout: float) -> None:
+        """Дожидается начатой работы и отменяет воркеры"""
+        await self.drain(timeout)
+
+        tasks = [worker.task for worker in self._workers.values() if worker.task is not None]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(asyncio.CancelledError, Exception):
+                await asyncio.wait_for(task, timeout)
+        for worker in self._workers.values():
+            worker.task = None
+
+    def status(self) -> Dict[str, str]:
+        return {
+            name: "stopped" if worker.task is None
+            else "failed" if worker.task.done() and not worker.task.cancelled() and worker.task.exception()
+            else "done" if worker.task.done()
+            else "running"
+            for name, worker in self._workers.items()
+        }
+
+
+background_workers = BackgroundWorkers()
+register_metrics("background_workers", background_workers.status)
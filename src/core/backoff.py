@@ -0,0 +1,21 @@
+"""
+Экспоненциальная задержка повторов с джиттером.
+
+Половина задержки фиксирована, вторая половина случайна («equal jitter»):
+повторы, упавшие одновременно, расходятся во времени, но ни один не
+повторяется раньше половины расчётной паузы.
+"""
+import random
+from typing import Callable
+
+
+def backoff_delay(
+    attempt: int,
+    *,
+    base: float,
+    cap: float,
+    rand: Callable[[], float] = random.random,
+) -> float:
+    """Пауза перед повтором номер ``attempt`` (с 1): ``base · 2^(attempt-1)``, не больше ``cap``"""
+    delay = min(cap, base * 2 ** max(0, attempt - 1))
+    return delay / 2 + rand() * delay / 2
@@ -0,0 +1,48 @@
+"""
+Проверки живости и готовности воркера.
+
+Каждый процесс uvicorn отвечает за себя: ``/health/ready`` возвращает 200
+только между окончанием startup и началом shutdown, поэтому балансировщик
+не шлёт запросы в воркер, который ещё прогревается или уже останавливается.
+"""
+import os
+import time
+
+from fastapi import APIRouter, Response, status
+
+
+class WorkerReadiness:
+    def __init__(self):
+        self.ready = False
+        self.started_at = time.time()
+        self.ready_at: float | None = None
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        self.ready_at = time.time()
+
+    def mark_not_ready(self) -> None:
+        self.ready = False
+
+
+readiness = WorkerReadiness()
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+async def live() -> dict:
+    """Процесс жив и обслуживает event loop"""
+    return {"status": "ok", "pid": os.getpid()}
+
+
+@router.get("/ready")
+async def ready(response: Response) -> dict:
+    """Воркер прогрет и принимает трафик"""
+    if not readiness.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ready" if readiness.ready else "starting",
+        "pid": os.getpid(),
+        "uptime_seconds": round(time.time() - readiness.started_at, 3),
+    }
@@ -0,0 +1,32 @@
+"""
+Простейший реестр метрик процесса.
+
+Подсистемы регистрируют функцию, возвращающую словарь текущих значений,
+``GET /metrics`` отдаёт снимок всех зарегистрированных источников.
+"""
+from typing import Any, Callable, Dict
+
+from fastapi import APIRouter
+
+
+MetricsProvider = Callable[[], Dict[str, Any]]
+
+_providers: Dict[str, MetricsProvider] = {}
+
+
+def register_metrics(name: str, provider: MetricsProvider) -> None:
+    """Регистрирует (или заменяет) источник метрик под именем ``name``"""
+    _providers[name] = provider
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    return {name: provider() for name, provider in _providers.items()}
+
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def get_metrics() -> Dict[str, Dict[str, Any]]:
+    """Текущие значения метрик процесса"""
+    return snapshot()
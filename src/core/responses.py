@@ -0,0 +1,58 @@
+"""
+Быстрые JSON-ответы.
+
+``ORJSONResponse`` — класс ответа по умолчанию для всего приложения.
+``model_response``/``models_response`` — обход ``response_model`` для уже
+проверенных схем: сервис вернул готовые Pydantic-объекты, повторная валидация
+FastAPI не нужна, а сериализация выполняется в Rust одним вызовом ``dump_json``.
+``response_model`` в декораторе остаётся только для документации OpenAPI.
+"""
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Type
+
+import orjson
+from fastapi import Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+__all__ = ["ORJSONResponse", "model_response", "models_response"]
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse с кодированием через orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def model_response(
+    model: BaseModel,
+    status_code: int = status.HTTP_200_OK,
+    context: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """Ответ из одной доверенной схемы; ``context`` передаётся сериализаторам полей"""
+    return Response(
+        content=model.model_dump_json(by_alias=True, context=context),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def models_response(
+    schema: Type[BaseModel],
+    items: Iterable[BaseModel],
+    status_code: int = status.HTTP_200_OK,
+    context: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """Ответ из списка доверенных схем одного типа"""
+    return Response(
+        content=_list_adapter(schema).dump_json(list(items), by_alias=True, context=context),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..database import get_async_session
 
 
-from ..auth.schemas import UserReadSchema
+from ..auth.schemas import CurrentUserSchema
 from ..auth.dependencies import get_current_user
 
 from ..channels.dependencies import get_current_channel, get_channel_service
@@ -35,7 +35,7 @@ async def get_course_service(session: AsyncSession = Depends(get_async_session))
 
 async def get_current_course_with_owner_validate(
     course_id: UUID,
-    user: UserReadSchema               = Depends(get_current_user),
+    user: CurrentUserSchema               = Depends(get_current_user),
     course_service: CourseService      = Depends(get_course_service),
     channel_service: ChannelService    = Depends(get_channel_service),
 ) -> CourseReadSchema:
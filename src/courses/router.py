@@ -3,12 +3,16 @@ from fastapi import APIRouter, Depends, status, HTTPException
 from uuid import UUID
 
 from ..auth.dependencies import get_current_user
-from ..auth.schemas import UserReadSchema
+from ..auth.schemas import CurrentUserSchema
+from ..core.responses import model_response, models_response
 
 from ..channels.service import ChannelService
 from ..channels.dependencies import get_channel_service, get_current_channel
 from ..channels.schemas import ChannelReadSchema
 
+from ..deletions.dependencies import get_deletion_service
+from ..deletions.service import DeletionService
+
 from .dependencies import get_course_service, get_current_course_with_owner_validate
 from .service import CourseService
 from .schemas import (
@@ -22,7 +26,7 @@ router = APIRouter(tags=["Courses"])
 async def get_all_courses(
     course_service: CourseService = Depends(get_course_service),
 ):
-    return await course_service.get_all_public_courses()
+    return models_response(CourseReadSchema, await course_service.get_all_public_courses())
 
 
 
@@ -32,7 +36,7 @@ async def get_course_by_id(
     course_service: CourseService = Depends(get_course_service)
     ):
 
-    return await course_service.get_course_by_id(course_id)
+    return model_response(await course_service.get_course_by_id(course_id))
 
 
 @router.get("/users/{user_id}/channels/courses", response_model=List[CourseReadSchema])
@@ -41,7 +45,7 @@ async def get_user_courses(
     course_service: CourseService = Depends(get_course_service),
     channel_service: ChannelService = Depends(get_channel_service),
 ):
-    return await course_service.get_courses_by_user(user_id, channel_service)
+    return models_response(CourseReadSchema, await course_service.get_courses_by_user(user_id, channel_service))
 
 
 @router.post("/channels/{channel_id}/courses", response_model=CourseReadSchema, status_code=status.HTTP_201_CREATED)
@@ -57,8 +61,13 @@ async def create_course(
 async def delete_course(
     course: CourseReadSchema = Depends(get_current_course_with_owner_validate),  
     course_service: CourseService = Depends(get_course_service),
+    deletions: DeletionService = Depends(get_deletion_service),
 ):
-    return await course_service.delete_course(course.id)
+    # Видео курса удаляются каскадом — их префиксы собираем до удаления
+    video_ids = await deletions.course_video_ids(course.id)
+    await deletions.purge_course(course.owner_id, course.channel_id, course.id, video_ids)
+    await course_service.delete_course(course.id)
+    deletions.wake()
 
 
 @router.patch("/channels/{channel_id}/courses/{course_id}",
@@ -76,7 +85,7 @@ async def get_channel_courses(
     channel: ChannelReadSchema = Depends(get_current_channel),  
     course_service: CourseService = Depends(get_course_service),
 ):
-    return await course_service.get_courses_by_channel(channel)
+    return models_response(CourseReadSchema, await course_service.get_courses_by_channel(channel))
 
 # @router.get("/courses/my",
 #             response_model=List[CourseReadSchema],
@@ -86,7 +95,7 @@ async def get_channel_courses(
 #             )
 # async def get_my_courses(
 #     course_service: CourseService = Depends(get_course_service),
-#     user: UserReadSchema = Depends(get_current_user),
+#     user: CurrentUserSchema = Depends(get_current_user),
 # ):
 #     return await course_service.get_my_courses(user.id)
             
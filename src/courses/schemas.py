@@ -3,7 +3,7 @@ from uuid import UUID
 from typing import Optional, List
 from pydantic import BaseModel, Field, ConfigDict, field_serializer
 
-from ..settings.config import S3_ENV
+from ..aws.layout import public_object_url
 from ..core.Enums.ExtensionsEnums import ImageExtensionsEnum
 
 
@@ -57,7 +57,6 @@ class CourseReadSchema(CourseBaseSchema):
             else:
                 ext_value = self.preview_ext
             
-            base_url = S3_ENV.BASE_SERVER_URL
-            return f"{base_url}/minio/{self.owner_id}/channels/{self.channel_id}/courses/{self.id}/course_preview.{ext_value}"
+            return public_object_url(self.owner_id, f"channels/{self.channel_id}/courses/{self.id}/course_preview.{ext_value}")
         
         return None
\ No newline at end of file
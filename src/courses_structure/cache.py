@@ -0,0 +1,60 @@
+"""
+Кэш уже сериализованных структур курса.
+
+Ключ — пара ``(course_id, version)``: версия меняется при каждом изменении
+структуры, поэтому устаревшая запись никогда не будет отдана, даже если
+инвалидация произошла в другом воркере. Локальная инвалидация лишь
+освобождает память от старых версий.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+from uuid import UUID
+
+from ..settings.config import CACHE_ENV
+
+
+class StructureBlobCache:
+    """
+    LRU-кэш JSON-байтов ``FullStructureReadSchema``.
+    На курс хранится только одна, последняя увиденная версия.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[UUID, tuple[int, bytes]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, course_id: UUID, version: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(course_id)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(course_id)
+            return entry[1]
+
+    def put(self, course_id: UUID, version: int, blob: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            current = self._entries.get(course_id)
+            if current is not None and current[0] > version:
+                return
+            self._entries[course_id] = (version, blob)
+            self._entries.move_to_end(course_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, course_id: UUID) -> None:
+        with self._lock:
+            self._entries.pop(course_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+structure_cache = StructureBlobCache(CACHE_ENV.STRUCTURE_CACHE_MAX_ENTRIES)
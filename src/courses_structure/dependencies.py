@@ -14,6 +14,7 @@ from ..permissions.dependencies import get_permissions_service
 from ..channels.dependencies import get_channel_service
 from ..channels.service import ChannelService
 
+from .cache import structure_cache
 from .exceptions import CourseStructureHTTPExceptions
 from .repository import CourseStructureRepository
 from .service import CourseStructureService
@@ -24,4 +25,4 @@ from .service import CourseStructureService
 async def get_course_structure_service(session: AsyncSession = Depends(get_async_session)) -> CourseStructureService:
     repository = CourseStructureRepository(session)
     exceptions = CourseStructureHTTPExceptions()
-    return CourseStructureService(repository, exceptions)
+    return CourseStructureService(repository, exceptions, structure_cache)
@@ -23,4 +23,10 @@ class CourseStructureHTTPExceptions(AbstractHTTPExceptions):
         return HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=detail
-        )
\ No newline at end of file
+        )
+
+    def unprocessable_422(self, detail: str = "Invalid structure patch") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=detail
+        )
@@ -0,0 +1,187 @@
+"""
+Разбор и валидация операций RFC 6902 (JSON Patch) для структуры курса.
+
+Проверяется только то поддерево схемы, в которое указывает операция:
+путь разворачивается по полям Pydantic-моделей ``StructureBaseSchema``,
+а значение валидируется ``TypeAdapter``-ом конечного поля.
+Сами изменения применяются в SQL (см. ``CourseStructureRepository.patch_structure``).
+"""
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Annotated, ForwardRef, List, Optional, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic.fields import FieldInfo
+
+from .schemas import StructureBaseSchema, JsonPatchOperationSchema
+
+
+class JsonPatchError(ValueError):
+    """Операция JSON Patch не может быть применена к структуре курса."""
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPatchOperation:
+    """Проверенная операция, готовая к переводу в SQL"""
+    op: str
+    path: tuple[str, ...]
+    from_path: Optional[tuple[str, ...]] = None
+    value: Any = None
+    is_array_item: bool = False
+    is_append: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class _ResolvedPath:
+    annotation: Any
+    field: Optional[FieldInfo]
+    is_array_item: bool
+    is_append: bool
+
+
+def parse_pointer(pointer: str) -> tuple[str, ...]:
+    """JSON Pointer (RFC 6901) → кортеж сегментов."""
+    if pointer == "":
+        return ()
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Некорректный JSON Pointer: {pointer!r}")
+    return tuple(
+        segment.replace("~1", "/").replace("~0", "~")
+        for segment in pointer[1:].split("/")
+    )
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _evaluate(annotation: Any, owner: type) -> Any:
+    if isinstance(annotation, str):
+        annotation = ForwardRef(annotation)
+    if isinstance(annotation, ForwardRef):
+        namespace = vars(sys.modules[owner.__module__])
+        return namespace[annotation.__forward_arg__]
+    return annotation
+
+
+def _resolve(path: tuple[str, ...], *, allow_append: bool) -> _ResolvedPath:
+    if not path:
+        raise JsonPatchError("Операции над корнем документа не поддерживаются, используйте полное обновление")
+
+    annotation: Any = StructureBaseSchema
+    owner: type = StructureBaseSchema
+    field: Optional[FieldInfo] = None
+    is_array_item = False
+    is_append = False
+
+    for position, segment in enumerate(path):
+        is_last = position == len(path) - 1
+        current = _unwrap_optional(_evaluate(annotation, owner))
+
+        if isinstance(current, type) and issubclass(current, BaseModel):
+            if segment not in current.model_fields:
+                raise JsonPatchError(f"Поле {segment!r} отсутствует в {current.__name__}")
+            if is_last and current.__pydantic_decorators__.model_validators:
+                raise JsonPatchError(
+                    f"Поля {current.__name__} зависят друг от друга — заменяйте элемент целиком"
+                )
+            owner = current
+            field = current.model_fields[segment]
+            annotation = field.annotation
+            is_array_item = False
+
+        elif get_origin(current) in (list, List):
+            if segment == "-":
+                if not (is_last and allow_append):
+                    raise JsonPatchError("Индекс '-' допустим только в конце пути операции add")
+                is_append = True
+            elif not segment.isdigit() or (len(segment) > 1 and segment.startswith("0")):
+                raise JsonPatchError(f"Некорректный индекс массива: {segment!r}")
+            annotation = get_args(current)[0]
+            field = None
+            is_array_item = True
+
+        else:
+            raise JsonPatchError(f"Путь /{'/'.join(path)} ведёт внутрь скалярного значения")
+
+    return _ResolvedPath(
+        annotation=_evaluate(annotation, owner),
+        field=field,
+        is_array_item=is_array_item,
+        is_append=is_append,
+    )
+
+
+@lru_cache(maxsize=64)
+def _adapter(path_shape: tuple[str, ...]) -> TypeAdapter:
+    """TypeAdapter для поддерева; индексы массивов схлопнуты, чтобы кэш не разрастался."""
+    resolved = _resolve(path_shape, allow_append=True)
+    if resolved.field is not None:
+        return TypeAdapter(Annotated[resolved.annotation, resolved.field])
+    return TypeAdapter(resolved.annotation)
+
+
+def _shape(path: tuple[str, ...]) -> tuple[str, ...]:
+    return tuple("0" if segment.isdigit() or segment == "-" else segment for segment in path)
+
+
+def _validate_value(path: tuple[str, ...], value: Any) -> Any:
+    adapter = _adapter(_shape(path))
+    try:
+        validated = adapter.validate_python(value)
+    except ValidationError as exc:
+        raise JsonPatchError(f"Некорректное значение для /{'/'.join(path)}: {exc.errors()}") from exc
+    return adapter.dump_python(validated, mode="json")
+
+
+def compile_patch(operations: List[JsonPatchOperationSchema]) -> List[CompiledPatchOperation]:
+    """Проверяет операции и возвращает их в виде, пригодном для построения SQL."""
+    compiled: List[CompiledPatchOperation] = []
+
+    for operation in operations:
+        path = parse_pointer(operation.path)
+        has_value = "value" in operation.model_fields_set
+
+        if operation.op in ("add", "replace", "test") and not has_value:
+            raise JsonPatchError(f"Операция {operation.op} требует поле value")
+        if operation.op in ("move", "copy") and operation.from_ is None:
+            raise JsonPatchError(f"Операция {operation.op} требует поле from")
+
+        target = _resolve(path, allow_append=operation.op in ("add", "move", "copy"))
+
+        if operation.op == "remove" and not target.is_array_item:
+            raise JsonPatchError("remove допустим только для элементов массивов")
+
+        from_path: Optional[tuple[str, ...]] = None
+        if operation.from_ is not None and operation.op in ("move", "copy"):
+            from_path = parse_pointer(operation.from_)
+            source = _resolve(from_path, allow_append=False)
+            if _shape(from_path) != _shape(path) and source.annotation is not target.annotation:
+                raise JsonPatchError("Источник и приёмник операции имеют разные типы")
+            if operation.op == "move" and not source.is_array_item:
+                raise JsonPatchError("move допустим только для элементов массивов")
+            if operation.op == "move" and path[:len(from_path)] == from_path:
+                raise JsonPatchError("Нельзя переместить элемент внутрь самого себя")
+
+        value = None
+        if operation.op in ("add", "replace"):
+            value = _validate_value(path, operation.value)
+        elif operation.op == "test":
+            value = operation.value
+
+        compiled.append(CompiledPatchOperation(
+            op=operation.op,
+            path=path,
+            from_path=from_path,
+            value=value,
+            is_array_item=target.is_array_item,
+            is_append=target.is_append,
+        ))
+
+    return compiled
@@ -1,13 +1,100 @@
 from uuid import UUID
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Tuple
 
-from sqlalchemy import update
+from sqlalchemy import Boolean, Text, and_, case, cast, func, literal, null, select, true, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, JSONPATH
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.elements import ColumnElement
 
+from ..courses.models import CoursesORM
 from ..core.AbstractRepository import AbstractRepository
+from .json_patch import CompiledPatchOperation
 from .models import  CoursesStructureORM
 
 
+# jsonb_set с индексом за пределами массива и create_missing=true дописывает элемент в конец
+_APPEND_INDEX = str(2**31 - 1)
+
+
+def _text_path(path: Sequence[str]) -> ColumnElement:
+    return literal(list(path), ARRAY(Text))
+
+
+def _jsonb(value) -> ColumnElement:
+    return cast(literal(value, JSONB), JSONB)
+
+
+def _get(doc: ColumnElement, path: Sequence[str]) -> ColumnElement:
+    return doc.op("#>", return_type=JSONB)(_text_path(path))
+
+
+def _jsonpath(expression: str) -> ColumnElement:
+    return cast(literal(expression), JSONPATH)
+
+
+def _as_text(value: ColumnElement) -> ColumnElement:
+    return value.op("#>>", return_type=Text)(_text_path(()))
+
+
+def _path_count(doc: ColumnElement, expression: str) -> ColumnElement:
+    """Количество объектов, найденных jsonpath-выражением"""
+    return func.jsonb_array_length(func.jsonb_path_query_array(doc, _jsonpath(expression)))
+
+
+def _guard(condition: ColumnElement, doc: ColumnElement) -> ColumnElement:
+    """NULL «отравляет» весь документ — так SQL сообщает о проваленной проверке"""
+    return case((condition, doc), else_=null().cast(JSONB))
+
+
+def _add(doc: ColumnElement, operation: CompiledPatchOperation, value: ColumnElement) -> ColumnElement:
+    path, parent = operation.path, operation.path[:-1]
+    if operation.is_append:
+        return _guard(
+            func.jsonb_typeof(_get(doc, parent)) == "array",
+            func.jsonb_set(doc, _text_path((*parent, _APPEND_INDEX)), value, True, type_=JSONB),
+        )
+    if operation.is_array_item:
+        return _guard(
+            and_(
+                func.jsonb_typeof(_get(doc, parent)) == "array",
+                func.jsonb_array_length(_get(doc, parent)) >= int(path[-1]),
+            ),
+            func.jsonb_insert(doc, _text_path(path), value, False, type_=JSONB),
+        )
+    return _guard(
+        func.jsonb_typeof(_get(doc, parent)) == "object",
+        func.jsonb_set(doc, _text_path(path), value, True, type_=JSONB),
+    )
+
+
+def _apply(doc: ColumnElement, operation: CompiledPatchOperation) -> ColumnElement:
+    path = operation.path
+
+    if operation.op == "add":
+        return _add(doc, operation, _jsonb(operation.value))
+
+    if operation.op == "replace":
+        return _guard(
+            _get(doc, path).isnot(None),
+            func.jsonb_set(doc, _text_path(path), _jsonb(operation.value), False, type_=JSONB),
+        )
+
+    if operation.op == "remove":
+        return _guard(_get(doc, path).isnot(None), doc.op("#-", return_type=JSONB)(_text_path(path)))
+
+    if operation.op == "test":
+        return _guard(_get(doc, path) == _jsonb(operation.value), doc)
+
+    source = _get(doc, operation.from_path)
+    if operation.op == "copy":
+        return _guard(source.isnot(None), _add(doc, operation, source))
+
+    # move = remove(from) + add(path) над одним и тем же промежуточным документом
+    without_source = doc.op("#-", return_type=JSONB)(_text_path(operation.from_path))
+    return _guard(source.isnot(None), _add(without_source, operation, source))
+
+
 
 class CourseStructureRepository(AbstractRepository[CoursesStructureORM]):
     def __init__(self, session: AsyncSession):
@@ -37,10 +124,127 @@ class CourseStructureRepository(AbstractRepository[CoursesStructureORM]):
         query = (
             update(self.model)
             .where(self.model.id == course_id)
-            .values(structure=new_entity.structure)
+            .values(structure=new_entity.structure, version=self.model.version + 1)
             .returning(self.model)
         )
         result = await self.session.execute(query)
 
         await self.session.commit()
-        return result.scalar_one_or_none()
\ No newline at end of file
+        return result.scalar_one_or_none()
+
+    async def get_version(self, course_id: UUID) -> Optional[int]:
+        """Текущая версия структуры без чтения самого документа"""
+        query = select(self.model.version).where(self.model.id == course_id)
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def patch_structure(
+        self,
+        course_id: UUID,
+        expected_version: int,
+        operations: List[CompiledPatchOperation],
+    ) -> Optional[int]:
+        """
+        Применяет операции JSON Patch одним UPDATE через jsonb_set/jsonb_insert/#-.
+        Документ не покидает БД; обновление проходит только при совпадении версии
+        и успешных проверках всех операций. Возвращает новую версию или None.
+        """
+        current = aliased(self.model)
+        # Каждая операция — отдельное CTE над результатом предыдущей,
+        # чтобы размер SQL рос линейно от числа операций
+        patched = (
+            select(current.structure.label("structure"))
+            .where(current.id == course_id)
+            .cte("patch_step_0")
+        )
+        for step, operation in enumerate(operations, start=1):
+            patched = (
+                select(_apply(patched.c.structure, operation).label("structure"))
+                .cte(f"patch_step_{step}")
+            )
+        query = (
+            update(self.model)
+            .where(
+                self.model.id == course_id,
+                self.model.version == expected_version,
+                patched.c.structure.isnot(None),
+            )
+            .values(structure=patched.c.structure, version=self.model.version + 1)
+            .returning(self.model.version)
+        )
+        result = await self.session.execute(query)
+
+        await self.session.commit()
+        return result.scalar_one_or_none()
+
+    async def get_outline(self, course_id: UUID) -> Tuple[Optional[int], List[dict]]:
+        """
+        Оглавление структуры: по строке на элемент ``content`` с именем и счётчиками.
+        Вложенные уроки и подмодули не выходят из Postgres.
+        """
+        items = (
+            func.jsonb_path_query(self.model.structure, _jsonpath("$.content[*]"))
+            .table_valued("value", with_ordinality="ordinality")
+            .lateral("items")
+        )
+        item = items.c.value
+        query = (
+            select(
+                self.model.version,
+                (items.c.ordinality - 1).label("index"),
+                _as_text(func.jsonb_path_query_first(
+                    item, _jsonpath('$.keyvalue() ? (@.value.type() == "object").key')
+                )).label("kind"),
+                _as_text(func.jsonb_path_query_first(item, _jsonpath("$.*.name"))).label("name"),
+                cast(func.jsonb_path_query_first(item, _jsonpath("$.module.is_active")), Boolean).label("is_active"),
+                _path_count(item, '$.module.submodules[*] ? (@.type() == "object")').label("submodules_count"),
+                (
+                    _path_count(item, '$.module.submodules[*].lessons[*] ? (@.type() == "object")')
+                    + _path_count(item, '$.submodule.lessons[*] ? (@.type() == "object")')
+                ).label("lessons_count"),
+            )
+            .select_from(self.model)
+            .join(items, true())
+            .where(self.model.id == course_id)
+            .order_by(items.c.ordinality)
+        )
+        result = await self.session.execute(query)
+        rows = result.mappings().all()
+        if not rows:
+            return await self.get_version(course_id), []
+
+        version = rows[0]["version"]
+        return version, [{key: row[key] for key in row.keys() if key != "version"} for row in rows]
+
+    async def get_subtree(self, course_id: UUID, expression: str, **variables: int) -> Tuple[bool, Any]:
+        """
+        Поддерево структуры по jsonpath-выражению с переменными (``$.content[$item]``).
+        Возвращает (структура существует, найденное значение или None).
+        """
+        query = (
+            select(
+                func.jsonb_path_query_first(
+                    self.model.structure,
+                    _jsonpath(expression),
+                    cast(literal(variables, JSONB), JSONB),
+                )
+            )
+            .where(self.model.id == course_id)
+        )
+        result = await self.session.execute(query)
+        row = result.first()
+        if row is None:
+            return False, None
+        return True, row[0]
+
+    async def get_hottest(self, limit: int) -> List[CoursesStructureORM]:
+        """Структуры публичных курсов с наибольшим числом студентов"""
+        query = (
+            select(self.model)
+            .join(CoursesORM, CoursesORM.id == self.model.id)
+            .where(CoursesORM.is_public.is_(True))
+            .order_by(CoursesORM.student_count.desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
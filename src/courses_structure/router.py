@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, Depends, status, Path, Body
+from fastapi import APIRouter, Depends, Header, Response, status, Path, Body
 from uuid import UUID
 
 
@@ -14,7 +14,11 @@ from ..permissions.dependencies import require_permission
 
 from .dependencies import get_course_structure_service
 from .service import CourseStructureService
-from .schemas import FullStructureReadSchema, FullStructureCreateSchema
+from .schemas import (
+    FullStructureReadSchema, FullStructureCreateSchema,
+    StructurePatchSchema, StructureVersionReadSchema,
+    StructureOutlineReadSchema, StructureItemSchema, StructureSubModuleReadSchema,
+)
 
 
 from ..courses.schemas import CourseReadSchema
@@ -36,6 +40,7 @@ router = APIRouter(
 )
 async def get_course_structure(
     course_id: UUID = Path(..., alias="course_id"),
+    if_none_match: str | None = Header(None),
 
     _: None | PermissionReadSchema = Depends(
         require_permission(access_level=None, skip_if_public=True)
@@ -46,8 +51,66 @@ async def get_course_structure(
     Если курс public → проверка не нужна;  
     если private → у пользователя должно быть **любое** живое право,
     иначе 403.
+
+    Тело отдаётся из кэша сериализованных структур, ETag — версия структуры.
     """
-    return await service.get_full_structure(course_id)
+    version, blob = await service.get_full_structure_json(course_id)
+    etag = f'"{course_id}:{version}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=blob, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/outline",
+    response_model=StructureOutlineReadSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Оглавление курса: элементы верхнего уровня и счётчики",
+)
+async def get_course_outline(
+    course_id: UUID = Path(..., alias="course_id"),
+    _: None | PermissionReadSchema = Depends(
+        require_permission(access_level=None, skip_if_public=True)
+    ),
+    service: CourseStructureService = Depends(get_course_structure_service),
+):
+    return await service.get_outline(course_id)
+
+
+@router.get(
+    "/items/{item_index}",
+    response_model=StructureItemSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Поддерево одного элемента структуры",
+)
+async def get_structure_item(
+    course_id: UUID = Path(..., alias="course_id"),
+    item_index: int = Path(..., ge=0),
+    _: None | PermissionReadSchema = Depends(
+        require_permission(access_level=None, skip_if_public=True)
+    ),
+    service: CourseStructureService = Depends(get_course_structure_service),
+):
+    return await service.get_item(course_id, item_index)
+
+
+@router.get(
+    "/items/{item_index}/submodules/{submodule_index}",
+    response_model=StructureSubModuleReadSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Подмодуль с уроками",
+)
+async def get_structure_submodule(
+    course_id: UUID = Path(..., alias="course_id"),
+    item_index: int = Path(..., ge=0),
+    submodule_index: int = Path(..., ge=0),
+    _: None | PermissionReadSchema = Depends(
+        require_permission(access_level=None, skip_if_public=True)
+    ),
+    service: CourseStructureService = Depends(get_course_structure_service),
+):
+    return await service.get_submodule(course_id, item_index, submodule_index)
 
 
 @router.post(
@@ -86,4 +149,28 @@ async def update_structure(
     structure_data: FullStructureCreateSchema = Body(...),
     service: CourseStructureService = Depends(get_course_structure_service),
 ):
-    return await service.update_structure_for_course(course_id, structure_data.structure)
\ No newline at end of file
+    return await service.update_structure_for_course(course_id, structure_data.structure)
+
+
+@router.patch(
+    "/operations",
+    response_model=StructureVersionReadSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Точечное обновление структуры операциями JSON Patch (RFC 6902)"
+)
+async def patch_structure(
+    course_id: UUID = Path(..., alias="course_id"),
+    _: PermissionReadSchema = Depends(
+        require_permission(
+            access_level={PermissionsEnum.OWNER, PermissionsEnum.HIGH_MODERATOR},
+            skip_if_public=False,
+        )
+    ),
+    patch_data: StructurePatchSchema = Body(...),
+    service: CourseStructureService = Depends(get_course_structure_service),
+):
+    """
+    Пути указываются относительно структуры: ``/content/{i}/module/name``.  
+    При несовпадении ``version`` с текущей возвращается 409.
+    """
+    return await service.patch_structure_for_course(course_id, patch_data)
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Any, Literal, Optional, List
 from pydantic import BaseModel, Field, ConfigDict, model_validator
 
 
@@ -73,4 +73,41 @@ class FullStructureBaseSchema(BaseModel):
 class FullStructureCreateSchema(FullStructureBaseSchema):pass
 class FullStructureUpdateSchema(FullStructureBaseSchema):pass
 class FullStructureReadSchema(FullStructureBaseSchema):
+    version: int = Field(1, description="Версия структуры, увеличивается при каждом изменении")
     model_config = ConfigDict(from_attributes=True)
+
+
+class JsonPatchOperationSchema(BaseModel):
+    """Операция RFC 6902; пути указываются относительно документа структуры (``/content/0/...``)"""
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str = Field(..., description="JSON Pointer на изменяемый узел")
+    from_: Optional[str] = Field(None, alias="from", description="JSON Pointer источника для move/copy")
+    value: Any = Field(None, description="Новое значение для add/replace/test")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class StructurePatchSchema(BaseModel):
+    """Набор операций, применяемых к конкретной версии структуры"""
+    version: int = Field(..., ge=1, description="Версия, относительно которой составлен патч")
+    operations: List[JsonPatchOperationSchema] = Field(..., min_length=1, max_length=200)
+
+
+class StructureVersionReadSchema(BaseModel):
+    version: int = Field(description="Текущая версия структуры")
+
+
+class StructureOutlineItemSchema(BaseModel):
+    """Верхнеуровневый элемент структуры без вложенного содержимого"""
+    index: int = Field(description="Позиция элемента в content")
+    kind: Literal["module", "submodule", "lesson"] = Field(description="Тип элемента")
+    name: str = Field(description="Название элемента")
+    is_active: Optional[bool] = Field(None, description="Активность модуля")
+    submodules_count: int = Field(0, description="Количество подмодулей")
+    lessons_count: int = Field(0, description="Количество уроков внутри элемента")
+
+
+class StructureOutlineReadSchema(BaseModel):
+    """Оглавление курса для боковой панели"""
+    version: int = Field(description="Версия структуры")
+    items: List[StructureOutlineItemSchema]
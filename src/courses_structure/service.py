@@ -1,8 +1,15 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 
+from .cache import StructureBlobCache
 from .exceptions import CourseStructureHTTPExceptions
-from .schemas import FullStructureReadSchema, FullStructureCreateSchema
+from .schemas import (
+    FullStructureReadSchema, FullStructureCreateSchema,
+    StructurePatchSchema, StructureVersionReadSchema,
+    StructureOutlineReadSchema, StructureOutlineItemSchema,
+    StructureItemSchema, StructureSubModuleReadSchema,
+)
+from .json_patch import JsonPatchError, compile_patch
 from .models import CoursesStructureORM
 from .repository import  CourseStructureRepository
 
@@ -11,10 +18,17 @@ from .repository import  CourseStructureRepository
 
 class CourseStructureService:
     def __init__(self, repository: CourseStructureRepository, 
-                 http_exceptions: CourseStructureHTTPExceptions
+                 http_exceptions: CourseStructureHTTPExceptions,
+                 cache: StructureBlobCache
     ): 
         self.repository = repository
         self.http_exceptions = http_exceptions
+        self.cache = cache
+
+    def _remember(self, course_id: UUID, schema: FullStructureReadSchema) -> bytes:
+        blob = schema.model_dump_json().encode()
+        self.cache.put(course_id, schema.version, blob)
+        return blob
 
 
     async def create_structure_for_course(
@@ -30,18 +44,32 @@ class CourseStructureService:
             raise self.http_exceptions.conflict_409()
 
         created = await self.repository.create(orm_obj)
-        return FullStructureReadSchema(**created.__dict__)
+        result = FullStructureReadSchema(**created.__dict__)
+        self._remember(course_id, result)
+        return result
 
-    async def get_full_structure(
+    async def get_full_structure_json(
         self,
         course_id: UUID
-    ) -> FullStructureReadSchema:
-        orm_obj = await self.repository.get_by_id(course_id)
+    ) -> Tuple[int, bytes]:
+        """
+        Версия и готовый JSON структуры.
+        При попадании в кэш читается только версия, JSONB и Pydantic не трогаются.
+        """
+        version = await self.repository.get_version(course_id)
+        if version is None:
+            raise self.http_exceptions.not_found_404()
 
+        blob = self.cache.get(course_id, version)
+        if blob is not None:
+            return version, blob
+
+        orm_obj = await self.repository.get_by_id(course_id)
         if not orm_obj:
             raise self.http_exceptions.not_found_404()
-        
-        return FullStructureReadSchema(**orm_obj.__dict__)
+
+        schema = FullStructureReadSchema.model_validate(orm_obj)
+        return schema.version, self._remember(course_id, schema)
     
     async def update_structure_for_course(
         self,
@@ -52,8 +80,92 @@ class CourseStructureService:
             id=course_id,
             structure=body.model_dump(mode="python")  # raw dict → JSONB
         )
+        self.cache.invalidate(course_id)
         created = await self.repository.update_structure(course_id, new_entity=orm_obj)
-        return FullStructureReadSchema(**created.__dict__)
+        if created is None:
+            raise self.http_exceptions.not_found_404()
+        result = FullStructureReadSchema(**created.__dict__)
+        self._remember(course_id, result)
+        return result
+
+    async def patch_structure_for_course(
+        self,
+        course_id: UUID,
+        body: StructurePatchSchema
+    ) -> StructureVersionReadSchema:
+        """
+        Применяет RFC 6902 операции к версии ``body.version``.
+        Валидируются только затронутые поддеревья, документ меняется в SQL.
+        """
+        try:
+            operations = compile_patch(body.operations)
+        except JsonPatchError as exc:
+            raise self.http_exceptions.unprocessable_422(str(exc))
+
+        self.cache.invalidate(course_id)
+        new_version = await self.repository.patch_structure(course_id, body.version, operations)
+        if new_version is not None:
+            return StructureVersionReadSchema(version=new_version)
+
+        current_version = await self.repository.get_version(course_id)
+        if current_version is None:
+            raise self.http_exceptions.not_found_404()
+        if current_version != body.version:
+            raise self.http_exceptions.conflict_409(
+                f"Structure version conflict: expected {body.version}, current {current_version}"
+            )
+        raise self.http_exceptions.conflict_409("Patch could not be applied: test failed or path does not exist")
+
+    async def get_outline(self, course_id: UUID) -> StructureOutlineReadSchema:
+        """Модули и счётчики без вложенного содержимого"""
+        version, items = await self.repository.get_outline(course_id)
+        if version is None:
+            raise self.http_exceptions.not_found_404()
+
+        return StructureOutlineReadSchema(
+            version=version,
+            items=[StructureOutlineItemSchema(**item) for item in items],
+        )
+
+    async def get_item(self, course_id: UUID, item_index: int) -> StructureItemSchema:
+        """Один элемент content со всем его поддеревом"""
+        exists, value = await self.repository.get_subtree(
+            course_id, "$.content[$item]", item=item_index
+        )
+        if not exists:
+            raise self.http_exceptions.not_found_404()
+        if value is None:
+            raise self.http_exceptions.not_found_404("Structure item not found")
+
+        return StructureItemSchema.model_validate(value)
+
+    async def get_submodule(
+        self,
+        course_id: UUID,
+        item_index: int,
+        submodule_index: int
+    ) -> StructureSubModuleReadSchema:
+        """Подмодуль модуля по паре индексов"""
+        exists, value = await self.repository.get_subtree(
+            course_id,
+            "$.content[$item].module.submodules[$submodule]",
+            item=item_index,
+            submodule=submodule_index,
+        )
+        if not exists:
+            raise self.http_exceptions.not_found_404()
+        if value is None:
+            raise self.http_exceptions.not_found_404("Submodule not found")
+
+        return StructureSubModuleReadSchema.model_validate(value)
+
+    async def preload_cache(self, limit: int) -> int:
+        """Прогрев кэша структурами самых популярных публичных курсов"""
+        loaded = 0
+        for orm_obj in await self.repository.get_hottest(limit):
+            self._remember(orm_obj.id, FullStructureReadSchema.model_validate(orm_obj))
+            loaded += 1
+        return loaded
 
     async def open_module(self, course_id: UUID, module_id: UUID): pass
 
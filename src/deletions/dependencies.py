@@ -0,0 +1,12 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_async_session
+
+from .repository import DeletionJobRepository
+from .service import DeletionService
+from .worker import purge_worker
+
+
+async def get_deletion_service(session: AsyncSession = Depends(get_async_session)) -> DeletionService:
+    return DeletionService(DeletionJobRepository(session), purge_worker)
@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime, UTC
+
+from sqlalchemy import BigInteger, Boolean, Integer, String, Text, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+from ..core.Enums.DeletionEnums import DeletionJobStatusEnum
+
+
+class DeletionJobORM(Base):
+    """
+    Очистка префикса в хранилище после удаления владельца строк в БД.
+    ``cursor`` — последний удалённый ключ: прерванная задача продолжает
+    листинг с него, а счётчики показывают прогресс.
+    """
+    __tablename__ = "storage_deletion_jobs"
+
+    id:              Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        default=uuid.uuid4,
+        primary_key=True
+    )
+    bucket:          Mapped[str] = mapped_column(String(63), nullable=False)
+    prefix:          Mapped[str] = mapped_column(String(1024), nullable=False, default="")
+    drop_bucket:     Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    reason:          Mapped[str] = mapped_column(String(16), nullable=False)
+    status:          Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        default=DeletionJobStatusEnum.QUEUED.value,
+        index=True
+    )
+    cursor:          Mapped[str | None] = mapped_column(Text, nullable=True)
+    deleted_objects: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    deleted_bytes:   Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    attempts:        Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error:           Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at:      Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+    started_at:      Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at:    Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at:     Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,115 @@
+from uuid import UUID
+from datetime import datetime, timedelta, UTC
+from typing import List, Optional, Sequence
+
+from sqlalchemy import select, update, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import DeletionJobORM
+from .schemas import PurgeTargetSchema
+
+from ..videos.models import VideoORM
+from ..core.AbstractRepository import AbstractRepository
+from ..core.Enums.DeletionEnums import DeletionJobStatusEnum, DeletionReasonEnum
+
+import logging
+from ..core.log import configure_logging
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+class DeletionJobRepository(AbstractRepository[DeletionJobORM]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, DeletionJobORM)
+
+    async def enqueue(self, targets: Sequence[PurgeTargetSchema], reason: DeletionReasonEnum) -> List[DeletionJobORM]:
+        """Без commit: задания фиксируются в одной транзакции с удалением записи из БД"""
+        jobs = [
+            DeletionJobORM(
+                bucket=target.bucket,
+                prefix=target.prefix,
+                drop_bucket=target.drop_bucket,
+                reason=reason.value,
+                status=DeletionJobStatusEnum.QUEUED.value,
+                deleted_objects=0,
+                deleted_bytes=0,
+                attempts=0,
+            )
+            for target in targets
+        ]
+        self.session.add_all(jobs)
+        await self.session.flush()
+        return jobs
+
+    async def course_video_ids(self, course_id: UUID) -> List[UUID]:
+        """Видео курса — удаляются каскадом вместе с курсом, их файлы нужно найти заранее"""
+        result = await self.session.execute(select(VideoORM.id).where(VideoORM.course_id == course_id))
+        return list(result.scalars().all())
+
+    async def claim(self, *, limit: int, stale_after: timedelta, max_attempts: int) -> List[DeletionJobORM]:
+        """
+        Забирает до ``limit`` задач: из очереди и те, чей воркер перестал
+        отмечаться (``heartbeat_at`` старше ``stale_after``).
+        """
+        now = datetime.now(UTC)
+        candidates = (
+            select(self.model.id)
+            .where(
+                self.model.attempts < max_attempts,
+                or_(
+                    self.model.status == DeletionJobStatusEnum.QUEUED.value,
+                    and_(
+                        self.model.status == DeletionJobStatusEnum.RUNNING.value,
+                        self.model.heartbeat_at < now - stale_after,
+                    ),
+                ),
+            )
+            .order_by(self.model.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            update(self.model)
+            .where(self.model.id.in_(candidates.scalar_subquery()))
+            .values(
+                status=DeletionJobStatusEnum.RUNNING.value,
+                started_at=now,
+                heartbeat_at=now,
+                attempts=self.model.attempts + 1,
+            )
+            .returning(self.model)
+        )
+        jobs = list((await self.session.execute(query)).scalars().all())
+        await self.session.commit()
+        return jobs
+
+    async def progress(self, job_id: UUID, *, cursor: Optional[str], objects: int, size: int) -> None:
+        """Сдвигает курсор и счётчики после удалённой пачки; заодно heartbeat"""
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id == job_id)
+            .values(
+                cursor=cursor,
+                deleted_objects=self.model.deleted_objects + objects,
+                deleted_bytes=self.model.deleted_bytes + size,
+                heartbeat_at=datetime.now(UTC),
+            )
+        )
+        await self.session.commit()
+
+    async def finish(self, job_id: UUID) -> None:
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id == job_id)
+            .values(status=DeletionJobStatusEnum.DONE.value, finished_at=datetime.now(UTC), error=None)
+        )
+        await self.session.commit()
+
+    async def fail(self, job_id: UUID, error: str, *, retry: bool) -> None:
+        status = DeletionJobStatusEnum.QUEUED if retry else DeletionJobStatusEnum.FAILED
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id == job_id)
+            .values(status=status.value, finished_at=datetime.now(UTC), error=error[-4000:])
+        )
+        await self.session.commit()
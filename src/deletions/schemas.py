@@ -0,0 +1,9 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class PurgeTargetSchema(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    bucket: str = Field(description="Бакет владельца")
+    prefix: str = Field(default="", description="Префикс ключей; пустой — весь бакет")
+    drop_bucket: bool = Field(default=False, description="Удалить бакет после очистки")
@@ -0,0 +1,73 @@
+from typing import List, Sequence
+from uuid import UUID
+
+from .repository import DeletionJobRepository
+from .schemas import PurgeTargetSchema
+from .worker import PurgeWorker
+
+from ..aws.layout import LAYOUT, channel_prefix, cold_object, course_prefix, locate, video_prefix
+from ..core.Enums.DeletionEnums import DeletionReasonEnum
+
+import logging
+from ..core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+class DeletionService:
+    """
+    Ставит очистку хранилища в очередь; сами объекты удаляет ``PurgeWorker``.
+
+    ``purge_*`` не коммитят: задания добавляются в сессию запроса до удаления
+    записи и фиксируются тем же commit, что и удаление. Так не бывает ни
+    удалённой записи без очистки, ни очистки файлов живой записи.
+    После commit нужно вызвать ``wake``.
+    """
+
+    def __init__(self, repository: DeletionJobRepository, worker: PurgeWorker):
+        self.repository = repository
+        self.worker = worker
+
+    async def _enqueue(self, targets: Sequence[PurgeTargetSchema], reason: DeletionReasonEnum) -> None:
+        await self.repository.enqueue(targets, reason)
+        logger.debug(f"Очистка хранилища ({reason.value}): {[f'{t.bucket}/{t.prefix}' for t in targets]}")
+
+    def wake(self) -> None:
+        self.worker.wake()
+
+    async def purge_user(self, user_id: UUID) -> None:
+        """Все объекты пользователя; собственный бакет (режим per_user) удаляется целиком"""
+        bucket, root = locate(user_id, "")
+        cold_bucket, cold_root = cold_object(user_id, "")
+        await self._enqueue(
+            [
+                PurgeTargetSchema(bucket=bucket, prefix=root, drop_bucket=not LAYOUT.shared),
+                PurgeTargetSchema(bucket=cold_bucket, prefix=cold_root),
+            ],
+            DeletionReasonEnum.USER,
+        )
+
+    async def purge_channel(self, owner_id: UUID, channel_id: str) -> None:
+        prefix = f"{channel_prefix(channel_id)}/"
+        targets = [locate(owner_id, prefix), cold_object(owner_id, prefix)]
+        await self._enqueue(
+            [PurgeTargetSchema(bucket=bucket, prefix=prefix) for bucket, prefix in targets],
+            DeletionReasonEnum.CHANNEL,
+        )
+
+    async def course_video_ids(self, course_id: UUID) -> List[UUID]:
+        """Вызывается до удаления курса: его видео уйдут из БД каскадом"""
+        return await self.repository.course_video_ids(course_id)
+
+    async def purge_course(
+        self, owner_id: UUID, channel_id: str, course_id: UUID, video_ids: Sequence[UUID]
+    ) -> None:
+        prefixes = [course_prefix(channel_id, course_id)] + [video_prefix(channel_id, video_id) for video_id in video_ids]
+        # Холодные файлы видео лежат в отдельном бакете под тем же путём
+        targets = [locate(owner_id, f"{prefix}/") for prefix in prefixes]
+        targets += [cold_object(owner_id, f"{video_prefix(channel_id, video_id)}/") for video_id in video_ids]
+        await self._enqueue(
+            [PurgeTargetSchema(bucket=bucket, prefix=prefix) for bucket, prefix in targets],
+            DeletionReasonEnum.COURSE,
+        )
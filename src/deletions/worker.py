@@ -0,0 +1,169 @@
+"""
+Фоновая очистка хранилища после удаления пользователей, каналов и курсов.
+
+Удаление в запросе только ставит задачу: листинг крупного канала может
+занять минуты. Воркер идёт по префиксу в порядке ключей, удаляет пачками
+по 1000 (предел DeleteObjects) и после каждой пачки сохраняет курсор и
+счётчики — упавшая задача продолжается с последнего ключа. Задачи
+разбираются через SKIP LOCKED, поэтому несколько воркеров uvicorn делят очередь.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, List, Set
+
+from ..aws.backends import ObjectInfo, get_storage_backend
+from ..core.metrics import register_metrics
+from ..database import async_session_maker
+from ..settings.config import MAINTENANCE_ENV
+from ..storage_usage.service import release_objects, release_prefix
+from .models import DeletionJobORM
+from .repository import DeletionJobRepository
+
+from ..core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+PURGE_BATCH_SIZE = 1000
+
+
+class PurgeWorker:
+    def __init__(self, *, concurrency: int, poll_seconds: float, stale_after: int, max_attempts: int):
+        self.concurrency = max(1, concurrency)
+        self.poll_seconds = poll_seconds
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self._wakeup: asyncio.Event | None = None
+        self._draining = False
+        self._running: Set[asyncio.Task] = set()
+        self._done = 0
+        self._failed = 0
+        self._objects = 0
+        self._bytes = 0
+
+    def wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    @asynccontextmanager
+    async def _repository(self) -> AsyncIterator[DeletionJobRepository]:
+        async with async_session_maker() as session:
+            yield DeletionJobRepository(session)
+
+    async def _release(self, bucket: str, keys: List[str]) -> None:
+        # Снятие со счёта идемпотентно: повтор пачки после сбоя ничего не вычтет дважды
+        await release_objects(bucket, keys)
+
+    async def _release_prefix(self, bucket: str, prefix: str) -> None:
+        # Учтённое под префиксом, но уже отсутствующее в бакете (оригинал перенесён в хранилище содержимого)
+        await release_prefix(bucket, prefix)
+
+    async def run_forever(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._draining = False
+        try:
+            while True:
+                self._wakeup.clear()
+                claimed = 0
+                free = self.concurrency - len(self._running)
+                if free > 0 and not self._draining:
+                    try:
+                        claimed = await self._claim(free)
+                    except Exception:
+                        logger.exception("Не удалось получить задачи storage_deletion_jobs")
+
+                if claimed == 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            for task in self._running:
+                task.cancel()
+
+    async def drain(self) -> None:
+        """Остановка: новые задачи не берутся, начатые пачки удаления дописываются"""
+        self._draining = True
+        if self._running:
+            await asyncio.wait(list(self._running))
+
+    async def _claim(self, limit: int) -> int:
+        async with self._repository() as repository:
+            jobs = await repository.claim(
+                limit=limit,
+                stale_after=timedelta(seconds=self.stale_after),
+                max_attempts=self.max_attempts,
+            )
+        for job in jobs:
+            task = asyncio.create_task(self._execute(job), name=f"purge-{job.id}")
+            self._running.add(task)
+            task.add_done_callback(self._on_task_done)
+        return len(jobs)
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        self.wake()
+
+    async def _execute(self, job: DeletionJobORM) -> None:
+        try:
+            await self._purge(job)
+            async with self._repository() as repository:
+                await repository.finish(job.id)
+            self._done += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._failed += 1
+            logger.exception(f"Очистка {job.bucket}/{job.prefix} ({job.id}) не удалась, попытка {job.attempts}")
+            async with self._repository() as repository:
+                await repository.fail(job.id, f"{type(exc).__name__}: {exc}", retry=job.attempts < self.max_attempts)
+
+    async def _purge(self, job: DeletionJobORM) -> None:
+        backend = get_storage_backend()
+        batch: List[ObjectInfo] = []
+
+        async def flush() -> None:
+            keys = [info.key for info in batch]
+            deleted = await backend.delete(job.bucket, keys)
+            size = sum(info.size for info in batch)
+            await self._release(job.bucket, keys)
+            async with self._repository() as repository:
+                await repository.progress(job.id, cursor=batch[-1].key, objects=deleted, size=size)
+            self._objects += deleted
+            self._bytes += size
+            batch.clear()
+
+        # Курсор прошлой попытки: уже удалённое не листается повторно
+        async for info in backend.list_prefix(job.bucket, job.prefix, start_after=job.cursor):
+            batch.append(info)
+            if len(batch) >= PURGE_BATCH_SIZE:
+                await flush()
+        if batch:
+            await flush()
+        await self._release_prefix(job.bucket, job.prefix)
+
+        if job.drop_bucket:
+            await backend.delete_bucket(job.bucket)
+        logger.info(f"Очищено {job.bucket}/{job.prefix} ({job.reason})")
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "running": len(self._running),
+            "done": self._done,
+            "failed": self._failed,
+            "deleted_objects": self._objects,
+            "deleted_bytes": self._bytes,
+        }
+
+
+purge_worker = PurgeWorker(
+    concurrency=MAINTENANCE_ENV.PURGE_CONCURRENCY,
+    poll_seconds=MAINTENANCE_ENV.PURGE_POLL_SECONDS,
+    stale_after=MAINTENANCE_ENV.PURGE_STALE_SECONDS,
+    max_attempts=MAINTENANCE_ENV.PURGE_MAX_ATTEMPTS,
+)
+register_metrics("storage_purge", purge_worker.metrics)
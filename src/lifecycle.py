@@ -0,0 +1,118 @@
+"""
+Прогрев и остановка ресурсов процесса для ``lifespan`` приложения.
+
+Порядок старта: пул БД → хранилище → кэши → фоновые задачи.
+Остановка — в обратном порядке: сначала сливаются буферы и
+останавливаются фоновые задачи, затем закрываются хранилище и пул БД.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
+
+from .auth.exceptions import AuthHTTPExceptions
+from .auth.passwords import password_hasher
+from .auth.service import AuthService, sync_revoked_tokens_forever
+from .aws.backends import get_storage_backend
+from .core.background import background_workers
+from .core.health import readiness
+from .courses_structure.cache import structure_cache
+from .courses_structure.exceptions import CourseStructureHTTPExceptions
+from .courses_structure.repository import CourseStructureRepository
+from .courses_structure.service import CourseStructureService
+from .database import async_session_maker, engine
+from .deletions.worker import purge_worker
+from .media.blobs import blob_collector
+from .media.tiering import storage_tiering
+from .media.derivatives import image_derivatives
+from .media.worker import media_worker
+from .settings.config import API_ENV, AUTH_ENV, CACHE_ENV
+from .videos.drafts import draft_sweeper
+from .webhooks.local_events import deliver_storage_event
+from .webhooks.retries import webhook_retry_worker
+
+from .core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+@asynccontextmanager
+async def _timed(step: str):
+    started = time.perf_counter()
+    yield
+    logger.info(f"{step}: {time.perf_counter() - started:.3f} с")
+
+
+async def _warm_db_pool() -> None:
+    """Открывает ``pool_size`` соединений и проверяет каждое"""
+    async def check() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(check() for _ in range(engine.pool.size())))
+
+
+async def _warm_storage() -> None:
+    backend = get_storage_backend()
+    # Локальный бэкенд сам порождает события загрузки — доставляем их в обработчики вебхуков
+    backend.subscribe(deliver_storage_event)
+    await backend.warm()
+
+
+async def _preload_caches() -> None:
+    async with async_session_maker() as session:
+        structures = CourseStructureService(
+            CourseStructureRepository(session), CourseStructureHTTPExceptions(), structure_cache
+        )
+        loaded = await structures.preload_cache(CACHE_ENV.STRUCTURE_CACHE_PRELOAD)
+        revoked = await AuthService(session, AuthHTTPExceptions()).sync_revoked_tokens()
+    images = await image_derivatives.warm()
+    logger.info(f"Кэш структур: {loaded}, отозванных токенов: {revoked}, копий картинок: {images}")
+
+
+def _register_workers() -> None:
+    background_workers.register(
+        "revoked-tokens-sync",
+        lambda: sync_revoked_tokens_forever(AUTH_ENV.REVOCATION_SYNC_SECONDS),
+    )
+    background_workers.register("media-jobs", media_worker.run_forever)
+    background_workers.register_drain("media-jobs", media_worker.drain)
+    background_workers.register("draft-gc", draft_sweeper.run_forever)
+    background_workers.register("storage-purge", purge_worker.run_forever)
+    background_workers.register_drain("storage-purge", purge_worker.drain)
+    background_workers.register("webhook-retries", webhook_retry_worker.run_forever)
+    background_workers.register("blob-gc", blob_collector.run_forever)
+    background_workers.register("storage-tiering", storage_tiering.run_forever)
+
+
+async def startup() -> None:
+    async with _timed("Старт приложения"):
+        async with _timed("Пул БД"):
+            await _warm_db_pool()
+        async with _timed(f"Хранилище ({get_storage_backend().name})"):
+            await _warm_storage()
+        async with _timed("Прогрев кэшей"):
+            await _preload_caches()
+        _register_workers()
+        background_workers.start()
+        readiness.mark_ready()
+
+
+async def shutdown() -> None:
+    async with _timed("Остановка приложения"):
+        readiness.mark_not_ready()
+        async with _timed("Фоновые задачи"):
+            await background_workers.stop(API_ENV.SHUTDOWN_DRAIN_TIMEOUT)
+        async with _timed("Пул хеширования паролей"):
+            await asyncio.to_thread(password_hasher.shutdown)
+        async with _timed("Пул транскодирования"):
+            await asyncio.to_thread(media_worker.shutdown)
+        async with _timed("Пул ресайза картинок"):
+            await asyncio.to_thread(image_derivatives.shutdown)
+        async with _timed("Хранилище"):
+            await get_storage_backend().close()
+        async with _timed("Пул БД"):
+            await engine.dispose()
@@ -0,0 +1,113 @@
+"""
+Хранение одинаковых видео один раз (``STORAGE_CONTENT_DEDUP``).
+
+После загрузки оригинала задача ``digest`` считает sha256 содержимого,
+копирует оригинал в ``STORAGE_BLOB_BUCKET`` под ``sha256/…`` (если такого
+содержимого ещё нет), переключает на него видео и удаляет копию из
+бакета владельца. Постер, раскадровка и HLS пишутся рядом с общим
+оригиналом, поэтому повторная загрузка того же файла сразу получает
+готовые производные файлы (``MediaJobRepository.reuse``).
+
+Сборщик периодически пересчитывает ссылки и удаляет содержимое, на
+которое не ссылается ни одно видео дольше ``BLOB_GC_GRACE_HOURS``.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Optional
+
+from ..aws.backends import StorageBackend, get_storage_backend
+from ..aws.layout import blob_prefix
+from ..core.metrics import register_metrics
+from ..database import async_session_maker
+from ..settings.config import MAINTENANCE_ENV, STORAGE_ENV
+from .repository import MediaBlobRepository
+
+from ..core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+async def object_sha256(backend: StorageBackend, bucket: str, key: str, size: int, *, chunk_size: int) -> str:
+    """sha256 объекта, прочитанного последовательными диапазонами; хэш считается вне event loop"""
+    digest = hashlib.sha256()
+    for offset in range(0, size, chunk_size):
+        chunk = await backend.read_range(bucket, key, offset, min(chunk_size, size - offset))
+        # hashlib отпускает GIL на больших буферах
+        await asyncio.to_thread(digest.update, chunk)
+    return digest.hexdigest()
+
+
+class BlobCollector:
+    def __init__(self, *, grace: timedelta, batch_size: int, interval: float):
+        self.grace = grace
+        self.batch_size = batch_size
+        self.interval = interval
+        self._collected = 0
+        self._bytes = 0
+        self._reconciled = 0
+        self._last_run: Optional[datetime] = None
+        self._last_seconds = 0.0
+
+    async def sweep_once(self) -> int:
+        started = time.perf_counter()
+        async with async_session_maker() as session:
+            self._reconciled += await MediaBlobRepository(session).reconcile()
+
+        cutoff = datetime.now(UTC) - self.grace
+        collected = 0
+        while True:
+            batch = await self._collect_batch(cutoff)
+            collected += batch
+            if batch < self.batch_size:
+                break
+
+        self._collected += collected
+        self._last_run = datetime.now(UTC)
+        self._last_seconds = time.perf_counter() - started
+        if collected:
+            logger.info(f"Удалено неиспользуемого содержимого: {collected} за {self._last_seconds:.1f} с")
+        return collected
+
+    async def _collect_batch(self, cutoff: datetime) -> int:
+        # Строки удаляются в одной транзакции с объектами: при ошибке хранилища откат и повтор в следующий раз
+        async with async_session_maker() as session:
+            blobs = await MediaBlobRepository(session).collect(cutoff, self.batch_size)
+            backend = get_storage_backend()
+            bucket = STORAGE_ENV.STORAGE_BLOB_BUCKET
+            for sha256, size in blobs:
+                keys = [info.key async for info in backend.list_prefix(bucket, f"{blob_prefix(sha256)}/")]
+                if keys:
+                    await backend.delete(bucket, keys)
+                self._bytes += size
+            await session.commit()
+        return len(blobs)
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.sweep_once()
+            except Exception:
+                logger.exception("Не удалось собрать неиспользуемое содержимое")
+            await asyncio.sleep(self.interval)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "enabled": STORAGE_ENV.STORAGE_CONTENT_DEDUP,
+            "collected": self._collected,
+            "collected_bytes": self._bytes,
+            "reconciled_refs": self._reconciled,
+            "last_run": self._last_run.isoformat() if self._last_run else None,
+            "last_run_seconds": round(self._last_seconds, 3),
+        }
+
+
+blob_collector = BlobCollector(
+    grace=timedelta(hours=MAINTENANCE_ENV.BLOB_GC_GRACE_HOURS),
+    batch_size=MAINTENANCE_ENV.DRAFT_GC_BATCH_SIZE,
+    interval=MAINTENANCE_ENV.BLOB_GC_INTERVAL_SECONDS,
+)
+register_metrics("media_blobs", blob_collector.metrics)
@@ -0,0 +1,22 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_async_session
+
+from .derivatives import ImageDerivatives, image_derivatives
+from .exceptions import MediaHTTPExceptions
+from .repository import MediaJobRepository
+from .service import MediaService
+from .worker import media_worker
+
+
+async def get_media_service(session: AsyncSession = Depends(get_async_session)) -> MediaService:
+    return MediaService(MediaJobRepository(session), media_worker)
+
+
+async def get_media_exceptions() -> MediaHTTPExceptions:
+    return MediaHTTPExceptions()
+
+
+async def get_image_derivatives() -> ImageDerivatives:
+    return image_derivatives
@@ -0,0 +1,129 @@
+"""
+Производные картинки: ресайз в пуле процессов, дисковый LRU-кэш и
+склейка одновременных запросов одной и той же копии.
+
+Имя копии зависит от ETag исходника, поэтому перезаливка аватара
+не отдаёт старую копию: старая просто вытесняется из кэша по LRU.
+"""
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..aws.backends import ObjectInfo, get_storage_backend
+from ..core.metrics import register_metrics
+from ..settings.config import API_ENV, MEDIA_ENV
+from .image_cache import DiskLRUCache
+from .images import parse_widths, render_image, snap_width
+
+from ..core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+class ImageDerivatives:
+    def __init__(
+        self,
+        *,
+        workers: int,
+        widths: List[int],
+        quality: int,
+        cache: DiskLRUCache,
+    ):
+        self.workers = max(1, workers)
+        self.widths = widths
+        self.quality = quality
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+
+    # ---------- пул ----------
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.cache.close()
+
+    async def warm(self) -> int:
+        return await self.cache.load()
+
+    # ---------- копии ----------
+    def snap(self, width: int) -> int:
+        return snap_width(width, self.widths)
+
+    def name_for(self, source: ObjectInfo, *, width: int, fmt: str) -> str:
+        digest = hashlib.sha256(
+            f"{source.bucket}\0{source.key}\0{source.etag}\0{width}\0{fmt}\0{self.quality}".encode()
+        ).hexdigest()
+        return f"{digest[:40]}.{fmt}"
+
+    async def get(self, source: ObjectInfo, *, width: int, fmt: str) -> Path:
+        """Путь к готовой копии; одновременные промахи ждут один общий ресайз"""
+        name = self.name_for(source, width=width, fmt=fmt)
+        path = self.cache.get(name)
+        if path is not None:
+            self._hits += 1
+            return path
+
+        future = self._inflight.get(name)
+        if future is None:
+            self._misses += 1
+            future = asyncio.ensure_future(self._render(name, source, width=width, fmt=fmt))
+            self._inflight[name] = future
+            future.add_done_callback(partial(self._on_rendered, name))
+        else:
+            self._coalesced += 1
+        # shield: отключение первого клиента не отменяет ресайз для остальных
+        return await asyncio.shield(future)
+
+    def _on_rendered(self, name: str, future: asyncio.Future) -> None:
+        self._inflight.pop(name, None)
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"Не удалось построить копию {name}: {future.exception()}")
+
+    async def _render(self, name: str, source: ObjectInfo, *, width: int, fmt: str) -> Path:
+        data = await get_storage_backend().read_range(source.bucket, source.key, 0, source.size)
+        rendered = await asyncio.get_running_loop().run_in_executor(
+            self._pool(), partial(render_image, data, width=width, fmt=fmt, quality=self.quality)
+        )
+        return await self.cache.put(name, rendered)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self.workers,
+            "inflight": len(self._inflight),
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            **self.cache.metrics(),
+        }
+
+
+image_derivatives = ImageDerivatives(
+    workers=MEDIA_ENV.MEDIA_IMAGE_WORKERS,
+    widths=parse_widths(MEDIA_ENV.MEDIA_IMAGE_WIDTHS),
+    quality=MEDIA_ENV.MEDIA_IMAGE_QUALITY,
+    # У каждого воркера API свой слот кэша: бюджет делится между воркерами,
+    # чтобы суммарный объём не превышал MEDIA_IMAGE_CACHE_MAX_BYTES
+    cache=DiskLRUCache(
+        MEDIA_ENV.MEDIA_IMAGE_CACHE_DIR,
+        MEDIA_ENV.MEDIA_IMAGE_CACHE_MAX_BYTES // API_ENV.workers_count,
+    ),
+)
+register_metrics("images", image_derivatives.metrics)
@@ -0,0 +1,47 @@
+from fastapi import HTTPException, status
+
+from ..core.AbsractHTTPExceptions import AbstractHTTPExceptions
+
+
+class MediaHTTPExceptions(AbstractHTTPExceptions):
+
+    def not_found_404(self, detail: str = "Image not found") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail
+        )
+
+
+    def conflict_409(self, detail: str = "Ошибка не описана") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail
+        )
+
+
+    def forbidden_403(self, detail: str = "Access denied") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
+
+
+    def bad_request_400(self, detail: str = "Invalid object path") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail
+        )
+
+
+    def too_large_413(self, detail: str = "Source image is too large") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=detail
+        )
+
+
+    def unsupported_415(self, detail: str = "Unsupported image format") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=detail
+        )
@@ -0,0 +1,148 @@
+"""
+Дисковый LRU-кэш производных картинок с ограничением по суммарному размеру.
+
+Индекс (путь → размер) держится в памяти в порядке последнего обращения и
+при старте восстанавливается обходом каталога по времени изменения файлов.
+Запись атомарна: временный файл + ``os.replace``.
+
+Каждый процесс работает в своём подкаталоге ``slot-NN`` с собственным
+бюджетом ``max_bytes``: при старте он занимает первый слот, чей lock-файл
+не заблокирован другим процессом. Перезапущенный воркер получает
+освободившийся слот вместе с его файлами, а чужие файлы и недописанные
+``.part`` соседей никогда не трогает.
+"""
+import asyncio
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import aiofiles
+
+try:
+    import fcntl
+except ImportError:  # Windows: слоты по pid, без повторного использования
+    fcntl = None
+
+
+_TEMP_SUFFIX = ".part"
+
+
+class DiskLRUCache:
+    def __init__(self, root: str | Path, max_bytes: int):
+        self.base = Path(root)
+        self.root = self.base
+        self._slot_lock: Optional[BinaryIO] = None
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+
+    def path_for(self, name: str) -> Path:
+        # Два уровня каталогов, чтобы не держать сотни тысяч файлов в одном
+        return self.root / name[:2] / name[2:4] / name
+
+    # ---------- слот процесса ----------
+    def _claim_slot(self) -> Path:
+        """Свободный подкаталог; блокировка lock-файла держится до ``close``"""
+        self.base.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            return self.base / f"pid-{os.getpid()}"
+        index = 0
+        while True:
+            lock = open(self.base / f"slot-{index:02d}.lock", "a+b")
+            try:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock.close()
+                index += 1
+                continue
+            self._slot_lock = lock
+            return self.base / f"slot-{index:02d}"
+
+    def close(self) -> None:
+        lock, self._slot_lock = self._slot_lock, None
+        if lock is not None:
+            lock.close()
+
+    # ---------- индекс ----------
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        found = []
+        for directory, _, files in os.walk(self.root):
+            for file in files:
+                path = os.path.join(directory, file)
+                try:
+                    if file.endswith(_TEMP_SUFFIX):
+                        # Недописанный файл после падения процесса, занимавшего слот
+                        os.unlink(path)
+                        continue
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                found.append((stat.st_mtime, file, stat.st_size))
+        return sorted(found)
+
+    async def load(self) -> int:
+        """Занимает слот и восстанавливает его индекс с диска; старые файлы вытесняются первыми"""
+        if self._slot_lock is None:
+            self.root = await asyncio.to_thread(self._claim_slot)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._index.clear()
+        self.size = 0
+        for _, name, size in await asyncio.to_thread(self._scan):
+            self._index[name] = size
+            self.size += size
+        await self._evict()
+        return len(self._index)
+
+    # ---------- чтение/запись ----------
+    def get(self, name: str) -> Optional[Path]:
+        if name not in self._index:
+            return None
+        path = self.path_for(name)
+        if not path.is_file():
+            self.size -= self._index.pop(name)
+            return None
+        self._index.move_to_end(name)
+        return path
+
+    async def put(self, name: str, data: bytes) -> Path:
+        path = self.path_for(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f"{name}.{uuid.uuid4().hex}{_TEMP_SUFFIX}")
+        async with aiofiles.open(temp, "wb") as file:
+            await file.write(data)
+        os.replace(temp, path)
+
+        self.size += len(data) - self._index.pop(name, 0)
+        self._index[name] = len(data)
+        await self._evict(keep=name)
+        return path
+
+    async def _evict(self, keep: Optional[str] = None) -> None:
+        victims = []
+        while self.size > self.max_bytes and self._index:
+            name, size = next(iter(self._index.items()))
+            if name == keep:
+                break
+            del self._index[name]
+            self.size -= size
+            victims.append(self.path_for(name))
+        if victims:
+            self.evictions += len(victims)
+            await asyncio.to_thread(_unlink_all, victims)
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._index),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "slot": self.root.name,
+            "evictions": self.evictions,
+        }
+
+
+def _unlink_all(paths: List[Path]) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
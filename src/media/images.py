@@ -0,0 +1,75 @@
+"""
+Уменьшенные копии картинок (аватары, превью) для каталогов.
+
+``render_image`` — чистая функция без состояния, выполняется в пуле процессов:
+декодирование и ресайз держат GIL и не должны занимать event loop.
+"""
+from io import BytesIO
+from typing import Dict, List, Optional
+
+from PIL import Image, ImageOps
+
+
+IMAGE_FORMATS: Dict[str, str] = {
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+}
+# Расширения исходников, которые умеем уменьшать (SVG отдаётся как есть)
+SOURCE_FORMATS: Dict[str, str] = {"png": "png", "jpg": "jpeg", "jpeg": "jpeg", "webp": "webp"}
+
+
+class ImageError(ValueError):
+    """Исходник не является поддерживаемой картинкой"""
+    pass
+
+
+def parse_widths(spec: str) -> List[int]:
+    """``"64,128,256"`` → отсортированный список допустимых ширин"""
+    widths = sorted({int(item) for item in spec.split(",") if item.strip()})
+    if not widths or widths[0] <= 0:
+        raise ValueError(f"Некорректный список ширин: {spec!r}")
+    return widths
+
+
+def snap_width(width: int, widths: List[int]) -> int:
+    """Ширина из набора, не меньше запрошенной: ограничивает число копий в кэше"""
+    return next((allowed for allowed in widths if allowed >= width), widths[-1])
+
+
+def source_format(key: str) -> Optional[str]:
+    return SOURCE_FORMATS.get(key.rsplit(".", 1)[-1].lower()) if "." in key else None
+
+
+def render_image(data: bytes, *, width: int, fmt: str, quality: int) -> bytes:
+    # Декодирование ленивое: битый или обрезанный файл падает только в
+    # thumbnail/save, поэтому под try весь рендер, а не только open
+    try:
+        return _render(data, width=width, fmt=fmt, quality=quality)
+    except (OSError, Image.DecompressionBombError) as exc:
+        raise ImageError(str(exc)) from exc
+
+
+def _render(data: bytes, *, width: int, fmt: str, quality: int) -> bytes:
+    image = Image.open(BytesIO(data))
+    # JPEG декодируется сразу в уменьшенном масштабе (DCT scaling)
+    image.draft("RGB", (width, max(1, width * image.height // max(1, image.width))))
+    image = ImageOps.exif_transpose(image)
+
+    if image.width > width:
+        # Ресайз только вниз: увеличение не добавляет деталей, только байты
+        image.thumbnail((width, image.height), Image.Resampling.LANCZOS)
+
+    if fmt == "jpeg" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    elif image.mode not in ("RGB", "RGBA", "L", "LA"):
+        image = image.convert("RGBA")
+
+    output = BytesIO()
+    if fmt == "webp":
+        image.save(output, "WEBP", quality=quality, method=4)
+    elif fmt == "jpeg":
+        image.save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+    else:
+        image.save(output, "PNG", optimize=True)
+    return output.getvalue()
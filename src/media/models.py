@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime, UTC
+
+from sqlalchemy import ForeignKey, BigInteger, Boolean, Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+from ..videos.models import VideoORM
+from ..core.Enums.MediaStatusEnums import MediaJobStatusEnum
+
+
+class MediaJobORM(Base):
+    """
+    Задача обработки медиа (транскодирование и т.п.). На пару (видео, вид)
+    одна строка: повторная загрузка оригинала возвращает её в очередь.
+    Воркеры разбирают очередь через ``FOR UPDATE SKIP LOCKED``.
+    """
+    __tablename__ = "media_jobs"
+    __table_args__ = (
+        UniqueConstraint("video_id", "kind", name="uq_media_jobs_video_kind"),
+    )
+
+    id:          Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        default=uuid.uuid4,
+        primary_key=True
+    )
+    video_id:    Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey(VideoORM.id, ondelete='CASCADE'),
+        nullable=False
+    )
+    kind:        Mapped[str] = mapped_column(String(16), nullable=False)
+    status:      Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        default=MediaJobStatusEnum.QUEUED.value,
+        index=True
+    )
+    attempts:    Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error:       Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at:  Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+    started_at:  Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class MediaBlobORM(Base):
+    """
+    Загруженное видео, хранимое один раз по sha256 содержимого
+    (``STORAGE_BLOB_BUCKET``, ``sha256/…``). ``refs`` — число видео,
+    ссылающихся на него через ``videos.content_sha256``; сборщик
+    пересчитывает его и удаляет содержимое без ссылок.
+    """
+    __tablename__ = "media_blobs"
+
+    sha256:     Mapped[str] = mapped_column(String(64), primary_key=True)
+    size:       Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ext:        Mapped[str] = mapped_column(String(8), nullable=False)
+    refs:       Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Оригинал уже скопирован в общее хранилище
+    stored:     Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+    # Последнее обращение: содержимое моложе BLOB_GC_GRACE_HOURS не собирается
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False,
+        index=True
+    )
@@ -0,0 +1,187 @@
+"""
+Чтение технических метаданных видео без скачивания файла.
+
+Для MP4/MOV разбирается только дерево боксов ``moov`` через ranged-чтения:
+заголовки боксов читаются блоками по 64 КиБ, крупные таблицы сэмплов
+(``stsz``, ``stco`` и т.п.) пропускаются по размеру. Остальные контейнеры —
+через ffprobe (``ffprobe_metadata`` выполняется в пуле процессов).
+"""
+import json
+import struct
+import subprocess
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+RangeFetch = Callable[[int, int], Awaitable[bytes]]
+
+_CONTAINERS = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+_CODECS = {
+    "avc1": "h264", "avc3": "h264",
+    "hvc1": "hevc", "hev1": "hevc",
+    "av01": "av1", "vp09": "vp9",
+    "mp4a": "aac", "ac-3": "ac3", "ec-3": "eac3", "opus": "opus",
+}
+
+
+class ProbeError(ValueError):
+    """Файл не удалось разобрать этим способом"""
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class MediaInfo:
+    duration: float
+    width: Optional[int] = None
+    height: Optional[int] = None
+    bitrate: Optional[int] = None
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+
+
+class RangeReader:
+    """Кэш блоков поверх ranged-чтения; число запросов ограничено ``max_fetches``"""
+
+    def __init__(self, fetch: RangeFetch, size: int, *, block_size: int = 64 * 1024, max_fetches: int = 64):
+        self.size = size
+        self.fetches = 0
+        self._fetch = fetch
+        self._block_size = block_size
+        self._max_fetches = max_fetches
+        self._blocks: Dict[int, bytes] = {}
+
+    async def read(self, offset: int, length: int) -> bytes:
+        length = max(0, min(length, self.size - offset))
+        if length == 0:
+            return b""
+        first = offset // self._block_size
+        last = (offset + length - 1) // self._block_size
+        missing = [index for index in range(first, last + 1) if index not in self._blocks]
+        if missing:
+            if self.fetches >= self._max_fetches:
+                raise ProbeError("Слишком много ranged-запросов для разбора заголовка")
+            self.fetches += 1
+            start = missing[0] * self._block_size
+            data = await self._fetch(start, min((missing[-1] + 1) * self._block_size, self.size) - start)
+            for index in range(missing[0], missing[-1] + 1):
+                position = (index - missing[0]) * self._block_size
+                self._blocks[index] = data[position:position + self._block_size]
+        data = b"".join(self._blocks[index] for index in range(first, last + 1))
+        start = offset - first * self._block_size
+        return data[start:start + length]
+
+
+async def _boxes(reader: RangeReader, start: int, end: int):
+    """(тип, начало payload, конец бокса) для боксов в диапазоне"""
+    position = start
+    while position + 8 <= end:
+        header = await reader.read(position, 16)
+        size, kind = struct.unpack(">I4s", header[:8])
+        payload = position + 8
+        if size == 1:
+            size = struct.unpack(">Q", header[8:16])[0]
+            payload += 8
+        elif size == 0:
+            size = end - position
+        if size < payload - position:
+            raise ProbeError(f"Повреждённый бокс {kind!r} на смещении {position}")
+        yield kind, payload, min(position + size, end)
+        position += size
+
+
+def _full_box(data: bytes) -> Tuple[int, bytes]:
+    return data[0], data[4:]
+
+
+def _parse_mvhd(data: bytes) -> Tuple[int, int]:
+    version, body = _full_box(data)
+    if version == 1:
+        return struct.unpack(">IQ", body[16:28])
+    return struct.unpack(">II", body[8:16])
+
+
+def _parse_tkhd(data: bytes) -> Tuple[int, int]:
+    version, body = _full_box(data)
+    offset = 84 if version == 1 else 72
+    width, height = struct.unpack(">II", body[offset:offset + 8])
+    return width >> 16, height >> 16
+
+
+async def probe_mp4(fetch: RangeFetch, size: int) -> MediaInfo:
+    reader = RangeReader(fetch, size)
+    moov: Optional[Tuple[int, int]] = None
+    async for kind, payload, end in _boxes(reader, 0, size):
+        if kind == b"moov":
+            moov = (payload, end)
+            break
+        if kind not in (b"ftyp", b"free", b"skip", b"wide", b"mdat", b"uuid", b"pdin", b"styp"):
+            raise ProbeError(f"Не ISO BMFF: верхний бокс {kind!r}")
+    if moov is None:
+        raise ProbeError("Бокс moov не найден")
+
+    timescale = duration = 0
+    tracks: List[Dict[str, object]] = []
+
+    async def walk(start: int, end: int, track: Optional[Dict[str, object]]) -> None:
+        nonlocal timescale, duration
+        async for kind, payload, box_end in _boxes(reader, start, end):
+            if kind == b"trak":
+                tracks.append({})
+                await walk(payload, box_end, tracks[-1])
+            elif kind in _CONTAINERS:
+                await walk(payload, box_end, track)
+            elif kind == b"mvhd":
+                timescale, duration = _parse_mvhd(await reader.read(payload, box_end - payload))
+            elif track is not None and kind == b"tkhd":
+                track["size"] = _parse_tkhd(await reader.read(payload, box_end - payload))
+            elif track is not None and kind == b"hdlr":
+                track["handler"] = (await reader.read(payload + 8, 4)).decode("latin-1")
+            elif track is not None and kind == b"stsd":
+                entry = await reader.read(payload + 8, 8)
+                track["codec"] = entry[4:8].decode("latin-1")
+
+    await walk(*moov, None)
+    if not timescale:
+        raise ProbeError("В mvhd нет timescale")
+
+    seconds = duration / timescale
+    video = next((track for track in tracks if track.get("handler") == "vide"), {})
+    audio = next((track for track in tracks if track.get("handler") == "soun"), {})
+    width, height = video.get("size", (None, None))
+    return MediaInfo(
+        duration=seconds,
+        width=width or None,
+        height=height or None,
+        bitrate=int(size * 8 / seconds) if seconds else None,
+        video_codec=_CODECS.get(video.get("codec"), video.get("codec")),
+        audio_codec=_CODECS.get(audio.get("codec"), audio.get("codec")),
+    )
+
+
+def ffprobe_metadata(source: str, *, ffprobe: str = "ffprobe") -> MediaInfo:
+    """Запасной путь для не-MP4 контейнеров; выполняется в пуле процессов"""
+    result = subprocess.run(
+        [
+            ffprobe, "-v", "error",
+            "-show_entries", "format=duration,bit_rate:stream=codec_type,codec_name,width,height",
+            "-of", "json", source,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise ProbeError(f"ffprobe: {result.stderr.strip()[-2000:]}")
+
+    parsed = json.loads(result.stdout or "{}")
+    streams = parsed.get("streams", [])
+    container = parsed.get("format", {})
+    video = next((stream for stream in streams if stream.get("codec_type") == "video"), {})
+    audio = next((stream for stream in streams if stream.get("codec_type") == "audio"), {})
+    return MediaInfo(
+        duration=float(container.get("duration") or 0),
+        width=video.get("width"),
+        height=video.get("height"),
+        bitrate=int(container["bit_rate"]) if container.get("bit_rate") else None,
+        video_codec=video.get("codec_name"),
+        audio_codec=audio.get("codec_name"),
+    )
@@ -0,0 +1,398 @@
+from uuid import UUID, uuid4
+from collections import defaultdict
+from datetime import datetime, timedelta, UTC
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select, update, delete, func, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+
+from .models import MediaBlobORM, MediaJobORM
+from .probe import MediaInfo
+
+from ..videos.models import VideoORM, VideoMetadatasORM
+from ..core.AbstractRepository import AbstractRepository
+from ..core.Enums.ExtensionsEnums import VideoExtensionsEnum
+from ..core.Enums.MediaStatusEnums import HlsStatusEnum, MediaJobKindEnum, MediaJobStatusEnum
+
+import logging
+from ..core.log import configure_logging
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+# Задачи, результат которых лежит в общем префиксе содержимого и может быть переиспользован
+CONTENT_JOBS = (MediaJobKindEnum.PROBE, MediaJobKindEnum.STORYBOARD, MediaJobKindEnum.HLS)
+
+# Поля видео, которые заполняет каждая из задач
+_JOB_FIELDS: Dict[MediaJobKindEnum, Tuple[str, ...]] = {
+    MediaJobKindEnum.PROBE: ("timeline", "width", "height", "bitrate", "video_codec", "audio_codec"),
+    MediaJobKindEnum.STORYBOARD: ("has_poster", "has_storyboard"),
+    MediaJobKindEnum.HLS: ("hls_status",),
+}
+
+
+def pick_donor(done: Dict[UUID, Set[MediaJobKindEnum]]) -> Tuple[Optional[UUID], List[MediaJobKindEnum]]:
+    """
+    Видео с тем же содержимым, у которого готово больше всего задач, и
+    задачи, которые остаётся выполнить самому. Ничья решается по id — выбор
+    одинаков во всех воркерах.
+    """
+    if not done:
+        return None, list(CONTENT_JOBS)
+    donor = max(sorted(done), key=lambda video_id: len(done[video_id] & set(CONTENT_JOBS)))
+    return donor, [kind for kind in CONTENT_JOBS if kind not in done[donor]]
+
+
+class MediaJobRepository(AbstractRepository[MediaJobORM]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, MediaJobORM)
+
+    async def enqueue(self, video_id: UUID, kinds: Sequence[MediaJobKindEnum]) -> None:
+        """Ставит задачи в очередь; существующие задачи тех же видов перезапускаются"""
+        await self._upsert(video_id, kinds, MediaJobStatusEnum.QUEUED)
+        await self.session.commit()
+
+    async def enqueue_idle(self, video_id: UUID, kinds: Sequence[MediaJobKindEnum]) -> None:
+        """
+        Ставит задачи, которых нет или которые уже выполнены. Поставленные и
+        выполняющиеся не перезапускаются (иначе повторный вызов сбрасывал бы
+        attempts), упавшие остаются в dead letter до новой загрузки.
+        """
+        await self._upsert(
+            video_id, kinds, MediaJobStatusEnum.QUEUED,
+            where=self.model.status == MediaJobStatusEnum.DONE.value,
+        )
+        await self.session.commit()
+
+    async def _upsert(
+        self,
+        video_id: UUID,
+        kinds: Sequence[MediaJobKindEnum],
+        status: MediaJobStatusEnum,
+        *,
+        where=None,
+    ) -> None:
+        now = datetime.now(UTC)
+        finished_at = now if status is MediaJobStatusEnum.DONE else None
+        rows = [
+            dict(
+                id=uuid4(),
+                video_id=video_id,
+                kind=kind.value,
+                status=status.value,
+                attempts=0,
+                error=None,
+                created_at=now,
+                started_at=None,
+                finished_at=finished_at,
+            )
+            for kind in kinds
+        ]
+        query = insert(self.model).values(rows)
+        query = query.on_conflict_do_update(
+            constraint="uq_media_jobs_video_kind",
+            set_={name: query.excluded[name] for name in rows[0] if name not in ("id", "video_id", "kind")},
+            where=where,
+        )
+        await self.session.execute(query)
+
+    async def reuse(self, video_id: UUID, sha256: str) -> List[MediaJobKindEnum]:
+        """
+        Переносит на видео результаты обработки другого видео с тем же
+        содержимым: производные файлы уже лежат в общем префиксе, копируются
+        только поля строки. Возвращает задачи, которые нужно выполнить.
+        """
+        rows = await self.session.execute(
+            select(self.model.video_id, self.model.kind)
+            .join(VideoORM, VideoORM.id == self.model.video_id)
+            .where(
+                VideoORM.content_sha256 == sha256,
+                VideoORM.id != video_id,
+                self.model.status == MediaJobStatusEnum.DONE.value,
+            )
+        )
+        done: Dict[UUID, Set[MediaJobKindEnum]] = defaultdict(set)
+        for donor_id, kind in rows.all():
+            done[donor_id].add(MediaJobKindEnum(kind))
+        donor_id, pending = pick_donor(done)
+
+        reused = [kind for kind in CONTENT_JOBS if kind not in pending]
+        # Раскадровка по старому адресу (до переноса в общий префикс) больше не видна
+        values = {"has_poster": False, "has_storyboard": False} if MediaJobKindEnum.STORYBOARD in pending else {}
+        if donor_id is not None and reused:
+            donor = await self.session.get(VideoORM, donor_id)
+            for kind in reused:
+                values.update({name: getattr(donor, name) for name in _JOB_FIELDS[kind]})
+            await self._upsert(video_id, reused, MediaJobStatusEnum.DONE)
+        if values:
+            await self.session.execute(update(VideoORM).where(VideoORM.id == video_id).values(**values))
+        await self.session.commit()
+        return pending
+
+    async def claim(
+        self,
+        kind: MediaJobKindEnum,
+        *,
+        limit: int,
+        stale_after: timedelta,
+        max_attempts: int,
+    ) -> List[Tuple[MediaJobORM, VideoORM]]:
+        """
+        Забирает до ``limit`` задач: из очереди и зависшие в ``running``
+        дольше ``stale_after`` (воркер упал). Параллельные воркеры
+        не получат одни и те же строки благодаря SKIP LOCKED.
+        """
+        now = datetime.now(UTC)
+        candidates = (
+            select(self.model.id)
+            .where(
+                self.model.kind == kind.value,
+                self.model.attempts < max_attempts,
+                or_(
+                    self.model.status == MediaJobStatusEnum.QUEUED.value,
+                    and_(
+                        self.model.status == MediaJobStatusEnum.RUNNING.value,
+                        self.model.started_at < now - stale_after,
+                    ),
+                ),
+            )
+            .order_by(self.model.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            update(self.model)
+            .where(self.model.id.in_(candidates.scalar_subquery()))
+            .values(
+                status=MediaJobStatusEnum.RUNNING.value,
+                started_at=now,
+                attempts=self.model.attempts + 1,
+            )
+            .returning(self.model)
+        )
+        jobs = list((await self.session.execute(query)).scalars().all())
+        if not jobs:
+            await self.session.commit()
+            return []
+
+        videos = await self.session.execute(
+            select(VideoORM).where(VideoORM.id.in_([job.video_id for job in jobs]))
+        )
+        by_id = {video.id: video for video in videos.scalars().all()}
+        await self.session.commit()
+        return [(job, by_id[job.video_id]) for job in jobs if job.video_id in by_id]
+
+    async def finish(self, job_id: UUID) -> None:
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id == job_id)
+            .values(status=MediaJobStatusEnum.DONE.value, finished_at=datetime.now(UTC), error=None)
+        )
+        await self.session.commit()
+
+    async def fail(self, job_id: UUID, error: str, *, retry: bool) -> None:
+        """Ошибка задачи: при ``retry`` задача возвращается в очередь"""
+        status = MediaJobStatusEnum.QUEUED if retry else MediaJobStatusEnum.FAILED
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id == job_id)
+            .values(status=status.value, finished_at=datetime.now(UTC), error=error[-4000:])
+        )
+        await self.session.commit()
+
+    async def set_media_info(self, video_id: UUID, info: MediaInfo) -> None:
+        """Длительность и технические параметры — одним UPDATE"""
+        await self.session.execute(
+            update(VideoORM)
+            .where(VideoORM.id == video_id)
+            .values(
+                timeline=round(info.duration),
+                width=info.width,
+                height=info.height,
+                bitrate=info.bitrate,
+                video_codec=info.video_codec,
+                audio_codec=info.audio_codec,
+            )
+        )
+        await self.session.commit()
+
+    async def set_storyboard(self, video_id: UUID, *, poster: bool, storyboard: bool) -> None:
+        await self.session.execute(
+            update(VideoORM)
+            .where(VideoORM.id == video_id)
+            .values(has_poster=poster, has_storyboard=storyboard)
+        )
+        await self.session.commit()
+
+    async def detach_content(self, video_id: UUID) -> None:
+        """Видео снова читается из своего префикса; ссылку снимет пересчёт сборщика"""
+        await self.session.execute(
+            update(VideoORM)
+            .where(VideoORM.id == video_id, VideoORM.content_sha256.is_not(None))
+            .values(content_sha256=None)
+        )
+        await self.session.commit()
+
+    async def clear_cold(self, video_id: UUID) -> bool:
+        """Видео снова целиком в основном бакете; False — холодных файлов не было"""
+        result = await self.session.execute(
+            update(VideoORM)
+            .where(VideoORM.id == video_id, func.cardinality(VideoORM.cold_groups) > 0)
+            .values(cold_groups=[], tiered_at=None)
+            .returning(VideoORM.id)
+        )
+        cleared = result.scalar_one_or_none() is not None
+        await self.session.commit()
+        return cleared
+
+    async def cold_groups(self, video_id: UUID) -> List[str]:
+        result = await self.session.execute(select(VideoORM.cold_groups).where(VideoORM.id == video_id))
+        return list(result.scalar_one_or_none() or [])
+
+    async def set_hls_status(self, video_id: UUID, status: HlsStatusEnum) -> None:
+        await self.session.execute(
+            update(VideoORM).where(VideoORM.id == video_id).values(hls_status=status)
+        )
+        await self.session.commit()
+
+
+class MediaBlobRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def touch(self, sha256: str, *, size: int, ext: str) -> MediaBlobORM:
+        """Строка содержимого (создаётся при первой загрузке); обновляет время последнего обращения"""
+        query = insert(MediaBlobORM).values(
+            sha256=sha256, size=size, ext=ext, refs=0, stored=False,
+            created_at=datetime.now(UTC), updated_at=datetime.now(UTC),
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[MediaBlobORM.sha256],
+            set_={"updated_at": query.excluded.updated_at},
+        ).returning(MediaBlobORM)
+        blob = (await self.session.execute(query)).scalar_one()
+        await self.session.commit()
+        return blob
+
+    async def mark_stored(self, sha256: str) -> None:
+        await self.session.execute(
+            update(MediaBlobORM).where(MediaBlobORM.sha256 == sha256).values(stored=True)
+        )
+        await self.session.commit()
+
+    async def attach(self, video_id: UUID, sha256: str, *, ext: str) -> bool:
+        """
+        Переключает видео на общее содержимое и снимает ссылку с прежнего
+        (повторная загрузка другого файла). False — видео уже удалено.
+        """
+        video = (await self.session.execute(
+            select(VideoORM.content_sha256).where(VideoORM.id == video_id).with_for_update()
+        )).one_or_none()
+        if video is None or video.content_sha256 == sha256:
+            await self.session.commit()
+            return video is not None
+
+        previous = video.content_sha256
+        await self.session.execute(
+            update(VideoORM)
+            .where(VideoORM.id == video_id)
+            .values(content_sha256=sha256, video_ext=VideoExtensionsEnum(ext))
+        )
+        # Строки содержимого блокируются в одном порядке — без взаимоблокировок
+        changes = sorted({sha256: 1, **({previous: -1} if previous else {})}.items())
+        for blob_sha256, delta in changes:
+            await self.session.execute(
+                update(MediaBlobORM)
+                .where(MediaBlobORM.sha256 == blob_sha256)
+                .values(refs=func.greatest(MediaBlobORM.refs + delta, 0), updated_at=datetime.now(UTC))
+            )
+        await self.session.commit()
+        return True
+
+    async def reconcile(self) -> int:
+        """
+        Пересчитывает ``refs`` по таблице видео: строки видео удаляются
+        каскадом вместе с пользователем, каналом или курсом, минуя ``attach``.
+        """
+        counted = (
+            select(func.count())
+            .where(VideoORM.content_sha256 == MediaBlobORM.sha256)
+            .correlate(MediaBlobORM)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(MediaBlobORM).where(MediaBlobORM.refs != counted).values(refs=counted)
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    async def collect(self, cutoff: datetime, limit: int) -> List[Tuple[str, int]]:
+        """
+        Удаляет до ``limit`` строк содержимого без ссылок, не тронутых с
+        ``cutoff``, и возвращает (sha256, size). Не коммитит: объекты
+        удаляются в той же транзакции.
+        """
+        candidates = (
+            select(MediaBlobORM.sha256)
+            .where(MediaBlobORM.refs == 0, MediaBlobORM.updated_at < cutoff)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            delete(MediaBlobORM)
+            .where(MediaBlobORM.sha256.in_(candidates.scalar_subquery()))
+            .returning(MediaBlobORM.sha256, MediaBlobORM.size)
+        )
+        return [(sha256, size) for sha256, size in result.all()]
+
+
+class StorageTierRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def cold_candidates(
+        self,
+        *,
+        min_age: timedelta,
+        idle: timedelta,
+        max_views_per_day: float,
+        limit: int,
+    ) -> List[VideoORM]:
+        """
+        Опубликованные видео старше ``min_age`` без просмотров и оценок дольше
+        ``idle`` (``video_metadatas.updated_at``) и со средним числом просмотров
+        в день ниже порога — самые холодные первыми. Видео в общем хранилище
+        содержимого не переносятся: их файлы делят несколько видео.
+        """
+        now = datetime.now(UTC)
+        age_days = func.greatest(func.extract("epoch", now - VideoORM.upload_date) / 86400, 1)
+        views_per_day = func.coalesce(VideoMetadatasORM.views, 0) / age_days
+        last_active = func.coalesce(VideoMetadatasORM.updated_at, VideoORM.upload_date)
+        query = (
+            select(VideoORM)
+            .outerjoin(VideoMetadatasORM, VideoMetadatasORM.id == VideoORM.id)
+            .where(
+                func.cardinality(VideoORM.cold_groups) == 0,
+                VideoORM.content_sha256.is_(None),
+                VideoORM.is_public.is_(True),
+                VideoORM.upload_date < now - min_age,
+                last_active < now - idle,
+                views_per_day < max_views_per_day,
+            )
+            .order_by(views_per_day, last_active)
+            .limit(limit)
+        )
+        return list((await self.session.execute(query)).scalars().all())
+
+    async def mark_cold(self, video_id: UUID, groups: Sequence[str]) -> bool:
+        """Переключает адреса групп на холодный бакет; False — видео удалено или уже перенесено"""
+        result = await self.session.execute(
+            update(VideoORM)
+            .where(VideoORM.id == video_id, func.cardinality(VideoORM.cold_groups) == 0)
+            .values(cold_groups=list(groups), tiered_at=datetime.now(UTC))
+            .returning(VideoORM.id)
+        )
+        marked = result.scalar_one_or_none() is not None
+        await self.session.commit()
+        return marked
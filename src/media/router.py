@@ -0,0 +1,62 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import FileResponse
+
+from ..aws.backends import InvalidObjectPath, get_storage_backend
+from ..aws.delivery import delivery_signer
+from ..settings.config import MEDIA_ENV
+from .dependencies import get_image_derivatives, get_media_exceptions
+from .derivatives import ImageDerivatives
+from .exceptions import MediaHTTPExceptions
+from .images import IMAGE_FORMATS, ImageError, source_format
+
+router = APIRouter(prefix="/img", tags=["Media"])
+
+# С ``v`` (ETag исходника) адрес копии не меняет содержимого никогда
+_IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+_REVALIDATE_CACHE = "public, max-age=300"
+
+
+@router.get("/{bucket}/{key:path}", response_class=FileResponse)
+async def get_image(
+    bucket: str,
+    key: str,
+    request: Request,
+    w: int = Query(gt=0, le=4096, description="Ширина, округляется вверх до допустимой"),
+    fmt: Optional[Literal["webp", "jpeg", "png"]] = Query(default=None, description="Формат; по умолчанию как у исходника"),
+    v: Optional[str] = Query(default=None, description="ETag исходника для неизменяемого кэширования"),
+    derivatives: ImageDerivatives = Depends(get_image_derivatives),
+    http_exceptions: MediaHTTPExceptions = Depends(get_media_exceptions),
+):
+    """Уменьшенная копия картинки из хранилища"""
+    if delivery_signer.needs_signature(key):
+        # В режиме signed без подписи отдаются только обложки и аватары
+        raise http_exceptions.forbidden_403()
+    fmt = fmt or source_format(key)
+    if fmt is None:
+        raise http_exceptions.unsupported_415()
+
+    try:
+        source = await get_storage_backend().head(bucket, key)
+    except InvalidObjectPath as exc:
+        raise http_exceptions.bad_request_400(str(exc))
+    if source is None:
+        raise http_exceptions.not_found_404()
+    if source.size > MEDIA_ENV.MEDIA_IMAGE_MAX_SOURCE_BYTES:
+        raise http_exceptions.too_large_413()
+
+    width = derivatives.snap(w)
+    name = derivatives.name_for(source, width=width, fmt=fmt)
+    headers = {
+        "ETag": f'"{name.rsplit(".", 1)[0]}"',
+        "Cache-Control": _IMMUTABLE_CACHE if v == source.etag else _REVALIDATE_CACHE,
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    try:
+        path = await derivatives.get(source, width=width, fmt=fmt)
+    except ImageError:
+        raise http_exceptions.unsupported_415()
+    return FileResponse(path, media_type=IMAGE_FORMATS[fmt], headers=headers)
@@ -0,0 +1,45 @@
+from uuid import UUID
+
+from .repository import MediaJobRepository
+from .worker import MediaWorker
+
+from ..core.Enums.MediaStatusEnums import HlsStatusEnum, MediaJobKindEnum
+from ..settings.config import STORAGE_ENV
+
+import logging
+from ..core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+class MediaService:
+    def __init__(self, repository: MediaJobRepository, worker: MediaWorker):
+        self.repository = repository
+        self.worker = worker
+
+    async def enqueue_uploaded(self, video_id: UUID) -> None:
+        """
+        Оригинал загружен: разбор заголовка, постер с раскадровкой и нарезка HLS.
+        С ``STORAGE_CONTENT_DEDUP`` сначала хэш содержимого — он ставит только
+        то, чего нет у уже загруженного такого же видео.
+        """
+        if STORAGE_ENV.STORAGE_CONTENT_DEDUP:
+            kinds = [MediaJobKindEnum.DIGEST]
+        else:
+            kinds = [MediaJobKindEnum.PROBE, MediaJobKindEnum.STORYBOARD, MediaJobKindEnum.HLS]
+            # Дедупликацию выключили: новый оригинал лежит у владельца, а не в общем хранилище
+            await self.repository.detach_content(video_id)
+        if await self.repository.clear_cold(video_id):
+            # Новый оригинал лежит в основном бакете; задача удалит устаревшие холодные копии
+            kinds.append(MediaJobKindEnum.REHYDRATE)
+        await self.repository.enqueue(video_id, kinds)
+        await self.repository.set_hls_status(video_id, HlsStatusEnum.PENDING)
+        self.worker.wake()
+        logger.debug(f"Видео {video_id} поставлено в очередь обработки")
+
+    async def rehydrate(self, video_id: UUID) -> None:
+        """Видео снова смотрят: вернуть файлы из холодного бакета (до этого они отдаются оттуда)"""
+        await self.repository.enqueue_idle(video_id, [MediaJobKindEnum.REHYDRATE])
+        self.worker.wake()
+        logger.debug(f"Видео {video_id} поставлено в очередь возврата из холодного бакета")
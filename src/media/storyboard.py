@@ -0,0 +1,194 @@
+"""
+Постер и раскадровка для перемотки (спрайты + WebVTT).
+
+Как и ``transcoder``, модуль выполняется в дочерних процессах пула и не
+импортирует настройки, БД и клиентов хранилища. Кадры достаются отдельными
+вызовами ffmpeg с ``-ss`` перед ``-i``: по HTTP-источнику ffmpeg переходит
+к нужному месту ranged-запросом и не читает файл целиком.
+"""
+import math
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from .probe import ffprobe_metadata
+from .transcoder import TranscodeError
+
+
+POSTER = "poster.jpg"
+STORYBOARD_DIR = "storyboard"
+STORYBOARD_VTT = f"{STORYBOARD_DIR}/storyboard.vtt"
+
+
+@dataclass(frozen=True, slots=True)
+class StoryboardOptions:
+    interval: float = 10
+    max_frames: int = 200
+    tile_width: int = 160
+    columns: int = 10
+    rows: int = 10
+    poster_width: int = 1280
+    parallel: int = 4
+
+
+def plan_timestamps(duration: float, *, interval: float, max_frames: int) -> List[float]:
+    """Равномерная сетка кадров; для длинных видео шаг растёт, чтобы кадров было не больше ``max_frames``"""
+    if duration <= 0:
+        return [0.0]
+    step = max(interval, duration / max_frames)
+    return [round(index * step, 3) for index in range(max(1, math.ceil(duration / step)))]
+
+
+def poster_timestamp(duration: float) -> float:
+    # Первые секунды часто чёрные или с заставкой
+    return round(min(duration * 0.1, 10.0), 3)
+
+
+def _timestamp(seconds: float) -> str:
+    millis = round(seconds * 1000)
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    seconds, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{millis:03d}"
+
+
+def build_vtt(
+    timestamps: Sequence[float],
+    duration: float,
+    *,
+    tile: Tuple[int, int],
+    columns: int,
+    rows: int,
+) -> str:
+    """WebVTT-индекс: интервал времени → лист и прямоугольник плитки (``#xywh``)"""
+    width, height = tile
+    per_sheet = columns * rows
+    lines = ["WEBVTT", ""]
+    for index, start in enumerate(timestamps):
+        end = timestamps[index + 1] if index + 1 < len(timestamps) else max(duration, start + 1)
+        sheet, position = divmod(index, per_sheet)
+        row, column = divmod(position, columns)
+        lines += [
+            f"{_timestamp(start)} --> {_timestamp(end)}",
+            f"{sheet_name(sheet)}#xywh={column * width},{row * height},{width},{height}",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def sheet_name(index: int) -> str:
+    return f"sprite_{index:03d}.jpg"
+
+
+def assemble_sheets(
+    frames: Sequence[str | Path],
+    output_dir: str | Path,
+    *,
+    tile_width: int,
+    columns: int,
+    rows: int,
+    quality: int = 75,
+) -> Tuple[List[str], Tuple[int, int]]:
+    """Склеивает кадры в листы ``columns × rows``; высота плитки — по пропорциям первого кадра"""
+    with Image.open(frames[0]) as first:
+        tile = (tile_width, max(2, round(tile_width * first.height / first.width)))
+
+    per_sheet = columns * rows
+    names = []
+    for sheet_index in range(math.ceil(len(frames) / per_sheet)):
+        batch = frames[sheet_index * per_sheet:(sheet_index + 1) * per_sheet]
+        used_rows = math.ceil(len(batch) / columns)
+        sheet = Image.new("RGB", (tile[0] * min(columns, len(batch)), tile[1] * used_rows))
+        for position, frame in enumerate(batch):
+            row, column = divmod(position, columns)
+            with Image.open(frame) as image:
+                sheet.paste(image.convert("RGB").resize(tile), (column * tile[0], row * tile[1]))
+        names.append(sheet_name(sheet_index))
+        sheet.save(Path(output_dir, names[-1]), "JPEG", quality=quality, optimize=True)
+    return names, tile
+
+
+def grab_frame(
+    source: str,
+    at: float,
+    output: str | Path,
+    *,
+    width: int,
+    exact: bool = False,
+    ffmpeg: str = "ffmpeg",
+    timeout: Optional[float] = None,
+) -> None:
+    command = [ffmpeg, "-hide_banner", "-nostdin", "-y", "-v", "error"]
+    if not exact:
+        # Ближайший ключевой кадр: без декодирования GOP до точной позиции
+        command.append("-noaccurate_seek")
+    command += [
+        "-ss", f"{at:.3f}", "-i", source,
+        "-frames:v", "1",
+        "-vf", f"scale='min({width},iw)':-2",
+        "-q:v", "3",
+        str(output),
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired as exc:
+        raise TranscodeError(f"ffmpeg не уложился в {timeout} с") from exc
+    if result.returncode != 0 or not os.path.exists(output):
+        raise TranscodeError(f"ffmpeg ({at:.3f} с): {result.stderr.strip()[-2000:]}")
+
+
+def render_storyboard(
+    source: str,
+    output_dir: str,
+    *,
+    duration: float = 0,
+    options: StoryboardOptions = StoryboardOptions(),
+    ffmpeg: str = "ffmpeg",
+    ffprobe: str = "ffprobe",
+    timeout: Optional[float] = None,
+) -> List[str]:
+    """Точка входа для пула процессов; VTT в списке последним"""
+    if duration <= 0:
+        duration = ffprobe_metadata(source, ffprobe=ffprobe).duration
+
+    grab_frame(
+        source, poster_timestamp(duration), Path(output_dir, POSTER),
+        width=options.poster_width, exact=True, ffmpeg=ffmpeg, timeout=timeout,
+    )
+
+    frames_dir = Path(output_dir, "frames")
+    sheets_dir = Path(output_dir, STORYBOARD_DIR)
+    os.makedirs(frames_dir, exist_ok=True)
+    os.makedirs(sheets_dir, exist_ok=True)
+
+    def grab(item: Tuple[int, float]) -> Optional[Tuple[float, Path]]:
+        index, at = item
+        frame = frames_dir / f"{index:05d}.jpg"
+        try:
+            grab_frame(source, at, frame, width=options.tile_width, ffmpeg=ffmpeg, timeout=timeout)
+        except TranscodeError:
+            # Кадр у самого конца может не декодироваться — плитка просто пропускается
+            return None
+        return at, frame
+
+    timestamps = plan_timestamps(duration, interval=options.interval, max_frames=options.max_frames)
+    # Процессы ffmpeg ждут сети, поэтому несколько штук параллельно даже внутри одного воркера пула
+    with ThreadPoolExecutor(max_workers=max(1, options.parallel)) as threads:
+        grabbed = [item for item in threads.map(grab, enumerate(timestamps)) if item is not None]
+    if not grabbed:
+        raise TranscodeError("Не удалось извлечь ни одного кадра для раскадровки")
+
+    sheets, tile = assemble_sheets(
+        [frame for _, frame in grabbed], sheets_dir,
+        tile_width=options.tile_width, columns=options.columns, rows=options.rows,
+    )
+    Path(output_dir, STORYBOARD_VTT).write_text(
+        build_vtt([at for at, _ in grabbed], duration, tile=tile, columns=options.columns, rows=options.rows),
+        encoding="utf-8",
+    )
+    return [POSTER, *(f"{STORYBOARD_DIR}/{name}" for name in sheets), STORYBOARD_VTT]
@@ -0,0 +1,261 @@
+"""
+Перенос давно не смотревших видео в холодный бакет (``TIERING_ENABLED``).
+
+Раз в ``TIERING_INTERVAL_SECONDS`` выбираются опубликованные видео старше
+``TIERING_MIN_AGE_DAYS`` без активности дольше ``TIERING_IDLE_DAYS`` и с
+малым числом просмотров в день. Их оригиналы (и, если не оставлены
+настройками, HLS-ступени, постер и раскадровка) копируются внутри
+хранилища в ``STORAGE_COLD_BUCKET`` параллельно, после чего адреса в
+``VideoDataReadSchema`` переключаются на холодный бакет и горячие копии
+удаляются.
+
+Просмотр холодного видео (``GET /videos/{id}``) ставит задачу
+``rehydrate``: файлы сразу отдаются из холодного бакета, а задача
+возвращает их в основной и снова переключает адреса.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, UTC
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..aws.backends import ObjectInfo, get_storage_backend
+from ..aws.layout import ORIGINAL, PREVIEWS, RENDITIONS, cold_object, locate, video_file_group, video_prefix
+from ..core.metrics import register_metrics
+from ..database import async_session_maker
+from ..settings.config import MAINTENANCE_ENV, STORAGE_ENV
+from ..videos.models import VideoORM
+from .repository import MediaJobRepository, StorageTierRepository
+
+from ..core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+def tier_groups(*, keep_renditions: bool, keep_previews: bool) -> List[str]:
+    """Группы файлов, переносимые в холодный бакет; оригинал — всегда"""
+    groups = [ORIGINAL]
+    if not keep_renditions:
+        groups.append(RENDITIONS)
+    if not keep_previews:
+        groups.append(PREVIEWS)
+    return groups
+
+
+class StorageTiering:
+    def __init__(
+        self,
+        *,
+        enabled: bool,
+        groups: Sequence[str],
+        min_age: timedelta,
+        idle: timedelta,
+        max_views_per_day: float,
+        batch_size: int,
+        concurrency: int,
+        copy_concurrency: int,
+        interval: float,
+        storage_class: Optional[str] = None,
+    ):
+        self.enabled = enabled
+        self.groups = list(groups)
+        self.min_age = min_age
+        self.idle = idle
+        self.max_views_per_day = max_views_per_day
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+        self.copy_concurrency = max(1, copy_concurrency)
+        self.interval = interval
+        self.storage_class = storage_class
+        self._buckets: set[str] = set()
+        self._moved = 0
+        self._moved_bytes = 0
+        self._rehydrated = 0
+        self._failed = 0
+        self._last_run: Optional[datetime] = None
+        self._last_seconds = 0.0
+
+    @asynccontextmanager
+    async def _tiers(self) -> AsyncIterator[StorageTierRepository]:
+        async with async_session_maker() as session:
+            yield StorageTierRepository(session)
+
+    @asynccontextmanager
+    async def _jobs(self) -> AsyncIterator[MediaJobRepository]:
+        async with async_session_maker() as session:
+            yield MediaJobRepository(session)
+
+    # ---------- перенос ----------
+    async def sweep_once(self) -> int:
+        if not self.enabled:
+            return 0
+        started = time.perf_counter()
+        moved = 0
+        while True:
+            async with self._tiers() as tiers:
+                videos = await tiers.cold_candidates(
+                    min_age=self.min_age,
+                    idle=self.idle,
+                    max_views_per_day=self.max_views_per_day,
+                    limit=self.batch_size,
+                )
+            batch = await self._move_batch(videos)
+            moved += batch
+            # Пачка с ошибками или последняя — до следующего запуска
+            if batch < self.batch_size:
+                break
+
+        self._last_run = datetime.now(UTC)
+        self._last_seconds = time.perf_counter() - started
+        if moved:
+            logger.info(f"В холодный бакет перенесено видео: {moved} за {self._last_seconds:.1f} с")
+        return moved
+
+    async def _move_batch(self, videos: List[VideoORM]) -> int:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def move(video: VideoORM) -> bool:
+            async with semaphore:
+                try:
+                    return await self.move(video)
+                except Exception:
+                    self._failed += 1
+                    logger.exception(f"Не удалось перенести видео {video.id} в холодный бакет")
+                    return False
+
+        return sum(await asyncio.gather(*(move(video) for video in videos)))
+
+    async def move(self, video: VideoORM) -> bool:
+        """
+        Копирует файлы выбранных групп в холодный бакет, переключает адреса
+        и удаляет горячие копии. False — переносить нечего или видео изменилось.
+        """
+        backend = get_storage_backend()
+        bucket, prefix = locate(video.user_id, f"{video_prefix(video.channel_id, video.id)}/")
+        files = [
+            info async for info in backend.list_prefix(bucket, prefix)
+            if video_file_group(info.key[len(prefix):]) in self.groups
+        ]
+        original = next((info for info in files if video_file_group(info.key[len(prefix):]) == ORIGINAL), None)
+        if original is None:
+            return False
+
+        copies = await self._copy(
+            files,
+            lambda info: cold_object(video.user_id, f"{video_prefix(video.channel_id, video.id)}/{info.key[len(prefix):]}"),
+            storage_class=self.storage_class,
+        )
+        groups = sorted({video_file_group(info.key[len(prefix):]) for info in files})
+        async with self._tiers() as tiers:
+            marked = await tiers.mark_cold(video.id, groups)
+
+        # Пока шло копирование, автор мог загрузить оригинал заново
+        current = await backend.head(bucket, original.key)
+        if marked and (current is None or current.etag != original.etag):
+            async with self._jobs() as jobs:
+                await jobs.clear_cold(video.id)
+            marked = False
+        if not marked:
+            await self._delete_copies(copies)
+            return False
+
+        await backend.delete(bucket, [info.key for info in files])
+        self._moved += 1
+        self._moved_bytes += sum(info.size for info in files)
+        return True
+
+    # ---------- возврат ----------
+    async def rehydrate(self, video: VideoORM) -> None:
+        """
+        Возвращает холодные файлы видео в основной бакет. Группы читаются
+        заново: если автор успел загрузить новый оригинал, устаревшие
+        холодные копии только удаляются.
+        """
+        backend = get_storage_backend()
+        async with self._jobs() as jobs:
+            groups = await jobs.cold_groups(video.id)
+
+        cold_bucket, cold_prefix = cold_object(video.user_id, f"{video_prefix(video.channel_id, video.id)}/")
+        files = [info async for info in backend.list_prefix(cold_bucket, cold_prefix)]
+        restore = [info for info in files if video_file_group(info.key[len(cold_prefix):]) in groups]
+        await self._copy(restore, lambda info: locate(
+            video.user_id, f"{video_prefix(video.channel_id, video.id)}/{info.key[len(cold_prefix):]}"
+        ), storage_class=None)
+
+        async with self._jobs() as jobs:
+            await jobs.clear_cold(video.id)
+        if files:
+            await backend.delete(cold_bucket, [info.key for info in files])
+        self._rehydrated += 1
+        logger.info(f"Видео {video.id} возвращено из холодного бакета: {len(restore)} файлов")
+
+    # ---------- копирование ----------
+    async def _copy(
+        self,
+        files: List[ObjectInfo],
+        target: Callable[[ObjectInfo], Tuple[str, str]],
+        *,
+        storage_class: Optional[str],
+    ) -> List[Tuple[str, str]]:
+        """Параллельные копии внутри хранилища; возвращает адреса созданных копий"""
+        backend = get_storage_backend()
+        semaphore = asyncio.Semaphore(self.copy_concurrency)
+        targets = [target(info) for info in files]
+        for bucket in {bucket for bucket, _ in targets} - self._buckets:
+            await backend.ensure_bucket(bucket)
+            self._buckets.add(bucket)
+
+        async def copy(info: ObjectInfo, bucket: str, key: str) -> None:
+            async with semaphore:
+                await backend.copy_object(info.bucket, info.key, bucket, key, storage_class=storage_class)
+
+        await asyncio.gather(*(copy(info, *location) for info, location in zip(files, targets)))
+        return targets
+
+    async def _delete_copies(self, copies: List[Tuple[str, str]]) -> None:
+        backend = get_storage_backend()
+        by_bucket: Dict[str, List[str]] = {}
+        for bucket, key in copies:
+            by_bucket.setdefault(bucket, []).append(key)
+        for bucket, keys in by_bucket.items():
+            await backend.delete(bucket, keys)
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.sweep_once()
+            except Exception:
+                logger.exception("Не удалось перенести холодные видео")
+            await asyncio.sleep(self.interval)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "groups": self.groups,
+            "moved": self._moved,
+            "moved_bytes": self._moved_bytes,
+            "rehydrated": self._rehydrated,
+            "failed": self._failed,
+            "last_run": self._last_run.isoformat() if self._last_run else None,
+            "last_run_seconds": round(self._last_seconds, 3),
+        }
+
+
+storage_tiering = StorageTiering(
+    enabled=MAINTENANCE_ENV.TIERING_ENABLED,
+    groups=tier_groups(
+        keep_renditions=MAINTENANCE_ENV.TIERING_KEEP_RENDITIONS,
+        keep_previews=MAINTENANCE_ENV.TIERING_KEEP_PREVIEWS,
+    ),
+    min_age=timedelta(days=MAINTENANCE_ENV.TIERING_MIN_AGE_DAYS),
+    idle=timedelta(days=MAINTENANCE_ENV.TIERING_IDLE_DAYS),
+    max_views_per_day=MAINTENANCE_ENV.TIERING_MAX_VIEWS_PER_DAY,
+    batch_size=MAINTENANCE_ENV.TIERING_BATCH_SIZE,
+    concurrency=MAINTENANCE_ENV.TIERING_CONCURRENCY,
+    copy_concurrency=MAINTENANCE_ENV.TIERING_COPY_CONCURRENCY,
+    interval=MAINTENANCE_ENV.TIERING_INTERVAL_SECONDS,
+    storage_class=STORAGE_ENV.STORAGE_COLD_STORAGE_CLASS,
+)
+register_metrics("storage_tiering", storage_tiering.metrics)
@@ -0,0 +1,158 @@
+"""
+Нарезка HLS через ffmpeg.
+
+Модуль выполняется в дочерних процессах пула, поэтому не импортирует
+настройки, БД и клиентов хранилища: на вход — адрес исходника и каталог
+результата, на выход — список созданных файлов относительно каталога.
+"""
+import json
+import os
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+
+MASTER_PLAYLIST = "master.m3u8"
+
+
+class TranscodeError(RuntimeError):
+    """ffmpeg/ffprobe завершились с ошибкой"""
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Rendition:
+    height: int
+    video_kbps: int
+    audio_kbps: int = 128
+
+    @property
+    def name(self) -> str:
+        return f"{self.height}p"
+
+
+@dataclass(frozen=True, slots=True)
+class SourceInfo:
+    height: int
+    has_audio: bool
+
+
+def parse_renditions(spec: str) -> List[Rendition]:
+    """``"1080:5000,720:2800"`` → список ступеней от большей к меньшей"""
+    renditions = []
+    for item in spec.split(","):
+        height, _, kbps = item.strip().partition(":")
+        renditions.append(Rendition(height=int(height), video_kbps=int(kbps)))
+    return sorted(renditions, key=lambda rendition: rendition.height, reverse=True)
+
+
+def select_renditions(renditions: Sequence[Rendition], source_height: int) -> List[Rendition]:
+    """Без апскейла: ступени не выше исходника, но хотя бы одна — самая низкая"""
+    selected = [rendition for rendition in renditions if rendition.height <= source_height]
+    return selected or [min(renditions, key=lambda rendition: rendition.height)]
+
+
+def probe_source(source: str, *, ffprobe: str = "ffprobe") -> SourceInfo:
+    result = subprocess.run(
+        [ffprobe, "-v", "error", "-show_entries", "stream=codec_type,height", "-of", "json", source],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise TranscodeError(f"ffprobe: {result.stderr.strip()[-2000:]}")
+    streams = json.loads(result.stdout or "{}").get("streams", [])
+    heights = [stream.get("height") or 0 for stream in streams if stream.get("codec_type") == "video"]
+    if not heights:
+        raise TranscodeError("Во входном файле нет видеодорожки")
+    return SourceInfo(
+        height=max(heights),
+        has_audio=any(stream.get("codec_type") == "audio" for stream in streams),
+    )
+
+
+def build_hls_command(
+    source: str,
+    output_dir: str | Path,
+    renditions: Sequence[Rendition],
+    *,
+    has_audio: bool,
+    segment_seconds: int = 6,
+    preset: str = "veryfast",
+    ffmpeg: str = "ffmpeg",
+) -> List[str]:
+    """Один проход ffmpeg: декодирование один раз, split на все ступени, общий master-плейлист"""
+    output_dir = Path(output_dir)
+    count = len(renditions)
+    filters = [f"[0:v]split={count}" + "".join(f"[v{index}]" for index in range(count))]
+    filters += [f"[v{index}]scale=-2:{rendition.height}[v{index}out]" for index, rendition in enumerate(renditions)]
+
+    command = [ffmpeg, "-hide_banner", "-nostdin", "-y", "-i", source, "-filter_complex", ";".join(filters)]
+    stream_map = []
+    for index, rendition in enumerate(renditions):
+        command += [
+            "-map", f"[v{index}out]",
+            f"-c:v:{index}", "libx264",
+            f"-b:v:{index}", f"{rendition.video_kbps}k",
+            f"-maxrate:v:{index}", f"{int(rendition.video_kbps * 1.07)}k",
+            f"-bufsize:v:{index}", f"{rendition.video_kbps * 3 // 2}k",
+        ]
+        entry = f"v:{index}"
+        if has_audio:
+            command += ["-map", "a:0", f"-c:a:{index}", "aac", f"-b:a:{index}", f"{rendition.audio_kbps}k", "-ac", "2"]
+            entry += f",a:{index}"
+        stream_map.append(f"{entry},name:{rendition.name}")
+
+    # Ключевой кадр на границе каждого сегмента — ступени переключаются без разрывов
+    gop = f"expr:gte(t,n_forced*{segment_seconds})"
+    command += [
+        "-preset", preset,
+        "-force_key_frames", gop,
+        "-sc_threshold", "0",
+        "-f", "hls",
+        "-hls_time", str(segment_seconds),
+        "-hls_playlist_type", "vod",
+        "-hls_flags", "independent_segments",
+        "-hls_segment_filename", str(output_dir / "%v" / "segment_%05d.ts"),
+        "-master_pl_name", MASTER_PLAYLIST,
+        "-var_stream_map", " ".join(stream_map),
+        str(output_dir / "%v" / "index.m3u8"),
+    ]
+    return command
+
+
+def transcode_hls(
+    source: str,
+    output_dir: str,
+    renditions: Sequence[Rendition],
+    *,
+    segment_seconds: int = 6,
+    preset: str = "veryfast",
+    ffmpeg: str = "ffmpeg",
+    ffprobe: str = "ffprobe",
+    timeout: Optional[float] = None,
+) -> List[str]:
+    """Точка входа для пула процессов"""
+    info = probe_source(source, ffprobe=ffprobe)
+    selected = select_renditions(renditions, info.height)
+    for rendition in selected:
+        os.makedirs(Path(output_dir, rendition.name), exist_ok=True)
+
+    command = build_hls_command(
+        source, output_dir, selected,
+        has_audio=info.has_audio, segment_seconds=segment_seconds, preset=preset, ffmpeg=ffmpeg,
+    )
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired as exc:
+        raise TranscodeError(f"ffmpeg не уложился в {timeout} с") from exc
+    if result.returncode != 0:
+        raise TranscodeError(f"ffmpeg: {result.stderr.strip()[-2000:]}")
+
+    produced = [
+        path.relative_to(output_dir).as_posix()
+        for path in Path(output_dir).rglob("*")
+        if path.is_file()
+    ]
+    # Master-плейлист загружается последним: плеер не увидит его раньше сегментов
+    return sorted(produced, key=lambda name: (name == MASTER_PLAYLIST, name))
@@ -0,0 +1,399 @@
+"""
+Фоновый исполнитель задач ``media_jobs``: хэш содержимого, разбор
+заголовка, постер с раскадровкой, нарезка HLS и возврат из холодного бакета.
+
+ffmpeg/ffprobe запускаются в ограниченном пуле процессов (``MEDIA_TRANSCODE_WORKERS``):
+пул ограничивает число одновременных перекодировок на воркер API и
+изолирует тяжёлую работу от event loop. Задачи забираются из таблицы
+через SKIP LOCKED, поэтому несколько воркеров uvicorn делят очередь.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+from ..aws.backends import ObjectInfo, get_storage_backend
+from ..aws.layout import HLS_DIR, video_object
+from ..core.Enums.MediaStatusEnums import HlsStatusEnum, MediaJobKindEnum
+from ..core.metrics import register_metrics
+from ..database import async_session_maker
+from ..settings.config import MEDIA_ENV, STORAGE_ENV
+from ..videos.models import VideoORM
+from .blobs import object_sha256
+from .models import MediaJobORM
+from .probe import ProbeError, ffprobe_metadata, probe_mp4
+from .repository import MediaBlobRepository, MediaJobRepository
+from .storyboard import POSTER, STORYBOARD_VTT, StoryboardOptions, render_storyboard
+from .tiering import storage_tiering
+from .transcoder import parse_renditions, transcode_hls
+
+from ..core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+_CONTENT_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+    ".jpg": "image/jpeg",
+    ".vtt": "text/vtt",
+}
+JobHandler = Callable[[MediaJobORM, VideoORM], Awaitable[None]]
+
+_SEGMENT_CACHE = "public, max-age=31536000, immutable"
+_PLAYLIST_CACHE = "public, max-age=300"
+
+
+class MediaWorker:
+    def __init__(
+        self,
+        *,
+        workers: int,
+        probe_concurrency: int,
+        poll_seconds: float,
+        job_timeout: int,
+        max_attempts: int,
+    ):
+        self.workers = max(1, workers)
+        self.poll_seconds = poll_seconds
+        self.job_timeout = job_timeout
+        self.max_attempts = max_attempts
+        self.renditions = parse_renditions(MEDIA_ENV.MEDIA_HLS_RENDITIONS)
+        self.storyboard = StoryboardOptions(
+            interval=MEDIA_ENV.MEDIA_STORYBOARD_INTERVAL,
+            max_frames=MEDIA_ENV.MEDIA_STORYBOARD_MAX_FRAMES,
+            tile_width=MEDIA_ENV.MEDIA_STORYBOARD_TILE_WIDTH,
+            columns=MEDIA_ENV.MEDIA_STORYBOARD_COLUMNS,
+            rows=MEDIA_ENV.MEDIA_STORYBOARD_ROWS,
+            poster_width=MEDIA_ENV.MEDIA_POSTER_WIDTH,
+            parallel=MEDIA_ENV.MEDIA_STORYBOARD_PARALLEL,
+        )
+        # Слоты по видам задач: быстрый разбор заголовка не ждёт долгих перекодировок
+        self._slots: Dict[MediaJobKindEnum, int] = {
+            MediaJobKindEnum.PROBE: max(1, probe_concurrency),
+            MediaJobKindEnum.STORYBOARD: self.workers,
+            MediaJobKindEnum.HLS: self.workers,
+            MediaJobKindEnum.DIGEST: max(1, probe_concurrency),
+            MediaJobKindEnum.REHYDRATE: max(1, probe_concurrency),
+        }
+        self._handlers: Dict[MediaJobKindEnum, JobHandler] = {
+            MediaJobKindEnum.PROBE: self._run_probe,
+            MediaJobKindEnum.STORYBOARD: self._run_storyboard,
+            MediaJobKindEnum.HLS: self._run_hls,
+            MediaJobKindEnum.DIGEST: self._run_digest,
+            MediaJobKindEnum.REHYDRATE: self._run_rehydrate,
+        }
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._blob_buckets: Set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._draining = False
+        self._running: Dict[MediaJobKindEnum, Set[asyncio.Task]] = {kind: set() for kind in self._slots}
+        self._done: Dict[MediaJobKindEnum, int] = {kind: 0 for kind in self._slots}
+        self._failed: Dict[MediaJobKindEnum, int] = {kind: 0 for kind in self._slots}
+        self._seconds: Dict[MediaJobKindEnum, float] = {kind: 0.0 for kind in self._slots}
+
+    # ---------- пул ----------
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: форк процесса с работающим event loop и пулом БД небезопасен
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------- очередь ----------
+    def wake(self) -> None:
+        """Будит цикл после постановки задачи в этом процессе, не дожидаясь опроса"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    @asynccontextmanager
+    async def _repository(self) -> AsyncIterator[MediaJobRepository]:
+        async with async_session_maker() as session:
+            yield MediaJobRepository(session)
+
+    @asynccontextmanager
+    async def _blobs(self) -> AsyncIterator[MediaBlobRepository]:
+        async with async_session_maker() as session:
+            yield MediaBlobRepository(session)
+
+    async def run_forever(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._draining = False
+        try:
+            while True:
+                self._wakeup.clear()
+                claimed = 0
+                for kind, slots in self._slots.items():
+                    free = slots - len(self._running[kind])
+                    if free <= 0 or self._draining:
+                        continue
+                    try:
+                        claimed += await self._claim(kind, free)
+                    except Exception:
+                        logger.exception(f"Не удалось получить задачи media_jobs ({kind.value})")
+
+                if claimed == 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            # Прерванные задачи остаются в running и будут подобраны как зависшие
+            for tasks in self._running.values():
+                for task in tasks:
+                    task.cancel()
+
+    async def drain(self) -> None:
+        """Остановка: новые задачи не берутся, начатые дорабатывают (ожидание ограничено lifespan)"""
+        self._draining = True
+        tasks = [task for tasks in self._running.values() for task in tasks]
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def _claim(self, kind: MediaJobKindEnum, limit: int) -> int:
+        async with self._repository() as repository:
+            jobs = await repository.claim(
+                kind,
+                limit=limit,
+                stale_after=timedelta(seconds=self.job_timeout),
+                max_attempts=self.max_attempts,
+            )
+        for job, video in jobs:
+            task = asyncio.create_task(self._execute(kind, job, video), name=f"media-job-{job.id}")
+            self._running[kind].add(task)
+            task.add_done_callback(partial(self._on_task_done, kind))
+        return len(jobs)
+
+    def _on_task_done(self, kind: MediaJobKindEnum, task: asyncio.Task) -> None:
+        self._running[kind].discard(task)
+        self.wake()
+
+    async def _execute(self, kind: MediaJobKindEnum, job: MediaJobORM, video: VideoORM) -> None:
+        started = time.perf_counter()
+        try:
+            await self._handlers[kind](job, video)
+            async with self._repository() as repository:
+                await repository.finish(job.id)
+            self._done[kind] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            retry = job.attempts < self.max_attempts
+            self._failed[kind] += 1
+            logger.exception(f"Задача {kind.value} {job.id} (видео {video.id}) не выполнена, попытка {job.attempts}")
+            async with self._repository() as repository:
+                await repository.fail(job.id, f"{type(exc).__name__}: {exc}", retry=retry)
+                if kind is MediaJobKindEnum.HLS:
+                    await repository.set_hls_status(video.id, HlsStatusEnum.PENDING if retry else HlsStatusEnum.FAILED)
+        finally:
+            self._seconds[kind] += time.perf_counter() - started
+
+    @staticmethod
+    def _object(
+        video: VideoORM, name: str, *, shared: bool = True, cold_groups: Sequence[str] = ()
+    ) -> tuple[str, str]:
+        """Файл видео: после ``digest`` — в общем префиксе содержимого; новые файлы всегда пишутся в основной бакет"""
+        return video_object(
+            video.user_id, video.channel_id, video.id, name,
+            content_sha256=video.content_sha256 if shared else None,
+            cold_groups=cold_groups,
+        )
+
+    def _source(self, video: VideoORM) -> tuple[str, str]:
+        # Оригинал может лежать в холодном бакете — читается оттуда без возврата
+        return self._object(video, f"video.{video.video_ext.value}", cold_groups=video.cold_groups or ())
+
+    # ---------- хэш содержимого ----------
+    async def _run_digest(self, job: MediaJobORM, video: VideoORM) -> None:
+        backend = get_storage_backend()
+        bucket, key = self._object(video, f"video.{video.video_ext.value}", shared=False)
+        info = await backend.head(bucket, key)
+        if info is None:
+            if video.content_sha256 is None:
+                raise FileNotFoundError(f"{bucket}/{key}")
+            # Прошлая попытка успела перенести оригинал и упала позже
+            sha256 = video.content_sha256
+        else:
+            sha256 = await object_sha256(
+                backend, bucket, key, info.size, chunk_size=MEDIA_ENV.MEDIA_DIGEST_CHUNK_SIZE
+            )
+            await self._store_blob(video, sha256, info)
+
+        async with self._repository() as repository:
+            pending = await repository.reuse(video.id, sha256)
+            if pending:
+                await repository.enqueue(video.id, pending)
+        self.wake()
+        logger.info(f"Видео {video.id}: содержимое {sha256[:12]}, осталось задач: {[kind.value for kind in pending]}")
+
+    async def _store_blob(self, video: VideoORM, sha256: str, info: ObjectInfo) -> None:
+        """Оригинал — в общее хранилище (если такого содержимого ещё нет), видео — на него"""
+        backend = get_storage_backend()
+        async with self._blobs() as blobs:
+            blob = await blobs.touch(sha256, size=info.size, ext=video.video_ext.value)
+        if not blob.stored:
+            bucket, key = video_object(
+                video.user_id, video.channel_id, video.id, f"video.{blob.ext}", content_sha256=sha256
+            )
+            if bucket not in self._blob_buckets:
+                await backend.ensure_bucket(bucket)
+                self._blob_buckets.add(bucket)
+            await backend.copy_object(info.bucket, info.key, bucket, key)
+            async with self._blobs() as blobs:
+                await blobs.mark_stored(sha256)
+
+        async with self._blobs() as blobs:
+            attached = await blobs.attach(video.id, sha256, ext=blob.ext)
+        # Пока считался хэш, ключ могли перезаписать новой загрузкой — её обработает своя задача digest
+        current = await backend.head(info.bucket, info.key)
+        if attached and current is not None and current.etag == info.etag:
+            await backend.delete(info.bucket, [info.key])
+
+    # ---------- возврат из холодного бакета ----------
+    async def _run_rehydrate(self, job: MediaJobORM, video: VideoORM) -> None:
+        await storage_tiering.rehydrate(video)
+
+    # ---------- разбор заголовка ----------
+    async def _run_probe(self, job: MediaJobORM, video: VideoORM) -> None:
+        bucket, source_key = self._source(video)
+        backend = get_storage_backend()
+        info = await backend.head(bucket, source_key)
+        if info is None:
+            raise FileNotFoundError(f"{bucket}/{source_key}")
+
+        try:
+            media = await probe_mp4(partial(backend.read_range, bucket, source_key), info.size)
+        except ProbeError as exc:
+            logger.info(f"Заголовок {source_key} не разобран ({exc}), используем ffprobe")
+            source = await backend.source_url(bucket, source_key, expires_in=self.job_timeout)
+            media = await asyncio.get_running_loop().run_in_executor(
+                self._pool(), partial(ffprobe_metadata, source, ffprobe=MEDIA_ENV.FFPROBE_BINARY)
+            )
+
+        async with self._repository() as repository:
+            await repository.set_media_info(video.id, media)
+        logger.debug(f"Видео {video.id}: {media}")
+
+    # ---------- постер и раскадровка ----------
+    async def _run_storyboard(self, job: MediaJobORM, video: VideoORM) -> None:
+        bucket, source_key = self._source(video)
+        backend = get_storage_backend()
+        source = await backend.source_url(bucket, source_key, expires_in=self.job_timeout)
+
+        with tempfile.TemporaryDirectory(prefix="storyboard-", dir=MEDIA_ENV.MEDIA_WORK_DIR) as workdir:
+            files = await asyncio.get_running_loop().run_in_executor(
+                self._pool(),
+                partial(
+                    render_storyboard,
+                    source,
+                    workdir,
+                    # timeline уже заполнен, если задача probe успела отработать
+                    duration=video.timeline or 0,
+                    options=self.storyboard,
+                    ffmpeg=MEDIA_ENV.FFMPEG_BINARY,
+                    ffprobe=MEDIA_ENV.FFPROBE_BINARY,
+                    timeout=self.job_timeout,
+                ),
+            )
+            await self._upload(video, "", workdir, files)
+
+        async with self._repository() as repository:
+            await repository.set_storyboard(
+                video.id, poster=POSTER in files, storyboard=STORYBOARD_VTT in files
+            )
+
+    # ---------- HLS ----------
+    async def _run_hls(self, job: MediaJobORM, video: VideoORM) -> None:
+        started = time.perf_counter()
+        bucket, source_key = self._source(video)
+        backend = get_storage_backend()
+
+        async with self._repository() as repository:
+            await repository.set_hls_status(video.id, HlsStatusEnum.PROCESSING)
+
+        source = await backend.source_url(bucket, source_key, expires_in=self.job_timeout)
+        with tempfile.TemporaryDirectory(prefix="hls-", dir=MEDIA_ENV.MEDIA_WORK_DIR) as workdir:
+            files = await asyncio.get_running_loop().run_in_executor(
+                self._pool(),
+                partial(
+                    transcode_hls,
+                    source,
+                    workdir,
+                    self.renditions,
+                    segment_seconds=MEDIA_ENV.MEDIA_HLS_SEGMENT_SECONDS,
+                    preset=MEDIA_ENV.MEDIA_HLS_PRESET,
+                    ffmpeg=MEDIA_ENV.FFMPEG_BINARY,
+                    ffprobe=MEDIA_ENV.FFPROBE_BINARY,
+                    timeout=self.job_timeout,
+                ),
+            )
+            await self._upload(video, f"{HLS_DIR}/", workdir, files)
+
+        async with self._repository() as repository:
+            await repository.set_hls_status(video.id, HlsStatusEnum.READY)
+        logger.info(f"HLS для видео {video.id}: {len(files)} файлов за {time.perf_counter() - started:.1f} с")
+
+    async def _upload(self, video: VideoORM, directory: str, workdir: str, files: List[str]) -> None:
+        """Загружает результат задачи; ``files`` упорядочены так, что индекс — последний"""
+        backend = get_storage_backend()
+        semaphore = asyncio.Semaphore(MEDIA_ENV.MEDIA_UPLOAD_CONCURRENCY)
+
+        async def put(name: str) -> None:
+            suffix = os.path.splitext(name)[1]
+            bucket, key = self._object(video, f"{directory}{name}")
+            async with semaphore:
+                await backend.put_file(
+                    bucket,
+                    key,
+                    Path(workdir, name),
+                    content_type=_CONTENT_TYPES.get(suffix, "application/octet-stream"),
+                    cache_control=_SEGMENT_CACHE if suffix == ".ts" else _PLAYLIST_CACHE,
+                )
+
+        # Последний файл — индекс (master-плейлист, VTT): клиент не увидит его раньше частей
+        *parts, index = files
+        await asyncio.gather(*(put(name) for name in parts))
+        await put(index)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self.workers,
+            **{
+                kind.value: {
+                    "slots": self._slots[kind],
+                    "running": len(self._running[kind]),
+                    "done": self._done[kind],
+                    "failed": self._failed[kind],
+                    "avg_job_seconds": round(
+                        self._seconds[kind] / ((self._done[kind] + self._failed[kind]) or 1), 3
+                    ),
+                }
+                for kind in self._slots
+            },
+        }
+
+
+media_worker = MediaWorker(
+    workers=MEDIA_ENV.MEDIA_TRANSCODE_WORKERS,
+    probe_concurrency=MEDIA_ENV.MEDIA_PROBE_CONCURRENCY,
+    poll_seconds=MEDIA_ENV.MEDIA_JOB_POLL_SECONDS,
+    job_timeout=MEDIA_ENV.MEDIA_JOB_TIMEOUT_SECONDS,
+    max_attempts=MEDIA_ENV.MEDIA_JOB_MAX_ATTEMPTS,
+)
+register_metrics("media_jobs", media_worker.metrics)
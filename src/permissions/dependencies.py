@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_async_session
 
-from ..auth.schemas import UserReadSchema
+from ..auth.schemas import CurrentUserSchema
 from ..auth.dependencies import get_current_user
 
 from ..courses.dependencies import course_is_open
@@ -60,7 +60,7 @@ def require_permission(
 
     async def dependency(
         course_id: UUID = Path(..., alias=course_id_param),
-        user: UserReadSchema = Depends(get_current_user),
+        user: CurrentUserSchema = Depends(get_current_user),
         permissions_service: PermissionsService = Depends(get_permissions_service),
     ) -> PermissionReadSchema | None:
         
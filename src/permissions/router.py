@@ -5,7 +5,7 @@ from typing import List
 from fastapi import APIRouter, Depends, Path, status
 from uuid import UUID
 
-from ..auth.schemas import UserReadSchema
+from ..auth.schemas import CurrentUserSchema
 from ..auth.dependencies import get_current_user
 
 from ..courses.dependencies import get_current_course_with_owner_validate
@@ -46,7 +46,7 @@ async def grant_course_permission(
 async def get_course_permission(
     course_id: UUID = Path(..., alias="course_id"),
     service: PermissionsService = Depends(get_permissions_service),
-    current_user: UserReadSchema = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
 ):
     return await service.get_course_permission_for_user(current_user.id, course_id)
 
@@ -57,7 +57,7 @@ async def get_course_permission(
     status_code=status.HTTP_200_OK
 )
 async def get_permissions_for_user(
-    current_user: UserReadSchema = Depends(get_current_user),
+    current_user: CurrentUserSchema = Depends(get_current_user),
     service: PermissionsService = Depends(get_permissions_service),
 ):
     return await service.get_all_user_permissions(current_user.id)
\ No newline at end of file
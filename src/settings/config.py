@@ -1,3 +1,6 @@
+import os
+from typing import Literal, Optional
+
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -20,7 +23,12 @@ class DBEnv(BaseSettings):
 
 class AuthEnv(BaseSettings):
     SECRET_AUTH: str
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 999999
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    REVOCATION_SYNC_SECONDS: int = 30
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64
 
 class APIEnv(BaseSettings):
     SERVER_HOST: str
@@ -29,6 +37,17 @@ class APIEnv(BaseSettings):
     BASE_SERVER_URL: str
     FRONTEND_PORT: str = "5173"
     FRONTEND_TESTER_IP: str
+    WORKERS: Optional[int] = None
+    BACKLOG: int = 2048
+    KEEPALIVE_TIMEOUT: int = 5
+    GRACEFUL_SHUTDOWN_TIMEOUT: int = 30
+    LIMIT_CONCURRENCY: Optional[int] = None
+    SHUTDOWN_DRAIN_TIMEOUT: int = 10
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+
+    @property
+    def workers_count(self) -> int:
+        return self.WORKERS or os.cpu_count() or 1
     
     @property
     def public_url(self) -> str:
@@ -50,6 +69,13 @@ class S3Env(BaseSettings):
     S3_PUBLIC_URL: str
     BASE_SERVER_URL: str
     MINIO_PATH: str = "minio"
+    S3_MAX_POOL_CONNECTIONS: int = 50
+    S3_CONNECT_TIMEOUT: float = 5
+    S3_READ_TIMEOUT: float = 30
+    S3_RETRY_MODE: str = "standard"
+    S3_MAX_ATTEMPTS: int = 3
+    S3_TCP_KEEPALIVE: bool = True
+    S3_KEEPALIVE_TIMEOUT: float = 30
     
     @property
     def public_url(self) -> str:
@@ -58,6 +84,86 @@ class S3Env(BaseSettings):
 class WebhookEnv(BaseSettings):
     MINIO_WEBHOOK_ENDPOINT: str
     MINIO_WEBHOOK_TOKEN: str
+    WEBHOOK_DEDUP_CACHE_SIZE: int = 100_000
+    WEBHOOK_RETRY_POLL_SECONDS: float = 5
+    WEBHOOK_RETRY_BASE_SECONDS: float = 10
+    WEBHOOK_RETRY_MAX_DELAY_SECONDS: float = 3600
+    WEBHOOK_RETRY_MAX_ATTEMPTS: int = 8
+    WEBHOOK_RETRY_BATCH_SIZE: int = 50
+
+class StorageEnv(BaseSettings):
+    STORAGE_BACKEND: Literal["s3", "local"] = "s3"
+    STORAGE_LOCAL_ROOT: str = "storage-data"
+    STORAGE_LOCAL_SECRET: Optional[str] = None
+    STORAGE_LOCAL_ACCEL_PREFIX: Optional[str] = None
+    STORAGE_LOCAL_CHUNK_SIZE: int = 1024 * 1024
+    STORAGE_QUOTA_BYTES: Optional[int] = None
+    STORAGE_LAYOUT: Literal["per_user", "shared"] = "per_user"
+    STORAGE_SHARED_BUCKET: str = "uploads"
+    STORAGE_SHARED_SHARDS: int = 1
+    STORAGE_CONTENT_DEDUP: bool = False
+    STORAGE_BLOB_BUCKET: str = "blobs"
+    STORAGE_COLD_BUCKET: str = "cold"
+    STORAGE_COLD_STORAGE_CLASS: Optional[str] = None
+    STORAGE_DELIVERY: Literal["public", "signed"] = "public"
+    STORAGE_SIGNED_URL_TTL_SECONDS: int = 60 * 60
+    STORAGE_SIGNED_URL_MIN_TTL_SECONDS: int = 10 * 60
+    STORAGE_SIGNED_URL_CACHE_SIZE: int = 100_000
+
+class MediaEnv(BaseSettings):
+    MEDIA_TRANSCODE_WORKERS: int = 2
+    MEDIA_PROBE_CONCURRENCY: int = 8
+    MEDIA_HLS_RENDITIONS: str = "1080:5000,720:2800,480:1400,360:800"
+    MEDIA_HLS_SEGMENT_SECONDS: int = 6
+    MEDIA_HLS_PRESET: str = "veryfast"
+    MEDIA_JOB_POLL_SECONDS: float = 5
+    MEDIA_JOB_TIMEOUT_SECONDS: int = 4 * 60 * 60
+    MEDIA_JOB_MAX_ATTEMPTS: int = 3
+    MEDIA_UPLOAD_CONCURRENCY: int = 8
+    MEDIA_WORK_DIR: Optional[str] = None
+    FFMPEG_BINARY: str = "ffmpeg"
+    FFPROBE_BINARY: str = "ffprobe"
+    MEDIA_STORYBOARD_INTERVAL: float = 10
+    MEDIA_STORYBOARD_MAX_FRAMES: int = 200
+    MEDIA_STORYBOARD_TILE_WIDTH: int = 160
+    MEDIA_STORYBOARD_COLUMNS: int = 10
+    MEDIA_STORYBOARD_ROWS: int = 10
+    MEDIA_STORYBOARD_PARALLEL: int = 4
+    MEDIA_POSTER_WIDTH: int = 1280
+    MEDIA_DIGEST_CHUNK_SIZE: int = 8 * 1024 * 1024
+    MEDIA_IMAGE_WORKERS: int = 2
+    MEDIA_IMAGE_WIDTHS: str = "64,128,256,320,480,640,960,1280,1920"
+    MEDIA_IMAGE_QUALITY: int = 80
+    MEDIA_IMAGE_MAX_SOURCE_BYTES: int = 20 * 1024 * 1024
+    MEDIA_IMAGE_CACHE_DIR: str = "image-cache"
+    MEDIA_IMAGE_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+
+class MaintenanceEnv(BaseSettings):
+    DRAFT_GC_INTERVAL_SECONDS: float = 60 * 60
+    DRAFT_GC_TTL_HOURS: int = 24
+    DRAFT_GC_BATCH_SIZE: int = 500
+    PURGE_CONCURRENCY: int = 2
+    PURGE_POLL_SECONDS: float = 10
+    PURGE_STALE_SECONDS: int = 5 * 60
+    PURGE_MAX_ATTEMPTS: int = 5
+    BLOB_GC_INTERVAL_SECONDS: float = 60 * 60
+    BLOB_GC_GRACE_HOURS: int = 24
+    TIERING_ENABLED: bool = False
+    TIERING_INTERVAL_SECONDS: float = 6 * 60 * 60
+    TIERING_MIN_AGE_DAYS: int = 30
+    TIERING_IDLE_DAYS: int = 30
+    TIERING_MAX_VIEWS_PER_DAY: float = 1.0
+    TIERING_BATCH_SIZE: int = 100
+    TIERING_CONCURRENCY: int = 4
+    TIERING_COPY_CONCURRENCY: int = 8
+    TIERING_KEEP_RENDITIONS: bool = True
+    TIERING_KEEP_PREVIEWS: bool = True
+    VIDEO_VIEW_WINDOW_SECONDS: float = 6 * 60 * 60
+    VIDEO_VIEW_CACHE_SIZE: int = 100_000
+
+class CacheEnv(BaseSettings):
+    STRUCTURE_CACHE_MAX_ENTRIES: int = 512
+    STRUCTURE_CACHE_PRELOAD: int = 100
 
 
 API_ENV = APIEnv()
@@ -65,4 +171,8 @@ DB_ENV = DBEnv()
 S3_ENV = S3Env()
 MODE_ENV = ModeEnv()
 AUTH_ENV = AuthEnv()
-WEBHOOK_ENV = WebhookEnv()
\ No newline at end of file
+WEBHOOK_ENV = WebhookEnv()
+CACHE_ENV = CacheEnv()
+STORAGE_ENV = StorageEnv()
+MEDIA_ENV = MediaEnv()
+MAINTENANCE_ENV = MaintenanceEnv()
\ No newline at end of file
@@ -0,0 +1,12 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_async_session
+
+from .exceptions import StorageUsageHTTPExceptions
+from .repository import StorageUsageRepository
+from .service import StorageUsageService
+
+
+async def get_storage_usage_service(session: AsyncSession = Depends(get_async_session)) -> StorageUsageService:
+    return StorageUsageService(StorageUsageRepository(session), StorageUsageHTTPExceptions())
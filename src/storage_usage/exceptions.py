@@ -0,0 +1,33 @@
+from fastapi import HTTPException, status
+
+from ..core.AbsractHTTPExceptions import AbstractHTTPExceptions
+
+
+class StorageUsageHTTPExceptions(AbstractHTTPExceptions):
+
+    def not_found_404(self, detail: str = "Usage not found") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail
+        )
+
+
+    def conflict_409(self, detail: str = "Ошибка не описана") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail
+        )
+
+
+    def forbidden_403(self, detail: str = "Access denied") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
+
+
+    def quota_exceeded_413(self, detail: str = "Storage quota exceeded") -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=detail
+        )
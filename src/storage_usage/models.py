@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime, UTC
+
+from sqlalchemy import BigInteger, String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from ..database import Base
+
+
+class StorageObjectORM(Base):
+    """
+    Размер каждого загруженного пользователем объекта. Нужен, чтобы при
+    перезаписи и удалении скорректировать счётчики на разницу, а повторное
+    или запоздавшее событие (``event_time`` не новее сохранённого) — пропустить.
+    """
+    __tablename__ = "storage_objects"
+
+    bucket:     Mapped[str] = mapped_column(String(63), primary_key=True)
+    key:        Mapped[str] = mapped_column(String(1024), primary_key=True)
+    user_id:    Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    channel_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    course_id:  Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    size:       Mapped[int] = mapped_column(BigInteger, nullable=False)
+    etag:       Mapped[str | None] = mapped_column(String(64), nullable=True)
+    event_time: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+
+
+class StorageUsageORM(Base):
+    """Счётчики занятого места: одна строка на пользователя, канал или курс"""
+    __tablename__ = "storage_usage"
+
+    scope:    Mapped[str] = mapped_column(String(16), primary_key=True)
+    scope_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    bytes:    Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    objects:  Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,177 @@
+from uuid import UUID
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, update, delete, exists
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+
+from .models import StorageObjectORM, StorageUsageORM
+
+from ..videos.models import VideoORM
+from ..core.Enums.UsageEnums import UsageScopeEnum
+
+import logging
+from ..core.log import configure_logging
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+UsageKey = Tuple[str, str]
+# (user_id, channel_id, course_id, Δбайт, Δобъектов)
+UsageChange = Tuple[UUID, Optional[str], Optional[UUID], int, int]
+
+
+def usage_deltas(changes: Iterable[UsageChange]) -> Dict[UsageKey, Tuple[int, int]]:
+    """Сводит изменения объектов к приращениям счётчиков пользователя, канала и курса"""
+    deltas: Dict[UsageKey, List[int]] = defaultdict(lambda: [0, 0])
+    for user_id, channel_id, course_id, size, objects in changes:
+        scopes = [(UsageScopeEnum.USER, user_id), (UsageScopeEnum.CHANNEL, channel_id), (UsageScopeEnum.COURSE, course_id)]
+        for scope, scope_id in scopes:
+            if scope_id is None:
+                continue
+            delta = deltas[(scope.value, str(scope_id))]
+            delta[0] += size
+            delta[1] += objects
+    return {key: (size, objects) for key, (size, objects) in deltas.items() if size or objects}
+
+
+class StorageUsageRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record_upload(
+        self,
+        *,
+        bucket: str,
+        key: str,
+        user_id: UUID,
+        channel_id: Optional[str],
+        course_id: Optional[UUID],
+        size: int,
+        etag: Optional[str],
+        event_time: datetime,
+    ) -> bool:
+        """
+        Учитывает загруженный объект. Новый объект прибавляет размер и +1
+        к числу объектов, перезапись — разницу размеров. Повторная доставка
+        того же события и запоздавшее старое событие (``event_time`` не новее
+        сохранённого) ничего не меняют. Возвращает True, если счётчики изменились.
+        """
+        try:
+            values = dict(
+                bucket=bucket, key=key, user_id=user_id, channel_id=channel_id,
+                course_id=course_id, size=size, etag=etag, event_time=event_time,
+            )
+            inserted = await self.session.execute(
+                insert(StorageObjectORM).values(values).on_conflict_do_nothing().returning(StorageObjectORM.key)
+            )
+            if inserted.scalar_one_or_none() is not None:
+                change: UsageChange = (user_id, channel_id, course_id, size, 1)
+            else:
+                stored = (await self.session.execute(
+                    select(StorageObjectORM.size, StorageObjectORM.event_time)
+                    .where(StorageObjectORM.bucket == bucket, StorageObjectORM.key == key)
+                    .with_for_update()
+                )).one()
+                if stored.event_time >= event_time:
+                    await self.session.rollback()
+                    return False
+                await self.session.execute(
+                    update(StorageObjectORM)
+                    .where(StorageObjectORM.bucket == bucket, StorageObjectORM.key == key)
+                    .values(size=size, etag=etag, event_time=event_time)
+                )
+                change = (user_id, channel_id, course_id, size - stored.size, 0)
+
+            await self._adjust(usage_deltas([change]))
+            await self.session.commit()
+            return True
+        except Exception:
+            # Сессия общая с обработчиком вебхука — не оставляем её в сломанной транзакции
+            await self.session.rollback()
+            raise
+
+    async def release(self, bucket: str, keys: Sequence[str]) -> int:
+        """
+        Снимает удалённые объекты со счёта; ключи, которых нет в учёте, пропускаются,
+        поэтому повтор безопасен. Не коммитит: удаление идёт в транзакции вызывающего.
+        """
+        if not keys:
+            return 0
+        return await self._release_where(StorageObjectORM.bucket == bucket, StorageObjectORM.key.in_(keys))
+
+    async def release_prefix(self, bucket: str, prefix: str) -> int:
+        """
+        Снимает со счёта всё, что учтено под префиксом, — в том числе объекты,
+        которых уже нет в бакете (оригиналы, перенесённые в общее хранилище
+        содержимого). Не коммитит.
+        """
+        return await self._release_where(
+            StorageObjectORM.bucket == bucket, StorageObjectORM.key.startswith(prefix, autoescape=True)
+        )
+
+    async def _release_where(self, *conditions) -> int:
+        result = await self.session.execute(
+            delete(StorageObjectORM)
+            .where(*conditions)
+            .returning(
+                StorageObjectORM.user_id, StorageObjectORM.channel_id,
+                StorageObjectORM.course_id, StorageObjectORM.size,
+            )
+        )
+        released = result.all()
+        await self._adjust(usage_deltas(
+            (user_id, channel_id, course_id, -size, -1)
+            for user_id, channel_id, course_id, size in released
+        ))
+        return len(released)
+
+    async def move_bucket(self, source_bucket: str, bucket: str, prefix: str) -> int:
+        """
+        Переносит учёт объектов бакета ``source_bucket`` в ``bucket`` с префиксом
+        ``prefix`` (миграция раскладки). Если объект по новому адресу уже учтён
+        (загружен после переключения), старая запись снимается со счёта.
+        Не коммитит. Возвращает число перенесённых записей.
+        """
+        target = aliased(StorageObjectORM)
+        duplicates = await self.session.execute(
+            select(StorageObjectORM.key).where(
+                StorageObjectORM.bucket == source_bucket,
+                exists().where(target.bucket == bucket, target.key == prefix + StorageObjectORM.key),
+            )
+        )
+        await self.release(source_bucket, duplicates.scalars().all())
+        moved = await self.session.execute(
+            update(StorageObjectORM)
+            .where(StorageObjectORM.bucket == source_bucket)
+            .values(bucket=bucket, key=prefix + StorageObjectORM.key)
+        )
+        return moved.rowcount
+
+    async def _adjust(self, deltas: Dict[UsageKey, Tuple[int, int]]) -> None:
+        if not deltas:
+            return
+        # Строки счётчиков блокируются в одном порядке — без взаимоблокировок между вебхуками
+        rows = [
+            dict(scope=scope, scope_id=scope_id, bytes=size, objects=objects)
+            for (scope, scope_id), (size, objects) in sorted(deltas.items())
+        ]
+        query = insert(StorageUsageORM).values(rows)
+        query = query.on_conflict_do_update(
+            index_elements=[StorageUsageORM.scope, StorageUsageORM.scope_id],
+            set_={
+                "bytes": StorageUsageORM.bytes + query.excluded.bytes,
+                "objects": StorageUsageORM.objects + query.excluded.objects,
+            },
+        )
+        await self.session.execute(query)
+
+    async def get_usage(self, scope: UsageScopeEnum, scope_id: UUID | str) -> Optional[StorageUsageORM]:
+        return await self.session.get(StorageUsageORM, (scope.value, str(scope_id)))
+
+    async def video_course_id(self, video_id: UUID) -> Optional[UUID]:
+        result = await self.session.execute(select(VideoORM.course_id).where(VideoORM.id == video_id))
+        return result.scalar_one_or_none()
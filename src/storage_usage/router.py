@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends
+
+from ..auth.dependencies import get_current_user
+from ..auth.schemas import CurrentUserSchema
+from ..channels.dependencies import get_current_channel
+from ..channels.schemas import ChannelReadSchema
+from ..core.Enums.UsageEnums import UsageScopeEnum
+
+from .dependencies import get_storage_usage_service
+from .schemas import StorageUsageReadSchema
+from .service import StorageUsageService
+
+router = APIRouter(
+    prefix="/usage",
+    tags=["Storage"]
+)
+
+
+@router.get("/me", response_model=StorageUsageReadSchema)
+async def get_my_usage(
+    user: CurrentUserSchema = Depends(get_current_user),
+    usage_service: StorageUsageService = Depends(get_storage_usage_service),
+):
+    """Место, занятое загрузками пользователя, и его квота"""
+    return await usage_service.get_usage(UsageScopeEnum.USER, user.id)
+
+
+@router.get("/channel", response_model=StorageUsageReadSchema)
+async def get_channel_usage(
+    channel: ChannelReadSchema = Depends(get_current_channel),
+    usage_service: StorageUsageService = Depends(get_storage_usage_service),
+):
+    """Место, занятое загрузками канала"""
+    return await usage_service.get_usage(UsageScopeEnum.CHANNEL, channel.id)
@@ -0,0 +1,9 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class StorageUsageReadSchema(BaseModel):
+    bytes: int = Field(description="Занято байт")
+    objects: int = Field(description="Число загруженных объектов")
+    quota_bytes: Optional[int] = Field(default=None, description="Квота пользователя; пусто — без ограничения")
@@ -0,0 +1,92 @@
+from uuid import UUID
+from datetime import datetime, UTC
+from typing import Optional, Sequence
+
+from .repository import StorageUsageRepository
+from .exceptions import StorageUsageHTTPExceptions
+from .schemas import StorageUsageReadSchema
+
+from ..aws.layout import locate
+from ..aws.strategies import ObjectKind
+from ..aws.upload_key import UploadKey
+from ..core.Enums.UsageEnums import UsageScopeEnum
+from ..database import async_session_maker
+from ..settings.config import STORAGE_ENV
+
+import logging
+from ..core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+class StorageUsageService:
+    """
+    Учёт занятого места по событиям загрузки: размер каждого объекта хранится
+    в ``storage_objects``, суммы — в ``storage_usage``. Проверка квоты читает
+    одну строку счётчика вместо листинга бакета.
+    """
+
+    def __init__(self, repository: StorageUsageRepository, http_exceptions: StorageUsageHTTPExceptions):
+        self.repository = repository
+        self.http_exceptions = http_exceptions
+
+    async def record_upload(
+        self,
+        upload_key: UploadKey,
+        *,
+        size: int,
+        etag: Optional[str] = None,
+        event_time: Optional[datetime] = None,
+    ) -> bool:
+        course_id = upload_key.course_id
+        if course_id is None and upload_key.kind in (ObjectKind.VIDEO, ObjectKind.VIDEO_PREVIEW):
+            course_id = await self.repository.video_course_id(upload_key.video_id)
+
+        bucket, key = locate(upload_key.user_id, upload_key.key)
+        applied = await self.repository.record_upload(
+            bucket=bucket,
+            key=key,
+            user_id=upload_key.user_id,
+            channel_id=upload_key.channel_id,
+            course_id=course_id,
+            size=size,
+            etag=etag,
+            event_time=event_time or datetime.now(UTC),
+        )
+        if not applied:
+            logger.debug(f"Событие для {upload_key.key} уже учтено")
+        return applied
+
+    async def get_usage(self, scope: UsageScopeEnum, scope_id: UUID | str) -> StorageUsageReadSchema:
+        usage = await self.repository.get_usage(scope, scope_id)
+        return StorageUsageReadSchema(
+            bytes=usage.bytes if usage else 0,
+            objects=usage.objects if usage else 0,
+            quota_bytes=STORAGE_ENV.STORAGE_QUOTA_BYTES if scope is UsageScopeEnum.USER else None,
+        )
+
+    async def ensure_quota(self, user_id: UUID) -> None:
+        """Размер будущей загрузки неизвестен до события, поэтому запрещается выдача URL сверх квоты"""
+        quota = STORAGE_ENV.STORAGE_QUOTA_BYTES
+        if quota is None:
+            return
+        usage = await self.repository.get_usage(UsageScopeEnum.USER, user_id)
+        if usage is not None and usage.bytes >= quota:
+            raise self.http_exceptions.quota_exceeded_413()
+
+
+async def release_objects(bucket: str, keys: Sequence[str]) -> int:
+    """Снимает со счёта объекты, удалённые фоновыми задачами вне запроса"""
+    async with async_session_maker() as session:
+        released = await StorageUsageRepository(session).release(bucket, keys)
+        await session.commit()
+    return released
+
+
+async def release_prefix(bucket: str, prefix: str) -> int:
+    """Снимает со счёта весь очищенный префикс"""
+    async with async_session_maker() as session:
+        released = await StorageUsageRepository(session).release_prefix(bucket, prefix)
+        await session.commit()
+    return released
@@ -4,7 +4,7 @@ from uuid import UUID
 
 from ..database import get_async_session
 
-from ..auth.schemas import UserReadSchema
+from ..auth.schemas import CurrentUserSchema
 from ..auth.dependencies import get_current_user
 
 from .service import VideoService
@@ -24,7 +24,7 @@ async def get_video_service(
 
 async def validate_video_access(
     video_id: UUID,
-    user: UserReadSchema = Depends(get_current_user),
+    user: CurrentUserSchema = Depends(get_current_user),
     service: VideoService = Depends(get_video_service),
 ) -> VideoDataReadSchema:
     
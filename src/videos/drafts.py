@@ -0,0 +1,126 @@
+"""
+Сборщик брошенных черновиков видео.
+
+``POST /upload/video`` создаёт черновик до загрузки файла; если загрузка так
+и не пришла, строка и, возможно, недокачанные объекты остаются навсегда.
+Сборщик периодически удаляет такие черновики пачками (DELETE … RETURNING
+по частичному индексу) вместе с их префиксами в хранилище. Строки
+удаляются в той же транзакции, что и объекты: при ошибке хранилища
+транзакция откатывается и черновики будут подобраны в следующий раз.
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, List, Optional
+
+from ..aws.backends import get_storage_backend
+from ..aws.layout import locate, video_prefix
+from ..core.metrics import register_metrics
+from ..database import async_session_maker
+from ..settings.config import MAINTENANCE_ENV
+from ..storage_usage.repository import StorageUsageRepository
+from .repository import VideoDataRepository
+
+from ..core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+@dataclass(frozen=True, slots=True)
+class SweepResult:
+    rows: int = 0
+    objects: int = 0
+    bytes: int = 0
+
+    def __add__(self, other: "SweepResult") -> "SweepResult":
+        return SweepResult(self.rows + other.rows, self.objects + other.objects, self.bytes + other.bytes)
+
+
+class DraftSweeper:
+    def __init__(self, *, ttl: timedelta, batch_size: int, interval: float):
+        self.ttl = ttl
+        self.batch_size = batch_size
+        self.interval = interval
+        self._total = SweepResult()
+        self._last_run: Optional[datetime] = None
+        self._last_seconds = 0.0
+
+    async def sweep_once(self) -> SweepResult:
+        """Удаляет все черновики старше ``ttl`` пачками по ``batch_size``"""
+        started = time.perf_counter()
+        cutoff = datetime.now(UTC) - self.ttl
+        result = SweepResult()
+        while True:
+            batch = await self._sweep_batch(cutoff)
+            result += batch
+            if batch.rows < self.batch_size:
+                break
+
+        self._total += result
+        self._last_run = datetime.now(UTC)
+        self._last_seconds = time.perf_counter() - started
+        if result.rows:
+            logger.info(
+                f"Удалено черновиков: {result.rows}, объектов: {result.objects}, "
+                f"освобождено {result.bytes} байт за {self._last_seconds:.1f} с"
+            )
+        return result
+
+    async def _sweep_batch(self, cutoff: datetime) -> SweepResult:
+        async with async_session_maker() as session:
+            drafts = await VideoDataRepository(session).delete_stale_drafts(cutoff, self.batch_size)
+            if not drafts:
+                await session.commit()
+                return SweepResult()
+
+            prefixes: Dict[str, List[str]] = defaultdict(list)
+            for video_id, user_id, channel_id in drafts:
+                bucket, prefix = locate(user_id, f"{video_prefix(channel_id, video_id)}/")
+                prefixes[bucket].append(prefix)
+
+            objects = size = 0
+            backend = get_storage_backend()
+            usage = StorageUsageRepository(session)
+            for bucket, bucket_prefixes in prefixes.items():
+                keys = []
+                for prefix in bucket_prefixes:
+                    async for info in backend.list_prefix(bucket, prefix):
+                        keys.append(info.key)
+                        size += info.size
+                if keys:
+                    # S3-бэкенд режет список на DeleteObjects по 1000 ключей
+                    objects += await backend.delete(bucket, keys)
+                for prefix in bucket_prefixes:
+                    await usage.release_prefix(bucket, prefix)
+
+            await session.commit()
+        return SweepResult(rows=len(drafts), objects=objects, bytes=size)
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                await self.sweep_once()
+            except Exception:
+                logger.exception("Не удалось очистить брошенные черновики видео")
+            await asyncio.sleep(self.interval)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "reclaimed_rows": self._total.rows,
+            "reclaimed_objects": self._total.objects,
+            "reclaimed_bytes": self._total.bytes,
+            "last_run": self._last_run.isoformat() if self._last_run else None,
+            "last_run_seconds": round(self._last_seconds, 3),
+        }
+
+
+draft_sweeper = DraftSweeper(
+    ttl=timedelta(hours=MAINTENANCE_ENV.DRAFT_GC_TTL_HOURS),
+    batch_size=MAINTENANCE_ENV.DRAFT_GC_BATCH_SIZE,
+    interval=MAINTENANCE_ENV.DRAFT_GC_INTERVAL_SECONDS,
+)
+register_metrics("draft_gc", draft_sweeper.metrics)
@@ -1,17 +1,18 @@
 import uuid
 from datetime import datetime, UTC
 
-from sqlalchemy import ForeignKey, Integer, String, Table,  DateTime, Boolean
+from sqlalchemy import ForeignKey, Integer, BigInteger, String, Table,  DateTime, Boolean, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID, ENUM as PgEnum
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, ENUM as PgEnum
 
-from ..settings.config import S3_ENV
+from ..aws.layout import public_object_url, video_object_url
 from ..database import Base
 
 from ..auth.models import UsersORM
 from ..courses.models import CoursesORM
 from ..channels.models import ChannelsORM
 from ..core.Enums.ExtensionsEnums import ImageExtensionsEnum, VideoExtensionsEnum
+from ..core.Enums.MediaStatusEnums import HlsStatusEnum
 
 
 class CategoryORM(Base):
@@ -26,6 +27,14 @@ class TagORM(Base):
 
 class VideoORM(Base):
     __tablename__ = 'videos'
+    __table_args__ = (
+        # Частичный индекс для сборщика брошенных черновиков (см. ``delete_stale_drafts``)
+        Index(
+            "ix_videos_drafts_upload_date",
+            "upload_date",
+            postgresql_where=text("name = '' AND is_public = false"),
+        ),
+    )
     
     id:         Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), default=uuid.uuid4, primary_key=True, unique= True
@@ -62,11 +71,36 @@ class VideoORM(Base):
         nullable=True,
         default=None
     )
+    hls_status: Mapped[HlsStatusEnum] = mapped_column(
+        PgEnum(
+            HlsStatusEnum,
+            name="hls_status_enum",
+            value_callable = lambda e: e.value,
+            create_type=False
+        ),
+        nullable=False,
+        default=HlsStatusEnum.NONE,
+        server_default=HlsStatusEnum.NONE.value
+    )
     name:           Mapped[str] = mapped_column(String(255), nullable=False) 
     description:    Mapped[str] = mapped_column(String(1000), nullable=True) 
     is_free:        Mapped[bool] = mapped_column(Boolean, default=True) 
     is_public:      Mapped[bool] = mapped_column(Boolean, default=True) 
     timeline:       Mapped[int] = mapped_column(Integer, default=0) 
+    width:          Mapped[int | None] = mapped_column(Integer, nullable=True)
+    height:         Mapped[int | None] = mapped_column(Integer, nullable=True)
+    bitrate:        Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    video_codec:    Mapped[str | None] = mapped_column(String(32), nullable=True)
+    audio_codec:    Mapped[str | None] = mapped_column(String(32), nullable=True)
+    has_poster:     Mapped[bool] = mapped_column(Boolean, default=False, server_default="false")
+    has_storyboard: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false")
+    # sha256 оригинала, перенесённого в общее хранилище содержимого (STORAGE_CONTENT_DEDUP)
+    content_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    # Группы файлов, перенесённых в холодный бакет (см. ``layout.video_file_group``)
+    cold_groups:    Mapped[list[str]] = mapped_column(
+        ARRAY(String(16)), nullable=False, default=list, server_default="{}"
+    )
+    tiered_at:      Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     upload_date:    Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(UTC),
@@ -75,22 +109,22 @@ class VideoORM(Base):
     
     @property
     def video_url(self) -> str:
-        return (
-            f"{S3_ENV.public_url}" \
-            f"/{self.user_id}" \
-            f"/channels/{self.channel_id}"\
-            f"/videos/{self.id}/video.{self.video_ext}"
+        return video_object_url(
+            self.user_id,
+            self.channel_id,
+            self.id,
+            f"video.{self.video_ext.value}",
+            content_sha256=self.content_sha256,
+            cold_groups=self.cold_groups or (),
         )
 
     @property
     def preview_url(self) -> str | None:
         if not self.preview_ext:
             return None
-        return (
-            f"{S3_ENV.public_url}" \
-            f"/{self.user_id}" \
-            f"/channels/{self.channel_id}"\
-            f"/videos/{self.id}/preview.{self.preview_ext.value}"
+        return public_object_url(
+            self.user_id,
+            f"channels/{self.channel_id}/videos/{self.id}/preview.{self.preview_ext.value}",
         )
 
 
@@ -1,14 +1,16 @@
 from uuid import UUID
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import Collection, Optional, List, Dict, Any, Set, Tuple
+from datetime import datetime, UTC
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, exists, literal_column, or_
 
 from ..core.AbstractRepository import AbstractRepository
 from ..core.Enums.ExtensionsEnums import VideoExtensionsEnum, ImageExtensionsEnum
 
 from .models import VideoORM, VideoMetadatasORM, VideoTagOrm, TagORM, CategoryORM
+from ..media.models import MediaJobORM
+from ..permissions.models import PermissionsORM
 from .schemas import VideoDataUpdateSchema
 
 
@@ -25,6 +27,11 @@ class VideoDataRepository(AbstractRepository[VideoORM]):
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def get_public(self, limit: int = 20, offset: int = 0) -> List[VideoORM]:
+        query = select(self.model).where(self.model.is_public.is_(True)).offset(offset).limit(limit)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
     async def create(self, entity: VideoORM) -> VideoORM:
         return await super().create(entity)
     
@@ -92,6 +99,33 @@ class VideoDataRepository(AbstractRepository[VideoORM]):
         )
         return await self.create(draft)
 
+    async def delete_stale_drafts(self, cutoff: datetime, limit: int) -> List[Tuple[UUID, UUID, str]]:
+        """
+        Удаляет до ``limit`` черновиков старше ``cutoff``, для которых так и не
+        пришла загрузка (нет задач media_jobs). Возвращает (id, user_id, channel_id).
+        Транзакция не фиксируется: вызывающий коммитит после удаления объектов.
+        """
+        candidates = (
+            select(self.model.id)
+            .where(
+                # Условие совпадает с предикатом ix_videos_drafts_upload_date;
+                # литерал, а не параметр, — иначе общий план не докажет совпадение
+                self.model.name == literal_column("''"),
+                self.model.is_public == False,
+                self.model.upload_date < cutoff,
+                ~exists().where(MediaJobORM.video_id == self.model.id),
+            )
+            .order_by(self.model.upload_date)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            delete(self.model)
+            .where(self.model.id.in_(candidates.scalar_subquery()))
+            .returning(self.model.id, self.model.user_id, self.model.channel_id)
+        )
+        return [tuple(row) for row in result.all()]
+
     async def set_preview_extension(self, video_id: UUID, extension: ImageExtensionsEnum) -> None:
         """
         Обновляет в БД расширение превью для уже существующего видео.
@@ -295,7 +329,17 @@ class VideoRepository:
         return await self.video_metadata_repo.get_by_id(video_id)
     
     async def get_all_video_datas(self, limit: int = 20, offset: int = 0) -> List[VideoORM]:
-        return await self.video_data_repo.get_all(limit, offset)
+        return await self.video_data_repo.get_public(limit, offset)
+
+    async def enrolled_course_ids(self, user_id: UUID, course_ids: Collection[UUID]) -> Set[UUID]:
+        """Курсы из ``course_ids``, на которые у пользователя есть непросроченные права"""
+        query = select(PermissionsORM.course_id).where(
+            PermissionsORM.user_id == user_id,
+            PermissionsORM.course_id.in_(course_ids),
+            or_(PermissionsORM.expiration_date.is_(None), PermissionsORM.expiration_date > datetime.now(UTC)),
+        )
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
 
     async def update_video_details(self, entity: VideoORM) -> VideoORM:
         return await self.video_data_repo.update(entity)
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, UploadFile, Query
+from fastapi import APIRouter, Depends, Request, UploadFile, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
-from ..auth.schemas import UserReadSchema
-from ..auth.dependencies import get_current_user
+from ..auth.schemas import CurrentUserSchema
+from ..auth.dependencies import get_current_user, get_optional_user
+from ..core.responses import model_response, models_response
+from ..media.dependencies import get_media_service
+from ..media.service import MediaService
 
 from .dependencies import get_video_service, validate_video_access
 from .service import VideoService
-from .schemas import VideoDataReadSchema, VideoDataUpdateSchema
+from .schemas import VideoDataReadSchema, VideoDataUpdateSchema, delivery_context
+from .views import viewer_key
 
 import logging
 from ..core.log import configure_logging
@@ -43,15 +47,35 @@ async def update_video(
 @router.get("/my", response_model=List[VideoDataReadSchema], status_code=200)
 async def get_my_videos(
     service: VideoService = Depends(get_video_service),
-    user: UserReadSchema = Depends(get_current_user),
+    user: CurrentUserSchema = Depends(get_current_user),
 ):
-    return await service.get_videos_by_user_id(user.id)
+    videos = await service.get_videos_by_user_id(user.id)
+    playable = await service.playable_ids(videos, user.id)
+    return models_response(VideoDataReadSchema, videos, context=delivery_context(videos, user.id, playable))
+
+
+@router.get("/{video_id}", response_model=VideoDataReadSchema, status_code=200)
+async def watch_video(
+    video_id: UUID,
+    request: Request,
+    service: VideoService = Depends(get_video_service),
+    media: MediaService = Depends(get_media_service),
+    user: Optional[CurrentUserSchema] = Depends(get_optional_user),
+):
+    viewer_id = user.id if user else None
+    video = await service.watch_video(video_id, media, viewer_key(request, viewer_id))
+    playable = await service.playable_ids([video], viewer_id)
+    return model_response(video, context=delivery_context([video], viewer_id, playable))
 
 
 @router.get("/", response_model=List[VideoDataReadSchema], status_code=200)
 async def get_videos(
     service: VideoService = Depends(get_video_service),
+    user: Optional[CurrentUserSchema] = Depends(get_optional_user),
     # limit: int = Query(default=20, ge=1, le=100),
     # offset: int = Query(default=0, ge=0),
 ):
-    return await service.get_all_video_datas()
+    videos = await service.get_all_video_datas()
+    viewer_id = user.id if user else None
+    playable = await service.playable_ids(videos, viewer_id)
+    return models_response(VideoDataReadSchema, videos, context=delivery_context(videos, viewer_id, playable))
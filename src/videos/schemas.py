@@ -1,12 +1,14 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Collection, Dict, Hashable, Iterable, List, Optional, Tuple
 
-from pydantic import BaseModel, Field, ConfigDict, field_serializer
+from pydantic import BaseModel, Field, ConfigDict, SerializationInfo, field_serializer
 from uuid import UUID
 
-from ..settings.config import S3_ENV
+from ..aws.delivery import delivery_signer
+from ..aws.layout import HLS_MASTER, POSTER, STORYBOARD_VTT, public_object_url, video_object
 
 from ..core.Enums.ExtensionsEnums import ImageExtensionsEnum, VideoExtensionsEnum
+from ..core.Enums.MediaStatusEnums import HlsStatusEnum
 
 
 import logging
@@ -22,11 +24,17 @@ class BaseVideoDataSchema(BaseModel):
     course_id: Optional[UUID] = Field(description="ID курса")
     channel_id: str = Field(description="ID канала")
     
-    video_url: str = Field(description="URL видео")
+    video_url: Optional[str] = Field(description="URL видео; null, если зрителю видео недоступно")
     preview_url: Optional[str] = Field(description="URL превью видео")
     
     video_ext: VideoExtensionsEnum = Field(description="Расширение видео", exclude=True)
     preview_ext: Optional[ImageExtensionsEnum] = Field(description="Расширение превью видео", exclude=True)
+    hls_status: HlsStatusEnum = Field(default=HlsStatusEnum.NONE, description="Состояние нарезки HLS")
+    has_poster: bool = Field(default=False, description="Постер извлечён из видео", exclude=True)
+    has_storyboard: bool = Field(default=False, description="Раскадровка готова", exclude=True)
+    storyboard_url: Optional[str] = Field(default=None, description="URL WebVTT-индекса раскадровки для перемотки")
+    content_sha256: Optional[str] = Field(default=None, description="sha256 общего содержимого", exclude=True)
+    cold_groups: Optional[List[str]] = Field(default=None, description="Файлы в холодном бакете", exclude=True)
     
     name: str = Field(description="Название видео")
     description: str = Field(description="Описание видео")
@@ -35,6 +43,12 @@ class BaseVideoDataSchema(BaseModel):
     timeline: int = Field(description="Временная шкала видео")
     upload_date: datetime = Field(description="Дата загрузки видео")
     
+    width: Optional[int] = Field(default=None, description="Ширина кадра, px")
+    height: Optional[int] = Field(default=None, description="Высота кадра, px")
+    bitrate: Optional[int] = Field(default=None, description="Средний битрейт, бит/с")
+    video_codec: Optional[str] = Field(default=None, description="Видеокодек")
+    audio_codec: Optional[str] = Field(default=None, description="Аудиокодек")
+    
     
     
     
@@ -43,11 +57,32 @@ class VideoDataCreateSchema(BaseVideoDataSchema): pass
 class VideoDataReadSchema(BaseVideoDataSchema): 
     model_config = ConfigDict(from_attributes=True)
     
+    def _video_file(self, name: str) -> Tuple[str, str]:
+        # Видео, найденное по содержимому, отдаётся из общего префикса sha256/…, холодное — из холодного бакета
+        return video_object(
+            self.user_id, self.channel_id, self.id, name,
+            content_sha256=self.content_sha256, cold_groups=self.cold_groups or (),
+        )
+
+    def _video_file_url(self, name: str, viewer: Optional[Hashable] = None) -> str:
+        return delivery_signer.url(viewer, *self._video_file(name))
+
+    def _playback_name(self) -> str:
+        # Когда ступени HLS готовы, плеер получает master-плейлист вместо оригинала.
+        # Плейлисты ссылаются на сегменты относительными путями без подписи,
+        # поэтому в режиме signed отдаётся подписанный оригинал
+        if self.hls_status is HlsStatusEnum.READY and not delivery_signer.signed:
+            return HLS_MASTER
+        return f"video.{self.video_ext.value}"
+
     @field_serializer("video_url", when_used="json")
-    def get_video_url(self, video_url: str) -> str | None:
-        ext_value = self.video_ext.value # mp4
-        base_url = S3_ENV.BASE_SERVER_URL
-        return f"{base_url}/minio/{self.user_id}/channels/{self.channel_id}/videos/{self.id}/video.{ext_value}"
+    def get_video_url(self, video_url: Optional[str], info: SerializationInfo) -> str | None:
+        # Подписанная ссылка — доступ к закрытому объекту: только тем, кому видео доступно.
+        # Без контекста доступно только бесплатное видео
+        context = info.context or {}
+        if delivery_signer.signed and not (self.is_free or self.id in context.get("playable", ())):
+            return None
+        return self._video_file_url(self._playback_name(), context.get("viewer"))
     
     @field_serializer("preview_url", when_used="json")
     def _get_full_preview_url(self, preview_url) -> str | None:    
@@ -57,13 +92,39 @@ class VideoDataReadSchema(BaseVideoDataSchema):
             else:
                 ext_value = self.preview_ext
             
-            base_url = S3_ENV.BASE_SERVER_URL
-            return f"{base_url}/minio/{self.user_id}/channels/{self.channel_id}/videos/{self.id}/video_preview.{ext_value}"
+            return public_object_url(self.user_id, f"channels/{self.channel_id}/videos/{self.id}/video_preview.{ext_value}")
         
+        # Автор не загрузил превью — отдаём постер, извлечённый из видео
+        if self.has_poster:
+            return self._video_file_url(POSTER)
+        return None
+    
+    @field_serializer("storyboard_url", when_used="json")
+    def _get_storyboard_url(self, storyboard_url) -> str | None:
+        if self.has_storyboard:
+            return self._video_file_url(STORYBOARD_VTT)
         return None
     
     
 
+def delivery_context(
+    videos: Iterable[VideoDataReadSchema],
+    viewer: Optional[Hashable] = None,
+    playable: Collection[UUID] = (),
+) -> Dict[str, Any]:
+    """
+    Контекст сериализации страницы видео: ссылки на доступные зрителю видео
+    (``playable``, см. ``VideoService.playable_ids``) подписываются одной
+    пачкой, ``video_url`` затем берёт их из кэша.
+    """
+    playable = set(playable)
+    if delivery_signer.signed:
+        delivery_signer.sign_many(
+            viewer, [video._video_file(video._playback_name()) for video in videos if video.id in playable]
+        )
+    return {"viewer": viewer, "playable": playable}
+
+
 class VideoDataUpdateSchema(BaseModel):
     name: str = Field(description="Название видео")
     description: str = Field(description="Описание видео")
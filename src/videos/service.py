@@ -1,15 +1,19 @@
 from uuid import UUID, uuid4
-from typing import List, Dict
+from typing import Hashable, Iterable, List, Dict, Optional, Set, TYPE_CHECKING
 
 from .repository import VideoRepository
 from .exceptions import VideoHTTPExceptions
 from .models     import VideoORM
 from .schemas    import VideoDataReadSchema, VideoDataUpdateSchema
+from .views      import recent_views
 
 from ..core.Enums.ExtensionsEnums import VideoExtensionsEnum, ImageExtensionsEnum
 from ..core.Enums.MIMETypeEnums import ImageMimeEnum
 from ..core.Enums.TypeReferencesEnums import ImageTypeReference
 
+if TYPE_CHECKING:
+    from ..media.service import MediaService
+
 
 import logging
 from ..core.log import configure_logging
@@ -29,6 +33,23 @@ class VideoService:
             raise self.http_exceptions.not_found_404()
         return VideoDataReadSchema.model_validate(data)
 
+    async def watch_video(self, video_id: UUID, media: "MediaService", viewer: Hashable) -> VideoDataReadSchema:
+        """
+        Просмотр видео: +1 к просмотрам; холодное видео отдаётся из холодного
+        бакета и ставится в очередь на возврат в основной. Повторные запросы
+        того же зрителя в окне ``recent_views`` только отдают данные.
+        """
+        data = await self.repository.video_data_repo.get_by_id(video_id)
+        if not data or (not data.is_public):
+            raise self.http_exceptions.not_found_404()
+        video = VideoDataReadSchema.model_validate(data)
+        if not recent_views.should_count(viewer, video_id):
+            return video
+        await self.repository.increment_views(video_id)
+        if data.cold_groups:
+            await media.rehydrate(video_id)
+        return video
+
     # ─── WEBHOOK: файл видео загружен ────────────────────────────────────────
     async def process_video_upload(
         self,
@@ -115,9 +136,23 @@ class VideoService:
         return [VideoDataReadSchema.model_validate(video) for video in videos]
 
     async def get_all_video_datas(self) -> List[VideoDataReadSchema]:
+        """Опубликованные видео"""
         videos = await self.repository.get_all_video_datas()
         return [VideoDataReadSchema.model_validate(video) for video in videos]
 
+    async def playable_ids(self, videos: Iterable[VideoDataReadSchema], viewer_id: Optional[UUID]) -> Set[UUID]:
+        """
+        Видео, которые зритель может смотреть: бесплатные, свои и из курсов,
+        на которые у него есть права. Права проверяются одним запросом на страницу.
+        """
+        videos = list(videos)
+        playable = {video.id for video in videos if video.is_free or video.user_id == viewer_id}
+        course_ids = {video.course_id for video in videos if video.id not in playable and video.course_id}
+        if viewer_id is not None and course_ids:
+            enrolled = await self.repository.enrolled_course_ids(viewer_id, course_ids)
+            playable |= {video.id for video in videos if video.course_id in enrolled}
+        return playable
+
     
     async def set_preview_extension(
            self,
@@ -0,0 +1,63 @@
+"""
+Отсев повторных просмотров.
+
+``GET /videos/{video_id}`` открыт без авторизации: без отсева каждое
+обновление страницы увеличивало бы ``views`` и ставило бы возврат из
+холодного бакета. Просмотр засчитывается один раз за окно
+``VIDEO_VIEW_WINDOW_SECONDS`` на пару (зритель, видео); зритель — id
+пользователя или адрес клиента (за прокси — из X-Forwarded-For, см.
+``FORWARDED_ALLOW_IPS``). Индекс — ограниченный LRU процесса, так
+что при нескольких воркерах повтор может засчитаться в каждом из них.
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+from uuid import UUID
+
+from fastapi import Request
+
+from ..core.metrics import register_metrics
+from ..settings.config import MAINTENANCE_ENV
+
+
+def viewer_key(request: Request, user_id: Optional[UUID]) -> Optional[Hashable]:
+    """Пользователь или, для анонима, адрес клиента"""
+    if user_id is not None:
+        return user_id
+    return request.client.host if request.client else None
+
+
+class RecentViews:
+    def __init__(self, *, window: float, max_entries: int):
+        self.window = window
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[Hashable, UUID], float]" = OrderedDict()
+        self._lock = Lock()
+        self.counted = 0
+        self.repeated = 0
+
+    def should_count(self, viewer: Hashable, video_id: UUID, *, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        key = (viewer, video_id)
+        with self._lock:
+            seen = self._entries.get(key)
+            if seen is not None and now - seen < self.window:
+                self.repeated += 1
+                return False
+            self._entries[key] = now
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.counted += 1
+            return True
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "counted": self.counted, "repeated": self.repeated}
+
+
+recent_views = RecentViews(
+    window=MAINTENANCE_ENV.VIDEO_VIEW_WINDOW_SECONDS,
+    max_entries=MAINTENANCE_ENV.VIDEO_VIEW_CACHE_SIZE,
+)
+register_metrics("video_views", recent_views.metrics)
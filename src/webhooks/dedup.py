@@ -0,0 +1,84 @@
+"""
+Отсев повторных и запоздавших событий MinIO.
+
+MinIO повторяет доставку вебхука, пока не получит 2xx, а порядок событий
+одного объекта не гарантирован. У каждого события есть ``sequencer`` —
+монотонный для объекта hex-счётчик (время в наносекундах); событие с
+номером не больше уже применённого пропускается. Последний применённый
+номер по объекту хранится в таблице ``webhook_events`` и в ограниченном
+LRU процесса, так что повтор обычно отсекается без обращения к БД.
+"""
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from ..core.metrics import register_metrics
+from ..settings.config import WEBHOOK_ENV
+from .schemas import Record
+
+
+SEQUENCER_WIDTH = 32
+
+
+def normalize_sequencer(sequencer: str) -> str:
+    """Hex фиксированной ширины: порядок событий совпадает со строковым сравнением"""
+    return sequencer.strip().upper().zfill(SEQUENCER_WIDTH)
+
+
+def sequencer_from_time(moment: datetime) -> str:
+    # MinIO формирует sequencer так же — из времени события в наносекундах
+    nanoseconds = int(moment.timestamp()) * 1_000_000_000 + moment.microsecond * 1000
+    return format(nanoseconds, "X")
+
+
+def event_sequencer(record: Record) -> Optional[str]:
+    """Номер события; без sequencer — по eventTime, без обоих — событие не отсеивается"""
+    if record.s3.object.sequencer:
+        return normalize_sequencer(record.s3.object.sequencer)
+    if record.eventTime is not None:
+        return normalize_sequencer(sequencer_from_time(record.eventTime))
+    return None
+
+
+class EventIndex:
+    """LRU последних применённых номеров событий по ``(bucket, key)``"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def is_applied(self, bucket: str, key: str, sequencer: str) -> bool:
+        with self._lock:
+            applied = self._entries.get((bucket, key))
+            if applied is None or applied < sequencer:
+                self.misses += 1
+                return False
+            self._entries.move_to_end((bucket, key))
+            self.hits += 1
+            return True
+
+    def remember(self, bucket: str, key: str, sequencer: str) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            current = self._entries.get((bucket, key))
+            if current is not None and current >= sequencer:
+                return
+            self._entries[(bucket, key)] = sequencer
+            self._entries.move_to_end((bucket, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"entries": len(self), "hits": self.hits, "misses": self.misses}
+
+
+event_index = EventIndex(WEBHOOK_ENV.WEBHOOK_DEDUP_CACHE_SIZE)
+register_metrics("webhook_dedup", event_index.metrics)
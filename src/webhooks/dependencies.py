@@ -1,8 +1,27 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..database import get_async_session
+from ..storage_usage.dependencies import get_storage_usage_service
+from .exceptions import WebhooksHTTPExceptions
+from .repository import WebhookEventRepository, WebhookRetryRepository
 from .service import WebhooksService
 
 
 
 
-async def get_webhooks_service() -> WebhooksService:
-    return WebhooksService()
\ No newline at end of file
+async def get_webhooks_service(session: AsyncSession = Depends(get_async_session)) -> WebhooksService:
+    return WebhooksService(
+        await get_storage_usage_service(session),
+        WebhookEventRepository(session),
+        WebhookRetryRepository(session),
+    )
+
+
+async def get_webhook_retry_repository(session: AsyncSession = Depends(get_async_session)) -> WebhookRetryRepository:
+    return WebhookRetryRepository(session)
+
+
+
+async def get_webhooks_exceptions() -> WebhooksHTTPExceptions:
+    return WebhooksHTTPExceptions()
@@ -0,0 +1,93 @@
+"""
+Доставка событий локального хранилища в ``WebhooksService``.
+
+MinIO шлёт уведомление HTTP-запросом на ``/webhooks/minio/<kind>``;
+локальный бэкенд вызывает тот же обработчик напрямую, с тем же форматом
+payload и собственной сессией БД.
+"""
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..auth.dependencies import get_auth_service
+from ..aws.backends import StorageEvent
+from ..aws.strategies import ObjectKind
+from ..aws.upload_key import UploadKey
+from ..channels.dependencies import get_channel_service
+from ..courses.dependencies import get_course_service
+from ..database import async_session_maker
+from ..media.dependencies import get_media_service
+from ..storage_usage.dependencies import get_storage_usage_service
+from ..videos.dependencies import get_video_service
+from .schemas import MinioWebhookPayloadSchema
+from .dependencies import get_webhooks_service
+from .repository import WebhookEventRepository
+from .service import WebhooksService
+
+import logging
+from ..core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+Dispatch = Callable[[WebhooksService, MinioWebhookPayloadSchema, AsyncSession], Awaitable[dict]]
+
+
+async def _avatar(webhooks: WebhooksService, payload: MinioWebhookPayloadSchema, session: AsyncSession):
+    return await webhooks.avatar_uploaded(payload, None, await get_auth_service(session))
+
+
+async def _channel_avatar(webhooks: WebhooksService, payload: MinioWebhookPayloadSchema, session: AsyncSession):
+    return await webhooks.channel_avatar_uploaded(payload, None, await get_channel_service(session))
+
+
+async def _channel_preview(webhooks: WebhooksService, payload: MinioWebhookPayloadSchema, session: AsyncSession):
+    return await webhooks.channel_preview_uploaded(payload, None, await get_channel_service(session))
+
+
+async def _course_preview(webhooks: WebhooksService, payload: MinioWebhookPayloadSchema, session: AsyncSession):
+    return await webhooks.course_preview_uploaded(payload, None, await get_course_service(session))
+
+
+async def _video(webhooks: WebhooksService, payload: MinioWebhookPayloadSchema, session: AsyncSession):
+    return await webhooks.video_uploaded(payload, None, await get_media_service(session))
+
+
+async def _video_preview(webhooks: WebhooksService, payload: MinioWebhookPayloadSchema, session: AsyncSession):
+    return await webhooks.video_preview_uploaded(payload, None, await get_video_service(session))
+
+
+_DISPATCH: Dict[ObjectKind, Dispatch] = {
+    ObjectKind.PROFILE_AVATAR: _avatar,
+    ObjectKind.CHANNEL_AVATAR: _channel_avatar,
+    ObjectKind.CHANNEL_PREVIEW: _channel_preview,
+    ObjectKind.COURSE_PREVIEW: _course_preview,
+    ObjectKind.VIDEO: _video,
+    ObjectKind.VIDEO_PREVIEW: _video_preview,
+}
+
+
+async def deliver_storage_event(event: StorageEvent) -> None:
+    """Подписчик ``StorageBackend``: выбирает обработчик по виду объекта, как правила NOTIFY_RULES"""
+    payload = MinioWebhookPayloadSchema.model_validate(event.to_minio_payload())
+    upload_key = UploadKey.from_object(event.bucket, event.key)
+
+    dispatch = _DISPATCH.get(upload_key.kind) if upload_key is not None else None
+    if dispatch is None:
+        logger.debug("Событие без обработчика: %s/%s", event.bucket, event.key)
+        return
+
+    async with async_session_maker() as session:
+        await dispatch(await get_webhooks_service(session), payload, session)
+
+
+async def redeliver(kind: ObjectKind, payload: MinioWebhookPayloadSchema) -> List[str]:
+    """
+    Повторная обработка записи из очереди повторов тем же обработчиком.
+    Возвращает ошибки; сама запись в очередь не ставится — её ведёт воркер.
+    """
+    async with async_session_maker() as session:
+        webhooks = WebhooksService(await get_storage_usage_service(session), WebhookEventRepository(session))
+        await _DISPATCH[kind](webhooks, payload, session)
+    return webhooks.failures
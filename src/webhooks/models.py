@@ -0,0 +1,62 @@
+import uuid
+from datetime import datetime, UTC
+from typing import Any, Dict
+
+from sqlalchemy import String, DateTime, Integer, Text, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+from ..database import Base
+
+
+class WebhookEventORM(Base):
+    """
+    Последнее применённое событие по каждому объекту. ``sequencer`` —
+    нормализованный счётчик MinIO (hex фиксированной ширины), поэтому
+    порядок событий совпадает со строковым сравнением.
+    """
+    __tablename__ = "webhook_events"
+
+    bucket:     Mapped[str] = mapped_column(String(63), primary_key=True)
+    key:        Mapped[str] = mapped_column(String(1024), primary_key=True)
+    sequencer:  Mapped[str] = mapped_column(String(32), nullable=False)
+    etag:       Mapped[str | None] = mapped_column(String(64), nullable=True)
+    event_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    applied_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+
+
+class WebhookRetryORM(Base):
+    """
+    Запись уведомления MinIO, обработка которой упала. ``record`` — исходная
+    запись в формате MinIO, ``kind`` — имя ``ObjectKind`` вебхука, которым
+    она пришла. После ``WEBHOOK_RETRY_MAX_ATTEMPTS`` попыток запись
+    остаётся в статусе ``dead`` для ручного разбора.
+    """
+    __tablename__ = "webhook_retries"
+    __table_args__ = (
+        Index("ix_webhook_retries_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id:              Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind:            Mapped[str] = mapped_column(String(32), nullable=False)
+    bucket:          Mapped[str] = mapped_column(String(63), nullable=False)
+    key:             Mapped[str] = mapped_column(String(1024), nullable=False)
+    record:          Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    status:          Mapped[str] = mapped_column(String(16), nullable=False)
+    attempts:        Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    last_error:      Mapped[str | None] = mapped_column(Text, nullable=True)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at:      Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
+    updated_at:      Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False
+    )
@@ -0,0 +1,137 @@
+from uuid import UUID
+from urllib.parse import unquote_plus
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+
+from .models import WebhookEventORM, WebhookRetryORM
+
+from ..core.Enums.WebhookEnums import WebhookRetryStatusEnum
+
+import logging
+from ..core.log import configure_logging
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+class WebhookEventRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def applied_sequencer(self, bucket: str, key: str) -> Optional[str]:
+        result = await self.session.execute(
+            select(WebhookEventORM.sequencer)
+            .where(WebhookEventORM.bucket == bucket, WebhookEventORM.key == key)
+        )
+        return result.scalar_one_or_none()
+
+    async def mark_applied(
+        self,
+        bucket: str,
+        key: str,
+        *,
+        sequencer: str,
+        etag: Optional[str],
+        event_time: Optional[datetime],
+    ) -> None:
+        """Сохраняет событие как применённое; более старое не затирает уже записанное новое"""
+        query = insert(WebhookEventORM).values(
+            bucket=bucket, key=key, sequencer=sequencer, etag=etag,
+            event_time=event_time, applied_at=datetime.now(UTC),
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[WebhookEventORM.bucket, WebhookEventORM.key],
+            set_={name: query.excluded[name] for name in ("sequencer", "etag", "event_time", "applied_at")},
+            where=WebhookEventORM.sequencer < query.excluded.sequencer,
+        )
+        await self.session.execute(query)
+        await self.session.commit()
+
+
+class WebhookRetryRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def enqueue(self, *, kind: str, record: Dict[str, Any], error: str, delay: float) -> None:
+        # Сессия могла остаться в упавшей транзакции обработчика
+        await self.session.rollback()
+        now = datetime.now(UTC)
+        self.session.add(WebhookRetryORM(
+            kind=kind,
+            bucket=record["s3"]["bucket"]["name"],
+            key=unquote_plus(record["s3"]["object"]["key"]),
+            record=record,
+            status=WebhookRetryStatusEnum.PENDING.value,
+            attempts=1,
+            last_error=error[-4000:],
+            next_attempt_at=now + timedelta(seconds=delay),
+            created_at=now,
+            updated_at=now,
+        ))
+        await self.session.commit()
+
+    async def claim(self, *, limit: int, lease: timedelta) -> List[WebhookRetryORM]:
+        """
+        Забирает подошедшие по времени записи и сдвигает их срок на ``lease``:
+        если воркер упадёт, записи вернутся в работу сами. SKIP LOCKED
+        разводит воркеры разных процессов.
+        """
+        now = datetime.now(UTC)
+        due = (
+            select(WebhookRetryORM.id)
+            .where(
+                WebhookRetryORM.status == WebhookRetryStatusEnum.PENDING.value,
+                WebhookRetryORM.next_attempt_at <= now,
+            )
+            .order_by(WebhookRetryORM.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            update(WebhookRetryORM)
+            .where(WebhookRetryORM.id.in_(due.scalar_subquery()))
+            .values(next_attempt_at=now + lease, updated_at=now)
+            .returning(WebhookRetryORM)
+        )
+        retries = list((await self.session.execute(query)).scalars().all())
+        await self.session.commit()
+        return retries
+
+    async def succeed(self, retry_id: UUID) -> None:
+        await self.session.execute(delete(WebhookRetryORM).where(WebhookRetryORM.id == retry_id))
+        await self.session.commit()
+
+    async def fail(self, retry_id: UUID, error: str, *, delay: Optional[float]) -> None:
+        """Следующая попытка через ``delay`` секунд; ``None`` — в dead letter"""
+        now = datetime.now(UTC)
+        values: Dict[str, Any] = dict(
+            attempts=WebhookRetryORM.attempts + 1,
+            last_error=error[-4000:],
+            updated_at=now,
+        )
+        if delay is None:
+            values["status"] = WebhookRetryStatusEnum.DEAD.value
+        else:
+            values["next_attempt_at"] = now + timedelta(seconds=delay)
+        await self.session.execute(update(WebhookRetryORM).where(WebhookRetryORM.id == retry_id).values(**values))
+        await self.session.commit()
+
+    async def depths(self) -> Dict[str, int]:
+        result = await self.session.execute(
+            select(WebhookRetryORM.status, func.count()).group_by(WebhookRetryORM.status)
+        )
+        counts = dict(result.all())
+        return {status.value: counts.get(status.value, 0) for status in WebhookRetryStatusEnum}
+
+    async def list_dead(self, *, limit: int, offset: int) -> List[WebhookRetryORM]:
+        result = await self.session.execute(
+            select(WebhookRetryORM)
+            .where(WebhookRetryORM.status == WebhookRetryStatusEnum.DEAD.value)
+            .order_by(WebhookRetryORM.updated_at.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(result.scalars().all())
@@ -0,0 +1,124 @@
+"""
+Повтор упавших записей уведомлений MinIO.
+
+``WebhooksService`` не теряет запись, если обработчик упал (например,
+кратковременно недоступна БД): она сохраняется в ``webhook_retries``,
+а воркер повторяет её с экспоненциальной паузой и джиттером. После
+``max_attempts`` попыток запись остаётся в dead letter и видна через
+``GET /webhooks/minio/dead_letters``.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict
+
+from ..aws.strategies import ObjectKind
+from ..core.backoff import backoff_delay
+from ..core.metrics import register_metrics
+from ..database import async_session_maker
+from ..settings.config import WEBHOOK_ENV
+from .local_events import redeliver
+from .models import WebhookRetryORM
+from .repository import WebhookRetryRepository
+from .schemas import MinioWebhookPayloadSchema
+
+from ..core.log import configure_logging
+
+logger = logging.getLogger(__name__)
+configure_logging()
+
+
+# Запись, забранная воркером, вернётся в очередь, если он не отчитается за это время
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+class WebhookRetryWorker:
+    def __init__(
+        self,
+        *,
+        poll_seconds: float,
+        base_delay: float,
+        max_delay: float,
+        max_attempts: int,
+        batch_size: int,
+    ):
+        self.poll_seconds = poll_seconds
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+        self._depths: Dict[str, int] = {}
+        self._redelivered = 0
+        self._failed = 0
+        self._dead_lettered = 0
+
+    @asynccontextmanager
+    async def _repository(self) -> AsyncIterator[WebhookRetryRepository]:
+        async with async_session_maker() as session:
+            yield WebhookRetryRepository(session)
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                claimed = await self.drain_once()
+            except Exception:
+                logger.exception("Не удалось обработать очередь повторов вебхуков")
+                claimed = 0
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.poll_seconds)
+
+    async def drain_once(self) -> int:
+        async with self._repository() as repository:
+            retries = await repository.claim(limit=self.batch_size, lease=CLAIM_LEASE)
+        for retry in retries:
+            await self._retry(retry)
+        async with self._repository() as repository:
+            self._depths = await repository.depths()
+        return len(retries)
+
+    async def _retry(self, retry: WebhookRetryORM) -> None:
+        try:
+            payload = MinioWebhookPayloadSchema.model_validate({"Records": [retry.record]})
+            failures = await redeliver(ObjectKind[retry.kind], payload)
+        except Exception as exc:
+            failures = [f"{type(exc).__name__}: {exc}"]
+
+        async with self._repository() as repository:
+            if not failures:
+                await repository.succeed(retry.id)
+                self._redelivered += 1
+                logger.info(f"Запись вебхука {retry.bucket}/{retry.key} обработана с попытки {retry.attempts + 1}")
+                return
+
+            attempt = retry.attempts + 1
+            if attempt >= self.max_attempts:
+                await repository.fail(retry.id, failures[-1], delay=None)
+                self._dead_lettered += 1
+                logger.error(f"Запись вебхука {retry.bucket}/{retry.key} ушла в dead letter: {failures[-1]}")
+                return
+
+            await repository.fail(
+                retry.id, failures[-1],
+                delay=backoff_delay(attempt, base=self.base_delay, cap=self.max_delay),
+            )
+            self._failed += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "pending": self._depths.get("pending", 0),
+            "dead": self._depths.get("dead", 0),
+            "redelivered": self._redelivered,
+            "failed_attempts": self._failed,
+            "dead_lettered": self._dead_lettered,
+        }
+
+
+webhook_retry_worker = WebhookRetryWorker(
+    poll_seconds=WEBHOOK_ENV.WEBHOOK_RETRY_POLL_SECONDS,
+    base_delay=WEBHOOK_ENV.WEBHOOK_RETRY_BASE_SECONDS,
+    max_delay=WEBHOOK_ENV.WEBHOOK_RETRY_MAX_DELAY_SECONDS,
+    max_attempts=WEBHOOK_ENV.WEBHOOK_RETRY_MAX_ATTEMPTS,
+    batch_size=WEBHOOK_ENV.WEBHOOK_RETRY_BATCH_SIZE,
+)
+register_metrics("webhook_retries", webhook_retry_worker.metrics)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Request, status, Depends
+from typing import List
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, status, Depends
 from uuid import UUID
 from pathlib import Path
 from urllib.parse import unquote_plus
@@ -19,9 +21,14 @@ from ..courses.dependencies import get_course_service
 from ..videos.service import VideoService
 from ..videos.dependencies import get_video_service
 
+from ..media.service import MediaService
+from ..media.dependencies import get_media_service
+
 from .service import WebhooksService
-from .schemas import MinioWebhookPayloadSchema
-from .dependencies import get_webhooks_service
+from .schemas import MinioWebhookPayloadSchema, WebhookDeadLetterSchema
+from .dependencies import get_webhooks_service, get_webhook_retry_repository, get_webhooks_exceptions
+from .exceptions import WebhooksHTTPExceptions
+from .repository import WebhookRetryRepository
 
 import logging
 from ..core.log import configure_logging
@@ -65,9 +72,9 @@ async def video_uploaded_webhook(
     payload: MinioWebhookPayloadSchema,
     request: Request,
     webhook_service: WebhooksService = Depends(get_webhooks_service),
-    video_service: VideoService    = Depends(get_video_service),
+    media_service: MediaService    = Depends(get_media_service),
 ):
-    return await webhook_service.video_uploaded(payload, request, video_service)
+    return await webhook_service.video_uploaded(payload, request, media_service)
 
 
 @router.post("/video_preview")
@@ -103,5 +110,15 @@ async def channel_preview_uploaded_webhook(
     logger.debug("/channel_preview отработал")
 
 
-
-
+@router.get("/dead_letters", response_model=List[WebhookDeadLetterSchema])
+async def list_dead_letters(
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    token: str | None = Header(default=None, alias="X-Minio-Webhook-Token"),
+    retries: WebhookRetryRepository = Depends(get_webhook_retry_repository),
+    http_exceptions: WebhooksHTTPExceptions = Depends(get_webhooks_exceptions),
+):
+    """Записи, исчерпавшие повторы; доступ по токену вебхуков"""
+    if token != WEBHOOK_ENV.MINIO_WEBHOOK_TOKEN:
+        raise http_exceptions.forbidden_403()
+    return await retries.list_dead(limit=limit, offset=offset)
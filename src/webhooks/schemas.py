@@ -1,5 +1,8 @@
-from pydantic import BaseModel
-from typing import List
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, List, Optional
 
 
 class S3Bucket(BaseModel):
@@ -8,6 +11,10 @@ class S3Bucket(BaseModel):
 
 class S3Object(BaseModel):
     key: str
+    size: int = 0
+    eTag: Optional[str] = None
+    contentType: Optional[str] = None
+    sequencer: Optional[str] = None
 
 
 class S3Entity(BaseModel):
@@ -16,8 +23,24 @@ class S3Entity(BaseModel):
 
 
 class Record(BaseModel):
+    eventName: Optional[str] = None
+    eventTime: Optional[datetime] = None
     s3: S3Entity
 
 
 class MinioWebhookPayloadSchema(BaseModel):
     Records: List[Record]
+
+
+class WebhookDeadLetterSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    kind: str
+    bucket: str
+    key: str
+    attempts: int
+    last_error: Optional[str]
+    record: Dict[str, Any]
+    created_at: datetime
+    updated_at: datetime
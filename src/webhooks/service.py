@@ -1,17 +1,25 @@
+import hmac
+import mimetypes
+
 from fastapi import Request
-from uuid import UUID
 from urllib.parse import unquote_plus
 from pathlib import Path
-from typing import Callable, Awaitable
+from typing import Callable, Awaitable, Optional
 
 from ..core.Enums.TypeReferencesEnums import ImageTypeReference
 from ..auth.service     import AuthService
 from ..channels.service import ChannelService
 from ..videos.service   import VideoService
 from ..courses.service  import CourseService
+from ..media.service    import MediaService
+from ..storage_usage.service import StorageUsageService
 
+from ..core.backoff     import backoff_delay
 from ..settings.config  import WEBHOOK_ENV
-from .schemas           import MinioWebhookPayloadSchema
+from .schemas           import MinioWebhookPayloadSchema, Record
+from .dedup             import EventIndex, event_index, event_sequencer
+from .exceptions        import WebhooksHTTPExceptions
+from .repository        import WebhookEventRepository, WebhookRetryRepository
 from ..aws.upload_key   import UploadKey
 from ..aws.strategies   import ObjectKind
 
@@ -25,18 +33,45 @@ ParsedHandler = Callable[[UploadKey, str], Awaitable[None]]
 
 
 class WebhooksService:
+    def __init__(
+        self,
+        usage: Optional[StorageUsageService] = None,
+        events: Optional[WebhookEventRepository] = None,
+        retries: Optional[WebhookRetryRepository] = None,
+        index: EventIndex = event_index,
+    ):
+        self.usage = usage
+        self.events = events
+        self.retries = retries
+        self.index = index
+        # Ошибки обработчиков за вызов — по ним воркер повторов решает судьбу записи
+        self.failures: list[str] = []
+
     # ---------- helpers ----------
     @staticmethod
-    def _check_token(request: Request) -> None:
-        if request.headers.get("X-Minio-Webhook-Token") != WEBHOOK_ENV.MINIO_WEBHOOK_TOKEN:
-            logger.debug("Неверный X-Minio-Webhook-Token")
-            #raise PermissionError("Invalid webhook token")
+    def _check_token(request: Optional[Request]) -> None:
+        """
+        Запрос без верного токена отклоняется до разбора записей: размер
+        объекта для учёта места берётся из тела события. MinIO передаёт
+        ``MINIO_NOTIFY_WEBHOOK_AUTH_TOKEN`` в ``Authorization: Bearer``.
+        """
+        # request is None — событие локального хранилища, доставленное внутри процесса
+        if request is None:
+            return
+        supplied = [request.headers.get("X-Minio-Webhook-Token", "")]
+        scheme, _, bearer = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer":
+            supplied.append(bearer.strip())
+        expected = WEBHOOK_ENV.MINIO_WEBHOOK_TOKEN.encode()
+        if not any(hmac.compare_digest(token.encode(), expected) for token in supplied):
+            logger.warning("Вебхук с неверным токеном отклонён: %s", request.url.path)
+            raise WebhooksHTTPExceptions().forbidden_403("Invalid webhook token")
 
     async def _process(
         self,
         *,
         payload: MinioWebhookPayloadSchema,
-        request: Request,
+        request: Optional[Request],
         allowed_kind: ObjectKind,
         handler: ParsedHandler,
     ) -> dict[str, str]:
@@ -44,28 +79,92 @@ class WebhooksService:
         self._check_token(request)
 
         for record in payload.Records:
+            upload_key: UploadKey | None = None
             try:
-                user_id: UUID = UUID(record.s3.bucket.name)
                 raw_key: str = unquote_plus(record.s3.object.key)
 
-                upload_key: UploadKey | None = UploadKey.from_s3(
-                    user_id=user_id, key=raw_key
-                )
+                upload_key = UploadKey.from_object(record.s3.bucket.name, raw_key)
                 if upload_key is None or upload_key.kind is not allowed_kind:
                     logger.debug("Пропуск: %s", raw_key)
                     continue
 
+                bucket: str = record.s3.bucket.name
+                sequencer: Optional[str] = event_sequencer(record)
+                if sequencer is not None and await self._already_applied(bucket, raw_key, sequencer):
+                    logger.debug("Повтор или устаревшее событие: %s (%s)", raw_key, sequencer)
+                    continue
+
+                await self._record_usage(upload_key, record)
+
                 mime_type: str = self._guess_mime(upload_key)
                 await handler(upload_key, mime_type)
 
+                if sequencer is not None:
+                    await self._mark_applied(bucket, raw_key, sequencer, record)
+
             except Exception as exc:  # noqa: BLE001
                 logger.warning(
-                    "Запись webhook пропущена (%s): %s", record, exc, exc_info=True
+                    "Запись webhook не обработана (%s): %s", record, exc, exc_info=True
                 )
+                error = f"{type(exc).__name__}: {exc}"
+                self.failures.append(error)
+                # Запись, которую не удалось даже разобрать, повтор не исправит
+                if upload_key is not None:
+                    await self._defer(allowed_kind, record, error)
 
         return {"status": "ok"}
 
 
+    async def _defer(self, kind: ObjectKind, record: Record, error: str) -> None:
+        """
+        Откладывает запись в очередь повторов. Если не удалось и это,
+        исключение уходит наружу: ответ 5xx, и MinIO повторит доставку сам.
+        """
+        if self.retries is None:
+            return
+        await self.retries.enqueue(
+            kind=kind.name,
+            record=record.model_dump(mode="json"),
+            error=error,
+            delay=backoff_delay(
+                1, base=WEBHOOK_ENV.WEBHOOK_RETRY_BASE_SECONDS, cap=WEBHOOK_ENV.WEBHOOK_RETRY_MAX_DELAY_SECONDS
+            ),
+        )
+
+    async def _already_applied(self, bucket: str, key: str, sequencer: str) -> bool:
+        """Сначала LRU процесса, затем таблица — её номер мог записать другой воркер"""
+        if self.index.is_applied(bucket, key, sequencer):
+            return True
+        if self.events is None:
+            return False
+        applied = await self.events.applied_sequencer(bucket, key)
+        if applied is None:
+            return False
+        self.index.remember(bucket, key, applied)
+        return applied >= sequencer
+
+    async def _mark_applied(self, bucket: str, key: str, sequencer: str, record: Record) -> None:
+        # Отмечается только после обработчика: упавшая запись будет применена при повторе MinIO
+        if self.events is not None:
+            await self.events.mark_applied(
+                bucket, key, sequencer=sequencer, etag=record.s3.object.eTag, event_time=record.eventTime
+            )
+        self.index.remember(bucket, key, sequencer)
+
+    async def _record_usage(self, upload_key: UploadKey, record: Record) -> None:
+        """Ошибка учёта места не должна мешать обработке самой загрузки"""
+        if self.usage is None:
+            return
+        try:
+            await self.usage.record_upload(
+                upload_key,
+                size=record.s3.object.size,
+                etag=record.s3.object.eTag,
+                event_time=record.eventTime,
+            )
+        except Exception:  # noqa: BLE001
+            logger.warning("Не удалось учесть размер %s", upload_key.key, exc_info=True)
+
     @staticmethod
     def _guess_mime(upload_key: UploadKey) -> str:
         """Получить MIME‑тип по расширению и ObjectKind."""
@@ -88,7 +187,7 @@ class WebhooksService:
     async def avatar_uploaded(
         self,
         payload: MinioWebhookPayloadSchema,
-        request: Request,
+        request: Optional[Request],
         auth_service: AuthService,
     ) -> dict[str, str]:
         """Webhook for user avatar."""
@@ -106,7 +205,7 @@ class WebhooksService:
     async def channel_avatar_uploaded(
         self,
         payload: MinioWebhookPayloadSchema,
-        request: Request,
+        request: Optional[Request],
         channel_service: ChannelService,
     ) -> dict[str, str]:
         """Webhook for channel avatar."""
@@ -128,7 +227,7 @@ class WebhooksService:
     async def channel_preview_uploaded(
         self,
         payload: MinioWebhookPayloadSchema,
-        request: Request,
+        request: Optional[Request],
         channel_service: ChannelService,
     ) -> dict[str, str]:
         async def _handler(upload_key: UploadKey, mime_type: str) -> None:
@@ -146,7 +245,7 @@ class WebhooksService:
     async def course_preview_uploaded(
         self,
         payload: MinioWebhookPayloadSchema,
-        request: Request,
+        request: Optional[Request],
         course_service: CourseService,
     ) -> dict[str, str]:
         async def _handler(upload_key: UploadKey, mime_type: str) -> None:
@@ -165,16 +264,12 @@ class WebhooksService:
     async def video_uploaded(
         self,
         payload: MinioWebhookPayloadSchema,
-        request: Request,
-        video_service: VideoService,
+        request: Optional[Request],
+        media_service: MediaService,
     ) -> dict[str, str]:
+        """Оригинал загружен — ставим разбор и нарезку HLS в очередь"""
         async def _handler(upload_key: UploadKey, mime_type: str) -> None:
-            await video_service.process_video_upload(
-                owner_id=upload_key.user_id,
-                video_id=upload_key.video_id,
-                ext=upload_key.ext,
-                mime=mime_type,
-            )
+            await media_service.enqueue_uploaded(upload_key.video_id)
 
         return await self._process(
             payload=payload,
@@ -186,7 +281,7 @@ class WebhooksService:
     async def video_preview_uploaded(
         self,
         payload: MinioWebhookPayloadSchema,
-        request: Request,
+        request: Optional[Request],
         video_service: VideoService,
     ) -> dict[str, str]:
         async def _handler(upload_key: UploadKey, mime_type: str) -> None:
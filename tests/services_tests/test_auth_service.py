@@ -76,40 +76,6 @@ async def test_get_password_hash(auth_service):
         mock_hash.assert_called_once_with("plain_password")
 
 
-async def test_create_access_token(auth_service):
-    """Тест создания токена доступа."""
-    with patch("src.auth.service.jwt.encode") as mock_encode:
-        mock_encode.return_value = "encoded_token"
-        
-        # Тест с указанным временем истечения
-        expires_delta = timedelta(minutes=15)
-        token = auth_service.create_access_token({"sub": "test@example.com"}, expires_delta)
-        assert token == "encoded_token"
-        
-        # Проверяем, что encode был вызван с правильными параметрами
-        assert mock_encode.call_count == 1
-        args, kwargs = mock_encode.call_args
-        assert "sub" in args[0]
-        assert "exp" in args[0]
-        assert args[1] == "test_secret_key"
-        assert kwargs["algorithm"] == "HS256"
-        
-        # Сбрасываем мок
-        mock_encode.reset_mock()
-        
-        # Тест без указания времени истечения
-        token = auth_service.create_access_token({"sub": "test@example.com"})
-        assert token == "encoded_token"
-        
-        # Проверяем, что encode был вызван с правильными параметрами
-        assert mock_encode.call_count == 1
-        args, kwargs = mock_encode.call_args
-        assert "sub" in args[0]
-        assert "exp" in args[0]
-        assert args[1] == "test_secret_key"
-        assert kwargs["algorithm"] == "HS256"
-
-
 async def test_authenticate_user_success(auth_service, test_user, test_secret_info):
     """Тест успешной аутентификации пользователя."""
     # Настраиваем моки
@@ -219,50 +185,6 @@ async def test_create_user_existing_email(auth_service, test_user, test_secret_i
     auth_service.repository.create_user.assert_not_called()
 
 
-async def test_get_current_user_success(auth_service, test_user, test_secret_info):
-    """Тест успешного получения текущего пользователя по токену."""
-    # Патчим jwt.decode
-    with patch("src.auth.service.jwt.decode") as mock_decode:
-        mock_decode.return_value = {"sub": "test@example.com"}
-        
-        # Настраиваем моки
-        auth_service.repository.get_user_by_email.return_value = (test_user, test_secret_info)
-        
-        # Получаем пользователя
-        result = await auth_service.get_current_user("valid_token")
-        
-        # Проверяем результаты
-        assert result is not None
-        assert isinstance(result, UserReadSchema)
-        assert result.id == test_user.id
-        assert result.username == test_user.username
-        assert result.email == test_secret_info.email
-        
-        # Проверяем вызовы методов
-        mock_decode.assert_called_once_with("valid_token", "test_secret_key", algorithms=["HS256"])
-        auth_service.repository.get_user_by_email.assert_called_once_with("test@example.com")
-
-
-async def test_get_current_user_invalid_token(auth_service):
-    """Тест получения пользователя по невалидному токену."""
-    # Патчим jwt.decode для выброса исключения
-    with patch("src.auth.service.jwt.decode") as mock_decode:
-        from jose import JWTError
-        mock_decode.side_effect = JWTError("Invalid token")
-        
-        # Проверяем, что получение пользователя вызывает исключение
-        with pytest.raises(HTTPException) as exc_info:
-            await auth_service.get_current_user("invalid_token")
-        
-        # Проверяем детали исключения
-        assert exc_info.value.status_code == 401
-        assert "credentials" in exc_info.value.detail
-        
-        # Проверяем вызовы методов
-        mock_decode.assert_called_once_with("invalid_token", "test_secret_key", algorithms=["HS256"])
-        auth_service.repository.get_user_by_email.assert_not_called()
-
-
 async def test_delete_user_success(auth_service):
     """Тест успешного удаления пользователя."""
     # Настраиваем моки
@@ -0,0 +1,179 @@
+"""
+Тесты access/refresh токенов и индекса отозванных jti.
+"""
+import time
+from datetime import datetime, timedelta, UTC
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.auth.exceptions import AuthHTTPExceptions
+from src.auth.repository import RevokedAccessTokenRepository
+from src.auth.service import AuthService
+from src.auth.schemas import CurrentUserSchema, UserReadSchema
+from src.auth.tokens import (
+    RevokedTokenIndex,
+    create_access_token,
+    decode_access_token,
+    new_refresh_token,
+    refresh_secret_matches,
+    revoked_tokens,
+    split_refresh_token,
+)
+
+
+def _user() -> UserReadSchema:
+    now = datetime.now(UTC)
+    return UserReadSchema(
+        id=uuid4(), username="john_doe", email="john@example.com",
+        is_verified=True, is_active=True, created_at=now, updated_at=now,
+    )
+
+
+def test_access_token_restores_user_without_db():
+    user = _user()
+    issued = create_access_token(user)
+
+    decoded, payload = decode_access_token(issued.token)
+
+    assert decoded == CurrentUserSchema(id=user.id, email=user.email, created_at=user.created_at)
+    # Изменяемые поля профиля в токен не попадают и не устаревают в нём
+    assert set(payload["usr"]) == {"created_at"}
+    assert payload["jti"] == str(issued.jti)
+
+
+def test_revoked_access_token_is_rejected():
+    issued = create_access_token(_user())
+    revoked_tokens.revoke(str(issued.jti), issued.expires_at.timestamp())
+
+    with pytest.raises(ValueError):
+        decode_access_token(issued.token)
+
+
+def test_revoked_index_forgets_expired_entries():
+    index = RevokedTokenIndex()
+    index.revoke("expired", time.time() - 1)
+    index.revoke("active", time.time() + 60)
+
+    assert not index.is_revoked("expired")
+    assert index.is_revoked("active")
+
+
+def test_refresh_token_round_trip():
+    token_id, secret_hash, raw = new_refresh_token()
+    parsed_id, secret = split_refresh_token(raw)
+
+    assert parsed_id == token_id
+    assert refresh_secret_matches(secret, secret_hash)
+    assert not refresh_secret_matches(secret + "x", secret_hash)
+    assert split_refresh_token("garbage") is None
+
+
+
+class _RevokedRepository:
+    """Общая для всех воркеров таблица revoked_access_tokens"""
+
+    def __init__(self, sessions=()):
+        self.rows = {}
+        self.sessions = list(sessions)
+
+    async def revoke(self, jti, expires_at, *, commit=True):
+        self.rows.setdefault(jti, expires_at)
+
+    async def revoke_user_sessions(self, user_id, ttl):
+        for jti, expires_at in self.sessions:
+            self.rows.setdefault(jti, expires_at)
+        return self.sessions
+
+    async def get_active(self):
+        return list(self.rows.items())
+
+    async def purge_expired(self):
+        pass
+
+
+class _RefreshRepository:
+    async def get_revoked_since(self, since):
+        return []
+
+
+class _CapturingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(all=lambda: [])
+
+    async def commit(self):
+        pass
+
+
+def _auth_service(revoked_repo) -> AuthService:
+    service = AuthService(None, AuthHTTPExceptions())
+    service.repository.revoked_repo = revoked_repo
+    service.repository.refresh_repo = _RefreshRepository()
+    return service
+
+
+async def test_logout_without_refresh_token_reaches_other_workers():
+    issued = create_access_token(_user())
+    _, payload = decode_access_token(issued.token)
+    shared = _RevokedRepository()
+
+    await _auth_service(shared).logout(None, payload)
+    assert shared.rows == {issued.jti: issued.expires_at.replace(microsecond=0)}
+
+    # Другой воркер: его индекс пуст, пока не прошла синхронизация
+    revoked_tokens._entries.pop(str(issued.jti))
+    decode_access_token(issued.token)
+    assert await _auth_service(shared).sync_revoked_tokens() == 1
+    with pytest.raises(ValueError):
+        decode_access_token(issued.token)
+
+
+async def test_user_sessions_are_revoked_from_refresh_tokens():
+    session = _CapturingSession()
+    await RevokedAccessTokenRepository(session).revoke_user_sessions(uuid4(), timedelta(minutes=15))
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "INSERT INTO revoked_access_tokens (jti, expires_at, revoked_at) SELECT refresh_tokens.access_jti" in sql
+    assert "ON CONFLICT (jti) DO NOTHING" in sql
+
+
+async def test_profile_is_read_from_db_and_deactivation_revokes_sessions():
+    user = _user()
+    issued = create_access_token(user)
+    other = create_access_token(user)
+    _, payload = decode_access_token(issued.token)
+    shared = _RevokedRepository(sessions=[(other.jti, other.expires_at)])
+    service = _auth_service(shared)
+
+    stored = SimpleNamespace(**user.model_dump(exclude={"email", "avatar_url"}), avatar_ext=None)
+    secret = SimpleNamespace(email=user.email)
+
+    async def update_user(user_id, update_data):
+        for field, value in update_data.items():
+            setattr(stored, field, value)
+        return stored
+
+    async def get_user_and_secret_by_id(user_id):
+        return stored, secret
+
+    service.repository.update_user = update_user
+    service.repository.get_user_and_secret_by_id = get_user_and_secret_by_id
+
+    renamed = await service.update_user(user.id, {"username": "jane_doe"}, payload)
+    assert renamed.username == "jane_doe"
+    assert (await service.get_user(user.id)).username == "jane_doe"
+    decode_access_token(issued.token)
+    assert shared.rows == {}
+
+    deactivated = await service.update_user(user.id, {"is_active": False}, payload)
+    assert not deactivated.is_active
+    for token in (issued, other):
+        with pytest.raises(ValueError):
+            decode_access_token(token.token)
+    assert set(shared.rows) == {issued.jti, other.jti}
@@ -0,0 +1,56 @@
+"""
+Тесты хранения одинаковых видео один раз: хэш содержимого, адреса общих файлов, выбор донора.
+"""
+import hashlib
+from uuid import UUID
+
+from src.aws.backends import LocalStorageBackend
+from src.aws.layout import HLS_MASTER, blob_prefix, video_object
+from src.core.Enums.MediaStatusEnums import MediaJobKindEnum
+from src.media.blobs import object_sha256
+from src.media.repository import CONTENT_JOBS, pick_donor
+
+
+OWNER = UUID("0f8fad5b-d9cb-469f-a165-70867728950e")
+VIDEO = UUID("7c9e6679-7425-40de-944b-e07fc1f90ae7")
+OTHER = UUID("16fd2706-8baf-433b-82eb-8c7fada847da")
+
+
+async def _chunks(data: bytes):
+    yield data
+
+
+async def test_sha256_is_read_in_ranges(tmp_path):
+    backend = LocalStorageBackend(root=tmp_path, secret="secret", public_base_url="http://host/api/storage")
+    data = bytes(range(256)) * 41
+    await backend.write(str(OWNER), "channels/c1/videos/v/video.mp4", _chunks(data))
+
+    digest = await object_sha256(backend, str(OWNER), "channels/c1/videos/v/video.mp4", len(data), chunk_size=1000)
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert await object_sha256(backend, str(OWNER), "missing", 0, chunk_size=1000) == hashlib.sha256().hexdigest()
+
+
+def test_video_files_move_to_content_prefix():
+    sha256 = hashlib.sha256(b"intro").hexdigest()
+    own = video_object(OWNER, "c1", VIDEO, HLS_MASTER)
+    shared = video_object(OWNER, "c1", VIDEO, HLS_MASTER, content_sha256=sha256)
+
+    assert own[1].endswith(f"channels/c1/videos/{VIDEO}/hls/master.m3u8")
+    assert shared == ("blobs", f"sha256/{sha256[:2]}/{sha256}/hls/master.m3u8")
+    # Одинаковое содержимое разных видео и владельцев — один и тот же адрес
+    assert video_object(OTHER, "c2", OTHER, HLS_MASTER, content_sha256=sha256) == shared
+    assert blob_prefix(sha256).startswith("sha256/")
+
+
+def test_donor_with_most_finished_jobs_is_reused():
+    assert pick_donor({}) == (None, list(CONTENT_JOBS))
+
+    done = {
+        VIDEO: {MediaJobKindEnum.PROBE},
+        OTHER: {MediaJobKindEnum.PROBE, MediaJobKindEnum.STORYBOARD, MediaJobKindEnum.DIGEST},
+    }
+    assert pick_donor(done) == (OTHER, [MediaJobKindEnum.HLS])
+
+    complete = {video_id: set(CONTENT_JOBS) for video_id in (VIDEO, OTHER)}
+    donor, pending = pick_donor(complete)
+    assert pending == [] and donor == min(VIDEO, OTHER)
@@ -0,0 +1,40 @@
+"""
+Тесты кэша сериализованных структур курса.
+"""
+from uuid import uuid4
+
+from src.courses_structure.cache import StructureBlobCache
+
+
+def test_cache_hit_requires_same_version():
+    cache = StructureBlobCache(max_entries=4)
+    course_id = uuid4()
+    cache.put(course_id, 2, b"{}")
+
+    assert cache.get(course_id, 2) == b"{}"
+    assert cache.get(course_id, 3) is None
+
+
+def test_newer_version_replaces_older_and_stale_put_is_ignored():
+    cache = StructureBlobCache(max_entries=4)
+    course_id = uuid4()
+    cache.put(course_id, 2, b"v2")
+    cache.put(course_id, 1, b"v1")
+
+    assert cache.get(course_id, 2) == b"v2"
+    assert len(cache) == 1
+
+
+def test_invalidate_and_lru_eviction():
+    cache = StructureBlobCache(max_entries=2)
+    first, second, third = uuid4(), uuid4(), uuid4()
+    cache.put(first, 1, b"1")
+    cache.put(second, 1, b"2")
+    cache.get(first, 1)
+    cache.put(third, 1, b"3")
+
+    assert cache.get(second, 1) is None
+    assert cache.get(first, 1) == b"1"
+
+    cache.invalidate(first)
+    assert cache.get(first, 1) is None
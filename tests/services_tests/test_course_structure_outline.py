@@ -0,0 +1,149 @@
+"""
+Тесты оглавления и поддеревьев структуры курса: SQL-запросы, индексы элементов и 404 за пределами content.
+"""
+import re
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from src.courses_structure.cache import StructureBlobCache
+from src.courses_structure.exceptions import CourseStructureHTTPExceptions
+from src.courses_structure.repository import CourseStructureRepository
+from src.courses_structure.service import CourseStructureService
+
+
+STRUCTURE = {
+    "content": [
+        {"module": {
+            "name": "Модуль",
+            "is_active": True,
+            "submodules": [
+                {"name": "Первый", "lessons": [{"name": "Урок 1"}]},
+                {"name": "Второй", "lessons": []},
+            ],
+        }},
+        {"lesson": {"name": "Отдельный урок"}},
+    ]
+}
+
+
+class FakeRepository:
+    """Выполняет те же jsonpath-выражения над словарём, как lax-режим Postgres"""
+
+    def __init__(self, structure):
+        self.structure = structure
+        self.calls = []
+
+    async def get_subtree(self, course_id, expression, **variables):
+        self.calls.append((expression, variables))
+        if self.structure is None:
+            return False, None
+        value = self.structure
+        for name, index in re.findall(r"\.(\w+)(?:\[\$(\w+)\])?", expression):
+            value = value.get(name) if isinstance(value, dict) else None
+            if index:
+                position = variables[index]
+                value = value[position] if isinstance(value, list) and position < len(value) else None
+            if value is None:
+                return True, None
+        return True, value
+
+    async def get_outline(self, course_id):
+        if self.structure is None:
+            return None, []
+        return 4, [
+            {"index": 0, "kind": "module", "name": "Модуль", "is_active": True,
+             "submodules_count": 2, "lessons_count": 1},
+            {"index": 1, "kind": "lesson", "name": "Отдельный урок", "is_active": None,
+             "submodules_count": 0, "lessons_count": 0},
+        ]
+
+
+def _service(structure=STRUCTURE) -> CourseStructureService:
+    return CourseStructureService(FakeRepository(structure), CourseStructureHTTPExceptions(), StructureBlobCache(max_entries=4))
+
+
+async def test_item_and_submodule_are_addressed_by_index():
+    service = _service()
+
+    item = await service.get_item(uuid4(), 1)
+    assert item.lesson.name == "Отдельный урок"
+
+    submodule = await service.get_submodule(uuid4(), 0, 1)
+    assert submodule.name == "Второй"
+    assert service.repository.calls[-1] == (
+        "$.content[$item].module.submodules[$submodule]", {"item": 0, "submodule": 1}
+    )
+
+
+@pytest.mark.parametrize("call, detail", [
+    (lambda service: service.get_item(uuid4(), 2), "Structure item not found"),
+    (lambda service: service.get_submodule(uuid4(), 0, 2), "Submodule not found"),
+    # У урока нет подмодулей
+    (lambda service: service.get_submodule(uuid4(), 1, 0), "Submodule not found"),
+    (lambda service: service.get_submodule(uuid4(), 5, 0), "Submodule not found"),
+])
+async def test_out_of_range_indexes_return_404(call, detail):
+    with pytest.raises(HTTPException) as error:
+        await call(_service())
+    assert error.value.status_code == 404 and error.value.detail == detail
+
+
+async def test_missing_structure_returns_404():
+    service = _service(None)
+    for call in (service.get_outline(uuid4()), service.get_item(uuid4(), 0), service.get_submodule(uuid4(), 0, 0)):
+        with pytest.raises(HTTPException) as error:
+            await call
+        assert error.value.detail == "Structure not found"
+
+
+async def test_outline_keeps_order_and_counters():
+    outline = await _service().get_outline(uuid4())
+    assert outline.version == 4
+    assert [(item.index, item.kind, item.lessons_count) for item in outline.items] == [
+        (0, "module", 1), (1, "lesson", 0)
+    ]
+
+
+class _Result:
+    def mappings(self):
+        return self
+
+    def all(self):
+        return []
+
+    def first(self):
+        return None
+
+    def scalar_one_or_none(self):
+        return None
+
+
+class _Session:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result()
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+async def test_outline_and_subtree_queries():
+    session = _Session()
+    repository = CourseStructureRepository(session)
+
+    assert await repository.get_subtree(uuid4(), "$.content[$item]", item=3) == (False, None)
+    subtree = session.statements[-1]
+    assert "jsonb_path_query_first" in _sql(subtree)
+    assert {"item": 3} in subtree.compile(dialect=postgresql.dialect()).params.values()
+
+    assert await repository.get_outline(uuid4()) == (None, [])
+    outline = _sql(session.statements[-2])
+    assert "WITH ORDINALITY" in outline
+    assert "ordinality - " in outline
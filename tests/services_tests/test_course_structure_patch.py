@@ -0,0 +1,56 @@
+"""
+Тесты разбора операций JSON Patch для структуры курса.
+"""
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.courses_structure.json_patch import JsonPatchError, compile_patch, parse_pointer
+from src.courses_structure.repository import _apply, _jsonb
+from src.courses_structure.schemas import JsonPatchOperationSchema
+
+
+def _ops(*raw: dict) -> list[JsonPatchOperationSchema]:
+    return [JsonPatchOperationSchema.model_validate(item) for item in raw]
+
+
+def test_parse_pointer_unescapes_segments():
+    assert parse_pointer("/content/0/module/a~1b~0c") == ("content", "0", "module", "a/b~c")
+    assert parse_pointer("") == ()
+
+
+def test_replace_validates_only_target_field():
+    [operation] = compile_patch(_ops({"op": "replace", "path": "/content/3/module/name", "value": "Новый модуль"}))
+    assert operation.path == ("content", "3", "module", "name")
+    assert operation.value == "Новый модуль"
+
+
+def test_add_append_fills_defaults_of_new_item():
+    [operation] = compile_patch(_ops({"op": "add", "path": "/content/-", "value": {"lesson": {"name": "Урок"}}}))
+    assert operation.is_append
+    assert operation.value["lesson"]["homework"] is False
+
+
+@pytest.mark.parametrize("raw", [
+    {"op": "replace", "path": "/content/0/module/name", "value": ""},
+    {"op": "replace", "path": "/content/0/module", "value": None},
+    {"op": "remove", "path": "/content/0/module/name"},
+    {"op": "add", "path": "/content/0/module/name/x", "value": 1},
+    {"op": "replace", "path": "", "value": {}},
+    {"op": "move", "from": "/content/0", "path": "/content/0/module/submodules/0"},
+])
+def test_invalid_operations_rejected(raw):
+    with pytest.raises(JsonPatchError):
+        compile_patch(_ops(raw))
+
+
+def test_indexed_add_checks_parent_type_before_length():
+    # submodules = null: jsonb_array_length(null/скаляра) падает, проверка должна отсечь раньше
+    [operation] = compile_patch(_ops({
+        "op": "add", "path": "/content/0/module/submodules/0",
+        "value": {"name": "Подмодуль", "lessons": []},
+    }))
+    doc = _jsonb({"content": [{"module": {"name": "Модуль", "submodules": None}}]})
+
+    sql = str(_apply(doc, operation).compile(dialect=postgresql.dialect()))
+    guard = sql[sql.index("CASE WHEN"):sql.index("THEN")]
+    assert guard.index("jsonb_typeof") < guard.index(" AND ") < guard.index("jsonb_array_length")
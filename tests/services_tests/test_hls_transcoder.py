@@ -0,0 +1,34 @@
+"""
+Тесты построения команды ffmpeg для нарезки HLS.
+"""
+from src.media.transcoder import Rendition, build_hls_command, parse_renditions, select_renditions
+
+
+def test_parse_renditions_sorted_by_height():
+    renditions = parse_renditions("480:1400, 1080:5000,720:2800")
+    assert [r.height for r in renditions] == [1080, 720, 480]
+    assert renditions[0].video_kbps == 5000
+
+
+def test_select_renditions_never_upscales():
+    renditions = parse_renditions("1080:5000,720:2800,480:1400")
+    assert [r.height for r in select_renditions(renditions, 720)] == [720, 480]
+    assert [r.height for r in select_renditions(renditions, 240)] == [480]
+
+
+def test_command_maps_every_rendition_once():
+    renditions = [Rendition(720, 2800), Rendition(360, 800)]
+    command = build_hls_command("in.mp4", "/out", renditions, has_audio=True, segment_seconds=4)
+
+    assert command[command.index("-filter_complex") + 1] == (
+        "[0:v]split=2[v0][v1];[v0]scale=-2:720[v0out];[v1]scale=-2:360[v1out]"
+    )
+    assert command[command.index("-var_stream_map") + 1] == "v:0,a:0,name:720p v:1,a:1,name:360p"
+    assert command[command.index("-hls_time") + 1] == "4"
+    assert command[-1] == "/out/%v/index.m3u8"
+
+
+def test_command_without_audio_maps_video_only():
+    command = build_hls_command("in.mp4", "/out", [Rendition(480, 1400)], has_audio=False)
+    assert "a:0" not in command
+    assert command[command.index("-var_stream_map") + 1] == "v:0,name:480p"
@@ -0,0 +1,106 @@
+"""
+Тесты производных картинок: ресайз, дисковый LRU-кэш, склейка запросов.
+"""
+import asyncio
+from datetime import datetime, UTC
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from src.aws.backends import ObjectInfo
+from src.media.derivatives import ImageDerivatives
+from src.media.image_cache import DiskLRUCache
+from src.media import images
+from src.media.images import ImageError, parse_widths, render_image, snap_width
+
+
+def _png(width: int, height: int) -> bytes:
+    output = BytesIO()
+    Image.new("RGBA", (width, height), (200, 10, 10, 255)).save(output, "PNG")
+    return output.getvalue()
+
+
+def test_render_downscales_and_converts():
+    rendered = Image.open(BytesIO(render_image(_png(1000, 500), width=200, fmt="webp", quality=80)))
+    assert rendered.format == "WEBP"
+    assert rendered.size == (200, 100)
+
+    # Без увеличения маленьких исходников
+    rendered = Image.open(BytesIO(render_image(_png(100, 50), width=640, fmt="jpeg", quality=80)))
+    assert (rendered.format, rendered.size, rendered.mode) == ("JPEG", (100, 50), "RGB")
+
+
+def test_truncated_source_is_image_error(monkeypatch):
+    # Без EXIF-поворота декодирование откладывается до ресайза — ошибка
+    # обрезанного файла должна и там стать ImageError, а не 500
+    monkeypatch.setattr(images.ImageOps, "exif_transpose", lambda image: image)
+    truncated = _png(1000, 500)[:200]
+    with pytest.raises(ImageError):
+        render_image(truncated, width=200, fmt="webp", quality=80)
+
+
+def test_widths_snap_up_to_allowed_set():
+    widths = parse_widths("640, 128,256")
+    assert widths == [128, 256, 640]
+    assert [snap_width(w, widths) for w in (1, 128, 129, 5000)] == [128, 128, 256, 640]
+
+
+async def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=25)
+    await cache.load()
+    await cache.put("aa01.webp", b"x" * 10)
+    await cache.put("bb02.webp", b"x" * 10)
+    assert cache.get("aa01.webp") is not None
+
+    await cache.put("cc03.webp", b"x" * 10)
+    assert cache.get("bb02.webp") is None
+    assert cache.get("aa01.webp") is not None
+    assert cache.size == 20 and cache.evictions == 1
+
+    # Перезапуск: освободившийся слот достаётся новому процессу вместе с файлами
+    cache.close()
+    reloaded = DiskLRUCache(tmp_path, max_bytes=25)
+    assert await reloaded.load() == 2
+    reloaded.close()
+
+
+async def test_workers_get_separate_slots_and_budgets(tmp_path):
+    first = DiskLRUCache(tmp_path, max_bytes=25)
+    await first.load()
+    await first.put("aa01.webp", b"x" * 20)
+    # Сосед пишет файл прямо сейчас
+    writing = first.path_for("bb02.webp").with_name("bb02.webp.1234.part")
+    writing.parent.mkdir(parents=True)
+    writing.write_bytes(b"x")
+
+    second = DiskLRUCache(tmp_path, max_bytes=25)
+    assert await second.load() == 0
+    assert second.root != first.root and writing.exists()
+    await second.put("cc03.webp", b"x" * 20)
+    # Свой бюджет: чужие файлы не вытесняются
+    assert first.get("aa01.webp") is not None and second.get("cc03.webp") is not None
+
+    first.close()
+    second.close()
+
+
+async def test_concurrent_misses_share_one_render(tmp_path, monkeypatch):
+    derivatives = ImageDerivatives(workers=1, widths=[128], quality=80, cache=DiskLRUCache(tmp_path, 1024))
+    await derivatives.warm()
+    source = ObjectInfo(bucket="b", key="a.png", size=3, etag="e1", last_modified=datetime.now(UTC))
+    renders = 0
+
+    async def render(name, source, *, width, fmt):
+        nonlocal renders
+        renders += 1
+        await asyncio.sleep(0.01)
+        return await derivatives.cache.put(name, b"img")
+
+    monkeypatch.setattr(derivatives, "_render", render)
+    paths = await asyncio.gather(*(derivatives.get(source, width=128, fmt="webp") for _ in range(5)))
+    assert renders == 1 and len(set(paths)) == 1
+    assert derivatives.metrics()["coalesced"] == 4
+
+    await derivatives.get(source, width=128, fmt="webp")
+    assert derivatives.metrics()["hits"] == 1
@@ -0,0 +1,50 @@
+"""
+Тесты реестра шаблонов ключей: построение и разбор по одному описанию.
+"""
+from uuid import uuid4
+
+import pytest
+
+from src.aws.strategies import ObjectKind, build_key, key_templates
+from src.aws.upload_key import UploadKey
+
+
+@pytest.mark.parametrize("kind", [
+    ObjectKind.PROFILE_AVATAR,
+    ObjectKind.CHANNEL_AVATAR,
+    ObjectKind.CHANNEL_PREVIEW,
+    ObjectKind.VIDEO,
+    ObjectKind.VIDEO_PREVIEW,
+    ObjectKind.COURSE_PREVIEW,
+])
+def test_built_key_parses_back(kind):
+    context = dict(channel_id="chan-1", video_id=uuid4(), course_id=uuid4())
+    upload = UploadKey.from_context(owner_id=uuid4(), kind=kind, source_filename="Photo.PNG", **context)
+    parsed = UploadKey.from_s3(user_id=upload.user_id, key=upload.key)
+
+    assert (parsed.kind, parsed.key, parsed.ext) == (kind, upload.key, "png")
+    # Из ключа восстанавливаются только поля, которые в нём есть
+    assert parsed.channel_id in (None, "chan-1")
+    assert parsed.video_id in (None, context["video_id"])
+    assert parsed.course_id in (None, context["course_id"])
+    assert (parsed.video_id is not None) == (kind in (ObjectKind.VIDEO, ObjectKind.VIDEO_PREVIEW))
+
+
+def test_derived_and_foreign_keys_are_not_uploads():
+    video = uuid4()
+    for key in (
+        f"channels/c1/videos/{video}/hls/master.m3u8",
+        f"channels/c1/videos/{video}/poster.jpg",
+        "channels/c1/videos/not-a-uuid/video.mp4",
+        "other/user_avatar",
+    ):
+        assert key_templates.parse(key) is None
+
+
+def test_missing_context_is_rejected():
+    with pytest.raises(ValueError):
+        build_key(ObjectKind.VIDEO, channel_id="c1", source_filename="a.mp4")
+    # Ключи уроков только строятся
+    assert build_key(
+        ObjectKind.LESSON_MARKDOWN, channel_id="c1", course_id="k", module_name="Intro Part", lesson_name="First",
+    ) == "channels/c1/courses/k/intro_part/first.md"
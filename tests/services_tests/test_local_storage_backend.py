@@ -0,0 +1,72 @@
+"""
+Тесты локального бэкенда хранилища: подпись загрузки, запись, события, листинг.
+"""
+from urllib.parse import parse_qs, urlsplit, unquote
+
+import pytest
+
+from src.aws.access_policies import AccessPolicy
+from src.aws.backends import InvalidObjectPath, LocalStorageBackend, StorageEvent
+
+
+BUCKET = "0f8fad5b-d9cb-469f-a165-70867728950e"
+
+
+@pytest.fixture
+def backend(tmp_path) -> LocalStorageBackend:
+    return LocalStorageBackend(root=tmp_path, secret="secret", public_base_url="http://host/api/storage")
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def test_presigned_upload_verifies_and_expires(backend):
+    url = backend.presign_upload(
+        BUCKET, "channels/c 1/video.mp4",
+        content_type="video/mp4", access=AccessPolicy.PUBLIC_READ, expires_in=60, now=1000,
+    )
+    parsed = urlsplit(url)
+    assert parsed.path == f"/api/storage/{BUCKET}/channels/c%201/video.mp4"
+    query = {name: values[0] for name, values in parse_qs(parsed.query).items()}
+    key = unquote(parsed.path.split(f"{BUCKET}/", 1)[1])
+
+    kwargs = dict(acl=query["X-Acl"], expires=int(query["X-Expires"]), signature=query["X-Signature"])
+    assert backend.verify_upload(BUCKET, key, content_type="video/mp4", now=1030, **kwargs)
+    assert not backend.verify_upload(BUCKET, key, content_type="image/png", now=1030, **kwargs)
+    assert not backend.verify_upload(BUCKET, key, content_type="video/mp4", now=1061, **kwargs)
+
+
+@pytest.mark.parametrize("bucket, key", [("..", "a"), (BUCKET, "../x"), (BUCKET, "a/./b"), (BUCKET, "a.part")])
+def test_path_outside_root_rejected(backend, bucket, key):
+    with pytest.raises(InvalidObjectPath):
+        backend.path_for(bucket, key)
+
+
+@pytest.mark.asyncio
+async def test_write_emits_event_and_lists(backend):
+    events: list[StorageEvent] = []
+
+    async def listener(event: StorageEvent) -> None:
+        events.append(event)
+
+    backend.subscribe(listener)
+    info = await backend.write(BUCKET, "other/user_avatar.png", _chunks(b"ab", b"cd"), content_type="image/png")
+    await backend.write(BUCKET, "channels/1/channel_avatar.png", _chunks(b"x"))
+
+    assert info.size == 4
+    assert (await backend.head(BUCKET, "other/user_avatar.png")) == info
+    assert await backend.head(BUCKET, "other/missing.png") is None
+
+    [first, _] = events
+    record = first.to_minio_payload()["Records"][0]["s3"]
+    assert record["bucket"]["name"] == BUCKET
+    assert record["object"]["key"] == "other%2Fuser_avatar.png"
+    assert record["object"]["size"] == 4
+
+    listed = [item.key async for item in backend.list_prefix(BUCKET, "channels/")]
+    assert listed == ["channels/1/channel_avatar.png"]
+
+    assert await backend.delete(BUCKET, ["other/user_avatar.png", "other/missing.png"]) == 1
+    assert [item.key async for item in backend.list_prefix(BUCKET)] == ["channels/1/channel_avatar.png"]
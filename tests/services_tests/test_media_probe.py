@@ -0,0 +1,66 @@
+"""
+Тесты разбора заголовка MP4 через ranged-чтения.
+"""
+import struct
+
+import pytest
+
+from src.media.probe import ProbeError, probe_mp4
+
+
+def _box(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def _full(kind: bytes, payload: bytes, version: int = 0) -> bytes:
+    return _box(kind, bytes([version, 0, 0, 0]) + payload)
+
+
+def _track(handler: bytes, codec: bytes, width: int = 0, height: int = 0) -> bytes:
+    tkhd = bytes(20) + bytes(8 + 8 + 36) + struct.pack(">II", width << 16, height << 16)
+    hdlr = bytes(4) + handler + bytes(12) + b"\0"
+    stsd = struct.pack(">I", 1) + _box(codec, bytes(78))
+    return _box(b"trak", _full(b"tkhd", tkhd) + _box(b"mdia", (
+        _full(b"mdhd", bytes(20))
+        + _full(b"hdlr", hdlr)
+        + _box(b"minf", _box(b"stbl", _full(b"stsd", stsd) + _full(b"stsz", bytes(200_000))))
+    )))
+
+
+def _movie(moov_last: bool) -> bytes:
+    mvhd = struct.pack(">IIII", 0, 0, 1000, 90_500) + bytes(80)
+    moov = _box(b"moov", _full(b"mvhd", mvhd) + _track(b"vide", b"avc1", 1280, 720) + _track(b"soun", b"mp4a"))
+    ftyp = _box(b"ftyp", b"isom" + bytes(4))
+    mdat = _box(b"mdat", bytes(300_000))
+    return ftyp + (mdat + moov if moov_last else moov + mdat)
+
+
+@pytest.mark.parametrize("moov_last", [False, True])
+@pytest.mark.asyncio
+async def test_probe_reads_header_only(moov_last):
+    data = _movie(moov_last)
+    requested = []
+
+    async def fetch(offset: int, length: int) -> bytes:
+        requested.append(length)
+        return data[offset:offset + length]
+
+    info = await probe_mp4(fetch, len(data))
+
+    assert info.duration == pytest.approx(90.5)
+    assert (info.width, info.height) == (1280, 720)
+    assert (info.video_codec, info.audio_codec) == ("h264", "aac")
+    assert info.bitrate == int(len(data) * 8 / 90.5)
+    # mdat и таблица stsz не читаются
+    assert sum(requested) < len(data) / 2
+
+
+@pytest.mark.asyncio
+async def test_probe_rejects_non_mp4():
+    data = b"\x1aE\xdf\xa3" + bytes(100)
+
+    async def fetch(offset: int, length: int) -> bytes:
+        return data[offset:offset + length]
+
+    with pytest.raises(ProbeError):
+        await probe_mp4(fetch, len(data))
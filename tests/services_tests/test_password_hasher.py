@@ -0,0 +1,63 @@
+"""
+Тесты пула хеширования паролей.
+"""
+import asyncio
+
+import pytest
+from passlib.context import CryptContext
+
+from src.auth.passwords import PasswordHasher, PasswordHasherBusy
+
+
+def _hasher(rounds: int = 4, queue_limit: int = 8) -> PasswordHasher:
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+    return PasswordHasher(context, max_workers=2, queue_limit=queue_limit)
+
+
+async def test_hash_and_verify_in_executor():
+    hasher = _hasher()
+    hashed = await hasher.hash("secret")
+
+    assert await hasher.verify_and_update("secret", hashed) == (True, None)
+    assert (await hasher.verify_and_update("wrong", hashed))[0] is False
+    assert hasher.metrics()["completed"] == 3
+
+
+async def test_rehash_when_rounds_change():
+    old_hash = await _hasher(rounds=4).hash("secret")
+
+    verified, new_hash = await _hasher(rounds=5).verify_and_update("secret", old_hash)
+
+    assert verified
+    assert new_hash is not None and new_hash.startswith("$2b$05$")
+
+
+async def test_queue_limit_rejects_excess_requests():
+    hasher = _hasher(queue_limit=0)
+
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.hash("secret")
+    assert hasher.metrics()["rejected"] == 1
+
+
+async def test_cancelled_waiting_calls_release_queue_slots():
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4)
+    hasher = PasswordHasher(context, max_workers=1, queue_limit=4)
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    # Единственный поток занят, следующие вызовы ждут в очереди
+    blocker = loop.run_in_executor(hasher._executor, lambda: asyncio.run_coroutine_threadsafe(release.wait(), loop).result())
+    waiting = [asyncio.create_task(hasher.hash("secret")) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    assert hasher.metrics()["queued"] == 3
+
+    for task in waiting:
+        task.cancel()
+    await asyncio.gather(*waiting, return_exceptions=True)
+    assert hasher.metrics()["queued"] == 0
+
+    release.set()
+    await blocker
+    assert await hasher.verify_and_update("secret", await hasher.hash("secret")) == (True, None)
+    assert hasher.metrics()["queued"] == 0 and hasher.metrics()["completed"] == 2
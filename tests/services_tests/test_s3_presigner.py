@@ -0,0 +1,57 @@
+"""
+Локальный SigV4-подписчик должен давать ту же подпись, что и botocore.
+"""
+from datetime import datetime, UTC
+from unittest.mock import patch
+
+from aiobotocore.session import get_session
+from botocore.config import Config
+
+from src.aws.presigner import SigV4Presigner
+
+
+NOW = datetime(2025, 6, 3, 10, 0, 0, tzinfo=UTC)
+
+
+async def test_presign_matches_botocore():
+    async with get_session().create_client(
+        "s3",
+        endpoint_url="http://example.com",
+        region_name="us-east-1",
+        aws_access_key_id="AK",
+        aws_secret_access_key="SK",
+        config=Config(signature_version="s3v4"),
+    ) as client:
+        with patch("botocore.auth.get_current_datetime", return_value=NOW.replace(tzinfo=None)):
+            expected = await client.generate_presigned_url(
+                "put_object",
+                Params={"Bucket": "b", "Key": "a b/c~d.mp4", "ContentType": "video/mp4", "ACL": "public-read"},
+                ExpiresIn=3600,
+            )
+
+    presigner = SigV4Presigner(
+        access_key="AK", secret_key="SK", region="us-east-1", public_base_url="http://example.com",
+    )
+    actual = presigner.presign(
+        "PUT", "b", "a b/c~d.mp4",
+        expires_in=3600,
+        headers={"Content-Type": "video/mp4", "x-amz-acl": "public-read"},
+        now=NOW,
+    )
+
+    assert actual == expected
+
+
+def test_public_prefix_is_not_signed():
+    presigner = SigV4Presigner(
+        access_key="AK", secret_key="SK", region="us-east-1", public_base_url="http://example.com/s3proxy",
+    )
+    plain = SigV4Presigner(
+        access_key="AK", secret_key="SK", region="us-east-1", public_base_url="http://example.com",
+    )
+
+    proxied = presigner.presign("PUT", "b", "k", expires_in=60, now=NOW)
+    direct = plain.presign("PUT", "b", "k", expires_in=60, now=NOW)
+
+    assert proxied.startswith("http://example.com/s3proxy/b/k?")
+    assert proxied.split("X-Amz-Signature=")[1] == direct.split("X-Amz-Signature=")[1]
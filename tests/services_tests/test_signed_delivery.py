@@ -0,0 +1,204 @@
+"""
+Тесты раздачи по подписанным ссылкам: подпись GET, кэш по (пользователь, объект), политика бакета,
+ссылки только для зрителей с доступом к видео.
+"""
+from datetime import datetime, UTC
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from src.aws import delivery
+from src.aws.access_policies import AccessPolicy, get_delivery_policy, is_public_object
+from src.aws.backends import LocalStorageBackend
+from src.aws.delivery import DeliverySigner, delivery_signer
+from src.aws.service import StorageService
+from src.aws.strategies import ObjectKind
+from src.core.Enums.MIMETypeEnums import VideoMimeEnum
+from src.media.exceptions import MediaHTTPExceptions
+from src.media.router import get_image
+from src.videos.repository import VideoRepository
+from src.videos.schemas import VideoDataReadSchema, delivery_context
+from src.videos.service import VideoService
+
+
+VIDEO_KEY = "channels/c1/videos/v1/video.mp4"
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    backend = LocalStorageBackend(root=tmp_path, secret="secret", public_base_url="http://host/api/storage")
+    monkeypatch.setattr(delivery, "get_storage_backend", lambda: backend)
+    return backend
+
+
+def _signer(**overrides):
+    options = dict(mode="signed", ttl=3600, min_ttl=600, max_entries=100)
+    options.update(overrides)
+    return DeliverySigner(**options)
+
+
+def test_local_get_signature_round_trip(backend):
+    url = backend.presign_get("owner", VIDEO_KEY, expires_in=60, now=1000)
+    query = {name: values[0] for name, values in parse_qs(urlsplit(url).query).items()}
+    expires, signature = int(query["X-Expires"]), query["X-Signature"]
+
+    assert backend.verify_get("owner", VIDEO_KEY, expires=expires, signature=signature, now=1030)
+    assert not backend.verify_get("owner", VIDEO_KEY, expires=expires, signature=signature, now=1061)
+    assert not backend.verify_get("owner", "channels/c1/videos/v2/video.mp4", expires=expires, signature=signature, now=1030)
+
+
+def test_urls_are_reused_until_near_expiry(backend):
+    signer = _signer()
+    objects = [("owner", VIDEO_KEY), ("owner", "channels/c1/videos/v2/video.mp4")]
+
+    first = signer.sign_many("user-1", objects, now=1000)
+    assert first == signer.sign_many("user-1", objects, now=3900)
+    assert signer.metrics()["signed"] == 2 and signer.metrics()["hits"] == 2
+
+    # До истечения осталось меньше min_ttl — новая подпись
+    renewed = signer.sign_many("user-1", objects, now=4100)
+    assert renewed != first
+    # Другой пользователь получает свою ссылку
+    signer.sign_many("user-2", objects[:1], now=4100)
+    assert signer.metrics()["signed"] == 5
+
+
+def test_public_objects_and_public_mode_are_not_signed(backend):
+    signer = _signer()
+    poster = signer.url(None, "owner", "channels/c1/videos/v1/poster.jpg")
+    assert "X-Signature" not in poster and poster.endswith("/owner/channels/c1/videos/v1/poster.jpg")
+
+    public = _signer(mode="public")
+    assert "X-Signature" not in public.url(None, "owner", VIDEO_KEY)
+    assert public.metrics()["signed"] == 0
+
+
+def test_cache_is_bounded(backend):
+    signer = _signer(max_entries=2)
+    signer.sign_many(None, [("owner", f"channels/c1/videos/v{index}/video.mp4") for index in range(5)], now=1000)
+    assert signer.metrics()["cached"] == 2 and signer.metrics()["evicted"] == 3
+
+
+def test_signed_policy_opens_only_artwork():
+    assert is_public_object("other/user_avatar.png")
+    assert is_public_object("0f8fad5b/channels/c1/videos/v1/video_preview.webp")
+    assert is_public_object("sha256/ab/abcd/storyboard/sprite_000.jpg")
+    assert not is_public_object(VIDEO_KEY)
+    assert not is_public_object("channels/c1/videos/v1/hls/720p/seg_00001.ts")
+
+    public = get_delivery_policy("uploads", "public")
+    signed = get_delivery_policy("uploads", "signed")
+    assert public["Statement"][0]["Resource"] == ["arn:aws:s3:::uploads/*"]
+    assert "arn:aws:s3:::uploads/*" not in signed["Statement"][0]["Resource"]
+    assert "arn:aws:s3:::uploads/*/poster.jpg" in signed["Statement"][0]["Resource"]
+
+
+def _video(**fields) -> VideoDataReadSchema:
+    values = dict(
+        id=uuid4(), user_id=uuid4(), course_id=uuid4(), channel_id="c1", video_url="", preview_url=None,
+        video_ext="mp4", preview_ext=None, name="v", description="", is_free=False, is_public=True,
+        timeline=0, upload_date=datetime.now(UTC),
+    )
+    values.update(fields)
+    return VideoDataReadSchema(**values)
+
+
+class _Repository:
+    def __init__(self, enrolled):
+        self.enrolled = enrolled
+        self.queries = []
+
+    async def enrolled_course_ids(self, user_id, course_ids):
+        self.queries.append(set(course_ids))
+        return self.enrolled & set(course_ids)
+
+
+async def test_only_entitled_viewers_get_signed_video_url(backend, monkeypatch):
+    monkeypatch.setattr(delivery_signer, "mode", "signed")
+    viewer = uuid4()
+    own, free, enrolled, locked = _video(user_id=viewer), _video(is_free=True), _video(), _video()
+    videos = [own, free, enrolled, locked]
+    repository = _Repository({enrolled.course_id})
+
+    playable = await VideoService(repository, None).playable_ids(videos, viewer)
+    assert playable == {own.id, free.id, enrolled.id}
+    # Свои и бесплатные видео не требуют запроса прав
+    assert repository.queries == [{enrolled.course_id, locked.course_id}]
+
+    context = delivery_context(videos, viewer, playable)
+    urls = [video.model_dump(mode="json", context=context)["video_url"] for video in videos]
+    assert all("X-Signature" in url for url in urls[:3]) and urls[3] is None
+
+    # Аноним: только бесплатное видео, без обращения к правам
+    anonymous = await VideoService(_Repository(set()), None).playable_ids(videos, None)
+    assert anonymous == {free.id}
+    # Без контекста ссылка подписывается только для бесплатного видео
+    assert locked.model_dump(mode="json")["video_url"] is None
+
+
+def test_public_mode_keeps_plain_urls(backend):
+    assert delivery_signer.mode == "public"
+    assert _video().model_dump(mode="json")["video_url"].endswith("/video.mp4")
+
+
+class _Session:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Scalars()
+
+
+class _Scalars:
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+async def test_catalog_and_enrollment_queries():
+    session = _Session()
+    repository = VideoRepository(session)
+    await repository.get_all_video_datas()
+    await repository.enrolled_course_ids(uuid4(), [uuid4()])
+
+    catalog, enrollment = (str(statement.compile(dialect=postgresql.dialect())) for statement in session.statements)
+    assert "WHERE videos.is_public IS true" in catalog
+    assert "permissions.expiration_date IS NULL OR permissions.expiration_date >" in enrollment
+
+
+class _PresignBackend:
+    def __init__(self):
+        self.access = []
+
+    async def ensure_bucket(self, bucket):
+        pass
+
+    def presign_upload(self, bucket, key, *, content_type, access, expires_in):
+        self.access.append(access)
+        return "upload"
+
+
+async def test_video_uploads_are_private_in_signed_mode(backend, monkeypatch):
+    monkeypatch.setattr(delivery_signer, "mode", "signed")
+    presign = _PresignBackend()
+    await StorageService(presign).generate_upload_urls(
+        owner_id=uuid4(), object_kind=ObjectKind.VIDEO, content_type=VideoMimeEnum.MP4, source_filename="clip.mp4",
+        access=AccessPolicy.PUBLIC_READ, channel_id="c1", video_id=uuid4(),
+    )
+    assert presign.access == [AccessPolicy.PRIVATE]
+
+
+async def test_image_route_does_not_resize_private_objects(monkeypatch):
+    monkeypatch.setattr(delivery_signer, "mode", "signed")
+    with pytest.raises(HTTPException) as error:
+        await get_image(
+            "owner", "channels/c1/videos/v1/video.png", None,
+            w=100, fmt="png", v=None, derivatives=None, http_exceptions=MediaHTTPExceptions(),
+        )
+    assert error.value.status_code == 403
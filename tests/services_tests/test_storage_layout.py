@@ -0,0 +1,105 @@
+"""
+Тесты раскладки хранилища: адреса в режиме shared, шардирование и перенос объектов.
+"""
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.aws import migrate_layout
+from src.aws.backends import LocalStorageBackend
+from src.aws.layout import StorageLayout
+from src.aws.migrate_layout import LayoutMigration
+
+
+OWNER = UUID("0f8fad5b-d9cb-469f-a165-70867728950e")
+
+
+async def _chunks(data: bytes):
+    yield data
+
+
+def test_per_user_layout_uses_owner_bucket():
+    layout = StorageLayout(mode="per_user")
+    assert layout.locate(OWNER, "other/user_avatar.png") == (str(OWNER), "other/user_avatar.png")
+    assert layout.resolve(str(OWNER), "other/user_avatar.png") == (OWNER, "other/user_avatar.png")
+    assert layout.resolve("static", "logo.png") is None
+
+
+def test_shared_layout_round_trip_and_foreign_keys():
+    layout = StorageLayout(mode="shared", shared_bucket="uploads")
+    bucket, key = layout.locate(OWNER, "channels/c1/channel_avatar.png")
+    assert (bucket, key) == ("uploads", f"{OWNER}/channels/c1/channel_avatar.png")
+    assert layout.resolve(bucket, key) == (OWNER, "channels/c1/channel_avatar.png")
+
+    assert layout.resolve("uploads", "not-a-uuid/channels/c1/channel_avatar.png") is None
+    assert layout.resolve("uploads", str(OWNER)) is None
+    assert layout.resolve("other", key) is None
+
+
+def test_shards_are_stable_and_cover_all_buckets():
+    layout = StorageLayout(mode="shared", shared_bucket="uploads", shards=4)
+    assert layout.buckets() == ["uploads-000", "uploads-001", "uploads-002", "uploads-003"]
+
+    owners = [uuid4() for _ in range(200)]
+    placement = {owner: layout.bucket_for(owner) for owner in owners}
+    assert set(placement.values()) == set(layout.buckets())
+    assert all(layout.bucket_for(str(owner).upper()) == bucket for owner, bucket in placement.items())
+    # Ключ из чужого шарда не принадлежит раскладке
+    owner = owners[0]
+    foreign = next(bucket for bucket in layout.buckets() if bucket != placement[owner])
+    assert layout.resolve(foreign, f"{owner}/other/user_avatar.png") is None
+
+
+async def test_migration_copies_once_and_skips_foreign_buckets(tmp_path):
+    backend = LocalStorageBackend(root=tmp_path, secret="secret", public_base_url="http://host/api/storage")
+    keys = [f"channels/c1/videos/v{index}/video.mp4" for index in range(5)]
+    for key in keys:
+        await backend.write(str(OWNER), key, _chunks(b"x" * 10))
+    await backend.write("static", "logo.png", _chunks(b"y"))
+
+    target = StorageLayout(mode="shared", shared_bucket="uploads", shards=2)
+    migration = LayoutMigration(backend, target=target, concurrency=3)
+
+    stats = await migration.run(rewrite_ledger=False)
+    assert (stats.copied, stats.skipped, stats.bytes, stats.failed) == (5, 0, 50, 0)
+    bucket = target.bucket_for(OWNER)
+    copied = [info.key async for info in backend.list_prefix(bucket)]
+    assert copied == [f"{OWNER}/{key}" for key in keys]
+    assert [info.key async for info in backend.list_prefix(str(OWNER))] == keys
+
+    again = await migration.run(rewrite_ledger=False)
+    assert (again.copied, again.skipped) == (0, 5)
+
+
+async def test_migration_deletes_source_after_copy(tmp_path, monkeypatch):
+    backend = LocalStorageBackend(root=tmp_path, secret="secret", public_base_url="http://host/api/storage")
+    await backend.write(str(OWNER), "other/user_avatar.png", _chunks(b"z"))
+
+    target = StorageLayout(mode="shared", shared_bucket="uploads")
+    # API уже переключён на shared
+    monkeypatch.setattr(migrate_layout, "LAYOUT", target)
+    migration = LayoutMigration(backend, target=target, delete_source=True)
+    moved = []
+
+    async def move_ledger(bucket, owner_id):
+        moved.append(bucket)
+
+    monkeypatch.setattr(migration, "_move_ledger", move_ledger)
+    await migration.run()
+
+    assert moved == [str(OWNER)]
+    assert not (tmp_path / str(OWNER)).exists()
+    assert await backend.head("uploads", f"{OWNER}/other/user_avatar.png") is not None
+
+
+async def test_source_is_kept_until_switch_and_ledger_move(tmp_path, monkeypatch):
+    backend = LocalStorageBackend(root=tmp_path, secret="secret", public_base_url="http://host/api/storage")
+    target = StorageLayout(mode="shared", shared_bucket="uploads")
+
+    monkeypatch.setattr(migrate_layout, "LAYOUT", StorageLayout(mode="per_user"))
+    with pytest.raises(ValueError):
+        LayoutMigration(backend, target=target, delete_source=True)
+
+    monkeypatch.setattr(migrate_layout, "LAYOUT", target)
+    with pytest.raises(ValueError):
+        await LayoutMigration(backend, target=target, delete_source=True).run(rewrite_ledger=False)
@@ -0,0 +1,152 @@
+"""
+Тесты фоновой очистки префиксов: пачки, курсор для продолжения, удаление бакета,
+постановка заданий в транзакции удаления.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from src.aws.backends import LocalStorageBackend
+from src.core.background import BackgroundWorkers
+from src.deletions import worker as purge_module
+from src.deletions.repository import DeletionJobRepository
+from src.deletions.service import DeletionService
+from src.deletions.worker import PurgeWorker
+
+
+BUCKET = "0f8fad5b-d9cb-469f-a165-70867728950e"
+
+
+class _Progress:
+    def __init__(self):
+        self.calls = []
+
+    async def progress(self, job_id, *, cursor, objects, size):
+        self.calls.append((cursor, objects, size))
+
+
+async def _chunks(data: bytes):
+    yield data
+
+
+@pytest.fixture
+async def backend(tmp_path, monkeypatch) -> LocalStorageBackend:
+    backend = LocalStorageBackend(root=tmp_path, secret="secret", public_base_url="http://host/api/storage")
+    for index in range(5):
+        await backend.write(BUCKET, f"channels/c1/videos/v{index}/video.mp4", _chunks(b"x" * 10))
+    await backend.write(BUCKET, "channels/c2/channel_avatar.png", _chunks(b"y"))
+    monkeypatch.setattr(purge_module, "get_storage_backend", lambda: backend)
+    return backend
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    progress = _Progress()
+    worker = PurgeWorker(concurrency=1, poll_seconds=1, stale_after=60, max_attempts=3)
+
+    @asynccontextmanager
+    async def repository():
+        yield progress
+
+    async def release(bucket, keys):
+        worker.released.extend(keys)
+
+    async def release_prefix(bucket, prefix):
+        worker.released_prefixes.append(prefix)
+
+    monkeypatch.setattr(worker, "_repository", repository)
+    monkeypatch.setattr(worker, "_release", release)
+    monkeypatch.setattr(worker, "_release_prefix", release_prefix)
+    monkeypatch.setattr(purge_module, "PURGE_BATCH_SIZE", 2)
+    worker.progress = progress
+    worker.released = []
+    worker.released_prefixes = []
+    return worker
+
+
+def _job(prefix: str, *, cursor=None, drop_bucket=False):
+    return SimpleNamespace(id="job", bucket=BUCKET, prefix=prefix, cursor=cursor, drop_bucket=drop_bucket, reason="channel")
+
+
+async def test_purge_deletes_in_batches_and_tracks_cursor(backend, worker, tmp_path):
+    await worker._purge(_job("channels/c1/"))
+
+    assert [call[1:] for call in worker.progress.calls] == [(2, 20), (2, 20), (1, 10)]
+    assert worker.progress.calls[-1][0] == "channels/c1/videos/v4/video.mp4"
+    assert [info.key async for info in backend.list_prefix(BUCKET)] == ["channels/c2/channel_avatar.png"]
+    # Пустые «каталоги» удалённого префикса не остаются
+    assert not (tmp_path / BUCKET / "channels" / "c1").exists()
+    # Удалённое снимается со счёта занятого места
+    assert worker.released == [f"channels/c1/videos/v{index}/video.mp4" for index in range(5)]
+    assert worker.released_prefixes == ["channels/c1/"]
+
+
+async def test_purge_resumes_after_cursor(backend, worker):
+    await worker._purge(_job("channels/c1/", cursor="channels/c1/videos/v2/video.mp4"))
+
+    assert sum(call[1] for call in worker.progress.calls) == 2
+    remaining = [info.key async for info in backend.list_prefix(BUCKET, "channels/c1/")]
+    assert remaining == [f"channels/c1/videos/v{index}/video.mp4" for index in range(3)]
+
+
+async def test_purge_whole_bucket_drops_it(backend, worker, tmp_path):
+    await worker._purge(_job("", drop_bucket=True))
+    assert not (tmp_path / BUCKET).exists()
+
+
+async def test_drain_waits_for_running_purge_and_stops_claiming(worker, monkeypatch):
+    release = asyncio.Event()
+    claims = []
+
+    async def claim(limit):
+        claims.append(limit)
+        task = asyncio.create_task(release.wait())
+        worker._running.add(task)
+        task.add_done_callback(worker._on_task_done)
+        return 1
+
+    monkeypatch.setattr(worker, "_claim", claim)
+    workers = BackgroundWorkers()
+    workers.register("storage-purge", worker.run_forever)
+    workers.register_drain("storage-purge", worker.drain)
+    workers.start()
+    await asyncio.sleep(0)
+
+    stopping = asyncio.create_task(workers.stop(timeout=5))
+    await asyncio.sleep(0.01)
+    assert not stopping.done() and claims == [1]
+
+    release.set()
+    await stopping
+    assert claims == [1] and not worker._running
+
+
+class _Session:
+    def __init__(self):
+        self.added = []
+        self.committed = False
+
+    def add_all(self, items):
+        self.added.extend(items)
+
+    async def flush(self):
+        pass
+
+    async def commit(self):
+        self.committed = True
+
+
+async def test_purge_jobs_wait_for_caller_commit():
+    session = _Session()
+    woken = []
+    deletions = DeletionService(DeletionJobRepository(session), SimpleNamespace(wake=lambda: woken.append(True)))
+
+    await deletions.purge_channel(BUCKET, "c1")
+    # Задания только в сессии: их зафиксирует commit удаления канала
+    assert [job.prefix for job in session.added] == ["channels/c1/", f"{BUCKET}/channels/c1/"]
+    assert not session.committed and not woken
+
+    deletions.wake()
+    assert woken == [True]
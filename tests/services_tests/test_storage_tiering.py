@@ -0,0 +1,190 @@
+"""
+Тесты переноса холодных видео: группы файлов, адреса в холодном бакете, перенос и возврат,
+постановка возврата при просмотре.
+"""
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from types import SimpleNamespace
+from uuid import UUID
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from sqlalchemy.dialects import postgresql
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from src.aws.backends import LocalStorageBackend
+from src.aws.layout import HLS_MASTER, ORIGINAL, PREVIEWS, RENDITIONS, locate, video_file_group, video_object
+from src.core.Enums.MediaStatusEnums import MediaJobKindEnum
+from src.media import tiering
+from src.media.repository import MediaJobRepository
+from src.media.tiering import StorageTiering, tier_groups
+from src.videos.views import RecentViews, viewer_key
+
+
+OWNER = UUID("0f8fad5b-d9cb-469f-a165-70867728950e")
+VIDEO = UUID("7c9e6679-7425-40de-944b-e07fc1f90ae7")
+PREFIX = f"channels/c1/videos/{VIDEO}"
+
+
+async def _chunks(data: bytes):
+    yield data
+
+
+class FakeRepository:
+    def __init__(self):
+        self.cold_groups: list[str] = []
+
+    async def mark_cold(self, video_id, groups):
+        if self.cold_groups:
+            return False
+        self.cold_groups = list(groups)
+        return True
+
+    async def clear_cold(self, video_id):
+        cleared, self.cold_groups = bool(self.cold_groups), []
+        return cleared
+
+    async def get_cold_groups(self, video_id):
+        return list(self.cold_groups)
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    backend = LocalStorageBackend(root=tmp_path, secret="secret", public_base_url="http://host/api/storage")
+    monkeypatch.setattr(tiering, "get_storage_backend", lambda: backend)
+    return backend
+
+
+@pytest.fixture
+def repository():
+    return FakeRepository()
+
+
+def _tiering(monkeypatch, repository, *, groups):
+    worker = StorageTiering(
+        enabled=True, groups=groups, min_age=timedelta(days=30), idle=timedelta(days=30),
+        max_views_per_day=1.0, batch_size=10, concurrency=2, copy_concurrency=2, interval=60,
+    )
+
+    @asynccontextmanager
+    async def session():
+        yield SimpleNamespace(
+            mark_cold=repository.mark_cold,
+            clear_cold=repository.clear_cold,
+            cold_groups=repository.get_cold_groups,
+        )
+
+    monkeypatch.setattr(worker, "_tiers", session)
+    monkeypatch.setattr(worker, "_jobs", session)
+    return worker
+
+
+async def _upload(backend, names):
+    bucket, _ = locate(OWNER, "")
+    for name in names:
+        await backend.write(bucket, locate(OWNER, f"{PREFIX}/{name}")[1], _chunks(name.encode()))
+
+
+def test_file_groups_and_cold_addresses():
+    assert video_file_group("video.mp4") == ORIGINAL
+    assert video_file_group("hls/720p/seg_00001.ts") == RENDITIONS
+    assert video_file_group("storyboard/sprite_000.jpg") == PREVIEWS
+    assert video_file_group("video_preview.png") is None
+    assert tier_groups(keep_renditions=True, keep_previews=False) == [ORIGINAL, PREVIEWS]
+
+    hot = video_object(OWNER, "c1", VIDEO, "video.mp4")
+    cold = video_object(OWNER, "c1", VIDEO, "video.mp4", cold_groups=[ORIGINAL])
+    assert cold == ("cold", f"{OWNER}/{PREFIX}/video.mp4")
+    assert hot != cold
+    # HLS не переносился — остаётся в основном бакете
+    assert video_object(OWNER, "c1", VIDEO, HLS_MASTER, cold_groups=[ORIGINAL]) == locate(OWNER, f"{PREFIX}/{HLS_MASTER}")
+
+
+async def test_move_keeps_renditions_and_rehydrate_restores(backend, repository, monkeypatch):
+    await _upload(backend, ["video.mp4", HLS_MASTER, "video_preview.png"])
+    worker = _tiering(monkeypatch, repository, groups=[ORIGINAL])
+    video = SimpleNamespace(id=VIDEO, user_id=OWNER, channel_id="c1")
+
+    assert await worker.move(video) is True
+    assert repository.cold_groups == [ORIGINAL]
+    assert await backend.head(*video_object(OWNER, "c1", VIDEO, "video.mp4")) is None
+    assert await backend.head(*video_object(OWNER, "c1", VIDEO, "video.mp4", cold_groups=[ORIGINAL])) is not None
+    assert await backend.head(*locate(OWNER, f"{PREFIX}/{HLS_MASTER}")) is not None
+    assert worker.metrics()["moved_bytes"] == len(b"video.mp4")
+
+    # Уже холодное видео второй раз не переносится
+    assert await worker.move(video) is False
+
+    await worker.rehydrate(video)
+    assert repository.cold_groups == []
+    assert await backend.head(*video_object(OWNER, "c1", VIDEO, "video.mp4")) is not None
+    assert [info async for info in backend.list_prefix("cold")] == []
+
+
+async def test_rehydrate_after_reupload_only_drops_cold_copies(backend, repository, monkeypatch):
+    await _upload(backend, ["video.mp4"])
+    worker = _tiering(monkeypatch, repository, groups=[ORIGINAL])
+    video = SimpleNamespace(id=VIDEO, user_id=OWNER, channel_id="c1")
+    await worker.move(video)
+
+    # Новая загрузка: оригинал снова в основном бакете, группы сброшены
+    await backend.write(*locate(OWNER, f"{PREFIX}/video.mp4"), _chunks(b"new"))
+    await repository.clear_cold(VIDEO)
+
+    await worker.rehydrate(video)
+    assert await backend.read_range(*locate(OWNER, f"{PREFIX}/video.mp4"), 0, 3) == b"new"
+    assert [info async for info in backend.list_prefix("cold")] == []
+
+
+class _Session:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+    async def commit(self):
+        pass
+
+
+async def test_rehydrate_on_view_does_not_restart_queued_or_running_job():
+    session = _Session()
+    await MediaJobRepository(session).enqueue_idle(VIDEO, [MediaJobKindEnum.REHYDRATE])
+
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "ON CONFLICT ON CONSTRAINT uq_media_jobs_video_kind DO UPDATE" in sql
+    assert sql.endswith("WHERE media_jobs.status = 'done'")
+
+
+def test_repeated_views_are_counted_once_per_window():
+    views = RecentViews(window=60, max_entries=2)
+    assert views.should_count("10.0.0.1", VIDEO, now=1000)
+    assert not views.should_count("10.0.0.1", VIDEO, now=1030)
+    assert views.should_count("10.0.0.2", VIDEO, now=1030)
+    assert views.should_count("10.0.0.1", VIDEO, now=1061)
+
+    # Вытесненный из LRU зритель засчитывается снова
+    views.should_count("10.0.0.3", VIDEO, now=1062)
+    assert views.should_count("10.0.0.2", VIDEO, now=1063)
+    assert views.metrics() == {"entries": 2, "counted": 5, "repeated": 1}
+
+
+async def test_anonymous_viewers_behind_proxy_are_told_apart():
+    views = RecentViews(window=60, max_entries=10)
+    app = FastAPI()
+
+    @app.get("/watch")
+    async def watch(request: Request):
+        return {"counted": views.should_count(viewer_key(request, None), VIDEO)}
+
+    # nginx в отдельном контейнере: все запросы приходят с его адреса
+    transport = httpx.ASGITransport(
+        app=ProxyHeadersMiddleware(app, trusted_hosts="172.18.0.0/16"), client=("172.18.0.2", 50000)
+    )
+    async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+        counted = [
+            (await client.get("/watch", headers={"X-Forwarded-For": address})).json()["counted"]
+            for address in ("203.0.113.7", "198.51.100.4", "203.0.113.7")
+        ]
+    assert counted == [True, True, False]
@@ -0,0 +1,36 @@
+"""
+Тесты учёта занятого места: разбор события MinIO и сведение изменений в счётчики.
+"""
+from uuid import uuid4
+
+from src.aws.backends import StorageEvent
+from src.storage_usage.repository import usage_deltas
+from src.webhooks.schemas import MinioWebhookPayloadSchema
+
+
+def test_payload_keeps_size_etag_and_event_time():
+    event = StorageEvent(bucket="b", key="channels/c1/channel_avatar.png", size=2048, etag="e1")
+    record = MinioWebhookPayloadSchema.model_validate(event.to_minio_payload()).Records[0]
+    assert (record.s3.object.size, record.s3.object.eTag) == (2048, "e1")
+    assert record.eventTime == event.event_time
+
+
+def test_deltas_fan_out_to_user_channel_and_course():
+    user, course = uuid4(), uuid4()
+    deltas = usage_deltas([
+        (user, "c1", course, 100, 1),
+        (user, "c1", None, 50, 1),
+        (user, "c2", None, -30, 0),
+    ])
+    assert deltas == {
+        ("user", str(user)): (120, 2),
+        ("channel", "c1"): (150, 2),
+        ("channel", "c2"): (-30, 0),
+        ("course", str(course)): (100, 1),
+    }
+
+
+def test_zero_deltas_are_dropped():
+    user = uuid4()
+    # Перезапись тем же размером не трогает счётчики
+    assert usage_deltas([(user, "c1", None, 0, 0)]) == {}
@@ -0,0 +1,36 @@
+"""
+Тесты раскадровки: сетка кадров, WebVTT-индекс и склейка листов.
+"""
+from PIL import Image
+
+from src.media.storyboard import assemble_sheets, build_vtt, plan_timestamps, poster_timestamp
+
+
+def test_plan_caps_frame_count_for_long_videos():
+    assert plan_timestamps(35, interval=10, max_frames=200) == [0, 10, 20, 30]
+    long = plan_timestamps(7200, interval=10, max_frames=100)
+    assert len(long) == 100 and long[1] == 72
+    assert plan_timestamps(0, interval=10, max_frames=100) == [0.0]
+    assert poster_timestamp(30) == 3 and poster_timestamp(3600) == 10
+
+
+def test_vtt_addresses_tiles_across_sheets():
+    vtt = build_vtt([0, 10, 20], 25, tile=(160, 90), columns=2, rows=1).splitlines()
+    assert vtt[0] == "WEBVTT"
+    assert vtt[2:4] == ["00:00:00.000 --> 00:00:10.000", "sprite_000.jpg#xywh=0,0,160,90"]
+    assert vtt[5:7] == ["00:00:10.000 --> 00:00:20.000", "sprite_000.jpg#xywh=160,0,160,90"]
+    assert vtt[8:10] == ["00:00:20.000 --> 00:00:25.000", "sprite_001.jpg#xywh=0,0,160,90"]
+
+
+def test_sheets_are_tiled_with_source_aspect(tmp_path):
+    frames = []
+    for index in range(5):
+        frames.append(tmp_path / f"{index}.jpg")
+        Image.new("RGB", (320, 180), (index * 40, 0, 0)).save(frames[-1])
+
+    names, tile = assemble_sheets(frames, tmp_path, tile_width=160, columns=2, rows=2)
+    assert tile == (160, 90)
+    assert names == ["sprite_000.jpg", "sprite_001.jpg"]
+    with Image.open(tmp_path / names[0]) as first, Image.open(tmp_path / names[1]) as last:
+        assert first.size == (320, 180)
+        assert last.size == (160, 90)
@@ -0,0 +1,145 @@
+"""
+Тесты отсева повторных событий MinIO: LRU процесса, таблица, порядок sequencer,
+проверка токена до учёта места.
+"""
+from datetime import datetime, timedelta, UTC
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, Request
+
+from src.aws.backends import StorageEvent
+from src.aws.strategies import ObjectKind
+from src.settings.config import WEBHOOK_ENV
+from src.webhooks.dedup import EventIndex, event_sequencer, normalize_sequencer
+from src.webhooks.schemas import MinioWebhookPayloadSchema
+from src.webhooks.service import WebhooksService
+
+
+BUCKET = str(uuid4())
+KEY = "channels/c1/channel_avatar.png"
+
+
+class _Events:
+    def __init__(self, applied=None):
+        self.applied = dict(applied or {})
+        self.reads = 0
+
+    async def applied_sequencer(self, bucket, key):
+        self.reads += 1
+        return self.applied.get((bucket, key))
+
+    async def mark_applied(self, bucket, key, *, sequencer, etag, event_time):
+        self.applied[(bucket, key)] = max(sequencer, self.applied.get((bucket, key), ""))
+
+
+def _payload(moment: datetime) -> MinioWebhookPayloadSchema:
+    event = StorageEvent(bucket=BUCKET, key=KEY, size=10, etag="e", event_time=moment)
+    return MinioWebhookPayloadSchema.model_validate(event.to_minio_payload())
+
+
+async def _deliver(service: WebhooksService, payload: MinioWebhookPayloadSchema, calls: list, fail=False):
+    async def handler(upload_key, mime_type):
+        calls.append(upload_key.key)
+        if fail:
+            raise RuntimeError("boom")
+
+    await service._process(payload=payload, request=None, allowed_kind=ObjectKind.CHANNEL_AVATAR, handler=handler)
+
+
+async def test_retries_and_older_events_are_skipped():
+    events, calls = _Events(), []
+    service = WebhooksService(events=events, index=EventIndex(10))
+    now = datetime.now(UTC)
+
+    await _deliver(service, _payload(now), calls)
+    await _deliver(service, _payload(now), calls)
+    await _deliver(service, _payload(now - timedelta(seconds=1)), calls)
+    assert calls == [KEY]
+    # Повторы отсечены в памяти, без чтения таблицы
+    assert events.reads == 1
+
+    await _deliver(service, _payload(now + timedelta(seconds=1)), calls)
+    assert calls == [KEY, KEY]
+
+
+async def test_event_applied_by_another_worker_is_skipped():
+    now = datetime.now(UTC)
+    sequencer = event_sequencer(_payload(now).Records[0])
+    events, calls = _Events({(BUCKET, KEY): sequencer}), []
+    service = WebhooksService(events=events, index=EventIndex(10))
+
+    await _deliver(service, _payload(now), calls)
+    await _deliver(service, _payload(now), calls)
+    assert calls == [] and events.reads == 1
+
+
+async def test_failed_event_is_applied_on_retry():
+    events, calls = _Events(), []
+    service = WebhooksService(events=events, index=EventIndex(10))
+    payload = _payload(datetime.now(UTC))
+
+    await _deliver(service, payload, calls, fail=True)
+    assert events.applied == {}
+    await _deliver(service, payload, calls)
+    assert calls == [KEY, KEY] and len(events.applied) == 1
+
+
+def test_index_compares_normalized_sequencers_and_is_bounded():
+    index = EventIndex(1)
+    index.remember("b", "k", normalize_sequencer("fff"))
+    assert index.is_applied("b", "k", normalize_sequencer("100"))
+    assert not index.is_applied("b", "k", normalize_sequencer("1000"))
+    index.remember("b", "other", normalize_sequencer("1"))
+    assert len(index) == 1
+
+
+class _Usage:
+    def __init__(self):
+        self.sizes = []
+
+    async def record_upload(self, upload_key, *, size, etag, event_time):
+        self.sizes.append(size)
+
+
+def _request(headers: dict) -> Request:
+    return Request({
+        "type": "http",
+        "path": "/webhooks/minio/channel_avatar",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.mark.parametrize("headers", [
+    {"Authorization": f"Bearer {WEBHOOK_ENV.MINIO_WEBHOOK_TOKEN}"},
+    {"X-Minio-Webhook-Token": WEBHOOK_ENV.MINIO_WEBHOOK_TOKEN},
+])
+async def test_token_from_minio_or_header_is_accepted(headers):
+    usage, calls = _Usage(), []
+    service = WebhooksService(usage=usage, index=EventIndex(10))
+
+    async def handler(upload_key, mime_type):
+        calls.append(upload_key.key)
+
+    await service._process(
+        payload=_payload(datetime.now(UTC)), request=_request(headers),
+        allowed_kind=ObjectKind.CHANNEL_AVATAR, handler=handler,
+    )
+    assert calls == [KEY] and usage.sizes == [10]
+
+
+async def test_forged_event_is_rejected_before_usage_accounting():
+    usage, calls = _Usage(), []
+    service = WebhooksService(usage=usage, index=EventIndex(10))
+
+    async def handler(upload_key, mime_type):
+        calls.append(upload_key.key)
+
+    for headers in ({}, {"Authorization": "Bearer wrong"}, {"X-Minio-Webhook-Token": "wrong"}):
+        with pytest.raises(HTTPException) as error:
+            await service._process(
+                payload=_payload(datetime.now(UTC)), request=_request(headers),
+                allowed_kind=ObjectKind.CHANNEL_AVATAR, handler=handler,
+            )
+        assert error.value.status_code == 403
+    assert calls == [] and usage.sizes == []
@@ -0,0 +1,105 @@
+"""
+Тесты очереди повторов вебхуков: пауза с джиттером, откладывание упавших записей, dead letter.
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime, UTC
+from types import SimpleNamespace
+from urllib.parse import unquote_plus
+from uuid import uuid4
+
+import pytest
+
+from src.aws.backends import StorageEvent
+from src.aws.strategies import ObjectKind
+from src.core.backoff import backoff_delay
+from src.webhooks import retries as retries_module
+from src.webhooks.dedup import EventIndex
+from src.webhooks.retries import WebhookRetryWorker
+from src.webhooks.schemas import MinioWebhookPayloadSchema
+from src.webhooks.service import WebhooksService
+
+
+BUCKET = str(uuid4())
+KEY = "channels/c1/channel_avatar.png"
+
+
+class _Retries:
+    def __init__(self):
+        self.enqueued, self.succeeded, self.failed = [], [], []
+
+    async def enqueue(self, *, kind, record, error, delay):
+        self.enqueued.append((kind, record, error, delay))
+
+    async def succeed(self, retry_id):
+        self.succeeded.append(retry_id)
+
+    async def fail(self, retry_id, error, *, delay):
+        self.failed.append((retry_id, error, delay))
+
+
+def _record() -> dict:
+    event = StorageEvent(bucket=BUCKET, key=KEY, size=10, etag="e", event_time=datetime.now(UTC))
+    return event.to_minio_payload()["Records"][0]
+
+
+def test_backoff_grows_exponentially_within_jitter_band():
+    assert [backoff_delay(n, base=10, cap=3600, rand=lambda: 0) for n in (1, 2, 3)] == [5, 10, 20]
+    assert backoff_delay(3, base=10, cap=3600, rand=lambda: 1) == 40
+    assert backoff_delay(20, base=10, cap=3600, rand=lambda: 1) == 3600
+
+
+async def test_failed_record_is_deferred_not_lost():
+    retries = _Retries()
+    service = WebhooksService(retries=retries, index=EventIndex(10))
+
+    async def handler(upload_key, mime_type):
+        raise ConnectionError("db is down")
+
+    payload = MinioWebhookPayloadSchema(Records=[_record()])
+    await service._process(payload=payload, request=None, allowed_kind=ObjectKind.CHANNEL_AVATAR, handler=handler)
+
+    [(kind, record, error, delay)] = retries.enqueued
+    assert kind == "CHANNEL_AVATAR" and unquote_plus(record["s3"]["object"]["key"]) == KEY
+    assert error == "ConnectionError: db is down" and delay > 0
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    repository = _Retries()
+    worker = WebhookRetryWorker(poll_seconds=1, base_delay=10, max_delay=60, max_attempts=3, batch_size=10)
+
+    @asynccontextmanager
+    async def _repository():
+        yield repository
+
+    monkeypatch.setattr(worker, "_repository", _repository)
+    worker.repository = repository
+    return worker
+
+
+def _retry(attempts: int):
+    return SimpleNamespace(id="r1", kind="CHANNEL_AVATAR", bucket=BUCKET, key=KEY, record=_record(), attempts=attempts)
+
+
+async def test_worker_reschedules_then_dead_letters(worker, monkeypatch):
+    async def redeliver(kind, payload):
+        assert kind is ObjectKind.CHANNEL_AVATAR and payload.Records[0].s3.object.key
+        return ["ConnectionError: still down"]
+
+    monkeypatch.setattr(retries_module, "redeliver", redeliver)
+    await worker._retry(_retry(attempts=1))
+    await worker._retry(_retry(attempts=2))
+
+    [(_, _, delay), (_, error, dead)] = worker.repository.failed
+    assert 10 <= delay <= 20
+    assert dead is None and error == "ConnectionError: still down"
+    assert worker.metrics()["dead_lettered"] == 1
+
+
+async def test_worker_clears_redelivered_record(worker, monkeypatch):
+    async def redeliver(kind, payload):
+        return []
+
+    monkeypatch.setattr(retries_module, "redeliver", redeliver)
+    await worker._retry(_retry(attempts=1))
+    assert worker.repository.succeeded == ["r1"] and worker.metrics()["redelivered"] == 1